@@ -0,0 +1,65 @@
+"""
+Benchmark for parsing long TextGrids, where linking phones to words and building word transcriptions
+dominates the parse time
+
+Generates a synthetic MFA-style TextGrid with a speaker's word and phone tiers and times
+:meth:`~polyglotdb.io.parsers.textgrid.TextgridParser.parse_discourse` on it.
+
+Usage: python benchmarks/textgrid_parsing.py [hours]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+
+from praatio import textgrid
+
+base = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, base)
+
+from polyglotdb.io import inspect_mfa
+
+phones = ['AA1', 'AE1', 'B', 'D', 'EH1', 'F', 'G', 'IY1', 'K', 'L', 'M', 'N', 'P', 'S', 'T', 'UW1', 'Z']
+
+
+def generate_textgrid(path, hours, seed=1234):
+    random.seed(seed)
+    duration = hours * 3600
+    word_entries = []
+    phone_entries = []
+    cur = 0.0
+    while True:
+        num_phones = random.randint(2, 7)
+        phone_durations = [round(random.uniform(0.03, 0.15), 3) for _ in range(num_phones)]
+        end = round(cur + sum(phone_durations), 3)
+        if end > duration:
+            break
+        word_phones = [random.choice(phones) for _ in range(num_phones)]
+        word_entries.append((cur, end, ''.join(word_phones).lower()))
+        for p, d in zip(word_phones, phone_durations):
+            phone_end = round(cur + d, 3)
+            phone_entries.append((cur, phone_end, p))
+            cur = phone_end
+        cur = end
+        if random.random() < 0.1:
+            cur = round(cur + random.uniform(0.1, 0.5), 3)
+    tg = textgrid.Textgrid()
+    tg.addTier(textgrid.IntervalTier('speaker - words', word_entries, 0, duration))
+    tg.addTier(textgrid.IntervalTier('speaker - phones', phone_entries, 0, duration))
+    tg.save(path, format='short_textgrid', includeBlankSpaces=True)
+    return len(word_entries), len(phone_entries)
+
+
+if __name__ == '__main__':
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'synthetic.TextGrid')
+        num_words, num_phones = generate_textgrid(path, hours)
+        print('Generated {} hours with {} words and {} phones'.format(hours, num_words, num_phones))
+        parser = inspect_mfa(path)
+        begin = time.time()
+        data = parser.parse_discourse(path)
+        print('Parsing took {:.2f} seconds'.format(time.time() - begin))
+        unlinked = sum(1 for x in data['phone'] if x.super_id is None)
+        print('{} phones without a word'.format(unlinked))
@@ -1,20 +1,149 @@
+from decimal import Decimal
+
+import numpy as np
+
+
+def _missing(values):
+    if values.dtype == object:
+        return np.equal(values, None)
+    return np.isnan(values)
+
+
+def _to_array(rows):
+    # Missing values are None, which become NaN in float arrays
+    try:
+        return np.array(rows, dtype=float)
+    except (TypeError, ValueError):
+        return np.array(rows, dtype=object)
+
+
+def _as_object(values):
+    if values.dtype == object:
+        return values
+    converted = values.astype(object)
+    converted[np.isnan(values)] = None
+    return converted
+
+
 class Track(object):
     """
-    Track class to contain, select, and manage :class:`~polyglotdb.acoustics.classes.TimePoint` objects
+    Track class to contain, select, and manage the time points of an acoustic track
+
+    Time points are stored as a sorted vector of times and a two-dimensional array of measures with a column for
+    each measure name, with NaN for missing values.  Points with the same time are merged.  Iterating over the track
+    generates :class:`~polyglotdb.acoustics.classes.TimePoint` objects for compatibility.
 
     Attributes
     ----------
-    points : iterable of :class:`~polyglotdb.acoustics.classes.TimePoint`
+    points : list of :class:`~polyglotdb.acoustics.classes.TimePoint`
         Time points with values of the acoustic track
+    columns : list
+        Names of the measures in the track
     """
     def __init__(self):
-        self.points = []
+        self._times = np.empty(0, dtype=float)
+        # Original time objects, like Decimals, when times are not plain floats
+        self._time_values = None
+        # Number of decimal places of times that are returned as Decimals created when needed
+        self._time_precision = None
+        self.columns = []
+        self._values = np.empty((0, 0), dtype=float)
+        self._pending = []
+
+    @classmethod
+    def from_arrays(cls, times, values, columns, time_values=None, time_precision=None):
+        """
+        Create a track from arrays of times and measures
+
+        Parameters
+        ----------
+        times : array_like
+            Time of each point
+        values : array_like
+            Two-dimensional array with a row for each point and a column for each measure, with NaN or None for
+            missing values
+        columns : list
+            Names of the measures
+        time_values : array_like, optional
+            Time objects to return for each point, like Decimals, instead of floats
+        time_precision : int, optional
+            Number of decimal places of the times, to return times as Decimals with that many places instead of
+            floats without having to create them for all points up front
+
+        Returns
+        -------
+        :class:`~polyglotdb.acoustics.classes.Track`
+            Track with the points
+        """
+        track = cls()
+        times = np.asarray(times, dtype=float)
+        if not isinstance(values, np.ndarray) or values.dtype != object:
+            values = _to_array(values)
+        values = values.reshape(len(times), len(columns))
+        if time_values is not None:
+            time_values = np.asarray(time_values, dtype=object)
+        track.columns = list(columns)
+        track._times, track._time_values, track._values = track._merge_sorted(times, time_values, values)
+        if time_values is None:
+            track._time_precision = time_precision
+        return track
 
     def __str__(self):
         return '<Track: {}>'.format(self.points)
 
     def __repr__(self):
-        return '<TrackObject with {} points'.format(len(self.points))
+        return '<TrackObject with {} points'.format(len(self))
+
+    @property
+    def points(self):
+        return list(self)
+
+    @property
+    def time_array(self):
+        """
+        Sorted times of the points as floats
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Times of the points
+        """
+        self._consolidate()
+        return self._times
+
+    @property
+    def measures(self):
+        """
+        Measures of the points, with a row for each point and a column for each name in ``columns``
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Two-dimensional array of measures
+        """
+        self._consolidate()
+        return self._values
+
+    def column(self, name):
+        """
+        Get the values of a measure for all points
+
+        Parameters
+        ----------
+        name : str
+            Name of the measure
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Values of the measure, with NaN for missing values, or None if the track does not have the measure
+        """
+        self._consolidate()
+        try:
+            index = self.columns.index(name)
+        except ValueError:
+            return None
+        return self._values[:, index]
 
     def keys(self):
         """
@@ -25,10 +154,28 @@ class Track(object):
         list
             All keys on TimePoint objects
         """
-        keys = set()
-        for point in self:
-            keys.update(point.values.keys())
-        return sorted(keys)
+        self._consolidate()
+        if not len(self._times):
+            return []
+        return sorted(self.columns)
+
+    def _decimal_times(self, times):
+        scale = 10 ** self._time_precision
+        return [Decimal(x).scaleb(-self._time_precision) for x in np.rint(times * scale).astype(np.int64).tolist()]
+
+    def _object_times(self):
+        if self._time_values is None and self._time_precision is not None:
+            time_values = np.empty(len(self._times), dtype=object)
+            time_values[:] = self._decimal_times(self._times)
+            return time_values
+        return self._time_values
+
+    def _time_list(self):
+        if self._time_values is not None:
+            return self._time_values.tolist()
+        if self._time_precision is not None:
+            return self._decimal_times(self._times)
+        return self._times.tolist()
 
     def times(self):
         """
@@ -39,29 +186,49 @@ class Track(object):
         list
             Sorted time points
         """
-        times = set()
-        for point in self:
-            times.add(point.time)
-        return sorted(times)
+        self._consolidate()
+        return self._time_list()
+
+    def _point(self, time, row):
+        p = TimePoint(time)
+        for k, v in zip(self.columns, row):
+            if v is not None and v != v:
+                v = None
+            p.values[k] = v
+        return p
+
+    def _index(self, time):
+        i = int(np.searchsorted(self._times, float(time)))
+        if i < len(self._times) and self._time_list_item(i) == time:
+            return i
+        return None
+
+    def _time_list_item(self, index):
+        if self._time_values is not None:
+            return self._time_values[index]
+        if self._time_precision is not None:
+            return self._decimal_times(self._times[index:index + 1])[0]
+        return float(self._times[index])
 
     def __getitem__(self, time):
-        for point in self:
-            if point.time == time:
-                return point
-        return None
+        self._consolidate()
+        i = self._index(time)
+        if i is None:
+            return None
+        return self._point(self._time_list_item(i), self._values[i].tolist())
 
     def __len__(self):
-        return len(self.points)
+        self._consolidate()
+        return len(self._times)
 
     def __contains__(self, time):
-        for point in self:
-            if point.time == time:
-                return True
-        return False
+        self._consolidate()
+        return self._index(time) is not None
 
     def add(self, point):
         """
-        Add a :class:`~polyglotdb.acoustics.classes.TimePoint` to the track
+        Add a :class:`~polyglotdb.acoustics.classes.TimePoint` to the track, updating the values of any point
+        with the same time
 
         Parameters
         ----------
@@ -69,11 +236,121 @@ class Track(object):
             Time point to add
 
         """
-        self.points.append(point)
+        self._pending.append((point.time, dict(point.values)))
+
+    def update(self, other):
+        """
+        Add the points of another track, updating the values of points with the same time
+
+        Parameters
+        ----------
+        other : :class:`~polyglotdb.acoustics.classes.Track`
+            Track to add
+        """
+        self._consolidate()
+        other._consolidate()
+        if not len(other._times):
+            return
+        if not len(self._times):
+            self.columns = list(other.columns)
+            self._times = other._times
+            self._time_values = other._time_values
+            self._time_precision = other._time_precision
+            self._values = other._values
+            return
+        self._combine(other._times, other._object_times(), other.columns, other._values)
+
+    def _consolidate(self):
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+        columns = []
+        seen = set()
+        for _, values in pending:
+            for k in values:
+                if k not in seen:
+                    seen.add(k)
+                    columns.append(k)
+        times = [t for t, _ in pending]
+        float_times = np.array([float(t) for t in times], dtype=float)
+        time_values = None
+        if not all(type(t) is float for t in times):
+            time_values = np.empty(len(times), dtype=object)
+            time_values[:] = times
+        values = _to_array([[v.get(k, None) for k in columns] for _, v in pending])
+        values = values.reshape(len(times), len(columns))
+        if not len(self._times):
+            self.columns = columns
+            self._times, self._time_values, self._values = self._merge_sorted(float_times, time_values, values)
+            return
+        self._combine(float_times, time_values, columns, values)
+
+    def _combine(self, times, time_values, columns, values):
+        all_columns = list(self.columns) + [x for x in columns if x not in self.columns]
+        first = self._expand(self._values, self.columns, all_columns)
+        second = self._expand(values, columns, all_columns)
+        if first.dtype != second.dtype:
+            first = _as_object(first)
+            second = _as_object(second)
+        combined_times = np.concatenate([self._times, times])
+        if self._time_precision is not None:
+            self._time_values = self._object_times()
+            self._time_precision = None
+        if self._time_values is None and time_values is None:
+            combined_time_values = None
+        else:
+            combined_time_values = np.empty(len(combined_times), dtype=object)
+            combined_time_values[:len(self._times)] = self._time_list()
+            if time_values is None:
+                combined_time_values[len(self._times):] = times.tolist()
+            else:
+                combined_time_values[len(self._times):] = time_values
+        self.columns = all_columns
+        self._times, self._time_values, self._values = self._merge_sorted(combined_times, combined_time_values,
+                                                                          np.concatenate([first, second]))
+
+    @staticmethod
+    def _expand(values, columns, all_columns):
+        if columns == all_columns:
+            return values
+        if values.dtype == object:
+            expanded = np.full((values.shape[0], len(all_columns)), None, dtype=object)
+        else:
+            expanded = np.full((values.shape[0], len(all_columns)), np.nan)
+        for i, c in enumerate(columns):
+            expanded[:, all_columns.index(c)] = values[:, i]
+        return expanded
+
+    @staticmethod
+    def _merge_sorted(times, time_values, values):
+        # Stable sorting keeps points that were added later after earlier ones with the same time
+        order = np.argsort(times, kind='stable')
+        times = times[order]
+        values = values[order]
+        if time_values is not None:
+            time_values = time_values[order]
+        different = np.ones(len(times), dtype=bool)
+        different[1:] = times[1:] != times[:-1]
+        if different.all():
+            return times, time_values, values
+        groups = np.cumsum(different) - 1
+        first = np.flatnonzero(different)
+        # Later values update earlier ones for the same time, unless they are missing
+        rows, columns = np.nonzero(~_missing(values))
+        last = np.full((len(first), values.shape[1]), -1)
+        np.maximum.at(last, (groups[rows], columns), rows)
+        merged = values[first]
+        updated = last >= 0
+        merged[updated] = values[last[updated], np.nonzero(updated)[1]]
+        if time_values is not None:
+            time_values = time_values[first]
+        return times[first], time_values, merged
 
     def __iter__(self):
-        for p in sorted(self.points, key=lambda x: x.time):
-            yield p
+        self._consolidate()
+        for t, row in zip(self._time_list(), self._values.tolist()):
+            yield self._point(t, row)
 
     def items(self):
         """
@@ -84,9 +361,19 @@ class Track(object):
         generator
             Tuples of time points and values
         """
-        for p in sorted(self.points, key=lambda x: x.time):
+        for p in self:
             yield p.time, p.values
 
+    def _take(self, begin_index, end_index):
+        new_track = Track()
+        new_track.columns = list(self.columns)
+        new_track._times = self._times[begin_index:end_index]
+        if self._time_values is not None:
+            new_track._time_values = self._time_values[begin_index:end_index]
+        new_track._time_precision = self._time_precision
+        new_track._values = self._values[begin_index:end_index]
+        return new_track
+
     def slice(self, begin, end):
         """
         Create a slice of the acoustic track between two times
@@ -103,13 +390,49 @@ class Track(object):
         :class:`~polyglotdb.acoustics.classes.Track`
             Track constructed from just the time points in the specified time
         """
-        new_track = Track()
-        for p in self:
-            if p.time < begin:
-                continue
-            if p.time > end:
-                break
-            new_track.add(p)
+        self._consolidate()
+        n = len(self._times)
+        lo = int(np.searchsorted(self._times, float(begin), side='left'))
+        hi = int(np.searchsorted(self._times, float(end), side='right'))
+        if self._time_values is not None or self._time_precision is not None:
+            # Compare the original time objects exactly at the edges of the slice
+            while lo > 0 and not self._time_list_item(lo - 1) < begin:
+                lo -= 1
+            while lo < n and self._time_list_item(lo) < begin:
+                lo += 1
+            while hi < n and not self._time_list_item(hi) > end:
+                hi += 1
+            while hi > lo and self._time_list_item(hi - 1) > end:
+                hi -= 1
+        return self._take(lo, max(lo, hi))
+
+    def relative(self, begin, end):
+        """
+        Create a copy of the track with times relative to a time range, from 0 at its beginning to 1 at its end
+
+        Parameters
+        ----------
+        begin : float
+            Beginning of the time range
+        end : float
+            End of the time range
+
+        Returns
+        -------
+        :class:`~polyglotdb.acoustics.classes.Track`
+            Track with relative times
+        """
+        self._consolidate()
+        new_track = self._take(0, len(self._times))
+        new_track._time_precision = None
+        if self._time_values is not None or self._time_precision is not None:
+            duration = end - begin
+            time_values = np.empty(len(self._times), dtype=object)
+            time_values[:] = [(t - begin) / duration for t in self._time_list()]
+            new_track._time_values = time_values
+            new_track._times = np.array([float(t) for t in time_values], dtype=float)
+        else:
+            new_track._times = (self._times - float(begin)) / float(end - begin)
         return new_track
 
 
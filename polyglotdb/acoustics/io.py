@@ -1,11 +1,14 @@
 import os
 import subprocess
 import shutil
-import re
 import csv
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
 import librosa
 import audioread
-import neo4j
+import soundfile
+import soxr
 
 from conch.utils import write_wav
 
@@ -38,60 +41,312 @@ def resample_audio(file_path, new_file_path, new_sr):
         write_wav(sig, sr, new_file_path)
 
 
-def add_discourse_sound_info(corpus_context, discourse, filepath):
-    with audioread.audio_open(filepath) as f:
-        sample_rate = f.samplerate
-        n_channels = f.channels
+AUDIO_RATES = [('consonant', 16000), ('vowel', 11000), ('low_freq', 2000)]
+
+# Attenuation applied when resampling, matching ``sox gain -1`` to avoid clipping
+RESAMPLE_GAIN = 10 ** (-1 / 20)
+
+
+def sound_file_header(file_path):
+    """
+    Read the sampling rate, number of channels and duration of an audio file from its header, without decoding it
+
+    Parameters
+    ----------
+    file_path : str
+        Path to audio file
+
+    Returns
+    -------
+    int
+        Sampling rate
+    int
+        Number of channels
+    float
+        Duration in seconds
+    """
     try:
-        p = subprocess.Popen(['sox', filepath, '-n', 'stat'], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-                             stderr=subprocess.PIPE)
-        output, err = p.communicate()
-        err = err.decode('utf8')
-        warnings = re.search(r'(sox WARN.*)', err).groups()
-        if warnings:
-            for w in warnings:
-                print(w)
-        duration = float(re.search(r'Length \(seconds\):\s+([0-9.]+)', err).groups()[0])
-    except:
-        with audioread.audio_open(filepath) as f:
-            duration = f.duration
-    audio_dir = corpus_context.discourse_audio_directory(discourse)
+        info = soundfile.info(file_path)
+        return info.samplerate, info.channels, info.frames / info.samplerate
+    except RuntimeError:
+        with audioread.audio_open(file_path) as f:
+            return f.samplerate, f.channels, f.duration
+
+
+def resample_audio_rates(file_path, outputs, block_duration=10):
+    """
+    Resample an audio file to several sampling rates, decoding it only once.  The file is read and resampled in
+    blocks, so memory use does not depend on the length of the file.  Will not overwrite files that already exist.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to audio file
+    outputs : list
+        Tuples of the path to save a new audio file to and its sampling rate
+    block_duration : int
+        Duration in seconds of the blocks to read at a time
+    """
+    outputs = [(path, rate) for path, rate in outputs if not os.path.exists(path)]
+    if not outputs:
+        return
+    try:
+        source = soundfile.SoundFile(file_path)
+    except RuntimeError:
+        # Formats that libsndfile cannot read are decoded separately for each rate
+        for path, rate in outputs:
+            resample_audio(file_path, path, rate)
+        return
+    with source:
+        sr = source.samplerate
+        channels = source.channels
+        resamplers = []
+        try:
+            for path, rate in outputs:
+                temp_path = path + '.tmp'
+                out = soundfile.SoundFile(temp_path, 'w', rate, channels, 'PCM_16', format='WAV')
+                resamplers.append((soxr.ResampleStream(sr, rate, channels, dtype='float32'), out, temp_path, path))
+            for block in source.blocks(blocksize=sr * block_duration, dtype='float32', always_2d=True):
+                block *= RESAMPLE_GAIN
+                for stream, out, temp_path, path in resamplers:
+                    out.write(stream.resample_chunk(block))
+            for stream, out, temp_path, path in resamplers:
+                out.write(stream.resample_chunk(np.zeros((0, channels), dtype='float32'), last=True))
+        finally:
+            for stream, out, temp_path, path in resamplers:
+                out.close()
+    for stream, out, temp_path, path in resamplers:
+        os.replace(temp_path, path)
+
+
+def create_sound_file(file_path, audio_dir, file_type, sample_rate=None):
+    """
+    Create a single resampled audio file for a sound file, if it does not already exist
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the sound file
+    audio_dir : str
+        Directory to save the resampled audio file to
+    file_type : str
+        One of ``consonant``, ``vowel`` or ``low_freq``
+    sample_rate : int, optional
+        Sampling rate of the sound file, read from its header if not specified
+
+    Returns
+    -------
+    str
+        Path to the resampled audio file
+    """
+    if sample_rate is None:
+        sample_rate, n_channels, duration = sound_file_header(file_path)
     os.makedirs(audio_dir, exist_ok=True)
-    consonant_rate = 16000
-    consonant_path = os.path.join(audio_dir, 'consonant.wav')
-    vowel_rate = 11000
-    vowel_path = os.path.join(audio_dir, 'vowel.wav')
-    low_freq_rate = 2000
-    low_freq_path = os.path.join(audio_dir, 'low_freq.wav')
-    if sample_rate > consonant_rate:
-        resample_audio(filepath, consonant_path, consonant_rate)
-    else:
-        shutil.copy(filepath, consonant_path)
-        consonant_rate = sample_rate
-    if sample_rate > vowel_rate:
-        resample_audio(consonant_path, vowel_path, vowel_rate)
-    else:
-        shutil.copy(filepath, vowel_path)
-        vowel_rate = sample_rate
-    if sample_rate > low_freq_rate:
-        resample_audio(vowel_path, low_freq_path, low_freq_rate)
-    else:
-        shutil.copy(filepath, low_freq_path)
-        low_freq_rate = sample_rate
-    statement = '''MATCH (d:Discourse:{corpus_name}) where d.name = $discourse_name
-                    SET d.file_path = $filepath,
-                    d.consonant_file_path = $consonant_filepath,
-                    d.vowel_file_path = $vowel_filepath,
-                    d.low_freq_file_path = $low_freq_filepath,
-                    d.duration = $duration,
-                    d.sampling_rate = $sampling_rate,
-                    d.num_channels = $n_channels'''.format(corpus_name=corpus_context.cypher_safe_name)
-    corpus_context.execute_cypher(statement, filepath=filepath,
-                                  consonant_filepath=consonant_path,
-                                  vowel_filepath=vowel_path,
-                                  low_freq_filepath=low_freq_path,
-                                  duration=duration, sampling_rate=sample_rate,
-                                  n_channels=n_channels, discourse_name=discourse)
+    rate = dict(AUDIO_RATES)[file_type]
+    path = os.path.join(audio_dir, '{}.wav'.format(file_type))
+    if sample_rate > rate:
+        resample_audio_rates(file_path, [(path, rate)])
+    elif not os.path.exists(path):
+        shutil.copy(file_path, path)
+    return path
+
+
+def prepare_sound_files(file_path, audio_dir, lazy=False):
+    """
+    Create the resampled audio files for a sound file and collect its sound file properties.  Does not need a
+    CorpusContext, so that it can be run in worker processes.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the sound file
+    audio_dir : str
+        Directory to save resampled audio files to
+    lazy : bool
+        If True, only collect the sound file properties, leaving the resampled audio files to be created with
+        :func:`~polyglotdb.acoustics.io.create_sound_file` when needed
+
+    Returns
+    -------
+    dict
+        Discourse properties for the sound files
+    """
+    sample_rate, n_channels, duration = sound_file_header(file_path)
+    info = {'file_path': file_path, 'duration': duration, 'sampling_rate': sample_rate, 'num_channels': n_channels}
+    if lazy:
+        for name, rate in AUDIO_RATES:
+            info['{}_file_path'.format(name)] = None
+        return info
+    os.makedirs(audio_dir, exist_ok=True)
+    outputs = []
+    for name, rate in AUDIO_RATES:
+        path = os.path.join(audio_dir, '{}.wav'.format(name))
+        if sample_rate > rate:
+            outputs.append((path, rate))
+        else:
+            shutil.copy(file_path, path)
+        info['{}_file_path'.format(name)] = path
+    resample_audio_rates(file_path, outputs)
+    return info
+
+
+def evict_sound_files(audio_dir, max_size, keep=None):
+    """
+    Remove the least recently used resampled audio files until their total size is at most ``max_size``.  Files are
+    marked as used by updating their modification times.
+
+    Parameters
+    ----------
+    audio_dir : str
+        Directory containing a directory of resampled audio files for each discourse
+    max_size : int
+        Maximum total size in bytes
+    keep : collection, optional
+        Paths of files that should not be removed
+
+    Returns
+    -------
+    list
+        Tuples of discourse name and file type of each removed file
+    """
+    if keep is None:
+        keep = set()
+    files = []
+    total = 0
+    for discourse in os.listdir(audio_dir):
+        for name, rate in AUDIO_RATES:
+            path = os.path.join(audio_dir, discourse, '{}.wav'.format(name))
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            total += stat.st_size
+            files.append((stat.st_mtime, stat.st_size, path, discourse, name))
+    removed = []
+    for mtime, size, path, discourse, name in sorted(files):
+        if total <= max_size:
+            break
+        if path in keep:
+            continue
+        os.remove(path)
+        total -= size
+        removed.append((discourse, name))
+    return removed
+
+
+def _prepare_sound_files_worker(discourse, file_path, audio_dir, lazy):
+    return discourse, prepare_sound_files(file_path, audio_dir, lazy)
+
+
+def discourse_sound_info(corpus_context, discourse, filepath):
+    """
+    Prepare the resampled audio files for a discourse and collect its sound file properties
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.AudioContext`
+        CorpusContext to use
+    discourse : str
+        Name of the discourse
+    filepath : str
+        Path to the discourse's sound file
+
+    Returns
+    -------
+    dict
+        Discourse properties for the sound files
+    """
+    return prepare_sound_files(filepath, corpus_context.discourse_audio_directory(discourse),
+                               corpus_context.config.lazy_audio)
+
+
+def discourses_sound_info(corpus_context, sound_files, num_jobs=None, call_back=None, stop_check=None):
+    """
+    Prepare the resampled audio files for several discourses, in parallel on a process pool
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.AudioContext`
+        CorpusContext to use
+    sound_files : dict
+        Paths to sound files keyed by discourse name
+    num_jobs : int, optional
+        Number of processes to use, defaults to preparing the files in this process
+    call_back : callable
+        Function to monitor progress
+    stop_check : callable
+        Function to check whether process should be terminated early
+
+    Returns
+    -------
+    dict
+        Discourse properties for the sound files keyed by discourse name
+    """
+    jobs = [(d, f, corpus_context.discourse_audio_directory(d), corpus_context.config.lazy_audio)
+            for d, f in sound_files.items()]
+    if call_back is not None:
+        call_back('Preparing audio files...')
+        call_back(0, len(jobs))
+    info = {}
+    if num_jobs is None or num_jobs <= 1:
+        for i, job in enumerate(jobs):
+            if stop_check is not None and stop_check():
+                break
+            discourse, discourse_info = _prepare_sound_files_worker(*job)
+            info[discourse] = discourse_info
+            if call_back is not None:
+                call_back(i + 1)
+        return info
+    with ProcessPoolExecutor(max_workers=num_jobs) as executor:
+        futures = [executor.submit(_prepare_sound_files_worker, *job) for job in jobs]
+        for i, f in enumerate(as_completed(futures)):
+            if stop_check is not None and stop_check():
+                for x in futures:
+                    x.cancel()
+                break
+            discourse, discourse_info = f.result()
+            info[discourse] = discourse_info
+            if call_back is not None:
+                call_back(i + 1)
+    return info
+
+
+def add_discourses_sound_info(corpus_context, sound_files, num_jobs=None, call_back=None, stop_check=None):
+    """
+    Prepare the resampled audio files for several discourses and save their sound file properties
+
+    See :func:`~polyglotdb.acoustics.io.discourses_sound_info` for more details.
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.AudioContext`
+        CorpusContext to use
+    sound_files : dict
+        Paths to sound files keyed by discourse name
+    num_jobs : int, optional
+        Number of processes to use, defaults to preparing the files in this process
+    call_back : callable
+        Function to monitor progress
+    stop_check : callable
+        Function to check whether process should be terminated early
+    """
+    info = discourses_sound_info(corpus_context, sound_files, num_jobs, call_back, stop_check)
+    if not info:
+        return
+    statement = '''UNWIND $discourses AS info
+                    MATCH (d:Discourse:{corpus_name}) where d.name = info.discourse
+                    SET d.file_path = info.file_path,
+                    d.consonant_file_path = info.consonant_file_path,
+                    d.vowel_file_path = info.vowel_file_path,
+                    d.low_freq_file_path = info.low_freq_file_path,
+                    d.duration = info.duration,
+                    d.sampling_rate = info.sampling_rate,
+                    d.num_channels = info.num_channels'''.format(corpus_name=corpus_context.cypher_safe_name)
+    corpus_context.execute_cypher(statement, discourses=[dict(discourse=k, **v) for k, v in info.items()])
+
+
+def add_discourse_sound_info(corpus_context, discourse, filepath):
+    add_discourses_sound_info(corpus_context, {discourse: filepath})
 
 
 def setup_audio(corpus_context, data):
@@ -156,14 +411,7 @@ def point_measures_from_csv(corpus_context, header_info, annotation_type="phone"
                                             annotation_type=annotation_type,
                                             new_properties=properties)
         corpus_context.execute_cypher(statement)
-    for h in header_info.keys():
-        if h == 'id':
-            continue
-        try:
-            corpus_context.execute_cypher('CREATE INDEX FOR (n:%s) ON (n.%s)' % (annotation_type, h))
-        except neo4j.exceptions.ClientError as e:
-            if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                raise
+    corpus_context.schema.ensure(indexes=[(annotation_type, h) for h in header_info.keys() if h != 'id'])
     corpus_context.hierarchy.add_token_properties(corpus_context, annotation_type,
                                                   [(h, t) for h, t in header_info.items() if h != 'id'])
     corpus_context.encode_hierarchy()
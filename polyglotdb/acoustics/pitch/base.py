@@ -32,7 +32,7 @@ def analyze_utterance_pitch(corpus_context, utterance, source='praat', min_pitch
     segment_mapping = SegmentMapping()
     for r in results:
         channel = r['channel']
-        file_path = r['d']['vowel_file_path']
+        file_path = corpus_context.sound_file_path(r['d'], 'vowel')
         u = r['u']
         segment_mapping.add_file_segment(file_path, u['begin'], u['end'], channel, padding=padding)
 
@@ -60,7 +60,7 @@ def analyze_utterance_pitch(corpus_context, utterance, source='praat', min_pitch
 
 
 def update_utterance_pitch_track(corpus_context, utterance, new_track):
-    from ...corpus.audio import s_to_ms, s_to_nano
+    from ...corpus.audio import s_to_ms
     if isinstance(utterance, str):
         utterance_id = utterance
     else:
@@ -87,19 +87,12 @@ def update_utterance_pitch_track(corpus_context, utterance, new_track):
         u = r['u']
         phones = r['p']
 
-    client = corpus_context.acoustic_client()
-    query = '''DELETE from "pitch"
-                    where "discourse" = '{}' 
-                    and "speaker" = '{}' 
-                    and "time" >= {} 
-                    and "time" <= {};'''.format(discourse, speaker, s_to_nano(u['begin']), s_to_nano(u['end']))
-    result = client.query(query)
+    corpus_context.acoustic_store.delete('pitch', discourse, speaker, u['begin'], u['end'])
 
-    data = []
+    columns = {name: [] for name in ['time', 'speaker', 'discourse', 'channel', 'phone', 'utterance_id', 'F0']}
     for data_point in new_track:
         speaker, discourse, channel = speaker, discourse, channel
         time_point, value = data_point['time'], data_point['F0']
-        t_dict = {'speaker': speaker, 'discourse': discourse, 'channel': channel}
         label = None
         for i, p in enumerate(sorted(phones, key=lambda x: x['begin'])):
             if p['begin'] > time_point:
@@ -111,7 +104,6 @@ def update_utterance_pitch_track(corpus_context, utterance, new_track):
             label = None
         if label is None:
             continue
-        fields = {'phone': label, 'utterance_id': u['id']}
         try:
             if value is None:
                 continue
@@ -120,14 +112,15 @@ def update_utterance_pitch_track(corpus_context, utterance, new_track):
             continue
         if value <= 0:
             continue
-        fields['F0'] = value
-        d = {'measurement': 'pitch',
-             'tags': t_dict,
-             'time': s_to_ms(time_point),
-             'fields': fields
-             }
-        data.append(d)
-    client.write_points(data, batch_size=1000, time_precision='ms')
+        columns['time'].append(s_to_ms(time_point))
+        columns['speaker'].append(speaker)
+        columns['discourse'].append(discourse)
+        columns['channel'].append(channel)
+        columns['phone'].append(label)
+        columns['utterance_id'].append(u['id'])
+        columns['F0'].append(value)
+    corpus_context.acoustic_store.write('pitch', columns)
+    corpus_context.bump_corpus_version()
     if 'pitch' not in corpus_context.hierarchy.acoustics:
         corpus_context.hierarchy.acoustics.add('pitch')
         corpus_context.encode_hierarchy()
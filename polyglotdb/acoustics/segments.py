@@ -38,12 +38,9 @@ def generate_segments(corpus_context, annotation_type='utterance', subset=None,
         for r in results:
             channel = r['channel']
             discourse = r['d']['name']
-            if file_type == 'vowel':
-                file_path = r['d']['vowel_file_path']
-            elif file_type == 'low_freq':
-                file_path = r['d']['low_freq_file_path']
-            else:
-                file_path = r['d']['consonant_file_path']
+            if file_type not in ['vowel', 'low_freq']:
+                file_type = 'consonant'
+            file_path = corpus_context.sound_file_path(r['d'], file_type)
             if file_path is None:
                 print("Skipping discourse {} because no wav file exists.".format(discourse))
                 continue
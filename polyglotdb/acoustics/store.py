@@ -0,0 +1,810 @@
+import json
+import math
+import os
+import shutil
+import threading
+import uuid
+from decimal import Decimal
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+TAG_NAMES = ['speaker', 'discourse', 'channel']
+
+STATISTICS = ['mean', 'median', 'stddev', 'sum', 'mode', 'count']
+
+
+def is_missing(value):
+    """
+    Check whether a measurement value is missing, which is None, NaN or an empty string
+
+    Parameters
+    ----------
+    value : object
+        Value to check
+
+    Returns
+    -------
+    bool
+        True if the value is missing
+    """
+    return value is None or value == '' or (isinstance(value, float) and value != value)
+
+
+def column_array(values):
+    """
+    Convert values of a measurement column to an array, as floats with NaN for missing values when all values are
+    numbers, and as objects otherwise
+
+    Parameters
+    ----------
+    values : iterable
+        Values of the column
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Values of the column
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'fiub':
+        return values.astype(float)
+    values = list(values)
+    if all(v is None or (isinstance(v, (int, float, np.number)) and not isinstance(v, bool)) for v in values):
+        return np.array([np.nan if v is None else v for v in values], dtype=float)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def column_matrix(columns, names):
+    """
+    Combine measurement columns into a two-dimensional array with a row for each point, as floats with NaN for
+    missing values when all the columns are numeric, and as objects with None for missing values otherwise
+
+    Parameters
+    ----------
+    columns : dict
+        Columns of measurements, from :meth:`AcousticStore.read`
+    names : list
+        Names of the columns to combine
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Values of the columns
+    """
+    length = len(columns['time'])
+    arrays = [columns.get(x, np.full(length, np.nan)) for x in names]
+    if all(x.dtype.kind == 'f' for x in arrays):
+        if not arrays:
+            return np.empty((length, 0))
+        return np.column_stack(arrays)
+    values = np.empty((length, len(names)), dtype=object)
+    for i, array in enumerate(arrays):
+        converted = array.astype(object)
+        if array.dtype.kind == 'f':
+            converted[np.isnan(array)] = None
+        elif array.dtype.kind == 'U':
+            converted[array == ''] = None
+        values[:, i] = converted
+    return values
+
+
+def seconds_to_ms(seconds, round_up=False):
+    """
+    Convert a time boundary in seconds to whole milliseconds, quantizing floats to milliseconds like
+    :func:`~polyglotdb.corpus.audio.s_to_nano`, and rounding boundaries between milliseconds down, or up for lower
+    boundaries
+
+    Parameters
+    ----------
+    seconds : float or Decimal
+        Seconds
+    round_up : bool, defaults to False
+        Whether to round up rather than down
+
+    Returns
+    -------
+    int
+        Milliseconds
+    """
+    if not isinstance(seconds, Decimal):
+        seconds = Decimal(seconds).quantize(Decimal('0.001'))
+    if round_up:
+        return math.ceil(seconds * 1000)
+    return math.floor(seconds * 1000)
+
+
+def summarize(values, statistic):
+    """
+    Compute a statistic of measurement values, ignoring missing values
+
+    Parameters
+    ----------
+    values : :class:`numpy.ndarray`
+        Float values with NaN for missing values
+    statistic : str
+        One of ``'mean'``, ``'median'``, ``'stddev'``, ``'sum'``, ``'mode'`` or ``'count'``
+
+    Returns
+    -------
+    float or int or None
+        Value of the statistic, or None if there are not enough values
+    """
+    values = values[~np.isnan(values)]
+    if statistic == 'count':
+        return len(values)
+    if statistic == 'stddev':
+        if len(values) < 2:
+            return None
+        return float(np.std(values, ddof=1))
+    if not len(values):
+        return None
+    if statistic == 'mean':
+        return float(np.mean(values))
+    if statistic == 'median':
+        return float(np.median(values))
+    if statistic == 'sum':
+        return float(np.sum(values))
+    if statistic == 'mode':
+        unique, counts = np.unique(values, return_counts=True)
+        return float(unique[np.argmax(counts)])
+    raise ValueError('Statistic name should be one of: {}.'.format(', '.join(STATISTICS)))
+
+
+class AcousticStore(object):
+    """
+    Interface for storing the acoustic measurements of a corpus
+
+    Measurements are exchanged as columns: dictionaries of equally long arrays or lists, with a ``'time'`` column
+    of integer milliseconds, tag columns identifying the series of the points (``'speaker'``, ``'discourse'`` and
+    ``'channel'``), and a column for each field, like the measures, ``'phone'`` and ``'utterance_id'``.  Missing values
+    are None, NaN or empty strings.  Writing a point with the same time and tags as a stored point updates the
+    values of the stored point.
+    """
+
+    def write(self, acoustic_name, columns, tag_names=None):
+        """
+        Save measurements, updating points with the same times and tags
+
+        Parameters
+        ----------
+        acoustic_name : str
+            Name of the acoustic measure
+        columns : dict
+            Columns of the measurements
+        tag_names : list, optional
+            Names of the columns that are tags, defaults to ``TAG_NAMES``
+        """
+        raise NotImplementedError
+
+    def read(self, acoustic_name, fields=None, discourse=None, speaker=None, channel=None, begin=None, end=None,
+             utterance_ids=None, require_phone=False, filters=None, time_step=None):
+        """
+        Get measurements, sorted by time within each series
+
+        Parameters
+        ----------
+        acoustic_name : str
+            Name of the acoustic measure
+        fields : list, optional
+            Fields to return, defaults to all fields
+        discourse : str, optional
+            Only return measurements for this discourse
+        speaker : str, optional
+            Only return measurements for this speaker
+        channel : int, optional
+            Only return measurements for this channel
+        begin : float or Decimal, optional
+            Only return measurements at or after this time in seconds
+        end : float or Decimal, optional
+            Only return measurements at or before this time in seconds
+        utterance_ids : collection, optional
+            Only return measurements for these utterances
+        require_phone : bool, defaults to False
+            Only return measurements with a phone label
+        filters : dict, optional
+            Only return measurements with these values of other tags or fields
+        time_step : int, optional
+            Return the means of the fields for intervals of this many milliseconds between ``begin`` and ``end``
+            instead of the measurements, without tags
+
+        Returns
+        -------
+        dict
+            Columns of the measurements, with numeric columns as float arrays with NaN for missing values
+        """
+        raise NotImplementedError
+
+    def has_measurements(self, acoustic_name, discourse):
+        """
+        Check whether there are measurements for a discourse
+
+        Parameters
+        ----------
+        acoustic_name : str
+            Name of the acoustic measure
+        discourse : str
+            Name of the discourse
+
+        Returns
+        -------
+        bool
+            True if there are measurements
+        """
+        raise NotImplementedError
+
+    def aggregate(self, acoustic_name, statistics, measures, phones=None, by_speaker=False):
+        """
+        Compute summary statistics of measures for the points with a phone label
+
+        Parameters
+        ----------
+        acoustic_name : str
+            Name of the acoustic measure
+        statistics : list
+            Statistics to compute, from ``STATISTICS``
+        measures : list
+            Names of numeric measures
+        phones : list, optional
+            Phone labels to compute statistics for separately
+        by_speaker : bool, defaults to False
+            Whether to compute statistics for each speaker separately
+
+        Returns
+        -------
+        dict
+            Values of the statistics indexed by ``(statistic, measure)``, in dictionaries indexed by
+            ``(speaker, phone)``, with None for the speaker and phone when not computing statistics separately for
+            them
+        """
+        raise NotImplementedError
+
+    def delete(self, acoustic_name, discourse, speaker, begin, end):
+        """
+        Remove the measurements of a speaker in a discourse between two times
+
+        Parameters
+        ----------
+        acoustic_name : str
+            Name of the acoustic measure
+        discourse : str
+            Name of the discourse
+        speaker : str
+            Name of the speaker
+        begin : float or Decimal
+            Beginning of the time range in seconds
+        end : float or Decimal
+            End of the time range in seconds
+        """
+        raise NotImplementedError
+
+    def remove_fields(self, acoustic_name, fields):
+        """
+        Remove fields from all measurements
+
+        Parameters
+        ----------
+        acoustic_name : str
+            Name of the acoustic measure
+        fields : list
+            Names of the fields to remove
+        """
+        raise NotImplementedError
+
+    def drop(self, acoustic_name):
+        """
+        Remove all measurements of an acoustic measure
+
+        Parameters
+        ----------
+        acoustic_name : str
+            Name of the acoustic measure
+        """
+        raise NotImplementedError
+
+    def drop_all(self):
+        """
+        Remove all measurements of the corpus
+        """
+        raise NotImplementedError
+
+
+def _escape(value):
+    return str(value).replace("'", r"\'")
+
+
+class InfluxDBStore(AcousticStore):
+    """
+    Acoustic store that keeps measurements in the InfluxDB database of a corpus
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.AudioContext`
+        Corpus context to run InfluxDB queries with
+    """
+
+    def __init__(self, corpus_context):
+        self.corpus_context = corpus_context
+
+    def write(self, acoustic_name, columns, tag_names=None):
+        if tag_names is None:
+            tag_names = TAG_NAMES
+        columns = {k: v.tolist() if isinstance(v, np.ndarray) else list(v) for k, v in columns.items()}
+        times = columns.pop('time')
+        tag_names = [x for x in tag_names if x in columns]
+        tags = [(x, columns.pop(x)) for x in tag_names]
+        fields = list(columns.items())
+        data = []
+        for i, time_point in enumerate(times):
+            point_fields = {}
+            for name, values in fields:
+                if not is_missing(values[i]):
+                    point_fields[name] = values[i]
+            if not point_fields:
+                continue
+            data.append({'measurement': acoustic_name,
+                         'tags': {name: values[i] for name, values in tags},
+                         'time': int(time_point),
+                         'fields': point_fields})
+        self.corpus_context.acoustic_client().write_points(data, batch_size=1000, time_precision='ms')
+
+    def _where(self, discourse=None, speaker=None, channel=None, begin=None, end=None, utterance_ids=None,
+               require_phone=False, filters=None):
+        from ..corpus.audio import s_to_nano
+        conditions = []
+        for name, value in [('discourse', discourse), ('speaker', speaker), ('channel', channel)]:
+            if value is not None:
+                conditions.append('''"{}" = '{}\''''.format(name, _escape(value)))
+        if begin is not None:
+            conditions.append('"time" >= {}'.format(s_to_nano(begin)))
+        if end is not None:
+            conditions.append('"time" <= {}'.format(s_to_nano(end)))
+        if utterance_ids is not None:
+            conditions.append('({})'.format(' OR '.join('''"utterance_id" = '{}\''''.format(_escape(x))
+                                                        for x in utterance_ids)))
+        if require_phone:
+            conditions.append('''"phone" != \'\'''')
+        if filters:
+            conditions.extend('''"{}" = '{}\''''.format(k, _escape(v)) for k, v in filters.items())
+        if not conditions:
+            return ''
+        return 'WHERE ' + '\nAND '.join(conditions)
+
+    def read(self, acoustic_name, fields=None, discourse=None, speaker=None, channel=None, begin=None, end=None,
+             utterance_ids=None, require_phone=False, filters=None, time_step=None):
+        from ..corpus.audio import epoch_to_ms
+        if utterance_ids is not None and not len(utterance_ids):
+            return {'time': np.empty(0, dtype=np.int64)}
+        if time_step:
+            select = ', '.join('mean("{0}") AS "{0}"'.format(x) for x in fields)
+        elif fields is None:
+            select = '*'
+        else:
+            select = ', '.join('"{}"'.format(x) for x in ['time'] + list(fields) + TAG_NAMES)
+        query = '''select {} from "{}"
+                {}'''.format(select, acoustic_name,
+                             self._where(discourse, speaker, channel, begin, end, utterance_ids, require_phone,
+                                         filters))
+        if time_step:
+            query += '\ngroup by time({}ms) fill(null)'.format(int(time_step))
+        result = self.corpus_context.execute_influxdb(query + ';', epoch='ns')
+        data = {}
+        for r in result.get_points(acoustic_name):
+            for k, v in r.items():
+                data.setdefault(k, []).append(v)
+        columns = {'time': epoch_to_ms(data.pop('time', []))}
+        for k, v in data.items():
+            columns[k] = column_array(v)
+        return columns
+
+    def has_measurements(self, acoustic_name, discourse):
+        query = '''select * from "{}" WHERE "discourse" = '{}' LIMIT 1;'''.format(acoustic_name, _escape(discourse))
+        result = self.corpus_context.execute_influxdb(query)
+        return len(result) > 0
+
+    def aggregate(self, acoustic_name, statistics, measures, phones=None, by_speaker=False):
+        select = ', '.join('{0}("{1}") AS "{0}_{1}"'.format(s, m) for s in statistics for m in measures)
+        group_by = ' group by "speaker"' if by_speaker else ''
+        if phones is None:
+            queries = [(None, '''"phone" != \'\'''')]
+        else:
+            queries = [(p, '''"phone" = '{}\''''.format(_escape(p))) for p in phones]
+        results = {}
+        for phone, condition in queries:
+            query = '''select {} from "{}"
+                    where {}{};'''.format(select, acoustic_name, condition, group_by)
+            for k, v in self.corpus_context.execute_influxdb(query).items():
+                v = list(v)
+                if not v:
+                    continue
+                speaker = k[1]['speaker'] if by_speaker else None
+                results[(speaker, phone)] = {(s, m): v[0]['{}_{}'.format(s, m)] for s in statistics for m in measures}
+        return results
+
+    def delete(self, acoustic_name, discourse, speaker, begin, end):
+        from ..corpus.audio import s_to_nano
+        query = '''DELETE from "{}"
+                        where "discourse" = '{}'
+                        and "speaker" = '{}'
+                        and "time" >= {}
+                        and "time" <= {};'''.format(acoustic_name, _escape(discourse), _escape(speaker),
+                                                   s_to_nano(begin), s_to_nano(end))
+        self.corpus_context.execute_influxdb(query)
+
+    def remove_fields(self, acoustic_name, fields):
+        result = self.corpus_context.execute_influxdb('SHOW FIELD KEYS FROM "{}";'.format(acoustic_name))
+        remaining = [x['fieldKey'] for x in result.get_points() if x['fieldKey'] not in fields]
+        client = self.corpus_context.acoustic_client()
+        query = """SELECT {fields}
+        INTO "{name}_copy" FROM "{name}" GROUP BY *;""".format(name=acoustic_name,
+                                                                fields=', '.join('"{}"'.format(x) for x in remaining))
+        client.query(query)
+        client.query('DROP MEASUREMENT "{}"'.format(acoustic_name))
+        client.query('SELECT * INTO "{0}" FROM "{0}_copy" GROUP BY *'.format(acoustic_name))
+        client.query('DROP MEASUREMENT "{}_copy"'.format(acoustic_name))
+
+    def drop(self, acoustic_name):
+        self.corpus_context.acoustic_client().query('''DROP MEASUREMENT "{}";'''.format(acoustic_name))
+
+    def drop_all(self):
+        self.corpus_context.acoustic_client().drop_database(self.corpus_context.corpus_name)
+
+
+def _path_name(name):
+    # Percent-encode names, including dots, so that any name is a single safe path component
+    return quote(str(name), safe='').replace('.', '%2E')
+
+
+class LocalAcousticStore(AcousticStore):
+    """
+    Acoustic store that keeps measurements in NumPy files on disk, without a database server
+
+    Each acoustic measure has a directory with a directory for each discourse, containing a directory for each
+    speaker with a file for the times of the points in milliseconds, sorted to be used as a time index, and a file
+    for each other column.  Numeric columns are stored as floats with NaN for missing values, and other columns as
+    strings with empty strings for missing values.  Files are memory-mapped when reading, so measurements are only
+    loaded from disk as they are used.
+
+    Writes replace the files of a speaker's measurements in a discourse, so only one process should write
+    measurements of a corpus at a time.
+
+    Parameters
+    ----------
+    directory : str
+        Directory to store measurements in
+    """
+    columns_file = 'columns.json'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def measure_directory(self, acoustic_name):
+        return os.path.join(self.directory, _path_name(acoustic_name))
+
+    def series_directory(self, acoustic_name, discourse, speaker):
+        return os.path.join(self.measure_directory(acoustic_name), _path_name(discourse), _path_name(speaker))
+
+    def _series(self, acoustic_name, discourse=None, speaker=None):
+        measure_directory = self.measure_directory(acoustic_name)
+        if discourse is None:
+            try:
+                discourses = sorted(os.listdir(measure_directory))
+            except FileNotFoundError:
+                return
+        else:
+            discourses = [_path_name(discourse)]
+        for d in discourses:
+            discourse_directory = os.path.join(measure_directory, d)
+            if speaker is None:
+                try:
+                    speakers = sorted(os.listdir(discourse_directory))
+                except FileNotFoundError:
+                    continue
+            else:
+                speakers = [_path_name(speaker)]
+            for s in speakers:
+                path = os.path.join(discourse_directory, s)
+                if os.path.exists(os.path.join(path, self.columns_file)):
+                    yield unquote(d), unquote(s), path
+
+    def _column_names(self, path):
+        try:
+            with open(os.path.join(path, self.columns_file), 'r', encoding='utf8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _load(self, path, fields=None, mmap_mode='r'):
+        names = self._column_names(path)
+        if names is None:
+            return None
+        if fields is not None:
+            names = [x for x in names if x in fields or x in TAG_NAMES]
+        columns = {}
+        for name in ['time'] + names:
+            columns[name] = np.load(os.path.join(path, _path_name(name) + '.npy'), mmap_mode=mmap_mode)
+        return columns
+
+    def _save(self, path, columns):
+        os.makedirs(path, exist_ok=True)
+        names = [x for x in columns if x != 'time']
+        previous = self._column_names(path) or []
+        for name, values in columns.items():
+            file_path = os.path.join(path, _path_name(name) + '.npy')
+            temp_path = '{}.{}.tmp'.format(file_path, uuid.uuid4().hex)
+            with open(temp_path, 'wb') as f:
+                np.save(f, values)
+            os.replace(temp_path, file_path)
+        # The list of columns is written last, so removed columns are only dropped once the other files are written
+        temp_path = '{}.{}.tmp'.format(os.path.join(path, self.columns_file), uuid.uuid4().hex)
+        with open(temp_path, 'w', encoding='utf8') as f:
+            json.dump(names, f)
+        os.replace(temp_path, os.path.join(path, self.columns_file))
+        for name in previous:
+            if name not in columns:
+                try:
+                    os.remove(os.path.join(path, _path_name(name) + '.npy'))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _stored_column(values, length):
+        values = column_array(values)
+        if values.dtype == object:
+            values = np.array(['' if is_missing(v) else str(v) for v in values.tolist()], dtype=str)
+            if not len(values):
+                values = values.astype('<U1')
+        return values.reshape(length)
+
+    @staticmethod
+    def _as_strings(values):
+        if values.dtype.kind != 'f':
+            return values
+        return np.array(['' if v != v else str(v) for v in values.tolist()], dtype=str).reshape(len(values))
+
+    @staticmethod
+    def _missing_column(like, length):
+        if like.dtype.kind == 'f':
+            return np.full(length, np.nan)
+        return np.full(length, '', dtype=like.dtype)
+
+    @staticmethod
+    def _is_missing(values):
+        if values.dtype.kind == 'f':
+            return np.isnan(values)
+        return values == ''
+
+    def _merge(self, existing, new, key_names):
+        length = len(existing['time']) + len(new['time'])
+        columns = {}
+        for name in list(existing) + [x for x in new if x not in existing]:
+            parts = []
+            for part in (existing, new):
+                like = existing.get(name, new.get(name))
+                if name in part:
+                    parts.append(part[name])
+                else:
+                    parts.append(self._missing_column(like, len(part['time'])))
+            if any(x.dtype.kind != 'f' for x in parts):
+                parts = [self._as_strings(x) for x in parts]
+            columns[name] = np.concatenate(parts)
+        # Stable sorting by time and then tags keeps newer points after older ones with the same time and tags
+        order = np.lexsort([columns[x] for x in reversed(key_names)] + [columns['time']])
+        columns = {k: v[order] for k, v in columns.items()}
+        different = np.zeros(length, dtype=bool)
+        different[0] = True
+        for name in ['time'] + key_names:
+            different[1:] |= columns[name][1:] != columns[name][:-1]
+        if different.all():
+            return columns
+        groups = np.cumsum(different) - 1
+        first = np.flatnonzero(different)
+        merged = {}
+        for name, values in columns.items():
+            if name == 'time' or name in key_names:
+                merged[name] = values[first]
+                continue
+            # Newer values update older ones, unless they are missing
+            present = np.flatnonzero(~self._is_missing(values))
+            last = np.full(len(first), -1)
+            np.maximum.at(last, groups[present], present)
+            result = self._missing_column(values, len(first))
+            result[last >= 0] = values[last[last >= 0]]
+            merged[name] = result
+        return merged
+
+    def write(self, acoustic_name, columns, tag_names=None):
+        if tag_names is None:
+            tag_names = TAG_NAMES
+        length = len(columns['time'])
+        if not length:
+            return
+        data = {'time': np.asarray(columns['time'], dtype=np.int64).reshape(length)}
+        for name, values in columns.items():
+            if name == 'time':
+                continue
+            if name in tag_names:
+                data[name] = np.array([str(x) for x in values], dtype=str)
+            else:
+                data[name] = self._stored_column(values, length)
+        key_names = [x for x in tag_names if x in data and x not in ('speaker', 'discourse')]
+        series = np.stack([data.pop('discourse'), data.pop('speaker')], axis=1)
+        keys, inverse = np.unique(series, axis=0, return_inverse=True)
+        inverse = inverse.reshape(length)
+        with self._lock:
+            for i, (discourse, speaker) in enumerate(keys.tolist()):
+                indices = np.flatnonzero(inverse == i)
+                new = {k: v[indices] for k, v in data.items()}
+                path = self.series_directory(acoustic_name, discourse, speaker)
+                existing = self._load(path, mmap_mode=None)
+                if existing is None:
+                    existing = {k: v[:0] for k, v in new.items()}
+                self._save(path, self._merge(existing, new, key_names))
+
+    def _filter(self, columns, channel, begin, end, utterance_ids, require_phone, filters):
+        times = columns['time']
+        lo, hi = 0, len(times)
+        if begin is not None:
+            lo = int(np.searchsorted(times, seconds_to_ms(begin, round_up=True), side='left'))
+        if end is not None:
+            hi = int(np.searchsorted(times, seconds_to_ms(end), side='right'))
+        columns = {k: v[lo:max(lo, hi)] for k, v in columns.items()}
+        mask = np.ones(len(columns['time']), dtype=bool)
+        conditions = {}
+        if channel is not None:
+            conditions['channel'] = channel
+        if filters:
+            conditions.update(filters)
+        for name, value in conditions.items():
+            try:
+                values = columns[name]
+            except KeyError:
+                mask[:] = False
+                break
+            if values.dtype.kind == 'f':
+                mask &= values == float(value)
+            else:
+                mask &= values == str(value)
+        if utterance_ids is not None:
+            try:
+                mask &= np.isin(columns['utterance_id'], np.array([str(x) for x in utterance_ids], dtype=str))
+            except KeyError:
+                mask[:] = False
+        if require_phone:
+            try:
+                mask &= ~self._is_missing(columns['phone'])
+            except KeyError:
+                mask[:] = False
+        if mask.all():
+            return columns
+        return {k: v[mask] for k, v in columns.items()}
+
+    def read(self, acoustic_name, fields=None, discourse=None, speaker=None, channel=None, begin=None, end=None,
+             utterance_ids=None, require_phone=False, filters=None, time_step=None):
+        needed = None
+        if fields is not None:
+            needed = set(fields)
+            if utterance_ids is not None:
+                needed.add('utterance_id')
+            if require_phone:
+                needed.add('phone')
+            if filters:
+                needed.update(filters)
+        parts = []
+        for d, s, path in self._series(acoustic_name, discourse, speaker):
+            columns = self._load(path, needed)
+            if columns is None:
+                continue
+            columns = self._filter(columns, channel, begin, end, utterance_ids, require_phone, filters)
+            columns['speaker'] = np.full(len(columns['time']), s)
+            columns['discourse'] = np.full(len(columns['time']), d)
+            parts.append(columns)
+        names = ['time']
+        for part in parts:
+            names.extend(x for x in part if x not in names)
+        if fields is not None:
+            names = ['time'] + [x for x in fields if x in names] + [x for x in TAG_NAMES if x in names]
+        columns = {}
+        for name in names:
+            numeric = all(part[name].dtype.kind in 'fi' for part in parts if name in part)
+            values = []
+            for part in parts:
+                if name not in part:
+                    values.append(np.full(len(part['time']), np.nan if numeric else ''))
+                elif numeric:
+                    values.append(part[name])
+                else:
+                    values.append(self._as_strings(part[name]))
+            if len(values) == 1:
+                columns[name] = values[0]
+            elif values:
+                columns[name] = np.concatenate(values)
+            elif name == 'time':
+                columns[name] = np.empty(0, dtype=np.int64)
+            else:
+                columns[name] = np.empty(0, dtype=float)
+        if time_step:
+            return self._bin(columns, fields, begin, end, int(time_step))
+        return columns
+
+    @staticmethod
+    def _bin(columns, fields, begin, end, time_step):
+        # Intervals start at multiples of the time step, as with InfluxDB's GROUP BY time()
+        first = seconds_to_ms(begin, round_up=True) // time_step
+        last = seconds_to_ms(end) // time_step
+        count = max(0, last - first + 1)
+        bins = columns['time'] // time_step - first
+        binned = {'time': (np.arange(count, dtype=np.int64) + first) * time_step}
+        for name in fields:
+            values = columns.get(name, np.full(len(bins), np.nan))
+            if values.dtype.kind != 'f':
+                continue
+            present = ~np.isnan(values)
+            totals = np.bincount(bins[present], weights=values[present], minlength=count)
+            counts = np.bincount(bins[present], minlength=count)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                binned[name] = np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)[:count]
+        return binned
+
+    def has_measurements(self, acoustic_name, discourse):
+        for _, _, path in self._series(acoustic_name, discourse):
+            columns = self._load(path, [])
+            if columns is not None and len(columns['time']):
+                return True
+        return False
+
+    def aggregate(self, acoustic_name, statistics, measures, phones=None, by_speaker=False):
+        values = {}
+        for _, speaker, path in self._series(acoustic_name):
+            columns = self._load(path, list(measures) + ['phone'])
+            if columns is None or 'phone' not in columns:
+                continue
+            phone_labels = columns['phone']
+            if phones is None:
+                groups = [(None, ~self._is_missing(phone_labels))]
+            else:
+                groups = [(p, phone_labels == p) for p in phones]
+            for phone, mask in groups:
+                if not mask.any():
+                    continue
+                key = (speaker if by_speaker else None, phone)
+                group = values.setdefault(key, {m: [] for m in measures})
+                for m in measures:
+                    if m in columns and columns[m].dtype.kind == 'f':
+                        group[m].append(columns[m][mask])
+        results = {}
+        for key, group in values.items():
+            results[key] = {}
+            for m, parts in group.items():
+                data = np.concatenate(parts) if parts else np.empty(0)
+                for s in statistics:
+                    results[key][(s, m)] = summarize(data, s)
+        return results
+
+    def delete(self, acoustic_name, discourse, speaker, begin, end):
+        with self._lock:
+            for _, _, path in self._series(acoustic_name, discourse, speaker):
+                columns = self._load(path, mmap_mode=None)
+                if columns is None:
+                    continue
+                times = columns['time']
+                keep = (times < seconds_to_ms(begin, round_up=True)) | (times > seconds_to_ms(end))
+                self._save(path, {k: v[keep] for k, v in columns.items()})
+
+    def remove_fields(self, acoustic_name, fields):
+        with self._lock:
+            for _, _, path in self._series(acoustic_name):
+                columns = self._load(path, mmap_mode=None)
+                if columns is None:
+                    continue
+                self._save(path, {k: v for k, v in columns.items() if k not in fields})
+
+    def drop(self, acoustic_name):
+        with self._lock:
+            shutil.rmtree(self.measure_directory(acoustic_name), ignore_errors=True)
+
+    def drop_all(self):
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
@@ -96,7 +96,7 @@ def analyze_vot(corpus_context, classifier, stop_label='stops',
                     speaker_mapped_stops[x["speaker"]] = [stop_info]
             for speaker in speaker_mapped_stops:
                 channel = corpus_context.get_channel_of_speaker(speaker, discourse)
-                segment_mapping.add_file_segment(sf["consonant_file_path"],
+                segment_mapping.add_file_segment(corpus_context.sound_file_path(sf, "consonant"),
                         0, sf["duration"], channel,
                         name="{}-{}".format(speaker, discourse), vot_marks=speaker_mapped_stops[speaker])
     output = analyze_segments(segment_mapping.segments, vot_func, stop_check=stop_check, multiprocessing=multiprocessing)
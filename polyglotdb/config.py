@@ -64,8 +64,48 @@ class CorpusConfig(object):
         Host for the graph database
     graph_port : int
         Port for connecting to the graph database
+    graph_max_connection_pool_size : int
+        Maximum number of connections to the graph database kept by the driver shared by corpus contexts with the
+        same connection settings, defaults to 100
+    graph_connection_acquisition_timeout : float
+        Seconds to wait for a connection from the pool before failing, defaults to 60
+    graph_keep_alive : bool
+        Whether to use TCP keep-alive on graph database connections, defaults to True
     engine : str
         Type of SQL database
+    import_workers : int
+        Number of speakers to load into the graph database concurrently during import,
+        defaults to 1
+    import_transport : str
+        How imported rows are sent to the graph database, either 'csv' to write temporary CSV files for
+        ``LOAD CSV`` (requires a file system shared with Neo4j) or 'bolt' to send batches of rows
+        as query parameters, defaults to 'csv'
+    import_batch_size : int
+        Number of rows in each batch sent when using the 'bolt' import transport, defaults to 2000
+    query_fetch_size : int
+        Number of records to fetch from the graph database at a time, defaults to 1000
+    query_workers : int
+        Number of speakers or discourses (see ``query_behavior``) to query at once on separate database sessions,
+        defaults to 1
+    query_split_threshold : int
+        Number of rows a query is estimated to return, from the corpus statistics, below which it is run as a single
+        query rather than one query for each speaker or discourse, defaults to 0 to always split queries
+    lazy_audio : bool
+        If True, the resampled consonant, vowel and low frequency audio files of discourses are created when they
+        are first used rather than on import, defaults to False
+    audio_cache_size : int or None
+        Maximum total size in bytes of the resampled audio files to keep, with the least recently used files
+        removed (and created again when needed) once it is exceeded, defaults to None for no limit
+    query_cache_size : int or None
+        Maximum total size in bytes of the query results to keep on disk, so that repeating a query returns the
+        stored results without querying the graph database until the corpus is changed, defaults to None to not
+        store results
+    acoustic_store : str
+        Where acoustic measurements are stored, either 'influxdb' for the corpus's InfluxDB database or 'local' for
+        NumPy files under ``acoustic_dir``, which needs no database server, defaults to 'influxdb'
+    acoustic_dir : str
+        Directory for acoustic measurements when using the 'local' acoustic store, defaults to "acoustics" under the
+        corpus's data directory
     base_dir : str
         Base directory to store information and temporary files for the corpus
         defaults to ".pgdb" under the current user's home directory
@@ -82,7 +122,20 @@ class CorpusConfig(object):
         self.query_behavior = 'speaker'
         self.graph_http_port = 7474
         self.graph_bolt_port = 7687
+        self.graph_max_connection_pool_size = 100
+        self.graph_connection_acquisition_timeout = 60.0
+        self.graph_keep_alive = True
         self.debug = False
+        self.import_workers = 1
+        self.import_transport = 'csv'
+        self.import_batch_size = 2000
+        self.query_fetch_size = 1000
+        self.query_workers = 1
+        self.query_split_threshold = 0
+        self.lazy_audio = False
+        self.audio_cache_size = None
+        self.query_cache_size = None
+        self.acoustic_store = 'influxdb'
 
         if data_dir is None:
             data_dir = BASE_DIR
@@ -100,6 +153,8 @@ class CorpusConfig(object):
         os.makedirs(self.data_dir, exist_ok=True)
         self.audio_dir = os.path.join(self.data_dir, 'audio')
         os.makedirs(self.audio_dir, exist_ok=True)
+        self.query_cache_dir = os.path.join(self.data_dir, 'query_cache')
+        self.acoustic_dir = os.path.join(self.data_dir, 'acoustics')
 
         self.engine = 'sqlite'
         self.db_path = os.path.join(self.data_dir, self.corpus_name)
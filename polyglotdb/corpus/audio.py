@@ -2,9 +2,11 @@ import os
 import re
 import librosa
 import subprocess
+from contextlib import contextmanager
 from datetime import datetime
 from decimal import Decimal
 
+import numpy as np
 from influxdb import InfluxDBClient
 from influxdb.exceptions import InfluxDBClientError
 
@@ -12,9 +14,17 @@ from ..acoustics import analyze_pitch, analyze_formant_tracks, analyze_formant_p
     analyze_script, analyze_track_script, analyze_utterance_pitch, update_utterance_pitch_track, analyze_vot
 
 from ..acoustics.formants.helper import save_formant_point_data
-from ..acoustics.classes import Track, TimePoint
+from ..acoustics.classes import Track
+from ..acoustics.store import InfluxDBStore, LocalAcousticStore, column_matrix
+from ..exceptions import CorpusConfigError
 from .syllabic import SyllabicContext
 from ..acoustics.utils import load_waveform, generate_spectrogram
+from ..acoustics.io import AUDIO_RATES, create_sound_file, evict_sound_files
+
+ACOUSTIC_BATCH_SIZE = 100
+
+MS_PER_DAY = 24 * 60 * 60 * 1000
+EPOCH_UNITS_PER_MS = {'ns': 1000000, 'u': 1000, 'ms': 1}
 
 
 def sanitize_value(value, type):
@@ -159,6 +169,57 @@ def to_seconds(time_string):
     return s
 
 
+def epoch_to_ms(times, precision='ns'):
+    """
+    Converts epoch times from InfluxDB into numbers of milliseconds into the day to generate time points in an audio
+    file, as :func:`to_seconds` does for time strings
+
+    Parameters
+    ----------
+    times : array_like
+        Integer epoch times, as returned by InfluxDB queries run with an ``epoch`` precision
+    precision : str, defaults to ``'ns'``
+        Precision of the epoch times (``'ns'``, ``'u'`` or ``'ms'``)
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Time stamps rounded to the nearest millisecond, as integers
+    """
+    per_ms = EPOCH_UNITS_PER_MS[precision]
+    times = np.asarray(times, dtype=np.int64) % (MS_PER_DAY * per_ms)
+    if per_ms == 1:
+        return times
+    return np.rint(times / per_ms).astype(np.int64) % MS_PER_DAY
+
+
+def phone_labels(phones, times):
+    """
+    Find the labels of the phones at time points, where each point gets the label of the last phone beginning at or
+    before it, out of the phones that overlap the time points
+
+    Parameters
+    ----------
+    phones : tuple or None
+        Arrays of the begin times, end times and labels of phones, sorted by begin time
+    times : :class:`numpy.ndarray`
+        Time points
+
+    Returns
+    -------
+    list
+        Phone label for each time point, or None for points before the first phone
+    """
+    if phones is None or not len(times):
+        return [None] * len(times)
+    begins, ends, labels = phones
+    overlapping = (ends >= times.min()) & (begins <= times.max())
+    begins = begins[overlapping]
+    labels = labels[overlapping]
+    indices = np.searchsorted(begins, times, side='right') - 1
+    return [labels[i] if i >= 0 else None for i in indices.tolist()]
+
+
 class AudioContext(SyllabicContext):
     """
     Class that contains methods for dealing with audio files for corpora
@@ -185,14 +246,7 @@ class AudioContext(SyllabicContext):
             Sampling rate of the file
         """
         sound_file = self.discourse_sound_file(discourse)
-        if file_type == 'consonant':
-            path = os.path.expanduser(sound_file.consonant_file_path)
-        elif file_type == 'vowel':
-            path = os.path.expanduser(sound_file.vowel_file_path)
-        elif file_type == 'low_freq':
-            path = os.path.expanduser(sound_file.low_freq_file_path)
-        else:
-            path = os.path.expanduser(sound_file.file_path)
+        path = os.path.expanduser(self.sound_file_path(sound_file, file_type))
         signal, sr = librosa.load(path, sr=None)
         return signal, sr
 
@@ -220,14 +274,7 @@ class AudioContext(SyllabicContext):
             Sampling rate of the file
         """
         sf = self.discourse_sound_file(discourse)
-        if file_type == 'consonant':
-            file_path = sf['consonant_file_path']
-        elif file_type == 'vowel':
-            file_path = sf['vowel_file_path']
-        elif file_type == 'low_freq':
-            file_path = sf['low_freq_file_path']
-        else:
-            file_path = sf['file_path']
+        file_path = self.sound_file_path(sf, file_type)
         return load_waveform(file_path, begin, end)
 
     def generate_spectrogram(self, discourse, file_type='consonant', begin=None, end=None):
@@ -285,8 +332,10 @@ class AudioContext(SyllabicContext):
         multiprocessing : bool
             Flag whether to use multiprocessing or threading
         """
-        analyze_pitch(self, source, algorithm, stop_check=stop_check, call_back=call_back, multiprocessing=multiprocessing,
-                      absolute_min_pitch=absolute_min_pitch, absolute_max_pitch=absolute_max_pitch, adjusted_octaves=adjusted_octaves)
+        with self.pin_sound_files():
+            analyze_pitch(self, source, algorithm, stop_check=stop_check, call_back=call_back,
+                          multiprocessing=multiprocessing, absolute_min_pitch=absolute_min_pitch,
+                          absolute_max_pitch=absolute_max_pitch, adjusted_octaves=adjusted_octaves)
 
     def analyze_utterance_pitch(self, utterance, source='praat', **kwargs):
         """
@@ -308,7 +357,8 @@ class AudioContext(SyllabicContext):
         :class:`~polyglotdb.acoustics.classes.Track`
             Pitch track
         """
-        return analyze_utterance_pitch(self, utterance, source, **kwargs)
+        with self.pin_sound_files():
+            return analyze_utterance_pitch(self, utterance, source, **kwargs)
 
     def update_utterance_pitch_track(self, utterance, new_track):
         """
@@ -368,11 +418,12 @@ class AudioContext(SyllabicContext):
         multiprocessing : bool
             Flag to use multiprocessing, otherwise will use threading
         """
-        analyze_vot(self, classifier, stop_label=stop_label, stop_check=stop_check,
-                    call_back=call_back, multiprocessing=multiprocessing,
-                    overwrite_edited=overwrite_edited,
-                    vot_min=vot_min, vot_max=vot_max, window_min=window_min,
-                    window_max=window_max)
+        with self.pin_sound_files():
+            analyze_vot(self, classifier, stop_label=stop_label, stop_check=stop_check,
+                        call_back=call_back, multiprocessing=multiprocessing,
+                        overwrite_edited=overwrite_edited,
+                        vot_min=vot_min, vot_max=vot_max, window_min=window_min,
+                        window_max=window_max)
 
     def analyze_formant_points(self, stop_check=None, call_back=None, multiprocessing=True,
                                vowel_label=None):
@@ -392,8 +443,9 @@ class AudioContext(SyllabicContext):
         vowel_label : str, optional
             Optional subset of phones to compute tracks over.  If None, then tracks over utterances are computed.
         """
-        data = analyze_formant_points(self,  stop_check=stop_check, call_back=call_back,
-                               multiprocessing=multiprocessing, vowel_label=vowel_label)
+        with self.pin_sound_files():
+            data = analyze_formant_points(self, stop_check=stop_check, call_back=call_back,
+                                          multiprocessing=multiprocessing, vowel_label=vowel_label)
         save_formant_point_data(self, data)
 
     def analyze_formant_tracks(self, source='praat', stop_check=None, call_back=None, multiprocessing=True,
@@ -416,8 +468,9 @@ class AudioContext(SyllabicContext):
         vowel_label : str, optional
             Optional subset of phones to compute tracks over.  If None, then tracks over utterances are computed.
         """
-        analyze_formant_tracks(self, source=source, stop_check=stop_check, call_back=call_back,
-                               multiprocessing=multiprocessing, vowel_label=vowel_label)
+        with self.pin_sound_files():
+            analyze_formant_tracks(self, source=source, stop_check=stop_check, call_back=call_back,
+                                   multiprocessing=multiprocessing, vowel_label=vowel_label)
 
     def analyze_intensity(self, source='praat', stop_check=None, call_back=None, multiprocessing=True):
         """
@@ -436,7 +489,8 @@ class AudioContext(SyllabicContext):
         multiprocessing : bool
             Flag to use multiprocessing, defaults to True, if False uses threading
         """
-        analyze_intensity(self, source, stop_check, call_back, multiprocessing=multiprocessing)
+        with self.pin_sound_files():
+            analyze_intensity(self, source, stop_check, call_back, multiprocessing=multiprocessing)
 
     def analyze_script(self, phone_class=None, subset=None, annotation_type=None, script_path=None, duration_threshold=0.01, arguments=None, stop_check=None,
                        call_back=None, multiprocessing=True, file_type='consonant'):
@@ -474,9 +528,10 @@ class AudioContext(SyllabicContext):
         list
             List of the names of newly added properties to the Neo4j database
         """
-        return analyze_script(self, subset=subset, annotation_type=annotation_type, phone_class=phone_class, script_path=script_path, duration_threshold=duration_threshold,
-                              arguments=arguments,
-                              stop_check=stop_check, call_back=call_back, multiprocessing=multiprocessing)
+        with self.pin_sound_files():
+            return analyze_script(self, subset=subset, annotation_type=annotation_type, phone_class=phone_class, script_path=script_path, duration_threshold=duration_threshold,
+                                  arguments=arguments,
+                                  stop_check=stop_check, call_back=call_back, multiprocessing=multiprocessing)
 
     def analyze_track_script(self, acoustic_name, properties, script_path, duration_threshold=0.01,phone_class=None,
                              arguments=None, stop_check=None, call_back=None, multiprocessing=True, file_type='consonant'):
@@ -509,9 +564,10 @@ class AudioContext(SyllabicContext):
         file_type : str
             Sampling rate type to use, one of ``consonant``, ``vowel``, or ``low_freq``
         """
-        return analyze_track_script(self, acoustic_name, properties, script_path, duration_threshold=duration_threshold,
-                              arguments=arguments, phone_class=phone_class,
-                              stop_check=stop_check, call_back=call_back, multiprocessing=multiprocessing, file_type=file_type)
+        with self.pin_sound_files():
+            return analyze_track_script(self, acoustic_name, properties, script_path, duration_threshold=duration_threshold,
+                                        arguments=arguments, phone_class=phone_class,
+                                        stop_check=stop_check, call_back=call_back, multiprocessing=multiprocessing, file_type=file_type)
 
     def reset_formant_points(self):
         """
@@ -546,7 +602,7 @@ class AudioContext(SyllabicContext):
         """
         Reset all acoustic measures currently encoded
         """
-        self.acoustic_client().drop_database(self.corpus_name)
+        self.acoustic_store.drop_all()
         if self.hierarchy.acoustics:
             self.hierarchy.acoustic_properties = {}
             self.encode_hierarchy()
@@ -560,7 +616,8 @@ class AudioContext(SyllabicContext):
         acoustic_type : str
             Name of the acoustic measurement to reset
         """
-        self.acoustic_client().query('''DROP MEASUREMENT "{}";'''.format(acoustic_type))
+        self.acoustic_store.drop(acoustic_type)
+        self.bump_corpus_version()
         if acoustic_type in self.hierarchy.acoustics:
             self.hierarchy.acoustic_properties = {k: v for k, v in self.hierarchy.acoustic_properties.items() if
                                                   k != acoustic_type}
@@ -592,13 +649,32 @@ class AudioContext(SyllabicContext):
             client.create_database(self.corpus_name)
         return client
 
+    @property
+    def acoustic_store(self):
+        """
+        Store of the corpus's acoustic measurements, set by the ``acoustic_store`` corpus configuration
+
+        Returns
+        -------
+        :class:`~polyglotdb.acoustics.store.AcousticStore`
+            Acoustic store
+        """
+        if self._acoustic_store is None:
+            if self.config.acoustic_store == 'influxdb':
+                self._acoustic_store = InfluxDBStore(self)
+            elif self.config.acoustic_store == 'local':
+                self._acoustic_store = LocalAcousticStore(self.config.acoustic_dir)
+            else:
+                raise CorpusConfigError('The acoustic store must be one of: influxdb, local.')
+        return self._acoustic_store
+
     def discourse_audio_directory(self, discourse):
         """
         Return the directory for the stored audio files for a discourse
         """
         return os.path.join(self.config.audio_dir, discourse)
 
-    def discourse_sound_file(self, discourse):
+    def discourse_sound_file(self, discourse, file_type=None):
         """
         Get details for the audio file paths for a specified discourse.
 
@@ -606,6 +682,9 @@ class AudioContext(SyllabicContext):
         ----------
         discourse : str
             Name of the audio file in the corpus
+        file_type : str, optional
+            One of ``consonant``, ``vowel`` or ``low_freq``, to create that resampled audio file if it does not exist
+            yet, see :meth:`~polyglotdb.corpus.AudioContext.sound_file_path`
 
         Returns
         -------
@@ -620,8 +699,94 @@ class AudioContext(SyllabicContext):
             break
         else:
             raise Exception('Could not find discourse {}'.format(discourse))
+        if file_type in dict(AUDIO_RATES):
+            path = d.get('{}_file_path'.format(file_type))
+            if self.sound_file_path(d, file_type) != path:
+                return self.discourse_sound_file(discourse)
         return d
 
+    def sound_file_path(self, sound_file, file_type):
+        """
+        Get the path to a resampled audio file of a discourse, creating it from the discourse's sound file if it does
+        not exist yet (i.e., when the ``lazy_audio`` configuration is set or it has been removed from the audio cache)
+
+        Resampled audio files are marked as used, so that they are kept over less recently used files when the total
+        size of the files exceeds the ``audio_cache_size`` configuration.  Files used inside
+        :meth:`~polyglotdb.corpus.AudioContext.pin_sound_files` are not removed until the block exits.
+
+        Parameters
+        ----------
+        sound_file : dict
+            Discourse information from :meth:`~polyglotdb.corpus.AudioContext.discourse_sound_file`
+        file_type : str
+            One of ``consonant``, ``vowel`` or ``low_freq``, other values will return the original sound file
+
+        Returns
+        -------
+        str or None
+            Path to the audio file, or None if the discourse does not have a sound file
+        """
+        if file_type not in dict(AUDIO_RATES):
+            return sound_file.get('file_path')
+        key = '{}_file_path'.format(file_type)
+        path = sound_file.get(key)
+        if path is not None and os.path.exists(path):
+            if self.config.audio_cache_size is not None:
+                os.utime(path)
+                self._pin_sound_file(path)
+            return path
+        if sound_file.get('file_path') is None or not os.path.exists(sound_file['file_path']):
+            return None
+        discourse = sound_file['name']
+        path = create_sound_file(sound_file['file_path'], self.discourse_audio_directory(discourse), file_type,
+                                 sound_file.get('sampling_rate'))
+        statement = '''MATCH (d:Discourse:{corpus_name}) WHERE d.name = $discourse_name
+        SET d.{key} = $path'''.format(corpus_name=self.cypher_safe_name, key=key)
+        self.execute_cypher(statement, discourse_name=discourse, path=path)
+        if self.config.audio_cache_size is not None:
+            self._pin_sound_file(path)
+            self.evict_sound_files(keep={path})
+        return path
+
+    @contextmanager
+    def pin_sound_files(self):
+        """
+        Keep the resampled audio files used inside the block from being removed from the audio cache until it exits,
+        for operations that get the paths of several files before reading them (i.e., analyzing segments)
+        """
+        pins = set()
+        self._sound_file_pins.append(pins)
+        try:
+            yield pins
+        finally:
+            self._sound_file_pins.pop()
+
+    def _pin_sound_file(self, path):
+        if self._sound_file_pins:
+            self._sound_file_pins[-1].add(path)
+
+    def evict_sound_files(self, keep=None):
+        """
+        Remove the least recently used resampled audio files until their total size is under the ``audio_cache_size``
+        configuration, clearing their paths from the discourses
+
+        Parameters
+        ----------
+        keep : collection, optional
+            Paths of files that should not be removed, in addition to the files pinned by
+            :meth:`~polyglotdb.corpus.AudioContext.pin_sound_files`
+        """
+        if self.config.audio_cache_size is None:
+            return
+        keep = set(keep) if keep is not None else set()
+        for pins in self._sound_file_pins:
+            keep.update(pins)
+        removed = evict_sound_files(self.config.audio_dir, self.config.audio_cache_size, keep=keep)
+        for discourse, file_type in removed:
+            statement = '''MATCH (d:Discourse:{corpus_name}) WHERE d.name = $discourse_name
+            SET d.{file_type}_file_path = NULL'''.format(corpus_name=self.cypher_safe_name, file_type=file_type)
+            self.execute_cypher(statement, discourse_name=discourse)
+
     def utterance_sound_file(self, utterance_id, file_type='consonant'):
         """
         Generate an audio file just for a single utterance in an audio file.
@@ -647,7 +812,7 @@ class AudioContext(SyllabicContext):
                             '{}_{}.wav'.format(utterance_id, file_type))
         if os.path.exists(path):
             return path
-        fname = self.discourse_sound_file(utterance_info['discourse'])["{}_file_path".format(file_type)]
+        fname = self.sound_file_path(self.discourse_sound_file(utterance_info['discourse']), file_type)
         subprocess.call(['sox', fname, path, 'trim', str(utterance_info['begin']),
                          str(utterance_info['end'] - utterance_info['begin'])])
         return path
@@ -696,7 +861,7 @@ class AudioContext(SyllabicContext):
                     break
         return self._has_sound_files
 
-    def execute_influxdb(self, query):
+    def execute_influxdb(self, query, epoch=None):
         """
         Execute an InfluxDB query for the corpus
 
@@ -704,6 +869,8 @@ class AudioContext(SyllabicContext):
         ----------
         query : str
             Query to run
+        epoch : str, optional
+            Precision of integer epoch times to return (``'ns'``, ``'u'`` or ``'ms'``), instead of time strings
 
         Returns
         -------
@@ -712,7 +879,7 @@ class AudioContext(SyllabicContext):
         """
         client = self.acoustic_client()
         try:
-            result = client.query(query)
+            result = client.query(query, epoch=epoch)
         except InfluxDBClientError:
             print('There was an issue with the following query:')
             print(query)
@@ -739,24 +906,48 @@ class AudioContext(SyllabicContext):
         :class:`polyglotdb.acoustics.classes.Track`
             Track object
         """
+        return self.get_utterances_acoustics(acoustic_name, [(utterance_id, discourse, speaker)])[utterance_id]
+
+    def get_utterances_acoustics(self, acoustic_name, utterances):
+        """
+        Get acoustic tracks for several utterances, with one acoustic store query for each speaker in each discourse
+        and batch of up to ``ACOUSTIC_BATCH_SIZE`` utterances
+
+        Parameters
+        ----------
+        acoustic_name : str
+            Name of acoustic track
+        utterances : iterable
+            Tuples of the ID, discourse name and speaker name of each utterance
+
+        Returns
+        -------
+        dict
+            :class:`polyglotdb.acoustics.classes.Track` objects indexed by utterance ID
+        """
         properties = [x[0] for x in self.hierarchy.acoustic_properties[acoustic_name]]
-        property_names = ["{}".format(x) for x in properties]
-        columns = '"time", {}'.format(', '.join(property_names))
-        speaker = speaker.replace("'", r"\'") # Escape apostrophes
-        discourse = discourse.replace("'", r"\'") # Escape apostrophes
-        query = '''select {} from "{}"
-                        WHERE "utterance_id" = '{}'
-                        AND "discourse" = '{}'
-                        AND "speaker" = '{}';'''.format(columns, acoustic_name, utterance_id, discourse, speaker)
-        result = self.execute_influxdb(query)
-        track = Track()
-        for r in result.get_points(acoustic_name):
-            s = to_seconds(r['time'])
-            p = TimePoint(s)
-            for name in properties:
-                p.add_value(name, r[name])
-            track.add(p)
-        return track
+        groups = {}
+        for utterance_id, discourse, speaker in utterances:
+            groups.setdefault((discourse, speaker), []).append(utterance_id)
+        tracks = {}
+        for (discourse, speaker), utterance_ids in groups.items():
+            for i in range(0, len(utterance_ids), ACOUSTIC_BATCH_SIZE):
+                batch = utterance_ids[i:i + ACOUSTIC_BATCH_SIZE]
+                columns = self.acoustic_store.read(acoustic_name, ['utterance_id'] + properties, discourse=discourse,
+                                                   speaker=speaker, utterance_ids=batch)
+                times = columns['time'] / 1000
+                values = column_matrix(columns, properties)
+                ids = columns.get('utterance_id', np.empty(0, dtype=object))
+                # Group the points of each utterance with one sort rather than comparing every ID
+                order = np.argsort(ids, kind='stable')
+                sorted_ids = ids[order]
+                for utterance_id in batch:
+                    lo = int(np.searchsorted(sorted_ids, utterance_id, side='left'))
+                    hi = int(np.searchsorted(sorted_ids, utterance_id, side='right'))
+                    indices = np.sort(order[lo:hi])
+                    tracks[utterance_id] = Track.from_arrays(times[indices], values[indices], properties,
+                                                             time_precision=3)
+        return tracks
 
     def get_acoustic_measure(self, acoustic_name, discourse, begin, end, channel=0, relative_time=False, **kwargs):
         """
@@ -787,60 +978,85 @@ class AudioContext(SyllabicContext):
         begin = Decimal(begin).quantize(Decimal('0.001'))
         end = Decimal(end).quantize(Decimal('0.001'))
         num_points = kwargs.pop('num_points', 0)
-        filter_string = generate_filter_string(discourse, begin, end, channel, num_points, kwargs)
-
         properties = [x[0] for x in self.hierarchy.acoustic_properties[acoustic_name]]
-        property_names = ["{}".format(x) for x in properties]
+        query_begin, query_end, time_step = begin, end, None
         if num_points:
-            columns = ', '.join(['mean({})'.format(x) for x in property_names])
-        else:
-            columns = '"time", {}'.format(', '.join(property_names))
-        query = '''select {} from "{}"
-                        {};'''.format(columns, acoustic_name, filter_string)
-        result = self.execute_influxdb(query)
-        track = Track()
-        for r in result.get_points(acoustic_name):
-            s = to_seconds(r['time'])
-            if relative_time:
-                s = (s - begin) / (end - begin)
-            p = TimePoint(s)
-            for name in properties:
-                p.add_value(name, r[name])
-            track.add(p)
+            # Average the points in intervals centered on equally spaced times
+            step = (end - begin) / (num_points - 1)
+            query_begin -= step / 2
+            query_end += step / 2
+            time_step = int(step * 1000)
+        columns = self.acoustic_store.read(acoustic_name, properties, discourse=discourse, channel=channel,
+                                           begin=query_begin, end=query_end, filters=kwargs, time_step=time_step)
+        track = Track.from_arrays(columns['time'] / 1000, column_matrix(columns, properties), properties,
+                                  time_precision=3)
+        if relative_time:
+            track = track.relative(begin, end)
         return track
 
-    def _save_measurement_tracks(self, acoustic_name, tracks, speaker):
-        data = []
+    def discourse_file_paths(self):
+        """
+        Get the names of discourses indexed by the paths of their consonant, vowel and low frequency sound files
 
+        Returns
+        -------
+        dict
+            Discourse names indexed by sound file path
+        """
+        statement = '''MATCH (d:Discourse:{corpus_name})
+        RETURN d.name AS name, d.low_freq_file_path AS low_freq_file_path, d.vowel_file_path AS vowel_file_path,
+        d.consonant_file_path AS consonant_file_path'''.format(corpus_name=self.cypher_safe_name)
+        paths = {}
+        for r in self.execute_cypher(statement):
+            for k in ['low_freq_file_path', 'vowel_file_path', 'consonant_file_path']:
+                if r[k] is not None:
+                    paths[r[k]] = r['name']
+        return paths
+
+    def _utterance_phones(self, speaker, utterance_ids):
+        if not utterance_ids:
+            return {}
+        phone_type = getattr(self, self.phone_name)
+        q = self.query_graph(phone_type).filter(phone_type.speaker.name == speaker,
+                                                phone_type.utterance.id.in_(sorted(utterance_ids)))
+        q = q.columns(phone_type.utterance.id.column_name('utterance_id'),
+                      phone_type.label.column_name('label'),
+                      phone_type.begin.column_name('begin'),
+                      phone_type.end.column_name('end')).order_by(phone_type.begin)
+        grouped = {}
+        for x in q.all():
+            grouped.setdefault(x['utterance_id'], []).append((x['begin'], x['end'], x['label']))
+        phones = {}
+        for utterance_id, rows in grouped.items():
+            labels = np.empty(len(rows), dtype=object)
+            labels[:] = [x[2] for x in rows]
+            phones[utterance_id] = (np.array([x[0] for x in rows], dtype=float),
+                                    np.array([x[1] for x in rows], dtype=float), labels)
+        return phones
+
+    def _save_measurement_tracks(self, acoustic_name, tracks, speaker):
         measures = self.hierarchy.acoustic_properties[acoustic_name]
-        for seg, track in tracks.items():
-            if not len(track.keys()):
+        columns = {name: [] for name in ['time', 'speaker', 'discourse', 'channel', 'phone', 'utterance_id']}
+        columns.update({name: [] for name, _ in measures})
+        tracks = [(seg, track) for seg, track in tracks.items() if len(track.keys())]
+        discourse_paths = self.discourse_file_paths()
+        utterance_phones = self._utterance_phones(speaker, {seg['utterance_id'] for seg, _ in tracks
+                                                            if seg['annotation_type'] != 'phone'})
+        for seg, track in tracks:
+            file_path, channel, utterance_id = seg.file_path, seg.channel, seg['utterance_id']
+            try:
+                discourse = discourse_paths[file_path]
+            except KeyError:
                 continue
-            file_path, begin, end, channel, utterance_id = seg.file_path, seg.begin, seg.end, seg.channel, seg[
-                'utterance_id']
-            res = self.execute_cypher(
-                'MATCH (d:Discourse:{corpus_name}) where d.low_freq_file_path = $file_path OR '
-                'd.vowel_file_path = $file_path OR '
-                'd.consonant_file_path = $file_path '
-                'RETURN d.name as name'.format(
-                    corpus_name=self.cypher_safe_name), file_path=file_path)
-            for r in res:
-                discourse = r['name']
-            phone_type = getattr(self, self.phone_name)
-            min_time = min(track.keys())
-            max_time = max(track.keys())
+            points = list(track.items())
             if seg['annotation_type'] == 'phone':
-                set_label = seg['label']
+                labels = [seg['label']] * len(points)
             else:
-                set_label = None
-                q = self.query_graph(phone_type).filter(phone_type.discourse.name == discourse)
-                q = q.filter(phone_type.utterance.id == utterance_id)
-                q = q.filter(phone_type.end >= min_time).filter(phone_type.begin <= max_time)
-                q = q.columns(phone_type.label.column_name('label'),
-                              phone_type.begin.column_name('begin'),
-                              phone_type.end.column_name('end')).order_by(phone_type.begin)
-                phones = [(x['label'], x['begin'], x['end']) for x in q.all()]
-            for time_point, value in track.items():
+                labels = phone_labels(utterance_phones.get(utterance_id, None),
+                                      np.array([float(t) for t, _ in points]))
+            for (time_point, value), label in zip(points, labels):
+                if label is None:
+                    continue
                 fields = {}
                 for name, type in measures:
                     v = sanitize_value(value[name], type)
@@ -850,30 +1066,16 @@ class AudioContext(SyllabicContext):
                         fields[name] = type(-1)
                 if not fields:
                     continue
-                if set_label is None:
-                    label = None
-                    for i, p in enumerate(phones):
-                        if p[1] > time_point:
-                            break
-                        label = p[0]
-                        if i == len(phones) - 1:
-                            break
-                    else:
-                        label = None
-                else:
-                    label = set_label
-                if label is None:
-                    continue
-                t_dict = {'speaker': speaker, 'discourse': discourse, 'channel': channel}
-                fields['phone'] = label
-                fields['utterance_id'] = utterance_id
-                d = {'measurement': acoustic_name,
-                     'tags': t_dict,
-                     'time': s_to_ms(time_point),
-                     'fields': fields
-                     }
-                data.append(d)
-        self.acoustic_client().write_points(data, batch_size=1000, time_precision='ms')
+                columns['time'].append(s_to_ms(time_point))
+                columns['speaker'].append(speaker)
+                columns['discourse'].append(discourse)
+                columns['channel'].append(channel)
+                columns['phone'].append(label)
+                columns['utterance_id'].append(utterance_id)
+                for name, _ in measures:
+                    columns[name].append(fields.get(name, None))
+        self.acoustic_store.write(acoustic_name, columns)
+        self.bump_corpus_version()
 
     def _save_measurement(self, sound_file, track, acoustic_name, **kwargs):
         if not len(track.keys()):
@@ -885,7 +1087,6 @@ class AudioContext(SyllabicContext):
         measures = self.hierarchy.acoustic_properties[acoustic_name]
         if kwargs.get('channel', None) is None:
             kwargs['channel'] = 0
-        data = []
         tag_dict = {}
         if isinstance(sound_file, str):
             kwargs['discourse'] = sound_file
@@ -903,6 +1104,8 @@ class AudioContext(SyllabicContext):
                       phone_type.end.column_name('end'),
                       phone_type.speaker.name.column_name('speaker')).order_by(phone_type.begin)
         phones = [(x['label'], x['begin'], x['end'], x['speaker']) for x in q.all()]
+        columns = {name: [] for name in ['time', 'speaker'] + list(tag_dict) + ['phone', 'utterance_id']}
+        columns.update({name: [] for name, _ in measures})
         for time_point, value in track.items():
             fields = {}
             for name, type in measures:
@@ -925,18 +1128,16 @@ class AudioContext(SyllabicContext):
                 speaker = None
             if speaker is None:
                 continue
-            t_dict = {'speaker': speaker}
-            t_dict.update(tag_dict)
-            if utterance_id is not None:
-                fields['utterance_id'] = utterance_id
-            fields['phone'] = label
-            d = {'measurement': acoustic_name,
-                 'tags': t_dict,
-                 'time': s_to_nano(time_point),
-                 'fields': fields
-                 }
-            data.append(d)
-        self.acoustic_client().write_points(data, batch_size=1000)
+            columns['time'].append(s_to_ms(time_point))
+            columns['speaker'].append(speaker)
+            for k, v in tag_dict.items():
+                columns[k].append(v)
+            columns['phone'].append(label)
+            columns['utterance_id'].append(utterance_id)
+            for name, _ in measures:
+                columns[name].append(fields.get(name, None))
+        self.acoustic_store.write(acoustic_name, columns, tag_names=['speaker'] + list(tag_dict))
+        self.bump_corpus_version()
 
     def save_acoustic_track(self, acoustic_name, discourse, track, **kwargs):
         """
@@ -987,12 +1188,7 @@ class AudioContext(SyllabicContext):
         """
         if acoustic_name not in self.hierarchy.acoustics:
             return False
-        discourse = discourse.replace("'", r"\'")
-        query = '''select * from "{}" WHERE "discourse" = '{}' LIMIT 1;'''.format(acoustic_name, discourse)
-        result = self.execute_influxdb(query)
-        if len(result) == 0:
-            return False
-        return True
+        return self.acoustic_store.has_measurements(acoustic_name, discourse)
 
     def encode_acoustic_statistic(self, acoustic_name, statistic, by_phone=True, by_speaker=False):
         """
@@ -1022,26 +1218,20 @@ class AudioContext(SyllabicContext):
             raise ValueError('Statistic name should be one of: {}.'.format(', '.join(available_statistics)))
 
         acoustic_name = acoustic_name.lower()
-        template = statistic + '("{0}") as "{0}"'
         statistic_template = 'n.{statistic}_{measure} = d.{measure}'
-        measures = {x[0]: template.format(x[0]) for x in self.hierarchy.acoustic_properties[acoustic_name] if
-                    x[1] in [int, float]}
+        measures = [x[0] for x in self.hierarchy.acoustic_properties[acoustic_name] if x[1] in [int, float]]
         if by_speaker and by_phone:
+            summaries = self.acoustic_store.aggregate(acoustic_name, [statistic], measures, phones=self.phones,
+                                                      by_speaker=True)
             results = []
-            for p in self.phones:
-                query = '''select {} from "{}"
-                                where "phone" = '{}' group by "speaker";'''.format(
-                    ', '.join(measures), acoustic_name, p)
-
-                influx_result = self.execute_influxdb(query)
-                for k, v in influx_result.items():
-                    result = {'speaker': k[1]['speaker'], 'phone': p}
-                    for measure in measures.keys():
-                        result[measure] = list(v)[0][measure]
-                    results.append(result)
+            for (speaker, p), values in summaries.items():
+                result = {'speaker': speaker, 'phone': p}
+                for measure in measures:
+                    result[measure] = values[(statistic, measure)]
+                results.append(result)
 
             set_statements = []
-            for measure in measures.keys():
+            for measure in measures:
                 set_statements.append(statistic_template.format(statistic=statistic, measure=measure))
             statement = '''WITH $data as data
                         UNWIND data as d
@@ -1053,20 +1243,16 @@ class AudioContext(SyllabicContext):
                         SET {set_statements}'''.format(corpus_name=self.cypher_safe_name,
                                                        set_statements='\nAND '.join(set_statements))
         elif by_phone:
+            summaries = self.acoustic_store.aggregate(acoustic_name, [statistic], measures, phones=self.phones)
             results = []
             for p in self.phones:
-                query = '''select {} from "{}"
-                                where "phone" = '{}';'''.format(', '.join(measures.values()),
-                                                                acoustic_name, p)
-
-                influx_result = self.execute_influxdb(query)
                 result = {'phone': p}
-                for k, v in influx_result.items():
-                    for measure in measures.keys():
-                        result[measure] = list(v)[0][measure]
+                values = summaries.get((None, p), {})
+                for measure in measures:
+                    result[measure] = values.get((statistic, measure), None)
                 results.append(result)
             set_statements = []
-            for measure in measures.keys():
+            for measure in measures:
                 set_statements.append(statistic_template.format(statistic=statistic, measure=measure))
             statement = '''WITH $data as data
                                 UNWIND data as d
@@ -1075,20 +1261,18 @@ class AudioContext(SyllabicContext):
                                 SET {set_statements}'''.format(corpus_name=self.cypher_safe_name,
                                                                set_statements='\nAND '.join(set_statements))
             self.hierarchy.add_type_properties(self, 'phone',
-                                               [('{}_{}'.format(statistic, x), float) for x in measures.keys()])
+                                               [('{}_{}'.format(statistic, x), float) for x in measures])
         elif by_speaker:
-            query = '''select {} from "{}" group by "speaker";'''.format(', '.join(measures), acoustic_name)
-            influx_result = self.execute_influxdb(query)
+            summaries = self.acoustic_store.aggregate(acoustic_name, [statistic], measures, by_speaker=True)
             results = []
-
-            for k, v in influx_result.items():
-                result = {'speaker': k[1]['speaker']}
-                for measure in measures.keys():
-                    result[measure] = list(v)[0][measure]
+            for (speaker, _), values in summaries.items():
+                result = {'speaker': speaker}
+                for measure in measures:
+                    result[measure] = values[(statistic, measure)]
                 results.append(result)
 
             set_statements = []
-            for measure in measures.keys():
+            for measure in measures:
                 set_statements.append(statistic_template.format(statistic=statistic, measure=measure))
             statement = '''WITH $data as data
                             UNWIND data as d
@@ -1097,7 +1281,7 @@ class AudioContext(SyllabicContext):
                             SET {set_statements}'''.format(corpus_name=self.cypher_safe_name,
                                                            set_statements='\nAND '.join(set_statements))
             self.hierarchy.add_speaker_properties(self,
-                                                  [('{}_{}'.format(statistic, x), float) for x in measures.keys()])
+                                                  [('{}_{}'.format(statistic, x), float) for x in measures])
         self.execute_cypher(statement, data=results)
         self.encode_hierarchy()
 
@@ -1183,17 +1367,9 @@ class AudioContext(SyllabicContext):
         """
         if acoustic_name not in self.hierarchy.acoustics:
             raise (ValueError('Acoustic measure must be one of: {}.'.format(', '.join(self.hierarchy.acoustics))))
-        measures = ', '.join(
-            ['"{}"'.format(x[0]) for x in self.hierarchy.acoustic_properties[acoustic_name] if x[1] in [int, float]
-             and not x[0].endswith('relativized')])
         to_remove = [x[0] for x in self.hierarchy.acoustic_properties[acoustic_name] if x[0].endswith('relativized')]
-        client = self.acoustic_client()
-        query = """SELECT "phone", {measures}, "utterance_id" 
-        INTO "{name}_copy" FROM "{name}" GROUP BY *;""".format(name=acoustic_name, measures=measures)
-        client.query(query)
-        client.query('DROP MEASUREMENT "{}"'.format(acoustic_name))
-        client.query('SELECT * INTO "{0}" FROM "{0}_copy" GROUP BY *'.format(acoustic_name))
-        client.query('DROP MEASUREMENT "{}_copy"'.format(acoustic_name))
+        self.acoustic_store.remove_fields(acoustic_name, to_remove)
+        self.bump_corpus_version()
         self.hierarchy.remove_acoustic_properties(self, acoustic_name, to_remove)
         self.encode_hierarchy()
 
@@ -1215,89 +1391,41 @@ class AudioContext(SyllabicContext):
             raise (ValueError('Acoustic measure must be one of: {}.'.format(', '.join(self.hierarchy.acoustics))))
         if not by_speaker and not by_phone:
             raise Exception('Relativization must be by phone, speaker, or both.')
-        client = self.acoustic_client()
-        phone_type = getattr(self, self.phone_name)
-        template = 'mean("{0}") as mean_{0}, stddev("{0}") as sd_{0}'
-        summary_data = {}
         props = [x for x in self.hierarchy.acoustic_properties[acoustic_name] if
                       x[1] in [int, float] and not x[0].endswith('relativized')]
-        statistics = {x[0]: template.format(x[0]) for x in props}
-        aliases = {x[0]: ('mean_' + x[0], 'sd_' + x[0]) for x in props}
-        if by_phone:
-            for p in self.phones:
-                if by_speaker:
-                    query = '''select {statistics} from "{acoustic_type}" 
-                    where "phone" = '{phone}' group by "speaker";'''.format(acoustic_type=acoustic_name,
-                                                                            statistics=', '.join(statistics.values()),
-                                                                            phone=p)
-                    result = client.query(query)
-                    for k, v in result.items():
-                        v = list(v)
-                        for measure, (mean_name, sd_name) in aliases.items():
-                            summary_data[(k[1]['speaker'], p, measure)] = v[0][mean_name], v[0][sd_name]
-
-                else:
-                    query = '''select {statistics} from "{acoustic_type}" 
-                    where "phone" = '{phone}';'''.format(acoustic_type=acoustic_name,
-                                                         statistics=', '.join(statistics.values()), phone=p)
-                    result = client.query(query)
-                    for k, v in result.items():
-                        v = list(v)
-                        for measure, (mean_name, sd_name) in aliases.items():
-                            summary_data[(p, measure)] = v[0][mean_name], v[0][sd_name]
-        else:
-            query = '''select {statistics} from "{acoustic_type}" 
-            where "phone" != '' group by "speaker";'''.format(acoustic_type=acoustic_name,
-                                                              statistics=', '.join(statistics.values()))
-            result = client.query(query)
-            for k, v in result.items():
-                v = list(v)
-                for measure, (mean_name, sd_name) in aliases.items():
-                    summary_data[(k[1]['speaker'], measure)] = v[0][mean_name], v[0][sd_name]
+        measures = [x[0] for x in props]
+        phones = self.phones if by_phone else None
+        summary_data = self.acoustic_store.aggregate(acoustic_name, ['mean', 'stddev'], measures, phones=phones,
+                                                     by_speaker=by_speaker)
         for s in self.speakers:
-            s = s.replace("'", r"\'")
-            all_query = '''select * from "{acoustic_type}"
-            where "phone" != '' and "speaker" = '{speaker}';'''.format(acoustic_type=acoustic_name, speaker=s)
-            all_results = client.query(all_query)
-            data = []
-            for _, r in all_results.items():
-                for t_dict in r:
-                    phone = t_dict.pop('phone')
-                    utterance_id = t_dict.pop('utterance_id', '')
-                    time_point = t_dict.pop('time')
-                    fields = {}
-                    for measure, (mean_name, sd_name) in aliases.items():
-                        if by_speaker and by_phone:
-                            mean_value, sd_value = summary_data[(t_dict['speaker'], phone, measure)]
-                        elif by_phone and not by_speaker:
-                            mean_value, sd_value = summary_data[(phone, measure)]
-                        elif by_speaker:
-                            mean_value, sd_value = summary_data[(t_dict['speaker'], measure)]
-                        if sd_value is None:
-                            continue
-                        value = t_dict.pop(measure)
-                        if value is None:
-                            continue
-                        new_value = t_dict.pop('{}_relativized'.format(measure), None)
-                        new_value= (value - mean_value) / sd_value
-                        fields['{}_relativized'.format(measure)] = new_value
-                    if not fields:
-                        continue
-                    time_point = s_to_ms(to_seconds(time_point))
-                    d = {'measurement': acoustic_name,
-                         'tags': t_dict,
-                         "time": time_point,
-                         "fields": fields
-                         }
-                    data.append(d)
-            client.write_points(data, batch_size=1000, time_precision='ms')
+            columns = self.acoustic_store.read(acoustic_name, measures + ['phone'], speaker=s, require_phone=True)
+            if not len(columns['time']):
+                continue
+            if by_phone:
+                phone_labels, groups = np.unique(columns['phone'], return_inverse=True)
+                phone_labels = phone_labels.tolist()
+            else:
+                phone_labels, groups = [None], np.zeros(len(columns['time']), dtype=int)
+            summary_speaker = s if by_speaker else None
+            relativized = {k: columns[k] for k in ['time', 'speaker', 'discourse', 'channel'] if k in columns}
+            for measure in measures:
+                values = columns.get(measure, None)
+                if values is None or values.dtype.kind != 'f':
+                    continue
+                summaries = [summary_data.get((summary_speaker, p), {}) for p in phone_labels]
+                means = np.array([x.get(('mean', measure), None) for x in summaries], dtype=float)
+                sds = np.array([x.get(('stddev', measure), None) for x in summaries], dtype=float)
+                sds[sds == 0] = np.nan
+                relativized['{}_relativized'.format(measure)] = (values - means[groups]) / sds[groups]
+            self.acoustic_store.write(acoustic_name, relativized)
+        self.bump_corpus_version()
         self.hierarchy.add_acoustic_properties(self, acoustic_name, [(x[0] +'_relativized', float) for x in props])
         self.encode_hierarchy()
 
     def reassess_utterances(self, acoustic_name):
         """
-        Update utterance IDs in InfluxDB for more efficient querying if utterances have been re-encoded after acoustic
-        measures were encoded
+        Update utterance IDs in the acoustic store for more efficient querying if utterances have been re-encoded
+        after acoustic measures were encoded
 
         Parameters
         ----------
@@ -1307,15 +1435,12 @@ class AudioContext(SyllabicContext):
         """
         if acoustic_name not in self.hierarchy.acoustics:
             raise (ValueError('Acoustic measure must be one of: {}.'.format(', '.join(self.hierarchy.acoustics))))
-        client = self.acoustic_client()
         q = self.query_discourses()
         q = q.columns(self.discourse.name.column_name('name'),
                       self.discourse.speakers.name.column_name('speakers'))
         discourses = q.all()
-        props = [x[0] for x in self.hierarchy.acoustic_properties[acoustic_name]]
         for d in discourses:
             discourse_name = d['name']
-            data = []
             for s in d['speakers']:
                 q = self.query_graph(self.utterance)
                 q = q.filter(self.utterance.discourse.name == discourse_name, self.utterance.speaker.name == s)
@@ -1324,31 +1449,18 @@ class AudioContext(SyllabicContext):
                               self.utterance.begin.column_name('begin'),
                               self.utterance.end.column_name('end'))
                 utterances = q.all()
-                s = s.replace("'", r"\'")
-                discourse_name = discourse_name.replace("'", r"\'")
-                all_query = '''select * from "{}"
-                                where "phone" != '' and 
-                                "discourse" = '{}' and 
-                                "speaker" = '{}';'''.format(acoustic_name, discourse_name, s)
-                all_results = client.query(all_query)
+                # Utterance boundaries in milliseconds, compared exactly with the integer times of the points
+                boundaries = [(Decimal(u['begin']) * 1000, Decimal(u['end']) * 1000) for u in utterances]
+                columns = self.acoustic_store.read(acoustic_name, ['utterance_id'], discourse=discourse_name,
+                                                   speaker=s, require_phone=True)
+                utterance_ids = []
                 cur_index = 0
-                for _, r in all_results.items():
-                    for t_dict in r:
-                        phone = t_dict.pop('phone')
-                        utterance_id = t_dict.pop('utterance_id', '')
-                        for m in props:
-                            value = t_dict.pop(m, None)
-
-                        time_point = to_seconds(t_dict.pop('time'))
-                        for i in range(cur_index, len(utterances)):
-                            if utterances[i]['begin'] <= time_point <= utterances[i]['end']:
-                                cur_index = i
-                                break
-                        time_point = s_to_ms(time_point)
-                        d = {'measurement': acoustic_name,
-                             'tags': t_dict,
-                             "time": time_point,
-                             "fields": {'utterance_id': utterances[cur_index]['utterance_id']}
-                             }
-                        data.append(d)
-            client.write_points(data, batch_size=1000, time_precision='ms')
+                for time_point in columns['time'].tolist():
+                    for i in range(cur_index, len(utterances)):
+                        if boundaries[i][0] <= time_point <= boundaries[i][1]:
+                            cur_index = i
+                            break
+                    utterance_ids.append(utterances[cur_index]['utterance_id'])
+                columns['utterance_id'] = utterance_ids
+                self.acoustic_store.write(acoustic_name, columns)
+        self.bump_corpus_version()
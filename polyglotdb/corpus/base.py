@@ -1,16 +1,24 @@
 import os
 import shutil
 import sys
+import threading
+import uuid
+from contextlib import contextmanager
 from decimal import Decimal
-
-from neo4j import GraphDatabase
+from time import perf_counter
 
 from ..query.annotations.attributes import AnnotationNode, PauseAnnotation
 from ..query.annotations import SplitQuery
 from ..query.lexicon import LexiconQuery, LexiconNode
 from ..query.speaker import SpeakerQuery, SpeakerNode
 from ..query.discourse import DiscourseQuery, DiscourseNode
+from ..query.base.profile import QueryProfile
+from .drivers import acquire_driver, release_driver
+from ..query.base.cache import ResultCache
+from ..query.base.planner import CorpusStatistics, QueryPlanner
+from ..query.base.helper import key_for_cypher
 from ..config import CorpusConfig
+from ..io.importer.schema import SchemaManager
 from ..exceptions import (CorpusConfigError, GraphQueryError)
 from ..structure import Hierarchy
 
@@ -37,13 +45,26 @@ class BaseContext(object):
             self.config = args[0]
         else:
             self.config = CorpusConfig(*args, **kwargs)
-        self.graph_driver = GraphDatabase.driver(self.config.graph_connection_string)
+        self._graph_driver = None
+        self._driver_key = None
+        self._driver_lock = threading.Lock()
+        self._local = threading.local()
         self.corpus_name = self.config.corpus_name
 
         self.hierarchy = Hierarchy({}, corpus_name=self.corpus_name)
+        self.schema = SchemaManager(self)
 
         self._has_sound_files = None
         self._has_all_sound_files = None
+        self._sound_file_pins = []
+        self._cypher_cache = {}
+        self._result_cache = None
+        self._version_lock = threading.Lock()
+        self._change_depth = 0
+        self._corpus_changed = False
+        self._query_planner = None
+        self._acoustic_store = None
+        self.query_profile = None
         if getattr(sys, 'frozen', False):
             self.config.reaper_path = os.path.join(sys.path[-1], 'reaper')
         else:
@@ -59,6 +80,55 @@ class BaseContext(object):
         else:
             self.config.praat_path = shutil.which(praat_exe)
 
+    @property
+    def graph_driver(self):
+        """
+        Graph database driver, shared with the other corpus contexts in the process that use the same connection
+        settings (see :func:`~polyglotdb.corpus.drivers.acquire_driver`)
+
+        Returns
+        -------
+        :class:`neo4j.Driver`
+            Graph database driver
+        """
+        with self._driver_lock:
+            if self._graph_driver is None:
+                self._driver_key, self._graph_driver = acquire_driver(self.config)
+            return self._graph_driver
+
+    def close(self):
+        """
+        Stop using the shared graph database driver, which is closed once no other corpus context is using it
+        """
+        with self._driver_lock:
+            if self._graph_driver is None:
+                return
+            release_driver(self._driver_key)
+            self._graph_driver = None
+            self._driver_key = None
+
+    @contextmanager
+    def graph_session(self):
+        """
+        Run all statements executed in the context by the current thread on a single graph database session, rather
+        than opening a session for each statement
+
+        Yields
+        ------
+        :class:`neo4j.Session`
+            Graph database session
+        """
+        session = getattr(self._local, 'session', None)
+        if session is not None:
+            yield session
+            return
+        with self.graph_driver.session() as session:
+            self._local.session = session
+            try:
+                yield session
+            finally:
+                self._local.session = None
+
     def exists(self):
         """
         Check whether the corpus has a Hierarchy schema in the Neo4j database
@@ -81,7 +151,8 @@ class BaseContext(object):
         statement : str
             the cypher statement
         parameters : kwargs
-            keyword arguments to execute a cypher statement
+            keyword arguments to execute a cypher statement, along with ``profile_mode`` (``'EXPLAIN'`` or
+            ``'PROFILE'``) to run the statement with and collect its plan in the current query profile
 
         Returns
         -------
@@ -92,23 +163,237 @@ class BaseContext(object):
         return_graph = False
         if 'return_graph' in parameters:
             return_graph = parameters.pop('return_graph')
+        profile_mode = parameters.pop('profile_mode', None)
         for k, v in parameters.items():
             if isinstance(v, Decimal):
                 parameters[k] = float(v)
-        try:
-            with self.graph_driver.session() as session:
-                if self.config.debug:
-                    print('Statement:', statement)
-                    print('Parameters:',parameters)
-                results = session.run(statement, **parameters)
+        profile = self.query_profile
+        if profile is None:
+            profile_mode = None
+        if profile_mode is not None:
+            statement = '{} {}'.format(profile_mode, statement)
+        with self.graph_session() as session:
+            if self.config.debug:
+                print('Statement:', statement)
+                print('Parameters:',parameters)
+            if profile is None:
+                result = session.run(statement, **parameters)
                 if return_graph:
-                    results = results.graph()
+                    results = result.graph()
                 else:
-                    results = results.data()
+                    results = result.data()
+                summary = result.consume()
+            else:
+                with profile.time('execute'):
+                    result = session.run(statement, **parameters)
+                with profile.time('fetch'):
+                    if return_graph:
+                        results = result.graph()
+                    else:
+                        results = result.data()
+                summary = result.consume()
+                if profile_mode is not None:
+                    profile.add_summary(statement, summary)
+        if summary.counters.contains_updates:
+            self.bump_corpus_version()
+        return results
+
+    def cached_cypher(self, statement, **parameters):
+        """
+        Executes a cypher query that only reads from the database, returning stored results for the same query if the
+        ``query_cache_size`` configuration is set and the corpus has not been changed since they were stored
+
+        Parameters
+        ----------
+        statement : str
+            the cypher statement
+        parameters : kwargs
+            keyword arguments to execute a cypher statement, along with ``profile_mode`` as for
+            :meth:`execute_cypher`
+
+        Returns
+        -------
+        list
+            Records of the Cypher query
+        """
+        profile_mode = parameters.pop('profile_mode', None)
+        cache = self.result_cache
+        # Changes in progress are only reflected in the version once they are done, so their results are not stored
+        if cache is None or self.query_profile is not None or self._change_depth:
+            return self.execute_cypher(statement, profile_mode=profile_mode, **parameters)
+        # Statements are generated with all query values as parameters, so together they fully describe the query
+        key = cache.make_key(self.corpus_name, self.corpus_version, statement, parameters)
+        try:
+            return cache.get(key)
+        except KeyError:
+            pass
+        results = self.execute_cypher(statement, **parameters)
+        cache.set(key, results)
+        return results
+
+    @property
+    def result_cache(self):
+        """
+        Cache of query results on disk, or None if the ``query_cache_size`` configuration is not set
+
+        Returns
+        -------
+        :class:`~polyglotdb.query.base.cache.ResultCache` or None
+            Cache of query results
+        """
+        if self.config.query_cache_size is None:
+            return None
+        if self._result_cache is None or self._result_cache.max_size != self.config.query_cache_size:
+            self._result_cache = ResultCache(self.config.query_cache_dir, self.config.query_cache_size)
+        return self._result_cache
+
+    @property
+    def corpus_version_path(self):
+        """
+        Get the path to the version of the corpus
 
-            return results
-        except Exception as e:
-            raise
+        Returns
+        -------
+        str
+            Path to the corpus version on disk
+        """
+        return os.path.join(self.config.base_dir, 'version')
+
+    @property
+    def corpus_version(self):
+        """
+        Counter of changes to the corpus, increased whenever the graph database, the acoustic measurements or the
+        hierarchy of the corpus is changed, to know whether stored query results are still valid
+
+        Returns
+        -------
+        int
+            Version of the corpus
+        """
+        try:
+            with open(self.corpus_version_path, 'r', encoding='utf8') as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def bump_corpus_version(self):
+        """
+        Increase the version of the corpus, so that query results stored before are no longer used
+
+        Within :meth:`changing_corpus`, the version is only increased once all the changes are done.
+        """
+        with self._version_lock:
+            if self._change_depth:
+                self._corpus_changed = True
+                return
+            self._write_corpus_version()
+
+    def _write_corpus_version(self):
+        path = self.corpus_version_path
+        version = self.corpus_version + 1
+        # Write to a temporary file first so that other threads and processes never read an empty version
+        temp_path = '{}.{}.tmp'.format(path, uuid.uuid4().hex)
+        with open(temp_path, 'w', encoding='utf8') as f:
+            f.write(str(version))
+        os.replace(temp_path, path)
+
+    @contextmanager
+    def changing_corpus(self):
+        """
+        Group the changes made to the corpus in the context, like the statements of an import, so that the version of
+        the corpus is increased once at the end rather than for every statement
+        """
+        with self._version_lock:
+            self._change_depth += 1
+        try:
+            yield
+        finally:
+            with self._version_lock:
+                self._change_depth -= 1
+                if not self._change_depth and self._corpus_changed:
+                    self._corpus_changed = False
+                    self._write_corpus_version()
+
+    def stream_cypher(self, statement, fetch_size=None, profile_mode=None, **parameters):
+        """
+        Executes a cypher query, generating its records as they are fetched from the database rather than all at once.
+        The session stays open until the generator is exhausted or closed.
+
+        Parameters
+        ----------
+        statement : str
+            the cypher statement
+        fetch_size : int, optional
+            Number of records to fetch at a time, defaults to the ``query_fetch_size`` configuration
+        profile_mode : str, optional
+            ``'EXPLAIN'`` or ``'PROFILE'`` to run the statement with, to collect its plan in the current query profile
+        parameters : kwargs
+            keyword arguments to execute a cypher statement
+
+        Yields
+        ------
+        dict
+            Record of the Cypher query
+        """
+        if fetch_size is None:
+            fetch_size = self.config.query_fetch_size
+        for k, v in parameters.items():
+            if isinstance(v, Decimal):
+                parameters[k] = float(v)
+        profile = self.query_profile
+        if profile is None:
+            profile_mode = None
+        if profile_mode is not None:
+            statement = '{} {}'.format(profile_mode, statement)
+        with self.graph_driver.session(fetch_size=fetch_size) as session:
+            if self.config.debug:
+                print('Statement:', statement)
+                print('Parameters:', parameters)
+            if profile is None:
+                for r in session.run(statement, **parameters):
+                    yield r.data()
+                return
+            with profile.time('execute'):
+                result = session.run(statement, **parameters)
+            records = iter(result)
+            while True:
+                begin = perf_counter()
+                r = next(records, None)
+                profile.add('fetch', perf_counter() - begin)
+                if r is None:
+                    break
+                yield r.data()
+            if profile_mode is not None:
+                profile.add_summary(statement, result.consume())
+
+    @contextmanager
+    def profile_queries(self, mode=None):
+        """
+        Collect timings for the stages of all queries run in the context, and optionally their query plans
+
+        Only the statements of the queries themselves are run with the mode, by their results, so that other reads
+        made along the way, like looking up speakers to split a query or refreshing the query planner's statistics,
+        and any writes run as normal.
+
+        Parameters
+        ----------
+        mode : str, optional
+            ``'EXPLAIN'`` or ``'PROFILE'`` to run the statements of queries with, to collect their plans
+
+        Yields
+        ------
+        :class:`~polyglotdb.query.base.profile.QueryProfile`
+            Collected timings and plans, which are also added to any profile being collected outside the context
+        """
+        outer = self.query_profile
+        profile = QueryProfile(mode)
+        self.query_profile = profile
+        try:
+            yield profile
+        finally:
+            self.query_profile = outer
+            if outer is not None:
+                outer.merge(profile)
 
     @property
     def cypher_safe_name(self):
@@ -176,20 +461,107 @@ class BaseContext(object):
         Save corpus Hierarchy to the disk
         """
         import json
+        # Compiled queries can depend on the hierarchy
+        self._cypher_cache.clear()
         with open(self.hierarchy_path, 'w', encoding='utf8') as f:
             json.dump(self.hierarchy.to_json(), f)
+        self.bump_corpus_version()
 
     def load_hierarchy(self):
         """
         Load Hierarchy object from the cached version
         """
         import json
+        self._cypher_cache.clear()
         with open(self.hierarchy_path, 'r', encoding='utf8') as f:
             self.hierarchy = Hierarchy(corpus_name=self.corpus_name)
             self.hierarchy.from_json(json.load(f))
 
+    @property
+    def statistics_path(self):
+        """
+        Get the path to cached corpus statistics
+
+        Returns
+        -------
+        str
+            Path to the corpus statistics on disk
+        """
+        return os.path.join(self.config.base_dir, 'statistics')
+
+    @property
+    def query_planner(self):
+        """
+        Planner for the queries of the corpus, using the corpus statistics saved by :meth:`refresh_statistics`.
+        Statistics for labels and properties added to the hierarchy since they were saved are counted when the
+        planner is first needed.
+
+        Returns
+        -------
+        :class:`~polyglotdb.query.base.planner.QueryPlanner`
+            Query planner
+        """
+        if self._query_planner is None:
+            import json
+            statistics = None
+            try:
+                with open(self.statistics_path, 'r', encoding='utf8') as f:
+                    statistics = CorpusStatistics.from_json(json.load(f))
+            except (OSError, ValueError):
+                pass
+            self._query_planner = QueryPlanner(statistics)
+            if statistics is not None:
+                stale = [label for label, properties in self._statistics_properties().items()
+                         if label not in statistics.label_counts
+                         or set(properties) != set(statistics.property_counts.get(label, {}))]
+                if stale:
+                    self.refresh_statistics(stale)
+        return self._query_planner
+
+    def _statistics_properties(self):
+        node_properties = {'Speaker': self.hierarchy.speaker_properties,
+                           'Discourse': self.hierarchy.discourse_properties}
+        for at in self.hierarchy.annotation_types:
+            node_properties[at] = self.hierarchy.token_properties.get(at, set())
+            node_properties['{}_type'.format(at)] = self.hierarchy.type_properties.get(at, set())
+        return {label: sorted(x[0] for x in properties) for label, properties in node_properties.items()}
+
+    def refresh_statistics(self, labels=None):
+        """
+        Count the nodes of each annotation, annotation type, speaker and discourse label, and the distinct values
+        of each of their properties in the hierarchy, and save them to the disk for planning queries
+
+        Parameters
+        ----------
+        labels : list, optional
+            Labels to count, keeping the saved statistics of other labels, defaults to counting all labels
+        """
+        import json
+        node_properties = self._statistics_properties()
+        if labels is None:
+            statistics = CorpusStatistics()
+            labels = node_properties.keys()
+        else:
+            statistics = self.query_planner.statistics
+        with self.graph_session():
+            for label in sorted(labels):
+                properties = node_properties[label]
+                returns = ['count(n) AS count']
+                for i, p in enumerate(properties):
+                    returns.append('count(DISTINCT n.{}) AS property_{}'.format(key_for_cypher(p), i))
+                statement = 'MATCH (n:{}:{}) RETURN {}'.format(key_for_cypher(label), self.cypher_safe_name,
+                                                             ', '.join(returns))
+                r = self.execute_cypher(statement)[0]
+                statistics.label_counts[label] = r['count']
+                statistics.property_counts[label] = {p: r['property_{}'.format(i)] for i, p in enumerate(properties)}
+        with open(self.statistics_path, 'w', encoding='utf8') as f:
+            json.dump(statistics.to_json(), f)
+        self._query_planner = QueryPlanner(statistics)
+        # Compiled queries depend on the plans
+        self._cypher_cache.clear()
+
     def __exit__(self, exc_type, exc, exc_tb):
-        self.graph_driver.close()
+        self.close()
         if exc_type is None:
             # try:
             #    shutil.rmtree(self.config.temp_dir)
@@ -290,52 +662,54 @@ class BaseContext(object):
         """
         Remove all nodes and relationships in the corpus.
         """
+        with self.changing_corpus():
 
-        delete_statement = '''MATCH (n:{corpus}:{anno})-[:spoken_by]->(s:{corpus}:Speaker)
-        where s.name = $speaker
-        with n LIMIT 1000 DETACH DELETE n return count(n) as deleted_count'''
+            delete_statement = '''MATCH (n:{corpus}:{anno})-[:spoken_by]->(s:{corpus}:Speaker)
+            where s.name = $speaker
+            with n LIMIT 1000 DETACH DELETE n return count(n) as deleted_count'''
 
-        delete_type_statement = '''MATCH (n:{corpus}:{anno}_type)
-        with n LIMIT 1000 DETACH DELETE n return count(n) as deleted_count'''
+            delete_type_statement = '''MATCH (n:{corpus}:{anno}_type)
+            with n LIMIT 1000 DETACH DELETE n return count(n) as deleted_count'''
 
-        if call_back is not None:
-            call_back('Resetting database...')
-            number = self.execute_cypher(
-                '''MATCH (n:{}) return count(*) as number '''.format(self.cypher_safe_name))['number']
-            call_back(0, number)
-        num_deleted = 0
-        for a in self.hierarchy.annotation_types:
-            if stop_check is not None and stop_check():
-                break
-            for s in self.speakers:
+            if call_back is not None:
+                call_back('Resetting database...')
+                number = self.execute_cypher(
+                    '''MATCH (n:{}) return count(*) as number '''.format(self.cypher_safe_name))['number']
+                call_back(0, number)
+            num_deleted = 0
+            for a in self.hierarchy.annotation_types:
                 if stop_check is not None and stop_check():
                     break
+                for s in self.speakers:
+                    if stop_check is not None and stop_check():
+                        break
+                    deleted = 1000
+                    while deleted > 0:
+                        if stop_check is not None and stop_check():
+                            break
+                        deleted = self.execute_cypher(delete_statement.format(corpus=self.cypher_safe_name, anno=a),
+                                                      speaker=s)[0]['deleted_count']
+                        num_deleted += deleted
+                        if call_back is not None:
+                            call_back(num_deleted)
+
                 deleted = 1000
                 while deleted > 0:
                     if stop_check is not None and stop_check():
                         break
-                    deleted = self.execute_cypher(delete_statement.format(corpus=self.cypher_safe_name, anno=a),
-                                                  speaker=s)[0]['deleted_count']
+                    deleted = self.execute_cypher(
+                        delete_type_statement.format(corpus=self.cypher_safe_name, anno=a))[0]['deleted_count']
                     num_deleted += deleted
                     if call_back is not None:
                         call_back(num_deleted)
 
-            deleted = 1000
-            while deleted > 0:
-                if stop_check is not None and stop_check():
-                    break
-                deleted = self.execute_cypher(
-                    delete_type_statement.format(corpus=self.cypher_safe_name, anno=a))[0]['deleted_count']
-                num_deleted += deleted
-                if call_back is not None:
-                    call_back(num_deleted)
-
-        self.execute_cypher('''MATCH (n:{}:Speaker) DETACH DELETE n '''.format(self.cypher_safe_name))
-        self.execute_cypher('''MATCH (n:{}:Discourse) DETACH DELETE n '''.format(self.cypher_safe_name))
-        self.reset_hierarchy()
-        self.execute_cypher('''MATCH (n:Corpus) where n.name = $corpus_name DELETE n ''', corpus_name=self.corpus_name)
-        self.hierarchy = Hierarchy(corpus_name=self.corpus_name)
-        self.cache_hierarchy()
+            self.execute_cypher('''MATCH (n:{}:Speaker) DETACH DELETE n '''.format(self.cypher_safe_name))
+            self.execute_cypher('''MATCH (n:{}:Discourse) DETACH DELETE n '''.format(self.cypher_safe_name))
+            self.reset_hierarchy()
+            self.execute_cypher('''MATCH (n:Corpus) where n.name = $corpus_name DELETE n ''',
+                                corpus_name=self.corpus_name)
+            self.hierarchy = Hierarchy(corpus_name=self.corpus_name)
+            self.cache_hierarchy()
 
     def reset(self, call_back=None, stop_check=None):
         """
@@ -453,42 +827,56 @@ class BaseContext(object):
         name : str
             Name of the discourse to remove
         """
-        if name not in self.discourses:
-            raise GraphQueryError('{} is not a discourse in this corpus.'.format(name))
-        d = self.discourse_sound_file(name)
-        if 'consonant_file_path' in d and d['consonant_file_path'] is not None and os.path.exists(d['consonant_file_path']):
-            directory = self.discourse_audio_directory(name)
-            if self.config.debug:
-                print('Removing', directory)
-            shutil.rmtree(directory, ignore_errors=True)
-
-        # Remove orphaned type nodes
-        for a in self.hierarchy.annotation_types:
-            # Remove tokens in discourse
-            statement = '''MATCH (d:{corpus_name}:Discourse)<-[:spoken_in]-(n:{corpus_name}:{atype})
+        with self.changing_corpus():
+            if name not in self.discourses:
+                raise GraphQueryError('{} is not a discourse in this corpus.'.format(name))
+            d = self.discourse_sound_file(name)
+            # Resampled audio files are only created on demand with lazy audio, so any of them may exist
+            if any(d.get(k) is not None and os.path.exists(d[k])
+                   for k in ['consonant_file_path', 'vowel_file_path', 'low_freq_file_path']):
+                directory = self.discourse_audio_directory(name)
+                if self.config.debug:
+                    print('Removing', directory)
+                shutil.rmtree(directory, ignore_errors=True)
+
+            # Remove orphaned type nodes
+            for a in self.hierarchy.annotation_types:
+                # Remove tokens in discourse
+                statement = '''MATCH (d:{corpus_name}:Discourse)<-[:spoken_in]-(n:{corpus_name}:{atype})
+                WHERE d.name = $discourse
+                DETACH DELETE n'''.format(corpus_name=self.cypher_safe_name, atype=a)
+                if self.config.debug:
+                    print(statement)
+                result = self.execute_cypher(statement, discourse=name)
+                if self.config.debug:
+                    for r in result:
+                        print('RESULT', r)
+            # Remove discourse node
+            statement = '''MATCH (d:{corpus_name}:Discourse)
             WHERE d.name = $discourse
-            DETACH DELETE n'''.format(corpus_name=self.cypher_safe_name, atype=a)
+            DETACH DELETE d'''.format(corpus_name=self.cypher_safe_name)
             if self.config.debug:
                 print(statement)
             result = self.execute_cypher(statement, discourse=name)
             if self.config.debug:
                 for r in result:
                     print('RESULT', r)
-        # Remove discourse node
-        statement = '''MATCH (d:{corpus_name}:Discourse)
-        WHERE d.name = $discourse
-        DETACH DELETE d'''.format(corpus_name=self.cypher_safe_name)
-        if self.config.debug:
-            print(statement)
-        result = self.execute_cypher(statement, discourse=name)
-        if self.config.debug:
-            for r in result:
-                print('RESULT', r)
-
-        for a in self.hierarchy.annotation_types:
-            statement = '''MATCH (t:{type}_type:{corpus_name})
-            WHERE NOT (t)<-[:is_a]-()
-            DETACH DELETE t'''.format(type=a, corpus_name=self.cypher_safe_name)
+
+            for a in self.hierarchy.annotation_types:
+                statement = '''MATCH (t:{type}_type:{corpus_name})
+                WHERE NOT (t)<-[:is_a]-()
+                DETACH DELETE t'''.format(type=a, corpus_name=self.cypher_safe_name)
+                if self.config.debug:
+                    print(statement)
+                result = self.execute_cypher(statement)
+                if self.config.debug:
+                    for r in result:
+                        print('RESULT', r)
+
+            # Remove orphaned speaker nodes
+            statement = '''MATCH (s:Speaker:{corpus_name})
+            WHERE NOT (s)<-[:spoken_by]-()
+            DETACH DELETE s'''.format(corpus_name=self.cypher_safe_name)
             if self.config.debug:
                 print(statement)
             result = self.execute_cypher(statement)
@@ -496,17 +884,6 @@ class BaseContext(object):
                 for r in result:
                     print('RESULT', r)
 
-        # Remove orphaned speaker nodes
-        statement = '''MATCH (s:Speaker:{corpus_name})
-        WHERE NOT (s)<-[:spoken_by]-()
-        DETACH DELETE s'''.format(corpus_name=self.cypher_safe_name)
-        if self.config.debug:
-            print(statement)
-        result = self.execute_cypher(statement)
-        if self.config.debug:
-            for r in result:
-                print('RESULT', r)
-
     @property
     def phones(self):
         """
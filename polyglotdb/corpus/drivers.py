@@ -0,0 +1,83 @@
+import threading
+
+from neo4j import GraphDatabase
+
+_drivers = {}
+_lock = threading.Lock()
+
+
+def driver_key(config):
+    """
+    Get the key of the graph database driver for a corpus configuration, so that corpus contexts that connect to the
+    same database with the same credentials and settings share a driver
+
+    Parameters
+    ----------
+    config : :class:`~polyglotdb.config.CorpusConfig`
+        Corpus configuration
+
+    Returns
+    -------
+    tuple
+        Key of the driver
+    """
+    return (config.graph_connection_string, config.graph_user, config.graph_password,
+            config.graph_max_connection_pool_size, config.query_fetch_size,
+            config.graph_connection_acquisition_timeout, config.graph_keep_alive)
+
+
+def acquire_driver(config):
+    """
+    Get the shared graph database driver for a corpus configuration, creating it if no corpus context is using it
+
+    Each call should be matched by a call to :func:`release_driver` with the returned key once the driver is no
+    longer used.
+
+    Parameters
+    ----------
+    config : :class:`~polyglotdb.config.CorpusConfig`
+        Corpus configuration
+
+    Returns
+    -------
+    tuple
+        Key of the driver
+    :class:`neo4j.Driver`
+        Graph database driver
+    """
+    key = driver_key(config)
+    with _lock:
+        try:
+            entry = _drivers[key]
+        except KeyError:
+            kwargs = {'max_connection_pool_size': config.graph_max_connection_pool_size,
+                      'fetch_size': config.query_fetch_size,
+                      'connection_acquisition_timeout': config.graph_connection_acquisition_timeout,
+                      'keep_alive': config.graph_keep_alive}
+            if config.graph_user is not None:
+                kwargs['auth'] = (config.graph_user, config.graph_password)
+            entry = [GraphDatabase.driver(config.graph_connection_string, **kwargs), 0]
+            _drivers[key] = entry
+        entry[1] += 1
+        return key, entry[0]
+
+
+def release_driver(key):
+    """
+    Stop using a shared graph database driver, closing it once no corpus context is using it
+
+    Parameters
+    ----------
+    key : tuple
+        Key of the driver, from :func:`acquire_driver`
+    """
+    with _lock:
+        try:
+            entry = _drivers[key]
+        except KeyError:
+            return
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del _drivers[key]
+    entry[0].close()
@@ -1,24 +1,66 @@
 import os
 import logging
 import time
-import csv
 import re
+import pickle
+import shutil
 from collections import defaultdict
-import neo4j
+from concurrent.futures import ProcessPoolExecutor
 
-from ..acoustics.io import setup_audio
+from ..acoustics.io import setup_audio, discourse_sound_info, discourses_sound_info, add_discourses_sound_info
 
 from ..io.importer import (data_to_graph_csvs, import_csvs,
-                           data_to_type_csvs, import_type_csvs)
+                           data_to_type_csvs, import_type_csvs,
+                           BulkImportData, data_to_bulk_import_files, import_bulk_schema,
+                           get_import_transport)
 
 from ..exceptions import ParseError
+from ..structure import Hierarchy
 from .structured import StructuredContext
 
+_worker_state = {}
+
+
+def _initialize_parse_worker(parser, corpus_name, directory):
+    _worker_state['parser'] = parser
+    _worker_state['corpus_name'] = corpus_name
+    _worker_state['directory'] = directory
+    _worker_state['hierarchy'] = parser.hierarchy.to_json()
+
+
+def _parse_file_worker(index, path):
+    """
+    Parse a single file once in a worker process, returning its type information and
+    spilling the parsed :class:`~polyglotdb.io.discoursedata.DiscourseData` to disk
+    """
+    parser = _worker_state['parser']
+    # Every file starts from the same hierarchy so that results do not depend on
+    # which worker happened to parse which files
+    parser.hierarchy = Hierarchy()
+    parser.hierarchy.from_json(_worker_state['hierarchy'])
+    try:
+        data = parser.parse_discourse(path)
+    except ParseError as e:
+        return None, None, str(e)
+    if data is None:
+        return None, None, None
+    information = parser.discourse_information(data, _worker_state['corpus_name'])
+    if not information['type_headers']:
+        return None, None, 'There was an issue using this parser to parse the file {}.'.format(path)
+    data_path = os.path.join(_worker_state['directory'], '{}.pickle'.format(index))
+    with open(data_path, 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return information, data_path, None
+
 
 class ImportContext(StructuredContext):
     """
     Class that contains methods for dealing with the initial import of corpus data
     """
+    _bulk_import = None
+    _pending_audio = None
+    _import_transport = None
+
     def add_types(self, types, type_headers):
         """
         This function imports types of annotations into the corpus.
@@ -31,54 +73,34 @@ class ImportContext(StructuredContext):
             Dictionary of header information for the CSV files
         """
         data_to_type_csvs(self, types, type_headers)
+        if self._bulk_import is not None:
+            self._bulk_import.type_headers = type_headers
+            return
         import_type_csvs(self, type_headers)
 
     def initialize_import(self, speakers, token_headers, subannotations=None):
         """ prepares corpus for import of types of annotations """
         directory = self.config.temporary_directory('csv')
+        transport = get_import_transport(self)
         for s in speakers:
             for k, v in token_headers.items():
                 path = os.path.join(directory, '{}_{}.csv'.format(re.sub(r'\W', '_', s), k))
-                with open(path, 'w', newline='', encoding='utf8') as f:
-                    w = csv.DictWriter(f, v, delimiter=',')
-                    w.writeheader()
+                transport.write(path, v, [], 'w')
             if subannotations is not None:
                 for k, v in subannotations.items():
                     for sub in v:
                         path = os.path.join(directory, '{}_{}_{}.csv'.format(re.sub(r'\W', '_', s), k, sub))
-                        with open(path, 'w', newline='', encoding='utf8') as f:
-                            header = ['id', 'begin', 'end', 'annotation_id', 'label']
-                            w = csv.DictWriter(f, header, delimiter=',')
-                            w.writeheader()
-
-        def _corpus_index(tx):
-            tx.run('CREATE CONSTRAINT FOR (node:Corpus) REQUIRE node.name IS UNIQUE')
-
-        def _discourse_index(tx):
-            tx.run('CREATE INDEX FOR (d:Discourse) ON (d.name)')
-
-        def _speaker_index(tx):
-            tx.run('CREATE INDEX FOR (s:Speaker) ON (s.name)')
+                        header = ['id', 'begin', 'end', 'annotation_id', 'label']
+                        transport.write(path, header, [], 'w')
+        if self._bulk_import is not None:
+            return
 
         def _corpus_create(tx, corpus_name):
             tx.run('MERGE (n:Corpus {name: $corpus_name}) return n', corpus_name=corpus_name)
 
-        with self.graph_driver.session() as session:
-            try:
-                session.execute_write(_corpus_index)
-            except neo4j.exceptions.ClientError as e:
-                if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                    raise
-            try:
-                session.execute_write(_discourse_index)
-            except neo4j.exceptions.ClientError as e:
-                if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                    raise
-            try:
-                session.execute_write(_speaker_index)
-            except neo4j.exceptions.ClientError as e:
-                if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                    raise
+        self.schema.ensure(constraints=[('Corpus', 'name')],
+                           indexes=[('Discourse', 'name'), ('Speaker', 'name')])
+        with self.graph_session() as session:
             session.execute_write(_corpus_create, self.corpus_name)
 
     def finalize_import(self, speakers, token_headers, hierarchy, call_back=None, stop_check=None):
@@ -96,10 +118,16 @@ class ImportContext(StructuredContext):
         stop_check : callable or None
             Function to check whether process should be terminated early
         """
+        if self._bulk_import is not None:
+            self._bulk_import.command = data_to_bulk_import_files(self, self._bulk_import, speakers,
+                                                                  token_headers, hierarchy)
+            self.cache_hierarchy()
+            return
         import_csvs(self, speakers, token_headers, hierarchy, call_back, stop_check)
         self.encode_hierarchy()
+        self.refresh_statistics()
 
-    def add_discourse(self, data):
+    def add_discourse(self, data, add_types=False):
         """
         Set up a discourse to be imported to the Neo4j database
 
@@ -107,36 +135,82 @@ class ImportContext(StructuredContext):
         ----------
         data : :class:`~polyglotdb.io.helper.DiscourseData`
             Data for the discourse to be added
+        add_types : bool
+            Flag for whether to also import the types of the discourse (see
+            :meth:`~polyglotdb.corpus.ImportContext.add_types`), collected while its annotations are written
         """
-        if data.name in self.discourses:
-            raise (ParseError('The discourse \'{}\' already exists in this corpus.'.format(data.name)))
-        log = logging.getLogger('{}_loading'.format(self.corpus_name))
-        log.info('Begin adding discourse {}...'.format(data.name))
-        begin = time.time()
-
-        def _create_speaker_discourse(tx, speaker_name, discourse_name, channel):
-            tx.run('''MERGE (n:Speaker:{corpus_name} {{name: $speaker_name}})
-                        MERGE (d:Discourse:{corpus_name} {{name: $discourse_name}})
-                         MERGE (n)-[r:speaks_in]->(d)
-                        WITH r
-                        SET r.channel = $channel'''.format(corpus_name=self.cypher_safe_name),
-                   speaker_name=speaker_name, discourse_name=discourse_name, channel=channel)
-
-        with self.graph_driver.session() as session:
-            for s in data.speakers:
-                if s in data.speaker_channel_mapping:
-                    session.execute_write(_create_speaker_discourse, s, data.name, data.speaker_channel_mapping[s])
-                else:
-                    session.execute_write(_create_speaker_discourse, s, data.name, 0)
-        data.corpus_name = self.corpus_name
-        data_to_graph_csvs(self, data)
-        self.hierarchy.update(data.hierarchy)
-        setup_audio(self, data)
-
-        log.info('Finished adding discourse {}!'.format(data.name))
-        log.debug('Total time taken: {} seconds'.format(time.time() - begin))
-
-    def load(self, parser, path):
+        with self.changing_corpus():
+            if self._bulk_import is not None:
+                existing_discourses = self._bulk_import.discourses
+            else:
+                existing_discourses = self.discourses
+            if data.name in existing_discourses:
+                raise (ParseError('The discourse \'{}\' already exists in this corpus.'.format(data.name)))
+            log = logging.getLogger('{}_loading'.format(self.corpus_name))
+            log.info('Begin adding discourse {}...'.format(data.name))
+            begin = time.time()
+
+            def _create_speaker_discourse(tx, speaker_name, discourse_name, channel):
+                tx.run('''MERGE (n:Speaker:{corpus_name} {{name: $speaker_name}})
+                            MERGE (d:Discourse:{corpus_name} {{name: $discourse_name}})
+                             MERGE (n)-[r:speaks_in]->(d)
+                            WITH r
+                            SET r.channel = $channel'''.format(corpus_name=self.cypher_safe_name),
+                       speaker_name=speaker_name, discourse_name=discourse_name, channel=channel)
+
+            if self._bulk_import is not None:
+                self._bulk_import.add_discourse(data)
+            else:
+                with self.graph_session() as session:
+                    for s in data.speakers:
+                        if s in data.speaker_channel_mapping:
+                            session.execute_write(_create_speaker_discourse, s, data.name,
+                                                  data.speaker_channel_mapping[s])
+                        else:
+                            session.execute_write(_create_speaker_discourse, s, data.name, 0)
+            data.corpus_name = self.corpus_name
+            types, type_headers = data_to_graph_csvs(self, data, collect_types=add_types)
+            if add_types:
+                self.add_types(types, type_headers)
+            if get_import_transport(self).name == 'bolt':
+                # Rows are streamed per discourse rather than held in memory until finalize_import
+                import_csvs(self, data.speakers, data.token_headers, data.hierarchy)
+            self.hierarchy.update(data.hierarchy)
+            if self._pending_audio is not None:
+                if data.wav_path is not None and os.path.exists(data.wav_path):
+                    self._pending_audio[data.name] = data.wav_path
+            elif self._bulk_import is not None:
+                if data.wav_path is not None and os.path.exists(data.wav_path):
+                    self._bulk_import.discourses[data.name] = discourse_sound_info(self, data.name, data.wav_path)
+            else:
+                setup_audio(self, data)
+
+            log.info('Finished adding discourse {}!'.format(data.name))
+            log.debug('Total time taken: {} seconds'.format(time.time() - begin))
+
+    def _prepare_pending_audio(self, num_jobs=None, call_back=None, stop_check=None):
+        """
+        Prepare the audio files of the discourses added since ``_pending_audio`` was set, on a process pool
+
+        Parameters
+        ----------
+        num_jobs : int, optional
+            Number of processes to use
+        call_back : callable
+            Function to monitor progress
+        stop_check : callable or None
+            Function to check whether process should be terminated early
+        """
+        sound_files, self._pending_audio = self._pending_audio, None
+        if not sound_files:
+            return
+        if self._bulk_import is not None:
+            self._bulk_import.discourses.update(discourses_sound_info(self, sound_files, num_jobs,
+                                                                      call_back, stop_check))
+        else:
+            add_discourses_sound_info(self, sound_files, num_jobs, call_back, stop_check)
+
+    def load(self, parser, path, num_jobs=None):
         """
         Use a specified parser on a path to either a directory or a single
         file
@@ -148,6 +222,9 @@ class ImportContext(StructuredContext):
 
         path : str
             The location of the corpus
+        num_jobs : int, optional
+            Number of processes to use for parsing the files in a directory, see
+            :meth:`~polyglotdb.corpus.ImportContext.load_directory`
 
         Returns
         -------
@@ -157,11 +234,84 @@ class ImportContext(StructuredContext):
 
         if os.path.isdir(path):
             print("loading {} with {}".format(path, parser))
-            could_not_parse = self.load_directory(parser, path)
+            could_not_parse = self.load_directory(parser, path, num_jobs=num_jobs)
         else:
             could_not_parse = self.load_discourse(parser, path)
         return could_not_parse
 
+    def start_bulk_import(self, directory=None):
+        """
+        Have subsequent imports generate files for ``neo4j-admin database import`` rather than
+        loading data into Neo4j.  This is only suitable for creating a new database, as
+        ``neo4j-admin`` can only import into an empty database.
+
+        Parameters
+        ----------
+        directory : str, optional
+            Directory to save the import files to, defaults to a temporary directory of the corpus
+        """
+        if directory is None:
+            directory = self.config.temporary_directory('bulk_import')
+        self._bulk_import = BulkImportData(directory)
+
+    def finish_bulk_import(self):
+        """
+        Stop generating ``neo4j-admin`` import files
+
+        Returns
+        -------
+        list
+            Arguments for running ``neo4j-admin`` on the generated files
+        """
+        bulk_import, self._bulk_import = self._bulk_import, None
+        return bulk_import.command
+
+    def load_bulk(self, parser, path, directory=None, num_jobs=None):
+        """
+        Parse a corpus into node and relationship files for ``neo4j-admin database import``, for
+        creating a new database without going through Cypher.  Once the files are imported and the
+        database is started, call :meth:`~polyglotdb.corpus.ImportContext.finalize_bulk_import`.
+
+        Parameters
+        ----------
+        parser : :class:`~polyglotdb.io.parsers.BaseParser`
+            The type of parser used for corpus
+        path : str
+            The location of the corpus
+        directory : str, optional
+            Directory to save the import files to, defaults to a temporary directory of the corpus
+        num_jobs : int, optional
+            Number of processes to use for parsing the files in a directory
+
+        Returns
+        -------
+        list
+            Arguments for running ``neo4j-admin`` on the generated files
+        """
+        self.start_bulk_import(directory)
+        try:
+            self.load(parser, path, num_jobs=num_jobs)
+        finally:
+            command = self.finish_bulk_import()
+        return command
+
+    def finalize_bulk_import(self, directory=None):
+        """
+        Create the constraints, indexes and hierarchy schema for a database that was populated
+        with the files from :meth:`~polyglotdb.corpus.ImportContext.load_bulk`
+
+        Parameters
+        ----------
+        directory : str, optional
+            Directory the import files were saved to, defaults to a temporary directory of the corpus
+        """
+        with self.changing_corpus():
+            if directory is None:
+                directory = self.config.temporary_directory('bulk_import')
+            import_bulk_schema(self, directory)
+            self.encode_hierarchy()
+            self.refresh_statistics()
+
     def load_discourse(self, parser, path):
         """
         initializes, adds types, adds data, and finalizes import
@@ -178,21 +328,21 @@ class ImportContext(StructuredContext):
         empty list
 
         """
-        data = parser.parse_discourse(path)
-
-        # If there is no data, e.g. empty TextGrid, return the empty list early.
-        if data is None:
+        with self.changing_corpus():
+            data = parser.parse_discourse(path)
+
+            # If there is no data, e.g. empty TextGrid, return the empty list early.
+            if data is None:
+                return []
+
+            self.initialize_import(data.speakers, data.token_headers, data.hierarchy.subannotations)
+            self.add_discourse(data, add_types=True)
+            speakers = data.speakers
+            token_headers = data.token_headers
+            self.finalize_import(speakers, token_headers, parser.hierarchy, parser.call_back, parser.stop_check)
             return []
 
-        self.initialize_import(data.speakers, data.token_headers, data.hierarchy.subannotations)
-        self.add_types(*data.types(self.corpus_name))
-        self.add_discourse(data)
-        speakers = data.speakers
-        token_headers = data.token_headers
-        self.finalize_import(speakers, token_headers, parser.hierarchy, parser.call_back, parser.stop_check)
-        return []
-
-    def load_directory(self, parser, path):
+    def load_directory(self, parser, path, num_jobs=None):
         """
         Checks if it can parse each file in dir,
         initializes, adds types, adds data, and finalizes import
@@ -203,87 +353,216 @@ class ImportContext(StructuredContext):
                 the type of parser used for corpus
         path : str
             the location of the directory
+        num_jobs : int, optional
+            Number of processes to parse files with, if greater than 1 each file is parsed
+            once in a process pool rather than serially parsing every file twice (once for
+            types and once for tokens), and the audio files of the discourses are also prepared
+            in a process pool
 
         Returns
         -------
         could_not_parse : list
             list of files that were not able to be parsed
         """
-        call_back = parser.call_back
-        parser.call_back = None
-        if call_back is not None:
-            call_back('Finding  files...')
-            call_back(0, 0)
-        file_tuples = []
-        for root, subdirs, files in os.walk(path, followlinks=True):
-            for filename in files:
+        with self.changing_corpus():
+            call_back = parser.call_back
+            parser.call_back = None
+            if call_back is not None:
+                call_back('Finding  files...')
+                call_back(0, 0)
+            file_tuples = []
+            for root, subdirs, files in os.walk(path, followlinks=True):
+                for filename in files:
+                    if parser.stop_check is not None and parser.stop_check():
+                        return
+                    if not parser.match_extension(filename):
+                        continue
+                    file_tuples.append((root, filename))
+            if len(file_tuples) == 0:
+                raise (ParseError(
+                    'No files in the specified directory matched the parser. '
+                    'Please check to make sure you have the correct parser.'))
+            if num_jobs is not None and num_jobs > 1:
+                self._load_directory_multiprocessing(parser, file_tuples, call_back, num_jobs)
+                parser.call_back = call_back
+                return
+            if call_back is not None:
+                call_back('Parsing types...')
+                call_back(0, len(file_tuples))
+                cur = 0
+            speakers = set()
+            types = defaultdict(set)
+            type_headers = None
+            token_headers = None
+            subannotations = None
+            could_not_parse = {}
+            for i, t in enumerate(file_tuples):
                 if parser.stop_check is not None and parser.stop_check():
                     return
-                if not parser.match_extension(filename):
+                if call_back is not None:
+                    call_back('Parsing types from file {} of {}...'.format(i + 1, len(file_tuples)))
+                    call_back(i)
+                root, filename = t
+                path = os.path.join(root, filename)
+                try:
+                    information = parser.parse_information(path, self.corpus_name)
+                    if not information['type_headers']:
+                        raise ParseError('There was an issue using this parser to parse the file {}.'.format(path))
+                    speakers.update(information['speakers'])
+                    type_headers = information['type_headers']
+                    token_headers = information['token_headers']
+                    subannotations = information['subannotations']
+                except ParseError as e:
+                    could_not_parse[path] = str(e)
                     continue
-                file_tuples.append((root, filename))
-        if len(file_tuples) == 0:
-            raise (ParseError(
-                'No files in the specified directory matched the parser. '
-                'Please check to make sure you have the correct parser.'))
+                for k, v in information['types'].items():
+                    types[k].update(v)
+            if could_not_parse:
+                error_template = '{}: {}'
+                errors = [error_template.format(k, v) for k,v in could_not_parse.items()]
+                raise ParseError('There were issues parsing the following files with {} parser: {}'.format(
+                    parser.name, '\n\n'.join(errors)))
+            if call_back is not None:
+                call_back('Importing types...')
+            self.initialize_import(speakers, token_headers, subannotations)
+            self.add_types(types, type_headers)
+
+            if call_back is not None:
+                call_back('Parsing files...')
+                call_back(0, len(file_tuples))
+                cur = 0
+            self._pending_audio = {}
+            try:
+                for i, t in enumerate(file_tuples):
+                    if parser.stop_check is not None and parser.stop_check():
+                        return
+                    root, filename = t
+                    name = os.path.splitext(filename)[0]
+                    if call_back is not None:
+                        call_back('Parsing file {} of {} ({})...'.format(i + 1, len(file_tuples), name))
+                        call_back(i)
+                    path = os.path.join(root, filename)
+                    try:
+                        data = parser.parse_discourse(path)
+                    except ParseError:
+                        continue
+                    self.add_discourse(data)
+                self._prepare_pending_audio(num_jobs, call_back, parser.stop_check)
+            finally:
+                self._pending_audio = None
+            if parser.stop_check is not None and parser.stop_check():
+                return
+            self.finalize_import(speakers, token_headers, parser.hierarchy, call_back, parser.stop_check)
+            parser.call_back = call_back
+
+    def _load_directory_multiprocessing(self, parser, file_tuples, call_back, num_jobs):
+        """
+        Parse files on a process pool and import them, producing the same type and token
+        CSVs as the serial path in :meth:`~polyglotdb.corpus.ImportContext.load_directory`
+
+        Parameters
+        ----------
+        parser : :class:`~polyglotdb.io.parsers.BaseParser`
+                the type of parser used for corpus
+        file_tuples : list
+            (root, filename) tuples of the files to import
+        call_back : callable
+            Function to monitor progress
+        num_jobs : int
+            Number of processes to use
+        """
+        directory = self.config.temporary_directory('parsed')
+        try:
+            self._import_parsed_files(parser, file_tuples, call_back, num_jobs, directory)
+        finally:
+            # Parsed files that are left over when the import is stopped or fails are removed with the directory
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _import_parsed_files(self, parser, file_tuples, call_back, num_jobs, directory):
+        stop_check = parser.stop_check
         if call_back is not None:
-            call_back('Parsing types...')
+            call_back('Parsing files...')
             call_back(0, len(file_tuples))
-            cur = 0
+        # Callables on the parser are not guaranteed to be picklable, and are only used in this process
+        parser.stop_check = None
+        executor = ProcessPoolExecutor(max_workers=num_jobs, initializer=_initialize_parse_worker,
+                                       initargs=(parser, self.corpus_name, directory))
+        results = []
+        try:
+            futures = [executor.submit(_parse_file_worker, i, os.path.join(root, filename))
+                       for i, (root, filename) in enumerate(file_tuples)]
+            for i, f in enumerate(futures):
+                if stop_check is not None and stop_check():
+                    break
+                if call_back is not None:
+                    call_back('Parsing file {} of {}...'.format(i + 1, len(file_tuples)))
+                    call_back(i)
+                results.append(f.result())
+        finally:
+            parser.stop_check = stop_check
+            # Files that are not being parsed yet are skipped when parsing is stopped or fails, and the ones that are
+            # finish before the parsed files are removed
+            executor.shutdown(wait=True, cancel_futures=True)
+        if len(results) < len(file_tuples):
+            return
+
         speakers = set()
         types = defaultdict(set)
         type_headers = None
         token_headers = None
-        subannotations = None
         could_not_parse = {}
-        for i, t in enumerate(file_tuples):
-            if parser.stop_check is not None and parser.stop_check():
-                return
-            if call_back is not None:
-                call_back('Parsing types from file {} of {}...'.format(i + 1, len(file_tuples)))
-                call_back(i)
-            root, filename = t
-            path = os.path.join(root, filename)
-            try:
-                information = parser.parse_information(path, self.corpus_name)
-                if not information['type_headers']:
-                    raise ParseError('There was an issue using this parser to parse the file {}.'.format(path))
-                speakers.update(information['speakers'])
-                type_headers = information['type_headers']
-                token_headers = information['token_headers']
-                subannotations = information['subannotations']
-            except ParseError as e:
-                could_not_parse[path] = str(e)
+        # Merge in file order so that the outcome is independent of scheduling
+        for (root, filename), (information, data_path, error) in zip(file_tuples, results):
+            if error is not None:
+                could_not_parse[os.path.join(root, filename)] = error
+                continue
+            if information is None:
                 continue
+            speakers.update(information['speakers'])
+            type_headers = information['type_headers']
+            token_headers = information['token_headers']
+            for k, v in information['subannotations'].items():
+                if k not in parser.hierarchy.subannotations:
+                    parser.hierarchy.subannotations[k] = set()
+                parser.hierarchy.subannotations[k].update(v)
             for k, v in information['types'].items():
                 types[k].update(v)
         if could_not_parse:
             error_template = '{}: {}'
-            errors = [error_template.format(k, v) for k,v in could_not_parse.items()]
+            errors = [error_template.format(k, v) for k, v in could_not_parse.items()]
             raise ParseError('There were issues parsing the following files with {} parser: {}'.format(
                 parser.name, '\n\n'.join(errors)))
         if call_back is not None:
             call_back('Importing types...')
-        self.initialize_import(speakers, token_headers, subannotations)
+        self.initialize_import(speakers, token_headers, parser.hierarchy.subannotations)
         self.add_types(types, type_headers)
 
         if call_back is not None:
-            call_back('Parsing files...')
+            call_back('Importing files...')
             call_back(0, len(file_tuples))
-            cur = 0
-        for i, t in enumerate(file_tuples):
-            if parser.stop_check is not None and parser.stop_check():
-                return
-            root, filename = t
-            name = os.path.splitext(filename)[0]
-            if call_back is not None:
-                call_back('Parsing file {} of {} ({})...'.format(i + 1, len(file_tuples), name))
-                call_back(i)
-            path = os.path.join(root, filename)
-            try:
-                data = parser.parse_discourse(path)
-            except ParseError:
-                continue
-            self.add_discourse(data)
-        self.finalize_import(speakers, token_headers, parser.hierarchy, call_back, parser.stop_check)
-        parser.call_back = call_back
+        self._pending_audio = {}
+        try:
+            for i, ((root, filename), (information, data_path, error)) in enumerate(zip(file_tuples, results)):
+                if stop_check is not None and stop_check():
+                    return
+                if data_path is None:
+                    continue
+                name = os.path.splitext(filename)[0]
+                if call_back is not None:
+                    call_back('Importing file {} of {} ({})...'.format(i + 1, len(file_tuples), name))
+                    call_back(i)
+                with open(data_path, 'rb') as f:
+                    data = pickle.load(f)
+                os.remove(data_path)
+                # Fold the per-file hierarchy into the parser's, as happens when a single parser
+                # parses every file in turn
+                parser.hierarchy.type_properties.update(data.hierarchy.type_properties)
+                parser.hierarchy.token_properties.update(data.hierarchy.token_properties)
+                data.hierarchy = parser.hierarchy
+                self.add_discourse(data)
+            self._prepare_pending_audio(num_jobs, call_back, stop_check)
+        finally:
+            self._pending_audio = None
+        if stop_check is not None and stop_check():
+            return
+        self.finalize_import(speakers, token_headers, parser.hierarchy, call_back, stop_check)
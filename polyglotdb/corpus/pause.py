@@ -31,58 +31,59 @@ class PauseContext(ImportContext):
         stop_check : callable
             Function to check whether process should be terminated early
         """
-        self.reset_pauses()
-        word = getattr(self, self.word_name)
-        for s in self.speakers:
-            discourses = self.get_discourses_of_speaker(s)
-            for d in discourses:
-                q = self.query_graph(word)
-                q = q.filter(word.speaker.name == s)
-                q = q.filter(word.discourse.name == d)
-                if call_back is not None:
-                    q.call_back = call_back
-                if stop_check is not None:
-                    q.stop_check = stop_check
-                if isinstance(pause_words, (list, tuple, set)):
-                    q = q.filter(word.label.in_(pause_words))
-                elif isinstance(pause_words, str):
-                    q = q.filter(word.label.regex(pause_words))
-                else:
-                    raise (NotImplementedError)
-                q.set_pause()
+        with self.changing_corpus():
+            self.reset_pauses()
+            word = getattr(self, self.word_name)
+            for s in self.speakers:
+                discourses = self.get_discourses_of_speaker(s)
+                for d in discourses:
+                    q = self.query_graph(word)
+                    q = q.filter(word.speaker.name == s)
+                    q = q.filter(word.discourse.name == d)
+                    if call_back is not None:
+                        q.call_back = call_back
+                    if stop_check is not None:
+                        q.stop_check = stop_check
+                    if isinstance(pause_words, (list, tuple, set)):
+                        q = q.filter(word.label.in_(pause_words))
+                    elif isinstance(pause_words, str):
+                        q = q.filter(word.label.regex(pause_words))
+                    else:
+                        raise (NotImplementedError)
+                    q.set_pause()
 
-        if call_back is not None:
-            call_back('Finishing up...')
-        for s in self.speakers:
-            discourses = self.get_discourses_of_speaker(s)
-            for d in discourses:
-                statement = '''MATCH (prec:{corpus}:{word_type}:speech)-[:spoken_by]->(s:Speaker:{corpus}),
-                (prec)-[:spoken_in]->(d:Discourse:{corpus})
-                WHERE not (prec)-[:precedes]->()
-                AND s.name = $speaker
-                AND d.name = $discourse
-                WITH prec
-                MATCH p = (prec)-[:precedes_pause*]->(foll:{corpus}:{word_type}:speech)
-                WITH prec, foll, p
-                WHERE NONE (x in nodes(p)[1..-1] where x:speech)
-                MERGE (prec)-[:precedes]->(foll)'''.format(corpus=self.cypher_safe_name,
-                                                           word_type=self.word_name)
+            if call_back is not None:
+                call_back('Finishing up...')
+            for s in self.speakers:
+                discourses = self.get_discourses_of_speaker(s)
+                for d in discourses:
+                    statement = '''MATCH (prec:{corpus}:{word_type}:speech)-[:spoken_by]->(s:Speaker:{corpus}),
+                    (prec)-[:spoken_in]->(d:Discourse:{corpus})
+                    WHERE not (prec)-[:precedes]->()
+                    AND s.name = $speaker
+                    AND d.name = $discourse
+                    WITH prec
+                    MATCH p = (prec)-[:precedes_pause*]->(foll:{corpus}:{word_type}:speech)
+                    WITH prec, foll, p
+                    WHERE NONE (x in nodes(p)[1..-1] where x:speech)
+                    MERGE (prec)-[:precedes]->(foll)'''.format(corpus=self.cypher_safe_name,
+                                                               word_type=self.word_name)
 
-                self.execute_cypher(statement, speaker=s, discourse=d)
+                    self.execute_cypher(statement, speaker=s, discourse=d)
 
-                statement = '''MATCH (s:Speaker:{corpus})<-[:spoken_by]-(w:{word_type}:{corpus}:speech)-[:spoken_in]->(d:Discourse:{corpus})
-                WHERE s.name = $speaker
-                AND d.name = $discourse
-                    with d, max(w.end) as speech_end, min(w.begin) as speech_begin
-                    set d.speech_begin = speech_begin,
-                        d.speech_end = speech_end
-                    return d'''.format(corpus=self.cypher_safe_name,
-                                       word_type=self.word_name)
+                    statement = '''MATCH (s:Speaker:{corpus})<-[:spoken_by]-(w:{word_type}:{corpus}:speech)-[:spoken_in]->(d:Discourse:{corpus})
+                    WHERE s.name = $speaker
+                    AND d.name = $discourse
+                        with d, max(w.end) as speech_end, min(w.begin) as speech_begin
+                        set d.speech_begin = speech_begin,
+                            d.speech_end = speech_end
+                        return d'''.format(corpus=self.cypher_safe_name,
+                                           word_type=self.word_name)
 
-                results = self.execute_cypher(statement, speaker=s, discourse=d)
-        self.hierarchy.add_token_subsets(self, self.word_name, ['pause'])
-        self.hierarchy.add_discourse_properties(self, [('speech_begin', float), ('speech_end', float)])
-        self.encode_hierarchy()
+                    results = self.execute_cypher(statement, speaker=s, discourse=d)
+            self.hierarchy.add_token_subsets(self, self.word_name, ['pause'])
+            self.hierarchy.add_discourse_properties(self, [('speech_begin', float), ('speech_end', float)])
+            self.encode_hierarchy()
 
     def reset_pauses(self):
         """
@@ -226,6 +226,8 @@ class StructuredContext(BaseContext):
 
         self.execute_cypher(statement, corpus_name=self.corpus_name)
         self.cache_hierarchy()
+        # Statistics of new labels and properties are counted when the next query is planned
+        self._query_planner = None
 
     def encode_position(self, higher_annotation_type, lower_annotation_type, name, subset=None):
         """
@@ -152,73 +152,74 @@ class SyllabicContext(UtteranceContext):
         stop_check : callable
             Function the check whether the process should terminate early
         """
-        if call_back is not None:
-            call_back('Resetting syllables...')
-            number = self.execute_cypher(
-                '''MATCH (n:syllable:%s) return count(*) as number ''' % self.cypher_safe_name)[0]['number']
-            call_back(0, number)
-        for s in self.speakers:
-            discourses = self.get_discourses_of_speaker(s)
-            for d in discourses:
-                phone_rel_statement = '''
-                        MATCH (p:{phone_name}:{corpus})-[:contained_by]->(s:syllable:{corpus}),
-                        (s)-[:contained_by]->(w:{word_name}:{corpus}),
-                        (s)-[:spoken_by]->(sp:Speaker:{corpus}),
-                        (s)-[:spoken_in]->(d:Discourse:{corpus})
-                        WHERE sp.name = $speaker_name
-                        AND d.name = $discourse_name
-                        with p,w
-                        CREATE (p)-[:contained_by]->(w)
-                '''.format(corpus=self.cypher_safe_name,
-                           word_name=self.word_name,
-                           phone_name=self.phone_name)
-                self.execute_cypher(phone_rel_statement, speaker_name=s, discourse_name=d)
-
-                phone_label_statement = '''
-                        MATCH (p:{phone_name}:{corpus})-[:spoken_by]->(sp:Speaker:{corpus}),
-                        (p)-[:spoken_in]->(d:Discourse:{corpus})
-                        WHERE sp.name = $speaker_name
-                        AND d.name = $discourse_name
-                        with p
-                        REMOVE p:onset, p:nucleus, p:coda, p.syllable_position
-                '''.format(corpus=self.cypher_safe_name,
-                           word_name=self.word_name,
-                           phone_name=self.phone_name)
-                self.execute_cypher(phone_label_statement, speaker_name=s, discourse_name=d)
-                num_deleted = 0
-                deleted = 1000
-                delete_statement = '''
-                MATCH (s:syllable:{corpus})-[:spoken_by]->(sp:Speaker:{corpus}),
-                        (s)-[:spoken_in]->(d:Discourse:{corpus})
-                        WHERE sp.name = $speaker_name
-                        AND d.name = $discourse_name
-                        WITH s
-                        LIMIT 1000
-                        DETACH DELETE s
-                        RETURN count(s) as deleted_count
-                '''.format(corpus=self.cypher_safe_name)
-                while deleted > 0:
-                    if stop_check is not None and stop_check():
-                        break
-                    deleted = self.execute_cypher(delete_statement, speaker_name=s, discourse_name=d)[0][
-                        'deleted_count']
-
-                    num_deleted += deleted
-                    if call_back is not None:
-                        call_back(num_deleted)
-
-        statement = '''MATCH (st:syllable_type:{corpus})
-                               WITH st
-                               DETACH DELETE st'''.format(corpus=self.cypher_safe_name)
-        self.execute_cypher(statement)
-        try:
-            self.hierarchy.remove_annotation_type('syllable')
-            self.hierarchy.remove_token_subsets(self, self.phone_name, ['onset', 'coda', 'nucleus'])
-            self.hierarchy.remove_token_properties(self, self.phone_name, ['syllable_position'])
-            # self.reset_to_old_label()
-            self.encode_hierarchy()
-        except KeyError:
-            pass
+        with self.changing_corpus():
+            if call_back is not None:
+                call_back('Resetting syllables...')
+                number = self.execute_cypher(
+                    '''MATCH (n:syllable:%s) return count(*) as number ''' % self.cypher_safe_name)[0]['number']
+                call_back(0, number)
+            for s in self.speakers:
+                discourses = self.get_discourses_of_speaker(s)
+                for d in discourses:
+                    phone_rel_statement = '''
+                            MATCH (p:{phone_name}:{corpus})-[:contained_by]->(s:syllable:{corpus}),
+                            (s)-[:contained_by]->(w:{word_name}:{corpus}),
+                            (s)-[:spoken_by]->(sp:Speaker:{corpus}),
+                            (s)-[:spoken_in]->(d:Discourse:{corpus})
+                            WHERE sp.name = $speaker_name
+                            AND d.name = $discourse_name
+                            with p,w
+                            CREATE (p)-[:contained_by]->(w)
+                    '''.format(corpus=self.cypher_safe_name,
+                               word_name=self.word_name,
+                               phone_name=self.phone_name)
+                    self.execute_cypher(phone_rel_statement, speaker_name=s, discourse_name=d)
+
+                    phone_label_statement = '''
+                            MATCH (p:{phone_name}:{corpus})-[:spoken_by]->(sp:Speaker:{corpus}),
+                            (p)-[:spoken_in]->(d:Discourse:{corpus})
+                            WHERE sp.name = $speaker_name
+                            AND d.name = $discourse_name
+                            with p
+                            REMOVE p:onset, p:nucleus, p:coda, p.syllable_position
+                    '''.format(corpus=self.cypher_safe_name,
+                               word_name=self.word_name,
+                               phone_name=self.phone_name)
+                    self.execute_cypher(phone_label_statement, speaker_name=s, discourse_name=d)
+                    num_deleted = 0
+                    deleted = 1000
+                    delete_statement = '''
+                    MATCH (s:syllable:{corpus})-[:spoken_by]->(sp:Speaker:{corpus}),
+                            (s)-[:spoken_in]->(d:Discourse:{corpus})
+                            WHERE sp.name = $speaker_name
+                            AND d.name = $discourse_name
+                            WITH s
+                            LIMIT 1000
+                            DETACH DELETE s
+                            RETURN count(s) as deleted_count
+                    '''.format(corpus=self.cypher_safe_name)
+                    while deleted > 0:
+                        if stop_check is not None and stop_check():
+                            break
+                        deleted = self.execute_cypher(delete_statement, speaker_name=s, discourse_name=d)[0][
+                            'deleted_count']
+
+                        num_deleted += deleted
+                        if call_back is not None:
+                            call_back(num_deleted)
+
+            statement = '''MATCH (st:syllable_type:{corpus})
+                                   WITH st
+                                   DETACH DELETE st'''.format(corpus=self.cypher_safe_name)
+            self.execute_cypher(statement)
+            try:
+                self.hierarchy.remove_annotation_type('syllable')
+                self.hierarchy.remove_token_subsets(self, self.phone_name, ['onset', 'coda', 'nucleus'])
+                self.hierarchy.remove_token_properties(self, self.phone_name, ['syllable_position'])
+                # self.reset_to_old_label()
+                self.encode_hierarchy()
+            except KeyError:
+                pass
 
     @property
     def has_syllabics(self):
@@ -259,164 +260,165 @@ class SyllabicContext(UtteranceContext):
         stop_check : callable
             Function the check whether the process should terminate early
         """
+        with self.changing_corpus():
 
-        self.reset_syllables(call_back, stop_check)
-
-        onsets = self.find_onsets(syllabic_label=syllabic_label)
-        if algorithm == 'probabilistic':
-            onsets = norm_count_dict(onsets, onset=True)
-            codas = self.find_codas(syllabic_label=syllabic_label)
-            codas = norm_count_dict(codas, onset=False)
-        elif algorithm == 'maxonset':
-            onsets = set(onsets.keys())
-        else:
-            raise NotImplementedError
+            self.reset_syllables(call_back, stop_check)
 
-        statement = '''MATCH (n:{}:{}) return n.label as label'''.format(self.cypher_safe_name,
-                                                                         make_label_safe_for_cypher(syllabic_label))
-        res = self.execute_cypher(statement)
-        syllabics = set(x['label'] for x in res)
+            onsets = self.find_onsets(syllabic_label=syllabic_label)
+            if algorithm == 'probabilistic':
+                onsets = norm_count_dict(onsets, onset=True)
+                codas = self.find_codas(syllabic_label=syllabic_label)
+                codas = norm_count_dict(codas, onset=False)
+            elif algorithm == 'maxonset':
+                onsets = set(onsets.keys())
+            else:
+                raise NotImplementedError
 
-        word_type = getattr(self, self.word_name)
-        phone_type = getattr(word_type, self.phone_name)
+            statement = '''MATCH (n:{}:{}) return n.label as label'''.format(self.cypher_safe_name,
+                                                                             make_label_safe_for_cypher(syllabic_label))
+            res = self.execute_cypher(statement)
+            syllabics = set(x['label'] for x in res)
 
-        create_syllabic_csvs(self)
-        create_nonsyllabic_csvs(self)
+            word_type = getattr(self, self.word_name)
+            phone_type = getattr(word_type, self.phone_name)
 
-        splits = self.speakers
-        process_string = 'Processing speaker {} of {} ({})...'
-        if call_back is not None:
-            call_back(0, len(self.speakers))
+            create_syllabic_csvs(self)
+            create_nonsyllabic_csvs(self)
 
-        for speaker_ind, s in enumerate(self.speakers):
-            if stop_check is not None and stop_check():
-                break
+            splits = self.speakers
+            process_string = 'Processing speaker {} of {} ({})...'
             if call_back is not None:
-                call_back(speaker_ind)
-                call_back(process_string.format(speaker_ind, len(self.speakers), s))
-            discourses = self.get_discourses_of_speaker(s)
-            for d in discourses:
-                syllables = []
-                non_syllables = []
-                q = self.query_graph(word_type)
-                q = q.filter(word_type.speaker.name == s)
-                q = q.filter(word_type.discourse.name == d)
-                q = q.order_by(word_type.begin)
-                q = q.columns(word_type.id.column_name('id'), phone_type.id.column_name('phone_id'),
-                              word_type.begin.column_name('begin'),
-                              word_type.label.column_name('label'),
-                              word_type.end.column_name('end'),
-                              phone_type.label.column_name('phones'),
-                              phone_type.begin.column_name('begins'),
-                              phone_type.end.column_name('ends'))
-                results = q.all()
-                prev_id = None
-                for w in results:
-                    phones = w['phones']
-                    phone_ids = w['phone_id']
-
-                    if not phone_ids:
-                        print('The word {} in file {} ({} to {}) did not have any phones.'.format(w['label'], d,
-                                                                                                  w['begin'], w['end']))
-                        continue
-                    phone_begins = w['begins']
-                    phone_ends = w['ends']
-                    vow_inds = [i for i, x in enumerate(phones) if x in syllabics]
-                    if len(vow_inds) == 0:
-                        cur_id = uuid1()
-                        if algorithm == 'probabilistic':
-                            split = split_nonsyllabic_prob(phones, onsets, codas)
-                        else:
-                            split = split_nonsyllabic_maxonset(phones, onsets)
-                        label = '.'.join(phones)
-                        row = {'id': cur_id, 'prev_id': prev_id,
-                               'onset_id': phone_ids[0],
-                               'break': split,
-                               'coda_id': phone_ids[-1],
-                               'begin': phone_begins[0],
-                               'label': label,
-                               'type_id': make_type_id([label], self.corpus_name),
-                               'end': phone_ends[-1]}
-                        non_syllables.append(row)
-                        prev_id = cur_id
-                        continue
-                    for j, i in enumerate(vow_inds):
-                        cur_id = uuid1()
-                        cur_vow_id = phone_ids[i]
-                        if j == 0:
-                            begin_ind = 0
-                            if i != 0:
-                                cur_ons_id = phone_ids[begin_ind]
-                            else:
-                                cur_ons_id = None
-                        else:
-                            prev_vowel_ind = vow_inds[j - 1]
-                            cons_string = phones[prev_vowel_ind + 1:i]
+                call_back(0, len(self.speakers))
+
+            for speaker_ind, s in enumerate(self.speakers):
+                if stop_check is not None and stop_check():
+                    break
+                if call_back is not None:
+                    call_back(speaker_ind)
+                    call_back(process_string.format(speaker_ind, len(self.speakers), s))
+                discourses = self.get_discourses_of_speaker(s)
+                for d in discourses:
+                    syllables = []
+                    non_syllables = []
+                    q = self.query_graph(word_type)
+                    q = q.filter(word_type.speaker.name == s)
+                    q = q.filter(word_type.discourse.name == d)
+                    q = q.order_by(word_type.begin)
+                    q = q.columns(word_type.id.column_name('id'), phone_type.id.column_name('phone_id'),
+                                  word_type.begin.column_name('begin'),
+                                  word_type.label.column_name('label'),
+                                  word_type.end.column_name('end'),
+                                  phone_type.label.column_name('phones'),
+                                  phone_type.begin.column_name('begins'),
+                                  phone_type.end.column_name('ends'))
+                    results = q.all()
+                    prev_id = None
+                    for w in results:
+                        phones = w['phones']
+                        phone_ids = w['phone_id']
+
+                        if not phone_ids:
+                            print('The word {} in file {} ({} to {}) did not have any phones.'.format(w['label'], d,
+                                                                                                      w['begin'], w['end']))
+                            continue
+                        phone_begins = w['begins']
+                        phone_ends = w['ends']
+                        vow_inds = [i for i, x in enumerate(phones) if x in syllabics]
+                        if len(vow_inds) == 0:
+                            cur_id = uuid1()
                             if algorithm == 'probabilistic':
-                                split = split_ons_coda_prob(cons_string, onsets, codas)
+                                split = split_nonsyllabic_prob(phones, onsets, codas)
                             else:
-                                split = split_ons_coda_maxonset(cons_string, onsets)
-                            if split is None:
-                                cur_ons_id = None
-                                begin_ind = i
+                                split = split_nonsyllabic_maxonset(phones, onsets)
+                            label = '.'.join(phones)
+                            row = {'id': cur_id, 'prev_id': prev_id,
+                                   'onset_id': phone_ids[0],
+                                   'break': split,
+                                   'coda_id': phone_ids[-1],
+                                   'begin': phone_begins[0],
+                                   'label': label,
+                                   'type_id': make_type_id([label], self.corpus_name),
+                                   'end': phone_ends[-1]}
+                            non_syllables.append(row)
+                            prev_id = cur_id
+                            continue
+                        for j, i in enumerate(vow_inds):
+                            cur_id = uuid1()
+                            cur_vow_id = phone_ids[i]
+                            if j == 0:
+                                begin_ind = 0
+                                if i != 0:
+                                    cur_ons_id = phone_ids[begin_ind]
+                                else:
+                                    cur_ons_id = None
                             else:
-                                begin_ind = prev_vowel_ind + 1 + split
-                                cur_ons_id = phone_ids[begin_ind]
-
-                        if j == len(vow_inds) - 1:
-                            end_ind = len(phones) - 1
-                            if i != len(phones) - 1:
-                                cur_coda_id = phone_ids[end_ind]
+                                prev_vowel_ind = vow_inds[j - 1]
+                                cons_string = phones[prev_vowel_ind + 1:i]
+                                if algorithm == 'probabilistic':
+                                    split = split_ons_coda_prob(cons_string, onsets, codas)
+                                else:
+                                    split = split_ons_coda_maxonset(cons_string, onsets)
+                                if split is None:
+                                    cur_ons_id = None
+                                    begin_ind = i
+                                else:
+                                    begin_ind = prev_vowel_ind + 1 + split
+                                    cur_ons_id = phone_ids[begin_ind]
+
+                            if j == len(vow_inds) - 1:
+                                end_ind = len(phones) - 1
+                                if i != len(phones) - 1:
+                                    cur_coda_id = phone_ids[end_ind]
+                                else:
+                                    cur_coda_id = None
                             else:
-                                cur_coda_id = None
-                        else:
-                            foll_vowel_ind = vow_inds[j + 1]
-                            cons_string = phones[i + 1:foll_vowel_ind]
-                            if algorithm == 'probabilistic':
-                                split = split_ons_coda_prob(cons_string, onsets, codas)
-                            else:
-                                split = split_ons_coda_maxonset(cons_string, onsets)
-                            if split is None:
-                                cur_coda_id = None
-                                end_ind = i
-                            else:
-                                end_ind = i + split
-                                cur_coda_id = phone_ids[end_ind]
-                        begin = phone_begins[begin_ind]
-                        end = phone_ends[end_ind]
-                        label = '.'.join(phones[begin_ind:end_ind + 1])
-                        row = {'id': cur_id, 'prev_id': prev_id,
-                               'vowel_id': cur_vow_id, 'onset_id': cur_ons_id,
-                               'label': label,
-                               'type_id': make_type_id([label], self.corpus_name),
-                               'coda_id': cur_coda_id, 'begin': begin, 'end': end}
-                        syllables.append(row)
-                        prev_id = cur_id
-                syllables_data_to_csvs(self, s, d, syllables)
-                nonsyls_data_to_csvs(self, s, d, non_syllables)
-        import_syllable_csv(self, call_back, stop_check)
-        import_nonsyl_csv(self, call_back, stop_check)
-        if stop_check is not None and stop_check():
-            return
-
-        if call_back is not None:
-            call_back('Cleaning up...')
-        for s in self.speakers:
-            discourses = self.get_discourses_of_speaker(s)
-            for d in discourses:
-                self.execute_cypher(
-                    '''MATCH (s:{corpus_name}:Speaker)<-[:spoken_by]-(n:{corpus_name}:syllable)-[:spoken_in]->(d:{corpus_name}:Discourse)
-                    where s.name = $speaker_name 
-                    AND d.name = $discourse_name and n.prev_id is not Null 
-                    REMOVE n.prev_id'''.format(corpus_name=self.cypher_safe_name), speaker_name=s, discourse_name=d)
-
-        self.hierarchy.add_annotation_type('syllable', above=self.phone_name, below=self.word_name)
-        self.hierarchy.add_token_subsets(self, self.phone_name, ['onset', 'coda', 'nucleus'])
-        self.hierarchy.add_token_properties(self, self.phone_name, [('syllable_position', str)])
-        self.encode_hierarchy()
-        if call_back is not None:
-            call_back('Finished!')
-            call_back(1, 1)
+                                foll_vowel_ind = vow_inds[j + 1]
+                                cons_string = phones[i + 1:foll_vowel_ind]
+                                if algorithm == 'probabilistic':
+                                    split = split_ons_coda_prob(cons_string, onsets, codas)
+                                else:
+                                    split = split_ons_coda_maxonset(cons_string, onsets)
+                                if split is None:
+                                    cur_coda_id = None
+                                    end_ind = i
+                                else:
+                                    end_ind = i + split
+                                    cur_coda_id = phone_ids[end_ind]
+                            begin = phone_begins[begin_ind]
+                            end = phone_ends[end_ind]
+                            label = '.'.join(phones[begin_ind:end_ind + 1])
+                            row = {'id': cur_id, 'prev_id': prev_id,
+                                   'vowel_id': cur_vow_id, 'onset_id': cur_ons_id,
+                                   'label': label,
+                                   'type_id': make_type_id([label], self.corpus_name),
+                                   'coda_id': cur_coda_id, 'begin': begin, 'end': end}
+                            syllables.append(row)
+                            prev_id = cur_id
+                    syllables_data_to_csvs(self, s, d, syllables)
+                    nonsyls_data_to_csvs(self, s, d, non_syllables)
+            import_syllable_csv(self, call_back, stop_check)
+            import_nonsyl_csv(self, call_back, stop_check)
+            if stop_check is not None and stop_check():
+                return
+
+            if call_back is not None:
+                call_back('Cleaning up...')
+            for s in self.speakers:
+                discourses = self.get_discourses_of_speaker(s)
+                for d in discourses:
+                    self.execute_cypher(
+                        '''MATCH (s:{corpus_name}:Speaker)<-[:spoken_by]-(n:{corpus_name}:syllable)-[:spoken_in]->(d:{corpus_name}:Discourse)
+                        where s.name = $speaker_name 
+                        AND d.name = $discourse_name and n.prev_id is not Null 
+                        REMOVE n.prev_id'''.format(corpus_name=self.cypher_safe_name), speaker_name=s, discourse_name=d)
+
+            self.hierarchy.add_annotation_type('syllable', above=self.phone_name, below=self.word_name)
+            self.hierarchy.add_token_subsets(self, self.phone_name, ['onset', 'coda', 'nucleus'])
+            self.hierarchy.add_token_properties(self, self.phone_name, [('syllable_position', str)])
+            self.encode_hierarchy()
+            if call_back is not None:
+                call_back('Finished!')
+                call_back(1, 1)
 
     def enrich_syllables(self, syllable_data, type_data=None):
         """
@@ -48,46 +48,47 @@ class UtteranceContext(PauseContext):
             Time in seconds that is the minimum duration of a stretch of
             speech to count as an utterance
         """
-        self.reset_utterances()
+        with self.changing_corpus():
+            self.reset_utterances()
 
-        self.hierarchy.add_annotation_type('utterance', above=self.word_name, below=None)
-        self.encode_hierarchy()
+            self.hierarchy.add_annotation_type('utterance', above=self.word_name, below=None)
+            self.encode_hierarchy()
 
-        discourses = self.discourses
-        if call_back is not None:
-            call_back(0, len(discourses))
-        create_utterance_csvs(self)
+            discourses = self.discourses
+            if call_back is not None:
+                call_back(0, len(discourses))
+            create_utterance_csvs(self)
 
-        for i, d in enumerate(discourses):
+            for i, d in enumerate(discourses):
+                if stop_check is not None and stop_check():
+                    return
+                if call_back is not None:
+                    call_back(i)
+                    call_back('Parsing utterances for discourse {} of {} ({})...'.format(i, len(discourses), d))
+                utt_data = self.get_utterance_ids(d, min_pause_length, min_utterance_length)
+                speaker_data = {}
+                for s, utterances in utt_data.items():
+                    speaker_data = []
+                    prev_id = None
+                    for u in utterances:
+                        cur_id = uuid1()
+                        row = {'id': cur_id, 'prev_id': prev_id,
+                               'begin_word_id': u[0],
+                               'end_word_id': u[1]}
+                        speaker_data.append(row)
+                        prev_id = cur_id
+                    utterance_data_to_csvs(self, s, d, speaker_data)
+            import_utterance_csv(self, call_back, stop_check)
+            for m in self.hierarchy.acoustics:
+                self.reassess_utterances(m)
+                if m == 'pitch':
+                    self.hierarchy.add_token_properties(self, 'utterance', [('pitch_last_edited', int)])
+                    self.encode_hierarchy()
             if stop_check is not None and stop_check():
                 return
             if call_back is not None:
-                call_back(i)
-                call_back('Parsing utterances for discourse {} of {} ({})...'.format(i, len(discourses), d))
-            utt_data = self.get_utterance_ids(d, min_pause_length, min_utterance_length)
-            speaker_data = {}
-            for s, utterances in utt_data.items():
-                speaker_data = []
-                prev_id = None
-                for u in utterances:
-                    cur_id = uuid1()
-                    row = {'id': cur_id, 'prev_id': prev_id,
-                           'begin_word_id': u[0],
-                           'end_word_id': u[1]}
-                    speaker_data.append(row)
-                    prev_id = cur_id
-                utterance_data_to_csvs(self, s, d, speaker_data)
-        import_utterance_csv(self, call_back, stop_check)
-        for m in self.hierarchy.acoustics:
-            self.reassess_utterances(m)
-            if m == 'pitch':
-                self.hierarchy.add_token_properties(self, 'utterance', [('pitch_last_edited', int)])
-                self.encode_hierarchy()
-        if stop_check is not None and stop_check():
-            return
-        if call_back is not None:
-            call_back(i + 1)
-            call_back('Finished!')
+                call_back(i + 1)
+                call_back('Finished!')
 
     def get_utterance_ids(self, discourse,
                           min_pause_length=0.5, min_utterance_length=0):
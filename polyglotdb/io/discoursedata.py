@@ -55,6 +55,22 @@ class DiscourseData(object):
     def __contains__(self, item):
         return item in self.data
 
+    def annotation_chunks(self):
+        """
+        Generate the annotations of the discourse, in chunks if the parser streams them
+
+        Yields
+        ------
+        dict
+            :class:`~polyglotdb.io.types.standardized.PGAnnotationType` objects indexed by their name
+        """
+        chunks = getattr(self.data, 'chunks', None)
+        if chunks is None:
+            yield self.data
+            return
+        for chunk in chunks():
+            yield chunk
+
     def highest_to_lowest(self):
         """
         orders hierarchy highest to lowest
@@ -142,12 +158,14 @@ class DiscourseData(object):
         """
         types = {}
         type_headers = {}
-        for k, v in self.items():
+        for k in self.keys():
             types[k] = set()
-            for w in v:
-                if k not in type_headers:
-                    type_headers[k] = ['id'] + w.type_keys()
-                id = w.sha(corpus_name)
-                props = tuple([id] + [x for x in w.type_values()])
-                types[k].add(props)
+        for chunk in self.annotation_chunks():
+            for k, v in chunk.items():
+                for w in v:
+                    if k not in type_headers:
+                        type_headers[k] = ['id'] + w.type_keys()
+                    id = w.sha(corpus_name)
+                    props = tuple([id] + [x for x in w.type_values()])
+                    types[k].add(props)
         return types, type_headers
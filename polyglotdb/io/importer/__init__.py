@@ -12,3 +12,9 @@ from .from_csv import (import_type_csvs, import_csvs, import_lexicon_csvs,
                        import_feature_csvs, import_speaker_csvs,
                        import_discourse_csvs, import_syllable_enrichment_csvs, import_utterance_enrichment_csvs,
                        import_token_csv)
+
+from .bulk import (BulkImportData, data_to_bulk_import_files, bulk_import_command, import_bulk_schema)
+
+from .transport import (CsvTransport, UnwindTransport, get_import_transport)
+
+from .schema import SchemaManager
@@ -0,0 +1,318 @@
+import os
+import re
+import csv
+import json
+import logging
+import time
+
+TOKEN_SPECIAL_COLUMNS = ['type_id', 'id', 'previous_id', 'speaker', 'discourse', 'begin', 'end']
+
+
+class BulkImportData(object):
+    """
+    Class for collecting the information about a corpus that would otherwise be written to Neo4j during
+    an import, for generating ``neo4j-admin database import`` files instead
+
+    Parameters
+    ----------
+    directory : str
+        Directory to save the import files to
+
+    Attributes
+    ----------
+    type_headers : dict
+        Header information for the type CSV files of each annotation type
+    discourses : dict
+        Discourse properties indexed by discourse name
+    speaker_discourses : dict
+        Channel of each (speaker, discourse) pair
+    command : list or None
+        Arguments for running ``neo4j-admin`` once the import files are generated
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+        self.type_headers = {}
+        self.discourses = {}
+        self.speaker_discourses = {}
+        self.command = None
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, 'manifest.json')
+
+    def add_discourse(self, data):
+        """
+        Record the speakers and discourse of a :class:`~polyglotdb.io.discoursedata.DiscourseData` object
+
+        Parameters
+        ----------
+        data : :class:`~polyglotdb.io.discoursedata.DiscourseData`
+            Data for the discourse to be added
+        """
+        self.discourses[data.name] = {}
+        for s in data.speakers:
+            self.speaker_discourses[s, data.name] = data.speaker_channel_mapping.get(s, 0)
+
+
+def _format_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return '"{}"'.format(value.replace('"', '""'))
+    return str(value)
+
+
+class _ImportFileWriter(object):
+    def __init__(self, path, header):
+        self.path = path
+        self.file = open(path, 'w', encoding='utf8', newline='')
+        self.file.write(','.join(header) + '\n')
+
+    def writerow(self, row):
+        self.file.write(','.join(_format_value(x) for x in row) + '\n')
+
+    def close(self):
+        self.file.close()
+
+
+def _read_csv(path):
+    with open(path, 'r', encoding='utf8', newline='') as f:
+        reader = csv.DictReader(f, delimiter=',')
+        for line in reader:
+            # LOAD CSV treats empty fields as null
+            yield {k: (v if v != '' else None) for k, v in line.items()}
+
+
+def _to_float(value):
+    if value is None:
+        return None
+    return float(value)
+
+
+def data_to_bulk_import_files(corpus_context, bulk_data, speakers, token_headers, hierarchy):
+    """
+    Convert the temporary CSV files of an import into node and relationship files in the
+    format of ``neo4j-admin database import``, with all relationships resolved to node ids
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.ImportContext`
+        CorpusContext to use
+    bulk_data : :class:`~polyglotdb.io.importer.bulk.BulkImportData`
+        Information collected during the import
+    speakers : list
+        Speakers in the corpus
+    token_headers : dict
+        Header information for the token CSV files
+    hierarchy : :class:`~polyglotdb.structure.Hierarchy`
+        Hierarchy of the corpus
+
+    Returns
+    -------
+    list
+        Arguments for running ``neo4j-admin`` on the generated files
+    """
+    log = logging.getLogger('{}_loading'.format(corpus_context.corpus_name))
+    log.info('Beginning to generate bulk import files...')
+    begin = time.time()
+    csv_directory = corpus_context.config.temporary_directory('csv')
+    directory = bulk_data.directory
+    corpus_name = corpus_context.corpus_name
+    node_files = []
+    relationship_files = []
+
+    def node_writer(name, header):
+        path = os.path.join(directory, '{}_nodes.csv'.format(name))
+        node_files.append(path)
+        return _ImportFileWriter(path, header)
+
+    def relationship_writer(name, header):
+        path = os.path.join(directory, '{}_relationships.csv'.format(name))
+        relationship_files.append(path)
+        return _ImportFileWriter(path, header)
+
+    w = node_writer('corpus', ['name:ID(Corpus)', ':LABEL'])
+    w.writerow([corpus_name, 'Corpus'])
+    w.close()
+
+    speaker_names = sorted(set(speakers) | set(x[0] for x in bulk_data.speaker_discourses))
+    w = node_writer('speaker', ['name:ID(Speaker)', ':LABEL'])
+    for s in speaker_names:
+        w.writerow([s, 'Speaker;{}'.format(corpus_name)])
+    w.close()
+
+    w = node_writer('discourse', ['name:ID(Discourse)', 'file_path', 'consonant_file_path', 'vowel_file_path',
+                                  'low_freq_file_path', 'duration:float', 'sampling_rate:long',
+                                  'num_channels:long', ':LABEL'])
+    for d, props in sorted(bulk_data.discourses.items()):
+        w.writerow([d, props.get('file_path'), props.get('consonant_file_path'), props.get('vowel_file_path'),
+                    props.get('low_freq_file_path'), props.get('duration'), props.get('sampling_rate'),
+                    props.get('num_channels'), 'Discourse;{}'.format(corpus_name)])
+    w.close()
+
+    w = relationship_writer('speaks_in', [':START_ID(Speaker)', ':END_ID(Discourse)', 'channel:long', ':TYPE'])
+    for (s, d), channel in sorted(bulk_data.speaker_discourses.items()):
+        w.writerow([s, d, channel, 'speaks_in'])
+    w.close()
+
+    for at, header in sorted(bulk_data.type_headers.items()):
+        path = os.path.join(csv_directory, '{}_type.csv'.format(at))
+        properties = [x for x in header if x != 'id']
+        file_header = ['id:ID({}_type)'.format(at)] + properties
+        if 'label' in header:
+            file_header.append('label_insensitive')
+        w = node_writer('{}_type'.format(at), file_header + [':LABEL'])
+        seen = set()
+        for line in _read_csv(path):
+            if line['id'] in seen:
+                continue
+            seen.add(line['id'])
+            row = [line['id']] + [line[x] for x in properties]
+            if 'label' in header:
+                row.append(line['label'].lower() if line['label'] is not None else None)
+            row.append('{}_type;{}'.format(at, corpus_name))
+            w.writerow(row)
+        w.close()
+        os.remove(path)
+
+    # Tokens are only linked if their containing annotation exists, as in the MATCH clause of import_csvs
+    super_ids = {x: set() for x in hierarchy.values() if x is not None}
+    for at in hierarchy.highest_to_lowest:
+        st = hierarchy[at]
+        properties = [x for x in token_headers[at] if x not in TOKEN_SPECIAL_COLUMNS]
+        file_header = ['id:ID({})'.format(at), 'begin:float', 'end:float'] + properties
+        if 'label' in token_headers[at]:
+            file_header.append('label_insensitive')
+        nodes = node_writer(at, file_header + [':LABEL'])
+        is_a = relationship_writer('{}_is_a'.format(at), [':START_ID({})'.format(at),
+                                                          ':END_ID({}_type)'.format(at), ':TYPE'])
+        spoken_in = relationship_writer('{}_spoken_in'.format(at), [':START_ID({})'.format(at),
+                                                                    ':END_ID(Discourse)', ':TYPE'])
+        spoken_by = relationship_writer('{}_spoken_by'.format(at), [':START_ID({})'.format(at),
+                                                                    ':END_ID(Speaker)', ':TYPE'])
+        precedes = relationship_writer('{}_precedes'.format(at), [':START_ID({})'.format(at),
+                                                                  ':END_ID({})'.format(at), ':TYPE'])
+        if st is not None:
+            contained_by = relationship_writer('{}_contained_by'.format(at), [':START_ID({})'.format(at),
+                                                                              ':END_ID({})'.format(st), ':TYPE'])
+        for s in speakers:
+            path = os.path.join(csv_directory, '{}_{}.csv'.format(re.sub(r'\W', '_', s), at))
+            if not os.path.exists(path):
+                continue
+            for line in _read_csv(path):
+                row = [line['id'], _to_float(line['begin']), _to_float(line['end'])] + [line[x] for x in properties]
+                if 'label' in token_headers[at]:
+                    row.append(line['label'].lower() if line['label'] is not None else None)
+                row.append('{};{};speech'.format(at, corpus_name))
+                nodes.writerow(row)
+                if at in super_ids:
+                    super_ids[at].add(line['id'])
+                if st is not None:
+                    if line[st] not in super_ids[st]:
+                        continue
+                    contained_by.writerow([line['id'], line[st], 'contained_by'])
+                is_a.writerow([line['id'], line['type_id'], 'is_a'])
+                spoken_in.writerow([line['id'], line['discourse'], 'spoken_in'])
+                spoken_by.writerow([line['id'], line['speaker'], 'spoken_by'])
+                if line['previous_id'] is not None:
+                    precedes.writerow([line['previous_id'], line['id'], 'precedes'])
+            os.remove(path)
+        for x in [nodes, is_a, spoken_in, spoken_by, precedes]:
+            x.close()
+        if st is not None:
+            contained_by.close()
+
+    for k, v in sorted(hierarchy.subannotations.items()):
+        for sub_type in sorted(v):
+            nodes = node_writer(sub_type, ['id:ID({})'.format(sub_type), 'type', 'begin:float', 'end:float',
+                                           'label', ':LABEL'])
+            annotates = relationship_writer('{}_annotates'.format(sub_type), [':START_ID({})'.format(sub_type),
+                                                                              ':END_ID({})'.format(k), ':TYPE'])
+            for s in speakers:
+                path = os.path.join(csv_directory, '{}_{}_{}.csv'.format(re.sub(r'\W', '_', s), k, sub_type))
+                if not os.path.exists(path):
+                    continue
+                for line in _read_csv(path):
+                    label = line['label'] if line['label'] is not None else ''
+                    nodes.writerow([line['id'], sub_type, _to_float(line['begin']), _to_float(line['end']), label,
+                                    '{};{};speech'.format(sub_type, corpus_name)])
+                    annotates.writerow([line['id'], line['annotation_id'], 'annotates'])
+                os.remove(path)
+            nodes.close()
+            annotates.close()
+
+    with open(bulk_data.manifest_path, 'w', encoding='utf8') as f:
+        json.dump({'speakers': speaker_names,
+                   'token_headers': token_headers,
+                   'type_headers': bulk_data.type_headers,
+                   'subannotations': {k: sorted(v) for k, v in hierarchy.subannotations.items()}}, f)
+    log.info('Finished generating bulk import files!')
+    log.debug('Generating bulk import files took: {} seconds'.format(time.time() - begin))
+    return bulk_import_command(node_files, relationship_files)
+
+
+def bulk_import_command(node_files, relationship_files, database='neo4j'):
+    """
+    Construct the arguments for importing node and relationship files into an empty database
+    with ``neo4j-admin``
+
+    Parameters
+    ----------
+    node_files : list
+        Paths to node files
+    relationship_files : list
+        Paths to relationship files
+    database : str
+        Name of the database to import into, defaults to 'neo4j'
+
+    Returns
+    -------
+    list
+        Command line arguments
+    """
+    command = ['neo4j-admin', 'database', 'import', 'full']
+    command += ['--nodes={}'.format(x) for x in node_files]
+    command += ['--relationships={}'.format(x) for x in relationship_files]
+    command += ['--multiline-fields=true', database]
+    return command
+
+
+def import_bulk_schema(corpus_context, directory):
+    """
+    Create the constraints and indexes that the regular import creates, for a database
+    that was populated by ``neo4j-admin database import``
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.ImportContext`
+        CorpusContext to use
+    directory : str
+        Directory containing the bulk import files
+    """
+    with open(os.path.join(directory, 'manifest.json'), 'r', encoding='utf8') as f:
+        manifest = json.load(f)
+    constraints = [('Corpus', 'name')]
+    indexes = [('Discourse', 'name'), ('Speaker', 'name')]
+    for at, header in manifest['type_headers'].items():
+        constraints.append(('%s_type' % at, 'id'))
+        if 'label' in header:
+            indexes.append(('%s_type' % at, 'label_insensitive'))
+        for x in header:
+            if x != 'id':
+                indexes.append(('%s_type' % at, x))
+    for at, header in manifest['token_headers'].items():
+        constraints.append((at, 'id'))
+        for x in header:
+            if x in TOKEN_SPECIAL_COLUMNS:
+                continue
+            indexes.append((at, x))
+        if 'label' in header:
+            indexes.append((at, 'label_insensitive'))
+        indexes.append((at, 'begin'))
+        indexes.append((at, 'end'))
+    for k, v in manifest['subannotations'].items():
+        for s in v:
+            constraints.append((s, 'id'))
+    corpus_context.schema.ensure(constraints, indexes)
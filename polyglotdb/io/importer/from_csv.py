@@ -3,15 +3,11 @@ import logging
 import time
 import neo4j
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def make_path_safe(path):
-    '''Takes a path and returns it with the associated Javascript URL-safe characters'''
-    replacements = [('%', '%25'), ('\\', '/'), (' ', '%20'), ("'", "\\'"), ('?', '%3F'), (';', '%3B'),
-                    ('<', '%3C'), ('=', '%3D'), ('>', '%3E'), (':', '%3A'), ('*', '%2A'), ('&', '%26'),
-                    ('(', '%28'), (')', '%29'), ('@', '%40'), ('!', '%21'), ('#', '%23')]
-    for o, r in replacements:
-        path = path.replace(o, r)
-    return path
+from .transport import make_path_safe, get_import_transport
+
+IMPORT_RETRY_LIMIT = 3
 
 
 def import_type_csvs(corpus_context, type_headers):
@@ -26,62 +22,48 @@ def import_type_csvs(corpus_context, type_headers):
         a list of type files
     """
     log = logging.getLogger('{}_loading'.format(corpus_context.corpus_name))
+    transport = get_import_transport(corpus_context)
     prop_temp = '''{name}: csvLine.{name}'''
+    constraints = []
+    indexes = []
+    for at, h in type_headers.items():
+        constraints.append(('%s_type' % at, 'id'))
+        if 'label' in h:
+            indexes.append(('%s_type' % at, 'label_insensitive'))
+        for x in h:
+            if x != 'id':
+                indexes.append(('%s_type' % at, x))
+    corpus_context.schema.ensure(constraints, indexes)
     for at, h in type_headers.items():
         path = os.path.join(corpus_context.config.temporary_directory('csv'),
                             '{}_type.csv'.format(at))
-        # If on the Docker version, the files live in /site/proj
-        if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-            type_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-        else:
-            type_path = 'file:///{}'.format(make_path_safe(path))
-        try:
-            corpus_context.execute_cypher('CREATE CONSTRAINT FOR (node:%s_type) REQUIRE node.id IS UNIQUE' % at)
-        except neo4j.exceptions.ClientError as e:
-            if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                raise
 
         properties = []
         for x in h:
             properties.append(prop_temp.format(name=x))
         if 'label' in h:
             properties.append('label_insensitive: toLower(csvLine.label)')
-            try:
-                corpus_context.execute_cypher('CREATE INDEX FOR (n:%s_type) ON (n.label_insensitive)' % at)
-            except neo4j.exceptions.ClientError as e:
-                if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                    raise
-        for x in h:
-            if x != 'id':
-                try:
-                    corpus_context.execute_cypher('CREATE INDEX FOR (n:%s_type) ON (n.%s)' % (at, x))
-                except neo4j.exceptions.ClientError as e:
-                    if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                        raise
         if properties:
             type_prop_string = ', '.join(properties)
         else:
             type_prop_string = ''
         type_import_statement = '''
-        CALL {{
-            LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-            MERGE (n:{annotation_type}_type:{corpus_name} {{ {type_property_string} }})
-        }} IN TRANSACTIONS OF 2000 ROWS
+        MERGE (n:{annotation_type}_type:{corpus_name} {{ {type_property_string} }})
         '''
-        kwargs = {'path': type_path, 'annotation_type': at,
+        kwargs = {'annotation_type': at,
                 'type_property_string': type_prop_string,
                 'corpus_name': corpus_context.cypher_safe_name}
         statement = type_import_statement.format(**kwargs)
         log.info('Loading {} types...'.format(at))
         begin = time.time()
         try:
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 2000)
         except:
             raise
         finally:
             #    with open(path, 'w'):
             #        pass
-            os.remove(path)
+            transport.remove(path)
 
         log.info('Finished loading {} types!'.format(at))
         log.debug('{} type loading took: {} seconds.'.format(at, time.time() - begin))
@@ -107,159 +89,149 @@ def import_csvs(corpus_context, speakers, token_headers, hierarchy, call_back=No
     initial_begin = time.time()
 
     prop_temp = '''{name}: csvLine.{name}'''
+    set_temp = '''t.{name} = csvLine.{name}'''
 
     directory = corpus_context.config.temporary_directory('csv')
+    transport = get_import_transport(corpus_context)
     annotation_types = hierarchy.highest_to_lowest
     if call_back is not None:
         call_back('Importing data...')
-        call_back(0, len(speakers) * len(annotation_types))
-        cur = 0
     statements = []
 
-    def _unique_function(tx, at):
-        tx.run('CREATE CONSTRAINT FOR (node:%s) REQUIRE node.id IS UNIQUE' % at)
-
-    def _prop_index(tx, at, prop):
-        tx.run('CREATE INDEX FOR (n:%s) ON (n.%s)' % (at, prop))
-
-    def _label_index(tx, at):
-        tx.run('CREATE INDEX FOR (n:%s) ON (n.label_insensitive)' % at)
-
-    def _begin_index(tx, at):
-        tx.run('CREATE INDEX FOR (n:%s) ON (n.begin)' % at)
-
-    def _end_index(tx, at):
-        tx.run('CREATE INDEX FOR (n:%s) ON (n.end)' % at)
+    constraints = []
+    indexes = []
+    for at in annotation_types:
+        if not any(transport.exists(os.path.join(directory, '{}_{}.csv'.format(re.sub(r'\W', '_', s), at)))
+                   for s in speakers):
+            continue
+        constraints.append((at, 'id'))
+        for x in token_headers[at]:
+            if x in ['type_id', 'id', 'previous_id', 'speaker', 'discourse', 'begin', 'end']:
+                continue
+            indexes.append((at, x))
+        if 'label' in token_headers[at]:
+            indexes.append((at, 'label_insensitive'))
+        indexes.append((at, 'begin'))
+        indexes.append((at, 'end'))
+    for k, v in hierarchy.subannotations.items():
+        for s in v:
+            constraints.append((s, 'id'))
+    corpus_context.schema.ensure(constraints, indexes)
 
-    with corpus_context.graph_driver.session() as session:
-        for i, s in enumerate(speakers):
-            speaker_statements = []
-            for at in annotation_types:
-                if stop_check is not None and stop_check():
-                    return
-                if call_back is not None:
-                    call_back(cur)
-                    cur += 1
-                path = os.path.join(directory, '{}_{}.csv'.format(re.sub(r'\W', '_', s), at))
-                if not os.path.exists(path):  # Already imported
+    for i, s in enumerate(speakers):
+        speaker_statements = []
+        for at in annotation_types:
+            if stop_check is not None and stop_check():
+                return
+            path = os.path.join(directory, '{}_{}.csv'.format(re.sub(r'\W', '_', s), at))
+            if not transport.exists(path):  # Already imported
+                continue
+            properties = []
+            set_properties = []
+
+            for x in token_headers[at]:
+                if x in ['type_id', 'id', 'previous_id', 'speaker', 'discourse', 'begin', 'end']:
                     continue
-                # If on the Docker version, the files live in /site/proj
-                if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-                    rel_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-                else:
-                    rel_path = 'file:///{}'.format(make_path_safe(path))
-                try:
-                    session.execute_write(_unique_function, at)
-                except neo4j.exceptions.ClientError as e:
-                    if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                        raise
-
-                properties = []
+                properties.append(prop_temp.format(name=x))
+                set_properties.append(set_temp.format(name=x))
+            if 'label' in token_headers[at]:
+                properties.append('label_insensitive: toLower(csvLine.label)')
+                set_properties.append('t.label_insensitive = toLower(csvLine.label)')
+            st = hierarchy[at]
+            if properties:
+                token_prop_string = ', ' + ', '.join(properties)
+                token_set_string = ', ' + ', '.join(set_properties)
+            else:
+                token_prop_string = ''
+                token_set_string = ''
+            node_import_statement = '''
+            CREATE (t:{annotation_type}:{corpus_name}:speech {{
+                id: csvLine.id, 
+                begin: toFloat(csvLine.begin),
+                end: toFloat(csvLine.end){token_property_string} 
+            }})
+            '''
+            # Retries must not duplicate nodes from batches that were committed before the failure
+            node_retry_statement = '''
+            MERGE (t:{annotation_type}:{corpus_name}:speech {{id: csvLine.id}})
+            ON CREATE SET t.begin = toFloat(csvLine.begin),
+                t.end = toFloat(csvLine.end){token_set_string}
+            '''
 
-                for x in token_headers[at]:
-                    if x in ['type_id', 'id', 'previous_id', 'speaker', 'discourse', 'begin', 'end']:
-                        continue
-                    properties.append(prop_temp.format(name=x))
-                    try:
-                        session.execute_write(_prop_index, at, x)
-                    except neo4j.exceptions.ClientError as e:
-                        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                            raise
-                if 'label' in token_headers[at]:
-                    properties.append('label_insensitive: toLower(csvLine.label)')
-                    try:
-                        session.execute_write(_label_index, at)
-                    except neo4j.exceptions.ClientError as e:
-                        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                            raise
-                st = hierarchy[at]
-                if properties:
-                    token_prop_string = ', ' + ', '.join(properties)
-                else:
-                    token_prop_string = ''
-                node_import_statement = '''
-                CALL {{
-                    LOAD CSV WITH HEADERS FROM '{path}' AS csvLine
-                    CREATE (t:{annotation_type}:{corpus_name}:speech {{
-                        id: csvLine.id, 
-                        begin: toFloat(csvLine.begin),
-                        end: toFloat(csvLine.end){token_property_string} 
-                    }})
-                }} IN TRANSACTIONS OF 2000 ROWS
-                '''
+            node_kwargs = {'annotation_type': at,
+                           'token_property_string': token_prop_string,
+                           'token_set_string': token_set_string,
+                           'corpus_name': corpus_context.cypher_safe_name}
+            if st is not None:
+                rel_import_statement = '''
+                MATCH (n:{annotation_type}_type:{corpus_name} {{id: csvLine.type_id}}), (super:{stype}:{corpus_name} {{id: csvLine.{stype}}}),
+                (d:Discourse:{corpus_name} {{name: csvLine.discourse}}),
+                (s:Speaker:{corpus_name} {{name: csvLine.speaker}}),
+                (t:{annotation_type}:{corpus_name}:speech {{id: csvLine.id}})
+                {create} (t)-[:is_a]->(n){sep}
+                    (t)-[:contained_by]->(super){sep}
+                    (t)-[:spoken_in]->(d){sep}
+                    (t)-[:spoken_by]->(s)
+                WITH t, csvLine
+                MATCH (p:{annotation_type}:{corpus_name}:speech {{id: csvLine.previous_id}})
+                    {create} (p)-[:precedes]->(t)'''
+                rel_kwargs = {'annotation_type': at,
+                              'corpus_name': corpus_context.cypher_safe_name,
+                              'stype': st}
+            else:
 
-                node_kwargs = {'path': rel_path, 'annotation_type': at,
-                               'token_property_string': token_prop_string,
-                               'corpus_name': corpus_context.cypher_safe_name}
-                if st is not None:
-                    rel_import_statement = '''
-                    CALL{{
-                        LOAD CSV WITH HEADERS FROM '{path}' AS csvLine
-                        MATCH (n:{annotation_type}_type:{corpus_name} {{id: csvLine.type_id}}), (super:{stype}:{corpus_name} {{id: csvLine.{stype}}}),
-                        (d:Discourse:{corpus_name} {{name: csvLine.discourse}}),
-                        (s:Speaker:{corpus_name} {{name: csvLine.speaker}}),
+                rel_import_statement = '''
+                MATCH (n:{annotation_type}_type:{corpus_name} {{id: csvLine.type_id}}),
+                (d:Discourse:{corpus_name} {{name: csvLine.discourse}}),
+                (s:Speaker:{corpus_name} {{ name: csvLine.speaker}}),
                         (t:{annotation_type}:{corpus_name}:speech {{id: csvLine.id}})
-                        CREATE (t)-[:is_a]->(n),
-                            (t)-[:contained_by]->(super),
-                            (t)-[:spoken_in]->(d),
-                            (t)-[:spoken_by]->(s)
-                        WITH t, csvLine
-                        MATCH (p:{annotation_type}:{corpus_name}:speech {{id: csvLine.previous_id}})
-                            CREATE (p)-[:precedes]->(t)
-                    }} IN TRANSACTIONS OF 2000 ROWS'''
-                    rel_kwargs = {'path': rel_path, 'annotation_type': at,
-                                  'corpus_name': corpus_context.cypher_safe_name,
-                                  'stype': st}
-                else:
-
-                    rel_import_statement = '''
-                    CALL{{
-                        LOAD CSV WITH HEADERS FROM '{path}' AS csvLine
-                        MATCH (n:{annotation_type}_type:{corpus_name} {{id: csvLine.type_id}}),
-                        (d:Discourse:{corpus_name} {{name: csvLine.discourse}}),
-                        (s:Speaker:{corpus_name} {{ name: csvLine.speaker}}),
-                                (t:{annotation_type}:{corpus_name}:speech {{id: csvLine.id}})
-                        CREATE (t)-[:is_a]->(n),
-                                (t)-[:spoken_in]->(d),
-                                (t)-[:spoken_by]->(s)
-                            WITH t, csvLine
-                            MATCH (p:{annotation_type}:{corpus_name}:speech {{id: csvLine.previous_id}})
-                                CREATE (p)-[:precedes]->(t)
-                    }} IN TRANSACTIONS OF 2000 ROWS'''
-                    rel_kwargs = {'path': rel_path, 'annotation_type': at,
-                                  'corpus_name': corpus_context.cypher_safe_name}
-                node_statement = node_import_statement.format(**node_kwargs)
-                rel_statement = rel_import_statement.format(**rel_kwargs)
-                speaker_statements.append((node_statement, rel_statement, path, at, s))
-                begin = time.time()
-                try:
-                    session.execute_write(_begin_index, at)
-                except neo4j.exceptions.ClientError as e:
-                    if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                        raise
-                try:
-                    session.execute_write(_end_index, at)
-                except neo4j.exceptions.ClientError as e:
-                    if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                        raise
+                {create} (t)-[:is_a]->(n){sep}
+                        (t)-[:spoken_in]->(d){sep}
+                        (t)-[:spoken_by]->(s)
+                    WITH t, csvLine
+                    MATCH (p:{annotation_type}:{corpus_name}:speech {{id: csvLine.previous_id}})
+                        {create} (p)-[:precedes]->(t)'''
+                rel_kwargs = {'annotation_type': at,
+                              'corpus_name': corpus_context.cypher_safe_name}
+            node_statement = node_import_statement.format(**node_kwargs)
+            node_retry = node_retry_statement.format(**node_kwargs)
+            rel_statement = rel_import_statement.format(create='CREATE', sep=',', **rel_kwargs)
+            rel_retry = rel_import_statement.format(create='MERGE', sep='\n                        MERGE',
+                                                    **rel_kwargs)
+            speaker_statements.append((node_statement, rel_statement, path, at, s, node_retry, rel_retry))
+        if speaker_statements:
             statements.append(speaker_statements)
 
-    for i, speaker_statements in enumerate(statements):
+    def _speaker_imported(num_imported, speaker):
         if call_back is not None:
-            call_back('Importing data for speaker {} of {} ({})...'.format(i, len(statements), speaker_statements[0][4]))
-        for s in speaker_statements:
-            log.info('Loading {} relationships...'.format(s[3]))
+            call_back('Imported data for speaker {} of {} ({})...'.format(num_imported, len(statements), speaker))
+            call_back(num_imported)
+
+    if call_back is not None:
+        call_back('Importing data for {} speakers...'.format(len(statements)))
+        call_back(0, len(statements))
+    num_workers = corpus_context.config.import_workers
+    if num_workers is None or num_workers <= 1:
+        for i, speaker_statements in enumerate(statements):
+            _load_speaker_csvs(corpus_context, speaker_statements)
+            _speaker_imported(i + 1, speaker_statements[0][4])
+            if stop_check is not None and stop_check():
+                return
+    else:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = {executor.submit(_load_speaker_csvs, corpus_context, x): x[0][4] for x in statements}
             try:
-                corpus_context.execute_cypher(s[0])
-                corpus_context.execute_cypher(s[1])
-            except:
+                for i, f in enumerate(as_completed(futures)):
+                    f.result()
+                    _speaker_imported(i + 1, futures[f])
+                    if stop_check is not None and stop_check():
+                        for x in futures:
+                            x.cancel()
+                        return
+            except BaseException:
+                for x in futures:
+                    x.cancel()
                 raise
-            finally:
-                # with open(path, 'w'):
-                #    pass
-                os.remove(s[2])
-            log.info('Finished loading {} relationships for speaker {}!'.format(s[3], s[4]))
-            log.debug('{} relationships loading took: {} seconds.'.format(s[3], time.time() - begin))
 
     log.info('Finished importing into the graph database!')
     log.debug('Graph importing took: {} seconds'.format(time.time() - initial_begin))
@@ -268,44 +240,76 @@ def import_csvs(corpus_context, speakers, token_headers, hierarchy, call_back=No
         for k, v in hierarchy.subannotations.items():
             for s in v:
                 path = os.path.join(directory, '{}_{}_{}.csv'.format(re.sub(r'\W', '_', sp), k, s))
-                try:
-                    corpus_context.execute_cypher('CREATE CONSTRAINT FOR (node:%s) REQUIRE node.id IS UNIQUE' % s)
-                except neo4j.exceptions.ClientError as e:
-                    if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                        raise
-                # If on the Docker version, the files live in /site/proj
-                if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-                    sub_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-                else:
-                    sub_path = 'file:///{}'.format(make_path_safe(path))
+                if not transport.exists(path):  # Already imported
+                    continue
 
                 rel_import_statement = '''
-                CALL {{
-                    LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                    MATCH (n:{annotation_type} {{id: csvLine.annotation_id}})
-                    CREATE (t:{subannotation_type}:{corpus_name}:speech {{
-                        id: csvLine.id, 
-                        type: $subannotation_type, 
-                        begin: toFloat(csvLine.begin),
-                        end: toFloat(csvLine.end), 
-                        label: CASE csvLine.label WHEN NULL THEN '' ELSE csvLine.label END
-                    }})
-                    CREATE (t)-[:annotates]->(n)
-                }} IN TRANSACTIONS OF 1000 ROWS
+                MATCH (n:{annotation_type} {{id: csvLine.annotation_id}})
+                CREATE (t:{subannotation_type}:{corpus_name}:speech {{
+                    id: csvLine.id, 
+                    type: $subannotation_type, 
+                    begin: toFloat(csvLine.begin),
+                    end: toFloat(csvLine.end), 
+                    label: CASE csvLine.label WHEN NULL THEN '' ELSE csvLine.label END
+                }})
+                CREATE (t)-[:annotates]->(n)
                 '''
 
-                kwargs = {'path': sub_path, 'annotation_type': k,
+                kwargs = {'annotation_type': k,
                           'subannotation_type': s,
                           'corpus_name': corpus_context.cypher_safe_name}
                 statement = rel_import_statement.format(**kwargs)
                 try:
-                    corpus_context.execute_cypher(statement, subannotation_type=s)
+                    transport.execute(statement, path, 1000, subannotation_type=s)
                 except:
                     raise
                 finally:
                     # with open(path, 'w'):
                     #    pass
-                    os.remove(path)
+                    transport.remove(path)
+
+
+def _load_speaker_csvs(corpus_context, speaker_statements):
+    """
+    Runs the node and relationship import statements for a single speaker,
+    removing each set of rows once it has been loaded
+
+    Transient failures (deadlocks, lost connections) are retried up to
+    ``IMPORT_RETRY_LIMIT`` times using MERGE versions of the statements, so
+    that rows committed before the failure are not duplicated
+
+    Parameters
+    ----------
+    corpus_context: :class:`~polyglotdb.corpus.importable.ImportContext`
+        the corpus to load into
+    speaker_statements : list
+        Tuples of node statement, relationship statement, CSV path, annotation type, speaker,
+        node retry statement and relationship retry statement
+    """
+    log = logging.getLogger('{}_loading'.format(corpus_context.corpus_name))
+    transport = get_import_transport(corpus_context)
+    retry_errors = (neo4j.exceptions.TransientError, neo4j.exceptions.ServiceUnavailable,
+                    neo4j.exceptions.SessionExpired)
+    for s in speaker_statements:
+        log.info('Loading {} relationships...'.format(s[3]))
+        begin = time.time()
+        try:
+            for statement, retry_statement in [(s[0], s[5]), (s[1], s[6])]:
+                attempt = 0
+                while True:
+                    try:
+                        transport.execute(statement if attempt == 0 else retry_statement, s[2], 2000)
+                        break
+                    except retry_errors as e:
+                        attempt += 1
+                        if attempt > IMPORT_RETRY_LIMIT:
+                            raise
+                        log.warning('Retrying {} import for speaker {} after error: {}'.format(s[3], s[4], e))
+                        time.sleep(2 ** (attempt - 1))
+        finally:
+            transport.remove(s[2])
+        log.info('Finished loading {} relationships for speaker {}!'.format(s[3], s[4]))
+        log.debug('{} relationships loading took: {} seconds.'.format(s[3], time.time() - begin))
 
 
 def import_lexicon_csvs(corpus_context, typed_data, case_sensitive=False):
@@ -370,12 +374,7 @@ def import_lexicon_csvs(corpus_context, typed_data, case_sensitive=False):
                                         word_type=corpus_context.word_name,
                                         new_properties=properties)
     corpus_context.execute_cypher(statement)
-    for h, v in typed_data.items():
-        try:
-            corpus_context.execute_cypher('CREATE INDEX FOR (n:%s) ON (n.%s)' % (corpus_context.word_name, h))
-        except neo4j.exceptions.ClientError as e:
-            if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                raise
+    corpus_context.schema.ensure(indexes=[(corpus_context.word_name, h) for h in typed_data])
     os.remove(path)
 
 
@@ -425,12 +424,7 @@ def import_feature_csvs(corpus_context, typed_data):
                                         phone_type=corpus_context.phone_name,
                                         new_properties=properties)
     corpus_context.execute_cypher(statement)
-    for h, v in typed_data.items():
-        try:
-            corpus_context.execute_cypher('CREATE INDEX FOR (n:%s) ON (n.%s)' % (corpus_context.phone_name, h))
-        except neo4j.exceptions.ClientError as e:
-            if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                raise
+    corpus_context.schema.ensure(indexes=[(corpus_context.phone_name, h) for h in typed_data])
     os.remove(path)
 
 
@@ -480,12 +474,7 @@ def import_syllable_enrichment_csvs(corpus_context, typed_data):
                                         phone_type="syllable",
                                         new_properties=properties)
     corpus_context.execute_cypher(statement)
-    for h, v in typed_data.items():
-        try:
-            corpus_context.execute_cypher('CREATE INDEX FOR (n:%s) ON (n.%s)' % ("syllable", h))
-        except neo4j.exceptions.ClientError as e:
-            if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                raise
+    corpus_context.schema.ensure(indexes=[("syllable", h) for h in typed_data])
 
 
 def import_utterance_enrichment_csvs(corpus_context, typed_data):
@@ -534,12 +523,7 @@ def import_utterance_enrichment_csvs(corpus_context, typed_data):
                                         phone_type="syllable",
                                         new_properties=properties)
     corpus_context.execute_cypher(statement)
-    for h, v in typed_data.items():
-        try:
-            corpus_context.execute_cypher('CREATE INDEX FOR (n:%s) ON (n.%s)' % ("utterance", h))
-        except neo4j.exceptions.ClientError as e:
-            if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                raise
+    corpus_context.schema.ensure(indexes=[("utterance", h) for h in typed_data])
 
 
 def import_speaker_csvs(corpus_context, typed_data):
@@ -587,12 +571,7 @@ def import_speaker_csvs(corpus_context, typed_data):
                                         corpus_name=corpus_context.cypher_safe_name,
                                         new_properties=properties)
     corpus_context.execute_cypher(statement)
-    for h, v in typed_data.items():
-        try:
-            corpus_context.execute_cypher('CREATE INDEX FOR (s:Speaker) ON (s.%s)' % h)
-        except neo4j.exceptions.ClientError as e:
-            if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                raise
+    corpus_context.schema.ensure(indexes=[('Speaker', h) for h in typed_data])
     os.remove(path)
 
 
@@ -641,12 +620,7 @@ def import_discourse_csvs(corpus_context, typed_data):
                                         corpus_name=corpus_context.cypher_safe_name,
                                         new_properties=properties)
     corpus_context.execute_cypher(statement)
-    for h, v in typed_data.items():
-        try:
-            corpus_context.execute_cypher('CREATE INDEX FOR (d:Discourse) ON (d.%s)' % h)
-        except neo4j.exceptions.ClientError as e:
-            if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                raise
+    corpus_context.schema.ensure(indexes=[('Discourse', h) for h in typed_data])
     os.remove(path)
 
 
@@ -663,14 +637,11 @@ def import_utterance_csv(corpus_context, call_back=None, stop_check=None):
     """
     import time
     speakers = corpus_context.speakers
+    transport = get_import_transport(corpus_context)
     if call_back is not None:
         call_back('Importing data...')
         call_back(0, len(speakers))
-    try:
-        corpus_context.execute_cypher('CREATE CONSTRAINT FOR (node:utterance) REQUIRE node.id IS UNIQUE')
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
+    corpus_context.schema.ensure(constraints=[('utterance', 'id')])
     for i, s in enumerate(speakers):
         discourses = corpus_context.get_discourses_of_speaker(s)
         for d in discourses:
@@ -684,90 +655,68 @@ def import_utterance_csv(corpus_context, call_back=None, stop_check=None):
             if corpus_context.config.debug:
                 print('Importing utterances for speaker {} in discourse {}, using import file {}'.format(s, d, path))
 
-            # If on the Docker version, the files live in /site/proj
-            if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-                csv_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-            else:
-                csv_path = 'file:///{}'.format(make_path_safe(path))
-
             begin = time.time()
             node_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MATCH (begin:{word_type}:{corpus}:speech {{id: csvLine.begin_word_id}}),
-                    (end:{word_type}:{corpus}:speech {{id: csvLine.end_word_id}})
-                WITH csvLine, begin, end
-                CREATE (utt:utterance:{corpus}:speech {{
-                    id: csvLine.id, 
-                    begin: begin.begin, 
-                    end: end.end
-                }})-[:is_a]->(u_type:utterance_type:{corpus})
-            }} IN TRANSACTIONS OF 1000 ROWS
+            MATCH (begin:{word_type}:{corpus}:speech {{id: csvLine.begin_word_id}}),
+                (end:{word_type}:{corpus}:speech {{id: csvLine.end_word_id}})
+            WITH csvLine, begin, end
+            CREATE (utt:utterance:{corpus}:speech {{
+                id: csvLine.id, 
+                begin: begin.begin, 
+                end: end.end
+            }})-[:is_a]->(u_type:utterance_type:{corpus})
             '''
 
-            statement = node_statement.format(path=csv_path,
-                                              corpus=corpus_context.cypher_safe_name,
+            statement = node_statement.format(corpus=corpus_context.cypher_safe_name,
                                               word_type=corpus_context.word_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 1000)
             if corpus_context.config.debug:
                 print('Utterance node creation took {} seconds.'.format(time.time() - begin))
 
             begin = time.time()
             rel_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MATCH (d:Discourse:{corpus})<-[:spoken_in]-(begin:{word_type}:{corpus}:speech {{id: csvLine.begin_word_id}})-[:spoken_by]->(s:Speaker:{corpus}),
-                    (utt:utterance:{corpus}:speech {{id: csvLine.id}})
-                CREATE
-                    (d)<-[:spoken_in]-(utt),
-                    (s)<-[:spoken_by]-(utt)
-            }} IN TRANSACTIONS OF 1000 ROWS
+            MATCH (d:Discourse:{corpus})<-[:spoken_in]-(begin:{word_type}:{corpus}:speech {{id: csvLine.begin_word_id}})-[:spoken_by]->(s:Speaker:{corpus}),
+                (utt:utterance:{corpus}:speech {{id: csvLine.id}})
+            CREATE
+                (d)<-[:spoken_in]-(utt),
+                (s)<-[:spoken_by]-(utt)
             '''
 
-            statement = rel_statement.format(path=csv_path,
-                                             corpus=corpus_context.cypher_safe_name,
+            statement = rel_statement.format(corpus=corpus_context.cypher_safe_name,
                                              word_type=corpus_context.word_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 1000)
             if corpus_context.config.debug:
                 print('Spoken relationship creation took {} seconds.'.format(time.time() - begin))
 
             begin = time.time()
             rel_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MATCH (begin:{word_type}:{corpus}:speech {{id: csvLine.begin_word_id}}),
-                    (utt:utterance:{corpus}:speech {{id: csvLine.id}}),
-                    (prev:utterance {{id: csvLine.prev_id}})
-                CREATE (prev)-[:precedes]->(utt)
-            }} IN TRANSACTIONS OF 1000 ROWS
+            MATCH (begin:{word_type}:{corpus}:speech {{id: csvLine.begin_word_id}}),
+                (utt:utterance:{corpus}:speech {{id: csvLine.id}}),
+                (prev:utterance {{id: csvLine.prev_id}})
+            CREATE (prev)-[:precedes]->(utt)
             '''
-            statement = rel_statement.format(path=csv_path,
-                                             corpus=corpus_context.cypher_safe_name,
+            statement = rel_statement.format(corpus=corpus_context.cypher_safe_name,
                                              word_type=corpus_context.word_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 1000)
             if corpus_context.config.debug:
                 print('Precedence relationship creation took {} seconds.'.format(time.time() - begin))
 
             begin = time.time()
             word_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MATCH (begin:{word_type}:{corpus}:speech {{id: csvLine.begin_word_id}}),
-                    (utt:utterance:{corpus}:speech {{id: csvLine.id}}),
-                    (end:{word_type}:{corpus}:speech {{id: csvLine.end_word_id}}),
-                    path = shortestPath((begin)-[:precedes*0..]->(end))
-                WITH utt, nodes(path) AS words
-                UNWIND words AS w
-                CREATE (w)-[:contained_by]->(utt)
-            }} IN TRANSACTIONS OF 1000 ROWS
+            MATCH (begin:{word_type}:{corpus}:speech {{id: csvLine.begin_word_id}}),
+                (utt:utterance:{corpus}:speech {{id: csvLine.id}}),
+                (end:{word_type}:{corpus}:speech {{id: csvLine.end_word_id}}),
+                path = shortestPath((begin)-[:precedes*0..]->(end))
+            WITH utt, nodes(path) AS words
+            UNWIND words AS w
+            CREATE (w)-[:contained_by]->(utt)
             '''
-            statement = word_statement.format(path=csv_path,
-                                              corpus=corpus_context.cypher_safe_name,
+            statement = word_statement.format(corpus=corpus_context.cypher_safe_name,
                                               word_type=corpus_context.word_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 1000)
             if corpus_context.config.debug:
                 print('Hierarchical relationship creation took {} seconds.'.format(time.time() - begin))
-            os.remove(path)
+            transport.remove(path)
 
 
 def import_syllable_csv(corpus_context, call_back=None, stop_check=None):
@@ -781,44 +730,13 @@ def import_syllable_csv(corpus_context, call_back=None, stop_check=None):
     """
     import time
     speakers = corpus_context.speakers
+    transport = get_import_transport(corpus_context)
     if call_back is not None:
         call_back('Importing syllables...')
         call_back(0, len(speakers))
-    try:
-        corpus_context.execute_cypher('CREATE CONSTRAINT FOR (node:syllable) REQUIRE node.id IS UNIQUE')
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
-    try:
-        corpus_context.execute_cypher('CREATE CONSTRAINT FOR (node:syllable_type) REQUIRE node.id IS UNIQUE')
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
-    try:
-        corpus_context.execute_cypher('CREATE INDEX FOR (s:syllable) ON (s.begin)')
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
-    try:
-        corpus_context.execute_cypher('CREATE INDEX FOR (s:syllable) ON (s.prev_id)')
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
-    try:
-        corpus_context.execute_cypher('CREATE INDEX FOR (s:syllable) ON (s.end)')
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
-    try:
-        corpus_context.execute_cypher('CREATE INDEX FOR (s:syllable) ON (s.label)')
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
-    try:
-        corpus_context.execute_cypher('CREATE INDEX FOR (s:syllable_type) ON (s.label)')
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
+    corpus_context.schema.ensure(constraints=[('syllable', 'id'), ('syllable_type', 'id')],
+                                 indexes=[('syllable', 'begin'), ('syllable', 'prev_id'), ('syllable', 'end'),
+                                          ('syllable', 'label'), ('syllable_type', 'label')])
     for i, s in enumerate(speakers):
         if stop_check is not None and stop_check():
             return
@@ -831,179 +749,142 @@ def import_syllable_csv(corpus_context, call_back=None, stop_check=None):
                                 '{}_{}_syllable.csv'.format(re.sub(r'\W', '_', s), d))
             if corpus_context.config.debug:
                 print('Importing syllables for speaker {} in discourse {}, using import file {}'.format(s, d, path))
-            # If on the Docker version, the files live in /site/proj
-            if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-                csv_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-            else:
-                csv_path = 'file:///{}'.format(make_path_safe(path))
 
             begin = time.time()
             nucleus_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MATCH (n:{phone_name}:{corpus}:speech {{id: csvLine.vowel_id}})-[r:contained_by]->(w:{word_name}:{corpus}:speech)
-                SET n :nucleus, n.syllable_position = 'nucleus'
-            }} IN TRANSACTIONS OF 2000 ROWS
+            MATCH (n:{phone_name}:{corpus}:speech {{id: csvLine.vowel_id}})-[r:contained_by]->(w:{word_name}:{corpus}:speech)
+            SET n :nucleus, n.syllable_position = 'nucleus'
             '''
-            statement = nucleus_statement.format(path=csv_path,
-                                                 corpus=corpus_context.cypher_safe_name,
+            statement = nucleus_statement.format(corpus=corpus_context.cypher_safe_name,
                                                  word_name=corpus_context.word_name,
                                                  phone_name=corpus_context.phone_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 2000)
             if corpus_context.config.debug:
                 print('Nucleus definition took {} seconds.'.format(time.time() - begin))
 
             begin = time.time()
             node_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MERGE (s_type:syllable_type:{corpus} {{id: csvLine.type_id}})
-                ON CREATE SET s_type.label = csvLine.label
-                WITH s_type, csvLine
-                CREATE (s:syllable:{corpus}:speech {{
-                    id: csvLine.id, 
-                    prev_id: csvLine.prev_id,
-                    label: csvLine.label,
-                    begin: toFloat(csvLine.begin), 
-                    end: toFloat(csvLine.end)
-                }}),
-                (s)-[:is_a]->(s_type)
-            }} IN TRANSACTIONS OF 2000 ROWS
+            MERGE (s_type:syllable_type:{corpus} {{id: csvLine.type_id}})
+            ON CREATE SET s_type.label = csvLine.label
+            WITH s_type, csvLine
+            CREATE (s:syllable:{corpus}:speech {{
+                id: csvLine.id, 
+                prev_id: csvLine.prev_id,
+                label: csvLine.label,
+                begin: toFloat(csvLine.begin), 
+                end: toFloat(csvLine.end)
+            }}),
+            (s)-[:is_a]->(s_type)
             '''
-            statement = node_statement.format(path=csv_path,
-                                              corpus=corpus_context.cypher_safe_name)
-            corpus_context.execute_cypher(statement)
+            statement = node_statement.format(corpus=corpus_context.cypher_safe_name)
+            transport.execute(statement, path, 2000)
             if corpus_context.config.debug:
                 print('Syllable node creation took {} seconds.'.format(time.time() - begin))
 
             begin = time.time()
             rel_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MATCH (n:{phone_name}:{corpus}:speech:nucleus {{id: csvLine.vowel_id}})-[:contained_by]->(w:{word_name}:{corpus}:speech),
-                    (s:syllable:{corpus}:speech {{id: csvLine.id}})
-                WITH n, w, s
-                CREATE (s)-[:contained_by]->(w),
-                    (n)-[:contained_by]->(s)
-            }} IN TRANSACTIONS OF 2000 ROWS
+            MATCH (n:{phone_name}:{corpus}:speech:nucleus {{id: csvLine.vowel_id}})-[:contained_by]->(w:{word_name}:{corpus}:speech),
+                (s:syllable:{corpus}:speech {{id: csvLine.id}})
+            WITH n, w, s
+            CREATE (s)-[:contained_by]->(w),
+                (n)-[:contained_by]->(s)
             '''
-            statement = rel_statement.format(path=csv_path,
-                                             corpus=corpus_context.cypher_safe_name,
+            statement = rel_statement.format(corpus=corpus_context.cypher_safe_name,
                                              word_name=corpus_context.word_name,
                                              phone_name=corpus_context.phone_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 2000)
             if corpus_context.config.debug:
                 print('Hierarchical relationship creation took {} seconds.'.format(time.time() - begin))
 
             begin = time.time()
             rel_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MATCH (n:{phone_name}:{corpus}:speech:nucleus {{id: csvLine.vowel_id}}),
-                    (s:syllable:{corpus}:speech {{id: csvLine.id}}),
-                    (n)-[:spoken_by]->(sp:Speaker),
-                    (n)-[:spoken_in]->(d:Discourse)
-                WITH sp, d, s
-                CREATE (s)-[:spoken_by]->(sp),
-                    (s)-[:spoken_in]->(d)
-            }} IN TRANSACTIONS OF 2000 ROWS
+            MATCH (n:{phone_name}:{corpus}:speech:nucleus {{id: csvLine.vowel_id}}),
+                (s:syllable:{corpus}:speech {{id: csvLine.id}}),
+                (n)-[:spoken_by]->(sp:Speaker),
+                (n)-[:spoken_in]->(d:Discourse)
+            WITH sp, d, s
+            CREATE (s)-[:spoken_by]->(sp),
+                (s)-[:spoken_in]->(d)
             '''
-            statement = rel_statement.format(path=csv_path,
-                                             corpus=corpus_context.cypher_safe_name,
+            statement = rel_statement.format(corpus=corpus_context.cypher_safe_name,
                                              word_name=corpus_context.word_name,
                                              phone_name=corpus_context.phone_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 2000)
             if corpus_context.config.debug:
                 print('Spoken relationship creation took {} seconds.'.format(time.time() - begin))
 
             begin = time.time()
             prev_rel_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MATCH (s:syllable:{corpus}:speech {{id: csvLine.id}})
-                WITH csvLine, s
-                MATCH (prev:syllable {{id: csvLine.prev_id}})
-                CREATE (prev)-[:precedes]->(s)
-            }} IN TRANSACTIONS OF 2000 ROWS
+            MATCH (s:syllable:{corpus}:speech {{id: csvLine.id}})
+            WITH csvLine, s
+            MATCH (prev:syllable {{id: csvLine.prev_id}})
+            CREATE (prev)-[:precedes]->(s)
             '''
-            statement = prev_rel_statement.format(path=csv_path,
-                                                  corpus=corpus_context.cypher_safe_name,
+            statement = prev_rel_statement.format(corpus=corpus_context.cypher_safe_name,
                                                   word_name=corpus_context.word_name,
                                                   phone_name=corpus_context.phone_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 2000)
             if corpus_context.config.debug:
                 print('Precedence relationship creation took {} seconds.'.format(time.time() - begin))
 
             begin = time.time()
             del_rel_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MATCH (n:{phone_name}:{corpus}:speech:nucleus {{id: csvLine.vowel_id}})-[r:contained_by]->(w:{word_name}:{corpus}:speech)
-                DELETE r
-            }} IN TRANSACTIONS OF 2000 ROWS
+            MATCH (n:{phone_name}:{corpus}:speech:nucleus {{id: csvLine.vowel_id}})-[r:contained_by]->(w:{word_name}:{corpus}:speech)
+            DELETE r
             '''
-            statement = del_rel_statement.format(path=csv_path,
-                                                 corpus=corpus_context.cypher_safe_name,
+            statement = del_rel_statement.format(corpus=corpus_context.cypher_safe_name,
                                                  word_name=corpus_context.word_name,
                                                  phone_name=corpus_context.phone_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 2000)
             if corpus_context.config.debug:
                 print('Phone-word relationship deletion took {} seconds.'.format(time.time() - begin))
 
             begin = time.time()
             onset_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MATCH (n:{phone_name}:nucleus:{corpus}:speech)-[:contained_by]->(s:syllable:{corpus}:speech {{id: csvLine.id}})-[:contained_by]->(w:{word_name}:{corpus}:speech)
-                WITH csvLine, s, w, n
-                OPTIONAL MATCH
-                    (onset:{phone_name}:{corpus} {{id: csvLine.onset_id}}),
-                    onspath = (onset)-[:precedes*1..10]->(n)
-                WITH n, w, s, csvLine, onspath
-                UNWIND (CASE WHEN onspath IS NOT NULL THEN nodes(onspath)[0..-1] ELSE [NULL] END) AS o
-                OPTIONAL MATCH (o)-[r:contained_by]->(w)
-                WITH n, w, s, csvLine, [x IN collect(o) WHERE x IS NOT NULL | x] AS ons,
-                    [x IN collect(r) WHERE x IS NOT NULL | x] AS rels
-                FOREACH (o IN ons | SET o :onset, o.syllable_position = 'onset')
-                FOREACH (o IN ons | CREATE (o)-[:contained_by]->(s))
-                FOREACH (r IN rels | DELETE r)
-            }} IN TRANSACTIONS OF 2000 ROWS
+            MATCH (n:{phone_name}:nucleus:{corpus}:speech)-[:contained_by]->(s:syllable:{corpus}:speech {{id: csvLine.id}})-[:contained_by]->(w:{word_name}:{corpus}:speech)
+            WITH csvLine, s, w, n
+            OPTIONAL MATCH
+                (onset:{phone_name}:{corpus} {{id: csvLine.onset_id}}),
+                onspath = (onset)-[:precedes*1..10]->(n)
+            WITH n, w, s, csvLine, onspath
+            UNWIND (CASE WHEN onspath IS NOT NULL THEN nodes(onspath)[0..-1] ELSE [NULL] END) AS o
+            OPTIONAL MATCH (o)-[r:contained_by]->(w)
+            WITH n, w, s, csvLine, [x IN collect(o) WHERE x IS NOT NULL | x] AS ons,
+                [x IN collect(r) WHERE x IS NOT NULL | x] AS rels
+            FOREACH (o IN ons | SET o :onset, o.syllable_position = 'onset')
+            FOREACH (o IN ons | CREATE (o)-[:contained_by]->(s))
+            FOREACH (r IN rels | DELETE r)
             '''
-            statement = onset_statement.format(path=csv_path,
-                                               corpus=corpus_context.cypher_safe_name,
+            statement = onset_statement.format(corpus=corpus_context.cypher_safe_name,
                                                word_name=corpus_context.word_name,
                                                phone_name=corpus_context.phone_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 2000)
             if corpus_context.config.debug:
                 print('Onset hierarchical relationship creation took {} seconds.'.format(time.time() - begin))
 
             begin = time.time()
             coda_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MATCH (n:nucleus:{corpus}:speech)-[:contained_by]->(s:syllable:{corpus}:speech {{id: csvLine.id}})-[:contained_by]->(w:{word_name}:{corpus}:speech)
-                WITH csvLine, s, w, n
-                OPTIONAL MATCH
-                    (coda:{phone_name}:{corpus} {{id: csvLine.coda_id}}),
-                    codapath = (n)-[:precedes*1..10]->(coda)
-                WITH n, w, s, codapath
-                UNWIND (CASE WHEN codapath IS NOT NULL THEN nodes(codapath)[1..] ELSE [NULL] END) AS c
-                OPTIONAL MATCH (c)-[r:contained_by]->(w)
-                WITH n, w, s, [x IN collect(c) WHERE x IS NOT NULL | x] AS cod,
-                    [x IN collect(r) WHERE x IS NOT NULL | x] AS rels
-                FOREACH (c IN cod | SET c :coda, c.syllable_position = 'coda')
-                FOREACH (c IN cod | CREATE (c)-[:contained_by]->(s))
-                FOREACH (r IN rels | DELETE r)
-            }} IN TRANSACTIONS OF 2000 ROWS
+            MATCH (n:nucleus:{corpus}:speech)-[:contained_by]->(s:syllable:{corpus}:speech {{id: csvLine.id}})-[:contained_by]->(w:{word_name}:{corpus}:speech)
+            WITH csvLine, s, w, n
+            OPTIONAL MATCH
+                (coda:{phone_name}:{corpus} {{id: csvLine.coda_id}}),
+                codapath = (n)-[:precedes*1..10]->(coda)
+            WITH n, w, s, codapath
+            UNWIND (CASE WHEN codapath IS NOT NULL THEN nodes(codapath)[1..] ELSE [NULL] END) AS c
+            OPTIONAL MATCH (c)-[r:contained_by]->(w)
+            WITH n, w, s, [x IN collect(c) WHERE x IS NOT NULL | x] AS cod,
+                [x IN collect(r) WHERE x IS NOT NULL | x] AS rels
+            FOREACH (c IN cod | SET c :coda, c.syllable_position = 'coda')
+            FOREACH (c IN cod | CREATE (c)-[:contained_by]->(s))
+            FOREACH (r IN rels | DELETE r)
             '''
-            statement = coda_statement.format(path=csv_path,
-                                             corpus=corpus_context.cypher_safe_name,
+            statement = coda_statement.format(corpus=corpus_context.cypher_safe_name,
                                              word_name=corpus_context.word_name,
                                              phone_name=corpus_context.phone_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 2000)
             if corpus_context.config.debug:
                 print('Coda hierarchical relationship creation took {} seconds.'.format(time.time() - begin))
-            os.remove(path)
+            transport.remove(path)
 
 
 def import_nonsyl_csv(corpus_context, call_back=None, stop_check=None):
@@ -1019,39 +900,13 @@ def import_nonsyl_csv(corpus_context, call_back=None, stop_check=None):
     """
     import time
     speakers = corpus_context.speakers
+    transport = get_import_transport(corpus_context)
     if call_back is not None:
         call_back('Importing degenerate syllables...')
         call_back(0, len(speakers))
-    try:
-        corpus_context.execute_cypher('CREATE CONSTRAINT FOR (node:syllable) REQUIRE node.id IS UNIQUE')
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
-    try:
-        corpus_context.execute_cypher('CREATE CONSTRAINT FOR (node:syllable_type) REQUIRE node.id IS UNIQUE')
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
-    try:
-        corpus_context.execute_cypher('CREATE INDEX FOR (s:syllable) ON (s.begin)')
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
-    try:
-        corpus_context.execute_cypher('CREATE INDEX FOR (s:syllable) ON (s.end)')
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
-    try:
-        corpus_context.execute_cypher('CREATE INDEX FOR (s:syllable) ON (s.label)')
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
-    try:
-        corpus_context.execute_cypher('CREATE INDEX FOR (s:syllable_type) ON (s.label)')
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
+    corpus_context.schema.ensure(constraints=[('syllable', 'id'), ('syllable_type', 'id')],
+                                 indexes=[('syllable', 'begin'), ('syllable', 'end'), ('syllable', 'label'),
+                                          ('syllable_type', 'label')])
     for i, s in enumerate(speakers):
         if stop_check is not None and stop_check():
             return
@@ -1066,123 +921,98 @@ def import_nonsyl_csv(corpus_context, call_back=None, stop_check=None):
             if corpus_context.config.debug:
                 print('Importing degenerate syllables for speaker {} in discourse {}, using import file {}'.format(s, d,
                                                                                                                    path))
-            # If on the Docker version, the files live in /site/proj
-            if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-                csv_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-            else:
-                csv_path = 'file:///{}'.format(make_path_safe(path))
 
             begin = time.time()
             node_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MERGE (s_type:syllable_type:{corpus} {{id: csvLine.type_id}})
-                ON CREATE SET s_type.label = csvLine.label
-                WITH s_type, csvLine
-                CREATE (s:syllable:{corpus}:speech {{
-                    id: csvLine.id, 
-                    prev_id: csvLine.prev_id,
-                    begin: toFloat(csvLine.begin), 
-                    end: toFloat(csvLine.end),
-                    label: csvLine.label
-                }}),
-                (s)-[:is_a]->(s_type)
-            }} IN TRANSACTIONS OF 2000 ROWS
+            MERGE (s_type:syllable_type:{corpus} {{id: csvLine.type_id}})
+            ON CREATE SET s_type.label = csvLine.label
+            WITH s_type, csvLine
+            CREATE (s:syllable:{corpus}:speech {{
+                id: csvLine.id, 
+                prev_id: csvLine.prev_id,
+                begin: toFloat(csvLine.begin), 
+                end: toFloat(csvLine.end),
+                label: csvLine.label
+            }}),
+            (s)-[:is_a]->(s_type)
             '''
 
-            statement = node_statement.format(path=csv_path,
-                                              corpus=corpus_context.cypher_safe_name)
-            corpus_context.execute_cypher(statement)
+            statement = node_statement.format(corpus=corpus_context.cypher_safe_name)
+            transport.execute(statement, path, 2000)
             if corpus_context.config.debug:
                 print('Syllable node creation took {} seconds.'.format(time.time() - begin))
 
             begin = time.time()
             rel_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MATCH (o:{phone_name}:{corpus}:speech {{id: csvLine.onset_id}})-[r:contained_by]->(w:{word_name}:{corpus}:speech),
-                    (o)-[:spoken_by]->(sp:Speaker),
-                    (o)-[:spoken_in]->(d:Discourse),
-                    (s:syllable:{corpus}:speech {{id: csvLine.id}})
-                WITH w, csvLine, sp, d, s
-                CREATE (s)-[:contained_by]->(w),
-                    (s)-[:spoken_by]->(sp),
-                    (s)-[:spoken_in]->(d)
-            }} IN TRANSACTIONS OF 2000 ROWS
+            MATCH (o:{phone_name}:{corpus}:speech {{id: csvLine.onset_id}})-[r:contained_by]->(w:{word_name}:{corpus}:speech),
+                (o)-[:spoken_by]->(sp:Speaker),
+                (o)-[:spoken_in]->(d:Discourse),
+                (s:syllable:{corpus}:speech {{id: csvLine.id}})
+            WITH w, csvLine, sp, d, s
+            CREATE (s)-[:contained_by]->(w),
+                (s)-[:spoken_by]->(sp),
+                (s)-[:spoken_in]->(d)
             '''
-            statement = rel_statement.format(path=csv_path,
-                                             corpus=corpus_context.cypher_safe_name,
+            statement = rel_statement.format(corpus=corpus_context.cypher_safe_name,
                                              word_name=corpus_context.word_name,
                                              phone_name=corpus_context.phone_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 2000)
             if corpus_context.config.debug:
                 print('Hierarchical and spoken relationship creation took {} seconds.'.format(time.time() - begin))
 
             begin = time.time()
             rel_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" as csvLine
-                MATCH (s:syllable:{corpus}:speech {{id: csvLine.id}})
-                with csvLine, s
-                MATCH (prev:syllable {{id:csvLine.prev_id}})
-                CREATE (prev)-[:precedes]->(s)
-            }} IN TRANSACTIONS OF 2000 ROWS
+            MATCH (s:syllable:{corpus}:speech {{id: csvLine.id}})
+            with csvLine, s
+            MATCH (prev:syllable {{id:csvLine.prev_id}})
+            CREATE (prev)-[:precedes]->(s)
             '''
-            statement = rel_statement.format(path=csv_path,
-                                             corpus=corpus_context.cypher_safe_name,
+            statement = rel_statement.format(corpus=corpus_context.cypher_safe_name,
                                              word_name=corpus_context.word_name,
                                              phone_name=corpus_context.phone_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 2000)
             if corpus_context.config.debug:
                 print('First precedence relationship creation took {} seconds.'.format(time.time() - begin))
 
             begin = time.time()
             rel_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" as csvLine
-                MATCH (s:syllable:{corpus}:speech {{id: csvLine.id}})
-                with csvLine, s
-                MATCH (foll:syllable {{prev_id:csvLine.id}})
-                CREATE (s)-[:precedes]->(foll)
-            }} IN TRANSACTIONS OF 2000 ROWS
+            MATCH (s:syllable:{corpus}:speech {{id: csvLine.id}})
+            with csvLine, s
+            MATCH (foll:syllable {{prev_id:csvLine.id}})
+            CREATE (s)-[:precedes]->(foll)
             '''
-            statement = rel_statement.format(path=csv_path,
-                                             corpus=corpus_context.cypher_safe_name,
+            statement = rel_statement.format(corpus=corpus_context.cypher_safe_name,
                                              word_name=corpus_context.word_name,
                                              phone_name=corpus_context.phone_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 2000)
             if corpus_context.config.debug:
                 print('Second precedence relationship creation took {} seconds.'.format(time.time() - begin))
 
             begin = time.time()
             phone_statement = '''
-            CALL {{
-                LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
-                MATCH (o:{phone_name}:{corpus}:speech {{id: csvLine.onset_id}}),
-                    (s:syllable:{corpus}:speech {{id: csvLine.id}})-[:contained_by]->(w:{word_name}:{corpus}:speech)
-                WITH o, w, csvLine, s
-                OPTIONAL MATCH
-                    (c:{phone_name}:{corpus}:speech {{id: csvLine.coda_id}})-[:contained_by]->(w),
-                    p = (o)-[:precedes*..10]->(c)
-                WITH o, w, s, p, csvLine
-                UNWIND (CASE WHEN p IS NOT NULL THEN nodes(p) ELSE [o] END) AS c
-                OPTIONAL MATCH (c)-[r:contained_by]->(w)
-                WITH w, s, toInteger(csvLine.break) AS break, [x IN collect(c) WHERE x IS NOT NULL | x] AS cod,
-                    [x IN collect(r) WHERE x IS NOT NULL | x] AS rels
-                FOREACH (c IN cod[break..] | SET c :coda, c.syllable_position = 'coda')
-                FOREACH (c IN cod[..break] | SET c :onset, c.syllable_position = 'onset')
-                FOREACH (c IN cod | CREATE (c)-[:contained_by]->(s))
-                FOREACH (r IN rels | DELETE r)
-            }} IN TRANSACTIONS OF 2000 ROWS
+            MATCH (o:{phone_name}:{corpus}:speech {{id: csvLine.onset_id}}),
+                (s:syllable:{corpus}:speech {{id: csvLine.id}})-[:contained_by]->(w:{word_name}:{corpus}:speech)
+            WITH o, w, csvLine, s
+            OPTIONAL MATCH
+                (c:{phone_name}:{corpus}:speech {{id: csvLine.coda_id}})-[:contained_by]->(w),
+                p = (o)-[:precedes*..10]->(c)
+            WITH o, w, s, p, csvLine
+            UNWIND (CASE WHEN p IS NOT NULL THEN nodes(p) ELSE [o] END) AS c
+            OPTIONAL MATCH (c)-[r:contained_by]->(w)
+            WITH w, s, toInteger(csvLine.break) AS break, [x IN collect(c) WHERE x IS NOT NULL | x] AS cod,
+                [x IN collect(r) WHERE x IS NOT NULL | x] AS rels
+            FOREACH (c IN cod[break..] | SET c :coda, c.syllable_position = 'coda')
+            FOREACH (c IN cod[..break] | SET c :onset, c.syllable_position = 'onset')
+            FOREACH (c IN cod | CREATE (c)-[:contained_by]->(s))
+            FOREACH (r IN rels | DELETE r)
             '''
-            statement = phone_statement.format(path=csv_path,
-                                               corpus=corpus_context.cypher_safe_name,
+            statement = phone_statement.format(corpus=corpus_context.cypher_safe_name,
                                                word_name=corpus_context.word_name,
                                                phone_name=corpus_context.phone_name)
-            corpus_context.execute_cypher(statement)
+            transport.execute(statement, path, 2000)
             if corpus_context.config.debug:
                 print('Onset/coda hierarchical relationship creation took {} seconds.'.format(time.time() - begin))
-            os.remove(path)
+            transport.remove(path)
 
 
 def import_subannotation_csv(corpus_context, type, annotated_type, props):
@@ -1211,11 +1041,7 @@ def import_subannotation_csv(corpus_context, type, annotated_type, props):
 
     prop_temp = '''{name}: csvLine.{name}'''
     properties = []
-    try:
-        corpus_context.execute_cypher('CREATE CONSTRAINT FOR (node:%s) REQUIRE node.id IS UNIQUE' % type)
-    except neo4j.exceptions.ClientError as e:
-        if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-            raise
+    corpus_context.schema.ensure(constraints=[(type, 'id')])
 
     for p in props:
         if p in ['id', 'annotated_id', 'begin', 'end']:
@@ -1243,14 +1069,7 @@ def import_subannotation_csv(corpus_context, type, annotated_type, props):
                                  type=type,
                                  properties=properties)
     corpus_context.execute_cypher(statement, type=type)
-    for p in props:
-        if p in ['id', 'annotated_id']:
-            continue
-        try:
-            corpus_context.execute_cypher('CREATE INDEX FOR (n:%s) ON (n.%s)' % (type, p))
-        except neo4j.exceptions.ClientError as e:
-            if e.code != 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists':
-                raise
+    corpus_context.schema.ensure(indexes=[(type, p) for p in props if p not in ['id', 'annotated_id']])
     os.remove(path)
 
 
@@ -1274,6 +1093,8 @@ def import_token_csv(corpus_context, path, annotated_type, id_column, properties
     if properties is None:
         with open(path, 'r') as f:
             properties = [x.strip() for x in f.readline().split(',') if x.strip() != id_column]
+    transport = get_import_transport(corpus_context)
+    transport.read(path)
 
     is_subann = not annotated_type in corpus_context.hierarchy.annotation_types
 
@@ -1303,12 +1124,9 @@ def import_token_csv(corpus_context, path, annotated_type, id_column, properties
 
     property_update = ', '.join(["x.{} = csvLine.{}".format(p, p) for p in properties])
     statement = '''
-    CALL {{
-        LOAD CSV WITH HEADERS FROM "file://{path}" AS csvLine
-        MATCH (x:{a_type}:{corpus} {{id: csvLine.{id_column}}})
-        SET {property_update}
-    }} IN TRANSACTIONS OF 500 ROWS
-    '''.format(path=path, a_type=annotated_type, corpus=corpus_context.cypher_safe_name,
-                       id_column=id_column, property_update=property_update)
-    corpus_context.execute_cypher(statement)
-    os.remove(path)
+    MATCH (x:{a_type}:{corpus} {{id: csvLine.{id_column}}})
+    SET {property_update}
+    '''.format(a_type=annotated_type, corpus=corpus_context.cypher_safe_name,
+               id_column=id_column, property_update=property_update)
+    transport.execute(statement, path, 500)
+    transport.remove(path)
@@ -0,0 +1,92 @@
+import logging
+
+
+class SchemaManager(object):
+    """
+    Cache of the constraints and indexes in the graph database, so that imports only send schema
+    commands for the ones that are missing
+
+    The existing schema is read once with ``SHOW INDEXES`` and updated as new constraints and indexes are created.
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.CorpusContext`
+        Corpus to manage the schema for
+    """
+
+    def __init__(self, corpus_context):
+        self.corpus_context = corpus_context
+        self._constraints = None
+        self._indexes = None
+
+    def refresh(self):
+        """
+        Read the existing constraints and indexes from the graph database
+        """
+        constraints = set()
+        indexes = set()
+        statement = '''SHOW INDEXES YIELD type, entityType, labelsOrTypes, properties, owningConstraint
+        WHERE type = 'RANGE' AND entityType = 'NODE' AND size(labelsOrTypes) = 1 AND size(properties) = 1
+        RETURN labelsOrTypes[0] AS label, properties[0] AS property, owningConstraint'''
+        for r in self.corpus_context.execute_cypher(statement):
+            key = (r['label'], r['property'])
+            if r['owningConstraint'] is not None:
+                constraints.add(key)
+            indexes.add(key)
+        self._constraints = constraints
+        self._indexes = indexes
+
+    def has_constraint(self, label, prop='id'):
+        if self._constraints is None:
+            self.refresh()
+        return (label, prop) in self._constraints
+
+    def has_index(self, label, prop):
+        if self._indexes is None:
+            self.refresh()
+        return (label, prop) in self._indexes
+
+    def ensure(self, constraints=None, indexes=None):
+        """
+        Create any of the specified uniqueness constraints and indexes that do not exist yet, in a single transaction
+
+        Parameters
+        ----------
+        constraints : iterable
+            Tuples of node label and property that should be unique
+        indexes : iterable
+            Tuples of node label and property that should be indexed
+        """
+        statements = []
+        new_constraints = []
+        new_indexes = []
+        if constraints is not None:
+            for label, prop in constraints:
+                if self.has_constraint(label, prop) or (label, prop) in new_constraints:
+                    continue
+                new_constraints.append((label, prop))
+                statements.append('CREATE CONSTRAINT IF NOT EXISTS FOR (node:%s) REQUIRE node.%s IS UNIQUE'
+                                  % (label, prop))
+        if indexes is not None:
+            for label, prop in indexes:
+                # Uniqueness constraints come with an index of their own
+                if self.has_index(label, prop) or (label, prop) in new_indexes or (label, prop) in new_constraints:
+                    continue
+                new_indexes.append((label, prop))
+                statements.append('CREATE INDEX IF NOT EXISTS FOR (n:%s) ON (n.%s)' % (label, prop))
+        if not statements:
+            return
+        log = logging.getLogger('{}_loading'.format(self.corpus_context.corpus_name))
+        log.info('Creating {} constraints and indexes...'.format(len(statements)))
+
+        def _create_schema(tx):
+            for statement in statements:
+                if self.corpus_context.config.debug:
+                    print('Statement:', statement)
+                tx.run(statement)
+
+        with self.corpus_context.graph_session() as session:
+            session.execute_write(_create_schema)
+        self._constraints.update(new_constraints)
+        self._indexes.update(new_constraints)
+        self._indexes.update(new_indexes)
@@ -2,14 +2,7 @@ import csv
 import os
 import re
 
-
-def write_csv_file(path, header, data, mode='w'):
-    with open(path, mode, newline='', encoding='utf8') as f:
-        writer = csv.DictWriter(f, header, delimiter=',')
-        if mode == 'w':
-            writer.writeheader()
-        for d in data:
-            writer.writerow(d)
+from .transport import write_csv_file, get_import_transport
 
 
 def data_to_type_csvs(corpus_context, types, type_headers):
@@ -26,15 +19,16 @@ def data_to_type_csvs(corpus_context, types, type_headers):
         Header information for the CSV file
     """
     directory = corpus_context.config.temporary_directory('csv')
+    transport = get_import_transport(corpus_context)
 
     for k, v in type_headers.items():
         path = os.path.join(directory, '{}_type.csv'.format(k))
         header = v
         data = [dict(zip(v, t)) for t in types[k]]
-        write_csv_file(path, header, data)
+        transport.write(path, header, data, 'w')
 
 
-def data_to_graph_csvs(corpus_context, data):
+def data_to_graph_csvs(corpus_context, data, collect_types=False):
     """
     Convert a DiscourseData object into CSV files for efficient loading
     of graph nodes and relationships
@@ -43,53 +37,70 @@ def data_to_graph_csvs(corpus_context, data):
     ----------
     data : :class:`~polyglotdb.io.helper.DiscourseData`
         Data to load into a graph
-    directory: str
-        Full path to a directory to store CSV files
+    collect_types : bool
+        Flag for whether to also collect the types of the annotations while writing them, so that streamed
+        annotations do not have to be generated again for :meth:`~polyglotdb.io.discoursedata.DiscourseData.types`
+
+    Returns
+    -------
+    dict or None
+        Type data, if ``collect_types`` is set
+    dict or None
+        Type headers, if ``collect_types`` is set
     """
+    types = None
+    type_headers = None
+    if collect_types:
+        types = {k: set() for k in data.annotation_types}
+        type_headers = {}
     directory = corpus_context.config.temporary_directory('csv')
-    rfs = {}
+    transport = get_import_transport(corpus_context)
     rel_writers = {}
     token_headers = data.token_headers
     for s in data.speakers:
         for x in data.annotation_types:
             path = os.path.join(directory, '{}_{}.csv'.format(re.sub(r'\W', '_', s), x))
-            rfs[s, x] = open(path, 'a', newline='', encoding='utf8')
-            rel_writers[s, x] = csv.DictWriter(rfs[s, x], token_headers[x], delimiter=',')
-    subanno_files = {}
+            rel_writers[s, x] = transport.open(path, token_headers[x])
     subanno_writers = {}
     for sp in data.speakers:
         for k, v in data.hierarchy.subannotations.items():
             for s in v:
                 path = os.path.join(directory, '{}_{}_{}.csv'.format(re.sub(r'\W', '_', sp), k, s))
-                subanno_files[sp, k, s] = open(path, 'a', newline='', encoding='utf8')
                 header = ['id', 'begin', 'end', 'annotation_id', 'label']
-                subanno_writers[sp, k, s] = csv.DictWriter(subanno_files[sp, k, s], header, delimiter=',')
-
-    for level in data.highest_to_lowest():
-        for d in data[level]:
-            if d.begin is None or d.end is None:
-                continue
-            token_additional = dict(zip(d.token_keys(), d.token_values()))
-            if d.super_id is not None:
-                token_additional[data[level].supertype] = d.super_id
-            s = d.speaker
-            if s is None:
-                s = 'unknown'
-            rel_writers[s, level].writerow(dict(begin=d.begin, end=d.end,
-                                                type_id=d.sha(corpus=corpus_context.corpus_name),
-                                                id=d.id, speaker=s, discourse=data.name,
-                                                previous_id=d.previous_id,
-                                                **token_additional))
-            if d.subannotations:
-                for sub in d.subannotations:
-                    row = {'begin': sub.begin, 'end': sub.end, 'label': sub.label,
-                           'annotation_id': d.id, 'id': sub.id}
-                    subanno_writers[s, level, sub.type].writerow(row)
-
-    for x in rfs.values():
+                subanno_writers[sp, k, s] = transport.open(path, header)
+
+    for chunk in data.annotation_chunks():
+        for level in data.highest_to_lowest():
+            for d in chunk[level]:
+                type_id = d.sha(corpus=corpus_context.corpus_name)
+                if collect_types:
+                    if level not in type_headers:
+                        type_headers[level] = ['id'] + d.type_keys()
+                    types[level].add(tuple([type_id] + [x for x in d.type_values()]))
+                if d.begin is None or d.end is None:
+                    continue
+                token_additional = dict(zip(d.token_keys(), d.token_values()))
+                if d.super_id is not None:
+                    token_additional[data[level].supertype] = d.super_id
+                s = d.speaker
+                if s is None:
+                    s = 'unknown'
+                rel_writers[s, level].writerow(dict(begin=d.begin, end=d.end,
+                                                    type_id=type_id,
+                                                    id=d.id, speaker=s, discourse=data.name,
+                                                    previous_id=d.previous_id,
+                                                    **token_additional))
+                if d.subannotations:
+                    for sub in d.subannotations:
+                        row = {'begin': sub.begin, 'end': sub.end, 'label': sub.label,
+                               'annotation_id': d.id, 'id': sub.id}
+                        subanno_writers[s, level, sub.type].writerow(row)
+
+    for x in rel_writers.values():
         x.close()
-    for x in subanno_files.values():
+    for x in subanno_writers.values():
         x.close()
+    return types, type_headers
 
 
 def utterance_data_to_csvs(corpus_context, speaker, discourse, data):
@@ -110,7 +121,7 @@ def utterance_data_to_csvs(corpus_context, speaker, discourse, data):
     path = os.path.join(corpus_context.config.temporary_directory('csv'),
                         '{}_{}_utterance.csv'.format(re.sub(r'\W', '_', speaker), discourse))
     header = ['id', 'prev_id', 'begin_word_id', 'end_word_id']
-    write_csv_file(path, header, data, 'a')
+    get_import_transport(corpus_context).write(path, header, data, 'a')
 
 
 def utterance_enriched_data_to_csvs(corpus_context, utterance_data):
@@ -154,7 +165,7 @@ def syllables_data_to_csvs(corpus_context, speaker, discourse, syllable_data):
     path = os.path.join(corpus_context.config.temporary_directory('csv'),
                         '{}_{}_syllable.csv'.format(re.sub(r'\W', '_', speaker), discourse))
     header = ['id', 'prev_id', 'vowel_id', 'onset_id', 'coda_id', 'begin', 'end', 'label', 'type_id']
-    write_csv_file(path, header, syllable_data, 'a')
+    get_import_transport(corpus_context).write(path, header, syllable_data, 'a')
 
 
 def syllables_enrichment_data_to_csvs(corpus_context, data):
@@ -195,7 +206,7 @@ def nonsyls_data_to_csvs(corpus_context, speaker, discourse, data):
     path = os.path.join(corpus_context.config.temporary_directory('csv'),
                         '{}_{}_nonsyl.csv'.format(re.sub(r'\W', '_', speaker), discourse))
     header = ['id', 'prev_id', 'break', 'onset_id', 'coda_id', 'begin', 'end', 'label', 'type_id']
-    write_csv_file(path, header, data, 'a')
+    get_import_transport(corpus_context).write(path, header, data, 'a')
 
 
 def subannotations_data_to_csv(corpus_context, type, data):
@@ -310,35 +321,32 @@ def discourse_data_to_csvs(corpus_context, data):
 
 def create_utterance_csvs(corpus_context):
     header = ['id', 'prev_id', 'begin_word_id', 'end_word_id']
+    transport = get_import_transport(corpus_context)
     for s in corpus_context.speakers:
         discourses = corpus_context.get_discourses_of_speaker(s)
         for d in discourses:
             path = os.path.join(corpus_context.config.temporary_directory('csv'),
                                 '{}_{}_utterance.csv'.format(re.sub(r'\W', '_', s), d))
-            with open(path, 'w', newline='', encoding='utf8') as f:
-                writer = csv.DictWriter(f, header, delimiter=',')
-                writer.writeheader()
+            transport.write(path, header, [], 'w')
 
 
 def create_syllabic_csvs(corpus_context):
     header = ['id', 'prev_id', 'vowel_id', 'onset_id', 'coda_id', 'begin', 'end', 'label', 'type_id']
+    transport = get_import_transport(corpus_context)
     for s in corpus_context.speakers:
         discourses = corpus_context.get_discourses_of_speaker(s)
         for d in discourses:
             path = os.path.join(corpus_context.config.temporary_directory('csv'),
                                 '{}_{}_syllable.csv'.format(re.sub(r'\W', '_', s), d))
-            with open(path, 'w', newline='', encoding='utf8') as f:
-                writer = csv.DictWriter(f, header, delimiter=',')
-                writer.writeheader()
+            transport.write(path, header, [], 'w')
 
 
 def create_nonsyllabic_csvs(corpus_context):
     header = ['id', 'prev_id', 'break', 'onset_id', 'coda_id', 'begin', 'end', 'label', 'type_id']
+    transport = get_import_transport(corpus_context)
     for s in corpus_context.speakers:
         discourses = corpus_context.get_discourses_of_speaker(s)
         for d in discourses:
             path = os.path.join(corpus_context.config.temporary_directory('csv'),
                                 '{}_{}_nonsyl.csv'.format(re.sub(r'\W', '_', s), d))
-            with open(path, 'w', newline='', encoding='utf8') as f:
-                writer = csv.DictWriter(f, header, delimiter=',')
-                writer.writeheader()
+            transport.write(path, header, [], 'w')
@@ -0,0 +1,235 @@
+import csv
+import os
+
+from polyglotdb.exceptions import CorpusConfigError
+
+
+def make_path_safe(path):
+    '''Takes a path and returns it with the associated Javascript URL-safe characters'''
+    replacements = [('%', '%25'), ('\\', '/'), (' ', '%20'), ("'", "\\'"), ('?', '%3F'), (';', '%3B'),
+                    ('<', '%3C'), ('=', '%3D'), ('>', '%3E'), (':', '%3A'), ('*', '%2A'), ('&', '%26'),
+                    ('(', '%28'), (')', '%29'), ('@', '%40'), ('!', '%21'), ('#', '%23')]
+    for o, r in replacements:
+        path = path.replace(o, r)
+    return path
+
+
+def write_csv_file(path, header, data, mode='w'):
+    with open(path, mode, newline='', encoding='utf8') as f:
+        writer = csv.DictWriter(f, header, delimiter=',')
+        if mode == 'w':
+            writer.writeheader()
+        for d in data:
+            writer.writerow(d)
+
+
+class CsvTransport(object):
+    """
+    Import transport that writes rows to CSV files in the corpus' temporary directory, which Neo4j then
+    reads with ``LOAD CSV``.  Requires the Neo4j server to share a file system with the client.
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.CorpusContext`
+        Corpus to import into
+    """
+    name = 'csv'
+
+    def __init__(self, corpus_context):
+        self.corpus_context = corpus_context
+
+    def open(self, path, header, mode='a'):
+        """
+        Open a row writer for an import path
+
+        Parameters
+        ----------
+        path : str
+            Path of the import file
+        header : list
+            Column names of the rows
+        mode : str
+            'w' to start a new file with a header, 'a' to append rows to an existing one
+
+        Returns
+        -------
+        :class:`csv.DictWriter`
+            Writer with ``writerow`` and ``close`` methods
+        """
+        f = open(path, mode, newline='', encoding='utf8')
+        writer = csv.DictWriter(f, header, delimiter=',')
+        writer.close = f.close
+        if mode == 'w':
+            writer.writeheader()
+        return writer
+
+    def write(self, path, header, data, mode='a'):
+        """
+        Write rows to an import path
+
+        Parameters
+        ----------
+        path : str
+            Path of the import file
+        header : list
+            Column names of the rows
+        data : iterable
+            Dictionaries to write
+        mode : str
+            'w' to start a new file with a header, 'a' to append rows to an existing one
+        """
+        write_csv_file(path, header, data, mode)
+
+    def read(self, path):
+        """
+        Make an existing CSV file on the client available for import
+
+        Parameters
+        ----------
+        path : str
+            Path of the CSV file
+        """
+        pass
+
+    def exists(self, path):
+        return os.path.exists(path)
+
+    def remove(self, path):
+        os.remove(path)
+
+    def url(self, path):
+        # If on the Docker version, the files live in /site/proj
+        if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
+            return 'file:///site/proj/{}'.format(make_path_safe(path))
+        return 'file:///{}'.format(make_path_safe(path))
+
+    def execute(self, statement, path, rows_per_transaction=2000, **parameters):
+        """
+        Run a Cypher statement once for every row of an import path, with each row bound to ``csvLine``
+
+        Parameters
+        ----------
+        statement : str
+            Cypher statement that uses ``csvLine``
+        path : str
+            Path of the import file
+        rows_per_transaction : int
+            Number of rows to commit in each transaction
+        parameters : kwargs
+            Additional parameters for the statement
+        """
+        statement = '''
+        CALL {{
+            LOAD CSV WITH HEADERS FROM '{path}' AS csvLine
+            {statement}
+        }} IN TRANSACTIONS OF {rows} ROWS
+        '''.format(path=self.url(path), statement=statement, rows=rows_per_transaction)
+        self.corpus_context.execute_cypher(statement, **parameters)
+
+
+class _RowBuffer(object):
+    def __init__(self, rows, header):
+        self.rows = rows
+        self.header = header
+
+    def writerow(self, row):
+        # Match what LOAD CSV would return for the same row: strings, with empty values as nulls
+        line = {}
+        for h in self.header:
+            v = row.get(h)
+            if v is None or v == '':
+                v = None
+            else:
+                v = str(v)
+            line[h] = v
+        self.rows.append(line)
+
+    def writerows(self, rows):
+        for row in rows:
+            self.writerow(row)
+
+    def close(self):
+        pass
+
+
+class UnwindTransport(CsvTransport):
+    """
+    Import transport that keeps rows in memory and sends them to Neo4j over Bolt as batched
+    ``UNWIND $rows`` parameters, so no files are written and Neo4j does not need access to the client's
+    file system.  Rows for an import path are released once the path is removed.
+
+    The batch size is set by the ``import_batch_size`` configuration of the corpus.
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.CorpusContext`
+        Corpus to import into
+    """
+    name = 'bolt'
+
+    def __init__(self, corpus_context):
+        super(UnwindTransport, self).__init__(corpus_context)
+        self.rows = {}
+
+    def open(self, path, header, mode='a'):
+        if mode == 'w' or path not in self.rows:
+            self.rows[path] = []
+        return _RowBuffer(self.rows[path], header)
+
+    def write(self, path, header, data, mode='a'):
+        self.open(path, header, mode).writerows(data)
+
+    def read(self, path):
+        with open(path, 'r', newline='', encoding='utf8') as f:
+            reader = csv.DictReader(f, delimiter=',')
+            self.write(path, reader.fieldnames, reader, 'w')
+
+    def exists(self, path):
+        return path in self.rows
+
+    def remove(self, path):
+        self.rows.pop(path, None)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def execute(self, statement, path, rows_per_transaction=2000, **parameters):
+        rows = self.rows.get(path, [])
+        batch_size = self.corpus_context.config.import_batch_size
+        statement = '''
+        UNWIND $rows AS csvLine
+        {statement}
+        '''.format(statement=statement)
+        for i in range(0, len(rows), batch_size):
+            self.corpus_context.execute_cypher(statement, rows=rows[i:i + batch_size], **parameters)
+
+
+TRANSPORTS = {x.name: x for x in [CsvTransport, UnwindTransport]}
+
+
+def get_import_transport(corpus_context):
+    """
+    Get the import transport configured for a corpus
+
+    Bulk imports always use CSV files, as those are what ``neo4j-admin`` reads.
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.CorpusContext`
+        Corpus to import into
+
+    Returns
+    -------
+    :class:`~polyglotdb.io.importer.transport.CsvTransport`
+        Transport to use for writing and importing rows
+    """
+    if getattr(corpus_context, '_bulk_import', None) is not None:
+        name = CsvTransport.name
+    else:
+        name = corpus_context.config.import_transport
+    if name not in TRANSPORTS:
+        raise CorpusConfigError('Import transport must be one of: {}.'.format(', '.join(sorted(TRANSPORTS))))
+    transport = getattr(corpus_context, '_import_transport', None)
+    if transport is None or transport.name != name:
+        transport = TRANSPORTS[name](corpus_context)
+        corpus_context._import_transport = transport
+    return transport
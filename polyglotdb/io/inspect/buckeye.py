@@ -5,7 +5,7 @@ from ..types.parsing import *
 from ..parsers import BuckeyeParser
 
 
-def inspect_buckeye(word_path):
+def inspect_buckeye(word_path, chunk_size=None):
     """
     Generate a :class:`~polyglotdb.io.parsers.buckeye.BuckeyeParser`
     for the Buckeye corpus.
@@ -14,6 +14,9 @@ def inspect_buckeye(word_path):
     ----------
     word_path : str
         Full path to text file
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker for the parser to generate at a time when
+        importing, see :class:`~polyglotdb.io.parsers.base.BaseParser`
 
     Returns
     -------
@@ -31,4 +34,4 @@ def inspect_buckeye(word_path):
     annotation_types[3].type_property = False
     hierarchy = Hierarchy({'phone': 'word', 'word': None})
 
-    return BuckeyeParser(annotation_types, hierarchy)
+    return BuckeyeParser(annotation_types, hierarchy, chunk_size=chunk_size)
@@ -5,7 +5,7 @@ from ..types.parsing import *
 from ..parsers import FaveParser
 
 
-def inspect_fave(path):
+def inspect_fave(path, chunk_size=None):
     """
     Generate an :class:`~polyglotdb.io.parsers.fave.FaveParser`
     for a specified text file for parsing it as an FAVE text file
@@ -14,6 +14,9 @@ def inspect_fave(path):
     ----------
     path : str
         Full path to text file
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker for the parser to generate at a time when
+        importing, see :class:`~polyglotdb.io.parsers.base.BaseParser`
 
     Returns
     -------
@@ -27,4 +30,4 @@ def inspect_fave(path):
     annotation_types[1].label = True
     hierarchy = Hierarchy({'phone': 'word', 'word': None})
 
-    return FaveParser(annotation_types, hierarchy)
+    return FaveParser(annotation_types, hierarchy, chunk_size=chunk_size)
@@ -9,7 +9,7 @@ from ..types.parsing import (TextOrthographyTier, TextTranscriptionTier,
 from ..parsers import IlgParser
 
 
-def inspect_ilg(path, number=None):
+def inspect_ilg(path, number=None, chunk_size=None):
     """
     Generate an :class:`~polyglotdb.io.parsers.ilg.IlgParser`
     for a specified text file for parsing it as an interlinear gloss text file
@@ -20,6 +20,9 @@ def inspect_ilg(path, number=None):
         Full path to text file
     number : int, optional
         Number of lines per gloss, if not supplied, it is auto-detected
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker for the parser to generate at a time when
+        importing, see :class:`~polyglotdb.io.parsers.base.BaseParser`
 
     Returns
     -------
@@ -65,4 +68,4 @@ def inspect_ilg(path, number=None):
             labels = lines[k][i][1]
             annotation_types[i].add(((x, j) for j, x in enumerate(labels)), save=False)
 
-    return IlgParser(annotation_types)
+    return IlgParser(annotation_types, chunk_size=chunk_size)
@@ -5,7 +5,7 @@ from ..types.parsing import *
 from ..parsers import LabbCatParser
 
 
-def inspect_labbcat(path):
+def inspect_labbcat(path, chunk_size=None):
     """
     Generate an :class:`~polyglotdb.io.parsers.ilg.LabbCatParser`
     for a specified text file for parsing it as a LabbCat file
@@ -14,6 +14,9 @@ def inspect_labbcat(path):
     ----------
     path : str
         Full path to text file
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker for the parser to generate at a time when
+        importing, see :class:`~polyglotdb.io.parsers.base.BaseParser`
 
     Returns
     -------
@@ -28,4 +31,4 @@ def inspect_labbcat(path):
     annotation_types[1].label = True
     hierarchy = Hierarchy({'phone': 'word', 'word': None})
 
-    return LabbCatParser(annotation_types, hierarchy)
+    return LabbCatParser(annotation_types, hierarchy, chunk_size=chunk_size)
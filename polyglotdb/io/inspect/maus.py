@@ -5,7 +5,7 @@ from ..types.parsing import *
 from ..parsers import MausParser
 
 
-def inspect_maus(path):
+def inspect_maus(path, chunk_size=None):
     """
     Generate an :class:`~polyglotdb.io.parsers.maus.MausParser`
     for a specified text file for parsing it as a MAUS file
@@ -14,6 +14,9 @@ def inspect_maus(path):
     ----------
     path : str
         Full path to text file
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker for the parser to generate at a time when
+        importing, see :class:`~polyglotdb.io.parsers.base.BaseParser`
 
     Returns
     -------
@@ -28,4 +31,4 @@ def inspect_maus(path):
     annotation_types[1].label = True
     hierarchy = Hierarchy({'phone': 'word', 'word': None})
 
-    return MausParser(annotation_types, hierarchy)
+    return MausParser(annotation_types, hierarchy, chunk_size=chunk_size)
@@ -5,7 +5,7 @@ from ..types.parsing import *
 from ..parsers.partitur import PartiturParser
 
 
-def inspect_partitur(path):
+def inspect_partitur(path, chunk_size=None):
     """
     Generate an :class:`~polyglotdb.io.parsers.partitur.PartiturParser`
     for a specified text file for parsing it as a BAS Partitur file
@@ -14,6 +14,9 @@ def inspect_partitur(path):
     ----------
     path : str
         Full path to text file
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker for the parser to generate at a time when
+        importing, see :class:`~polyglotdb.io.parsers.base.BaseParser`
 
     Returns
     -------
@@ -31,4 +34,4 @@ def inspect_partitur(path):
 
     hierarchy = Hierarchy({'phone': 'word', 'word': None})
 
-    return PartiturParser(annotation_types, hierarchy)
+    return PartiturParser(annotation_types, hierarchy, chunk_size=chunk_size)
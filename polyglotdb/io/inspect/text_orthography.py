@@ -5,7 +5,7 @@ from ..types.parsing import TextOrthographyTier
 from ..parsers import OrthographyTextParser
 
 
-def inspect_orthography(path):
+def inspect_orthography(path, chunk_size=None):
     """
     Generate a :class:`~polyglotdb.io.parsers.text_orthography.OrthographyTextParser`
     for a specified text file for parsing it as an orthographic text
@@ -17,6 +17,9 @@ def inspect_orthography(path):
     support_corpus_path : str, optional
         Full path to a corpus to look up transcriptions from spellings
         in the text
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker for the parser to generate at a time when
+        importing, see :class:`~polyglotdb.io.parsers.base.BaseParser`
 
     Returns
     -------
@@ -46,4 +49,4 @@ def inspect_orthography(path):
                 a.add(((x, index + i) for i, x in enumerate(trial)), save=False)
                 index += len(trial)
     annotation_types = [a]
-    return OrthographyTextParser(annotation_types)
+    return OrthographyTextParser(annotation_types, chunk_size=chunk_size)
@@ -7,7 +7,7 @@ from ..helper import guess_trans_delimiter
 from ..parsers import TranscriptionTextParser
 
 
-def inspect_transcription(path):
+def inspect_transcription(path, chunk_size=None):
     """
     Generate a :class:`~polyglotdb.io.parsers.text_transcription.TranscriptionTextParser`
     for a specified text file for parsing it as a transcribed text
@@ -16,6 +16,9 @@ def inspect_transcription(path):
     ----------
     path : str
         Full path to text file
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker for the parser to generate at a time when
+        importing, see :class:`~polyglotdb.io.parsers.base.BaseParser`
 
     Returns
     -------
@@ -52,4 +55,4 @@ def inspect_transcription(path):
                 a.add(((x, num_annotations + i) for i, x in enumerate(trial)), save=False)
                 num_annotations += len(trial)
     annotation_types = [a]
-    return TranscriptionTextParser(annotation_types)
+    return TranscriptionTextParser(annotation_types, chunk_size=chunk_size)
@@ -199,7 +199,7 @@ def guess_tiers(tg):
     return tier_guesses, hierarchy
 
 
-def inspect_textgrid(path):
+def inspect_textgrid(path, chunk_size=None):
     """
     Generate a :class:`~polyglotdb.io.parsers.textgrid.TextgridParser` for a specified TextGrid file
 
@@ -207,6 +207,9 @@ def inspect_textgrid(path):
     ----------
     path : str
         Full path to TextGrid file
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker for the parser to generate at a time when
+        importing, see :class:`~polyglotdb.io.parsers.base.BaseParser`
 
     Returns
     -------
@@ -275,5 +278,5 @@ def inspect_textgrid(path):
                 else:
                     anno_types[i].add(((text.strip(), time) for time, text in ti.entries), save=False)
 
-    parser = TextgridParser(anno_types, hierarchy)
+    parser = TextgridParser(anno_types, hierarchy, chunk_size=chunk_size)
     return parser
@@ -5,7 +5,7 @@ from ..types.parsing import SegmentTier, OrthographyTier
 from ..parsers.timit import TimitParser
 
 
-def inspect_timit(word_path):
+def inspect_timit(word_path, chunk_size=None):
     """
     Generate a :class:`~polyglotdb.io.parsers.timit.TimitParser`.
 
@@ -13,6 +13,9 @@ def inspect_timit(word_path):
     ----------
     word_path : str
         Full path to text file
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker for the parser to generate at a time when
+        importing, see :class:`~polyglotdb.io.parsers.base.BaseParser`
 
     Returns
     -------
@@ -22,4 +25,4 @@ def inspect_timit(word_path):
     annotation_types = [OrthographyTier('word', 'word'),
                         SegmentTier('phone', 'phone')]
     hierarchy = Hierarchy({'phone': 'word', 'word': None})
-    return TimitParser(annotation_types, hierarchy)
+    return TimitParser(annotation_types, hierarchy, chunk_size=chunk_size)
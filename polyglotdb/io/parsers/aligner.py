@@ -30,6 +30,8 @@ class AlignerParser(TextgridParser):
         Function to check for whether parsing should stop
     call_back : callable
         Function to report progress in parsing
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker to generate at a time when importing
 
     Attributes
     ----------
@@ -48,9 +50,9 @@ class AlignerParser(TextgridParser):
     speaker_first = True
 
     def __init__(self, annotation_tiers, hierarchy, make_transcription=True,
-                 stop_check=None, call_back=None):
+                 stop_check=None, call_back=None, chunk_size=None):
         super(AlignerParser, self).__init__(annotation_tiers, hierarchy, make_transcription,
-                                            False, stop_check, call_back)
+                                            False, stop_check, call_back, chunk_size=chunk_size)
         self.speaker_parser = DirectorySpeakerParser()
 
     def _is_valid(self, tg):
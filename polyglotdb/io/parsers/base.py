@@ -1,5 +1,9 @@
 
-from ..types.standardized import PGAnnotation, PGSubAnnotation, PGAnnotationType
+import copy
+from bisect import bisect_left
+from functools import partial
+
+from ..types.standardized import PGAnnotation, PGSubAnnotation, PGAnnotationType, PGAnnotationStream
 
 from ..types.parsing import Tobi, BreakIndex
 
@@ -8,6 +12,37 @@ from ..discoursedata import DiscourseData
 from ...exceptions import ParseError
 
 
+def _annotation_times(speaker_levels, i):
+    begin = None
+    end = None
+    for rl in speaker_levels:
+        if begin is None:
+            begin = getattr(rl[i], 'begin', getattr(rl[i], 'time', None))
+        if end is None:
+            end = getattr(rl[i], 'end', getattr(rl[i], 'time', None))
+    return begin, end
+
+
+def _window_ranges(times, boundaries):
+    """
+    Find the range of annotations in each window between boundaries, from the midpoints of annotations in order.
+    Returns None if any annotation is untimed or out of order
+    """
+    starts = [0]
+    i = -1
+    for i, (begin, end) in enumerate(times):
+        if begin is None or end is None:
+            return None
+        window = bisect_left(boundaries, (end - begin) / 2 + begin)
+        if window < len(starts) - 1:
+            return None
+        while len(starts) - 1 < window:
+            starts.append(i)
+    while len(starts) < len(boundaries) + 2:
+        starts.append(i + 1)
+    return list(zip(starts[:-1], starts[1:]))
+
+
 class BaseParser(object):
     """
     Base parser, extend this class for new parsers.
@@ -25,12 +60,15 @@ class BaseParser(object):
         Function to check whether to halt parsing
     call_back : callable, optional
         Function to output progress messages
+    chunk_size : int, optional
+        If set, parsed discourses generate their annotations in chunks of this many annotations of the highest
+        linguistic type per speaker when they are imported, rather than holding every annotation in memory
     """
     _extensions = ['.txt']
 
     def __init__(self, annotation_tiers, hierarchy, make_transcription=True,
                  make_label=False,
-                 stop_check=None, call_back=None):
+                 stop_check=None, call_back=None, chunk_size=None):
         self.speaker_parser = None
         self.annotation_tiers = annotation_tiers
         self.hierarchy = hierarchy
@@ -38,6 +76,7 @@ class BaseParser(object):
         self.make_label = make_label
         self.stop_check = stop_check
         self.call_back = call_back
+        self.chunk_size = chunk_size
 
     def match_extension(self, filename):
         """
@@ -60,42 +99,222 @@ class BaseParser(object):
             return False
         return True
 
-    def _parse_annotations(self, types_only=False):
+    def _create_annotation_types(self, hierarchy):
         annotation_tiers = {}
         segment_type = None
-        for k, v in self.hierarchy.items():
+        for k, v in hierarchy.items():
             annotation_tiers[k] = PGAnnotationType(k)
             annotation_tiers[k].supertype = v
             if 'word' in k:
                 annotation_tiers[k].is_word = True  # FIXME?
-                self.hierarchy.type_properties['word'] = set()
-                self.hierarchy.token_properties['word'] = set()
-            if k not in self.hierarchy.values() and not annotation_tiers[k].is_word:
+            if k not in hierarchy.values() and not annotation_tiers[k].is_word:
                 segment_type = k
+        return annotation_tiers, segment_type
 
-        for k in annotation_tiers.keys():
-            relevent_levels = {}
-            lengths = {}
-            for inputlevel in self.annotation_tiers:
+    def _relevant_levels(self, input_levels, hierarchy):
+        relevant_levels = {}
+        lengths = {}
+        for k in hierarchy.keys():
+            relevant_levels[k] = {}
+            lengths[k] = {}
+            for inputlevel in input_levels:
                 if inputlevel.ignored:
                     continue
                 if inputlevel.linguistic_type != k:
                     continue
                 speaker = inputlevel.speaker
-                if speaker not in relevent_levels:
-                    relevent_levels[speaker] = []
-                if speaker not in lengths:
-                    lengths[speaker] = 0
-                relevent_levels[speaker].append(inputlevel)
+                if speaker not in relevant_levels[k]:
+                    relevant_levels[k][speaker] = []
+                if speaker not in lengths[k]:
+                    lengths[k][speaker] = 0
+                relevant_levels[k][speaker].append(inputlevel)
                 if inputlevel.subannotation:
                     continue
-                if lengths[speaker] == 0:
-                    lengths[speaker] = len(inputlevel)
-                elif lengths[speaker] != len(inputlevel):
+                if lengths[k][speaker] == 0:
+                    lengths[k][speaker] = len(inputlevel)
+                elif lengths[k][speaker] != len(inputlevel):
                     raise (
                     ParseError('Annotations sharing a linguistic type and a speaker don\'t have a consistent length.'))
-            for speaker, speaker_levels in relevent_levels.items():
-                for i in range(lengths[speaker]):
+        return relevant_levels, lengths
+
+    def _parse_annotations(self, types_only=False):
+        for k in self.hierarchy.keys():
+            if 'word' in k:
+                self.hierarchy.type_properties['word'] = set()
+                self.hierarchy.token_properties['word'] = set()
+        # Input tiers are reset by parsers once they are done with them, so streamed chunks hold on to copies
+        input_levels = [copy.copy(x) for x in self.annotation_tiers]
+        relevant_levels, lengths = self._relevant_levels(input_levels, self.hierarchy)
+        windows = None
+        if self.chunk_size is not None and not types_only:
+            windows = self._chunk_windows(relevant_levels, lengths, self.chunk_size)
+        if windows is None:
+            selection = {}
+            for k, v in lengths.items():
+                for speaker, length in v.items():
+                    selection[k, speaker] = (0, length)
+            for k, v in relevant_levels.items():
+                for speaker, speaker_levels in v.items():
+                    for j, rl in enumerate(speaker_levels):
+                        if rl.subannotation:
+                            selection[k, speaker, j] = (0, len(rl))
+            return self._build_annotations(relevant_levels, selection, {}, self.hierarchy, types_only)
+        stream = PGAnnotationStream(partial(self._iter_annotation_chunks, relevant_levels, windows,
+                                            self.hierarchy))
+        annotation_tiers, segment_type = self._create_annotation_types(self.hierarchy)
+        stream.update(annotation_tiers)
+        self._scan_properties(stream, segment_type, relevant_levels, lengths, self.hierarchy)
+        return stream
+
+    def _scan_properties(self, annotation_tiers, segment_type, relevant_levels, lengths, hierarchy):
+        """
+        Collect the properties, speakers and subannotation types that :meth:`_build_annotations` would give the
+        annotation types, from the input tiers without creating the annotations
+        """
+        for k, at in annotation_tiers.items():
+            has_label = False
+            missing_label = False
+            for speaker, speaker_levels in relevant_levels[k].items():
+                if not lengths[k][speaker]:
+                    continue
+                at._speakers.add(speaker if speaker is not None else 'unknown')
+                label_levels = [rl for rl in speaker_levels if not rl.subannotation and self._is_label_level(rl, k)]
+                for i in range(lengths[k][speaker]):
+                    if any(rl[i].value is not None for rl in label_levels):
+                        has_label = True
+                    else:
+                        missing_label = True
+                for rl in speaker_levels:
+                    if rl.subannotation:
+                        for sub in rl:
+                            hierarchy.subannotations.setdefault(k, set()).add(self._subannotation_values(sub)[1])
+                        continue
+                    if self._is_label_level(rl, k):
+                        continue
+                    if rl.type_property:
+                        at.type_property_keys.add(rl.name)
+                        at.type_properties.update((rl.name, str if isinstance(x.value, list) else type(x.value))
+                                                  for x in rl)
+                    else:
+                        at.token_property_keys.add(rl.name)
+                        at.token_properties.update((rl.name, type(x.value)) for x in rl if x.value is not None)
+            if has_label:
+                at.type_property_keys.add('label')
+                at.token_property_keys.add('label')
+            self._add_derived_properties(at, segment_type, hierarchy, missing_label)
+
+    def _add_derived_properties(self, annotation_type, segment_type, hierarchy, missing_label):
+        """
+        Add the transcription property that words get from the segments they contain, and the label property
+        that words without labels get from their transcriptions
+
+        Parameters
+        ----------
+        annotation_type : :class:`~polyglotdb.io.types.standardized.PGAnnotationType`
+            Annotation type to add the properties to
+        segment_type : str or None
+            Lowest annotation type in the hierarchy, which is not a word
+        hierarchy : :class:`~polyglotdb.structure.Hierarchy`
+            Hierarchy of the parsed annotation types
+        missing_label : bool
+            Whether any annotations of the type are missing labels
+
+        Returns
+        -------
+        bool
+            True if annotations missing labels should be labelled with their transcription
+        """
+        if self.make_transcription and segment_type is not None and annotation_type.is_word:
+            annotation_type.type_property_keys.add('transcription')
+            annotation_type.type_properties.add(('transcription', str))
+            hierarchy.type_properties['word'].add(('transcription', str))
+        if self.make_label and 'transcription' in annotation_type.type_property_keys and annotation_type.is_word \
+                and missing_label:
+            annotation_type.type_property_keys.add('label')
+            annotation_type.token_property_keys.add('label')
+            return True
+        return False
+
+    def _chunk_windows(self, relevant_levels, lengths, chunk_size):
+        """
+        Split each speaker's annotations into contiguous ranges, with boundaries between every ``chunk_size``
+        annotations of the highest linguistic type, for streaming.  Annotations go in the chunk containing their
+        midpoint, so annotations are in the same chunk as the ones they are contained in.
+
+        Returns None if the annotations are not timed and in order, in which case they cannot be streamed
+        """
+        highest = None
+        for k, v in self.hierarchy.items():
+            if v is None:
+                highest = k
+                break
+        if highest is None:
+            return None
+        speakers = set()
+        for v in relevant_levels.values():
+            speakers.update(v.keys())
+        windows = {}
+        for speaker in speakers:
+            boundaries = []
+            if speaker in lengths[highest]:
+                speaker_levels = [x for x in relevant_levels[highest][speaker] if not x.subannotation]
+                max_end = None
+                for i in range(lengths[highest][speaker]):
+                    begin, end = _annotation_times(speaker_levels, i)
+                    if end is None:
+                        return None
+                    if max_end is None or end > max_end:
+                        max_end = end
+                    if (i + 1) % chunk_size == 0 and i + 1 < lengths[highest][speaker]:
+                        boundaries.append(max_end)
+            selections = [{} for _ in range(len(boundaries) + 1)]
+            for k, v in relevant_levels.items():
+                if speaker not in v:
+                    continue
+                speaker_levels = [x for x in v[speaker] if not x.subannotation]
+                ranges = _window_ranges((_annotation_times(speaker_levels, i) for i in range(lengths[k][speaker])),
+                                        boundaries)
+                if ranges is None:
+                    return None
+                for w, r in enumerate(ranges):
+                    selections[w][k, speaker] = r
+                for j, rl in enumerate(v[speaker]):
+                    if not rl.subannotation:
+                        continue
+                    ranges = _window_ranges(((x.begin, x.end) for x in rl), boundaries)
+                    if ranges is None:
+                        return None
+                    for w, r in enumerate(ranges):
+                        selections[w][k, speaker, j] = r
+            windows[speaker] = selections
+        return [windows[s] for s in sorted(windows, key=lambda x: (x is not None, x))]
+
+    def _iter_annotation_chunks(self, relevant_levels, windows, hierarchy):
+        for selections in windows:
+            previous_ids = {}
+            for selection in selections:
+                yield self._build_annotations(relevant_levels, selection, previous_ids, hierarchy)
+
+    @staticmethod
+    def _is_label_level(level, annotation_type):
+        return level.name == annotation_type or level.name == 'label' or level.label
+
+    @staticmethod
+    def _subannotation_values(sub):
+        if isinstance(sub, Tobi):
+            return sub.label, 'tone'
+        if isinstance(sub, BreakIndex):
+            return sub.value, 'break'
+        return None, sub.label
+
+    def _build_annotations(self, relevant_levels, selection, previous_ids, hierarchy, types_only=False):
+        annotation_tiers, segment_type = self._create_annotation_types(hierarchy)
+
+        for k in annotation_tiers.keys():
+            for speaker, speaker_levels in relevant_levels[k].items():
+                if (k, speaker) not in selection:
+                    continue
+                for i in range(*selection[k, speaker]):
                     type_properties = {}
                     token_properties = {}
                     label = None
@@ -123,7 +342,7 @@ class BaseParser(object):
                                     end = rl[i].time
                                 except AttributeError:
                                     pass
-                        if rl.name == k or rl.name == 'label' or rl.label:
+                        if self._is_label_level(rl, k):
                             if rl[i].value == '':
                                 label = '<SIL>'
                             elif rl[i].value is not None:
@@ -141,26 +360,24 @@ class BaseParser(object):
                     a.token_properties.update(token_properties)
                     a.speaker = speaker
                     if i != 0:
-                        a.previous_id = annotation_tiers[k][-1].id
+                        a.previous_id = previous_ids[k, speaker]
+                    previous_ids[k, speaker] = a.id
                     annotation_tiers[k].add(a)
-                for rl in speaker_levels:
+                for j, rl in enumerate(speaker_levels):
                     if types_only:
                         continue
                     if not rl.subannotation:
                         continue
-                    for sub in rl:
+                    for n in range(*selection[k, speaker, j]):
+                        sub = rl[n]
                         #TODO: Maybe will cause VOTs to be under wrong phone.
                         annotation = annotation_tiers[k].lookup(sub.midpoint, speaker=speaker)
-                        if isinstance(sub, Tobi):
-                            a = PGSubAnnotation(sub.label, 'tone', sub.begin, sub.end)
-                        elif isinstance(sub, BreakIndex):
-                            a = PGSubAnnotation(sub.value, 'break', sub.begin, sub.end)
-                        else:
-                            a = PGSubAnnotation(None, sub.label, sub.begin, sub.end)
+                        label, sub_type = self._subannotation_values(sub)
+                        a = PGSubAnnotation(label, sub_type, sub.begin, sub.end)
                         annotation.subannotations.append(a)
-                        if k not in self.hierarchy.subannotations:
-                            self.hierarchy.subannotations[k] = set()
-                        self.hierarchy.subannotations[k].add(a.type)
+                        if k not in hierarchy.subannotations:
+                            hierarchy.subannotations[k] = set()
+                        hierarchy.subannotations[k].add(a.type)
         for k, v in annotation_tiers.items():
             annotation_tiers[k].optimize_lookups()
             if not types_only:
@@ -175,19 +392,15 @@ class BaseParser(object):
                             pass
                             # raise
             if self.make_transcription and segment_type is not None and v.is_word:
-                v.type_property_keys.update(['transcription'])
                 annotation_tiers[segment_type].optimize_lookups()
                 for a in annotation_tiers[k]:
                     transcription = annotation_tiers[segment_type].lookup_range(a.begin, a.end, speaker=a.speaker)
                     a.type_properties['transcription'] = [x.label for x in transcription]
-                v.type_properties |= set([(tuple(['transcription', type("string")]))])
-                self.hierarchy.type_properties['word'] |= set([(tuple(['transcription', type("string")]))])
-            if self.make_label and 'transcription' in v.type_property_keys and v.is_word:
+            missing_label = any(a.label is None for a in annotation_tiers[k])
+            if self._add_derived_properties(v, segment_type, hierarchy, missing_label):
                 for a in annotation_tiers[k]:
                     if a.label is None:
                         a.label = ''.join(a.type_properties['transcription'])
-                        annotation_tiers[k].type_property_keys.add('label')
-                        annotation_tiers[k].token_property_keys.add('label')
         return annotation_tiers
 
     def parse_information(self, path, corpus_name):
@@ -207,6 +420,24 @@ class BaseParser(object):
             a list of data types
         """
         data = self.parse_discourse(path, types_only=True)
+        return self.discourse_information(data, corpus_name)
+
+    def discourse_information(self, data, corpus_name):
+        """
+        Collects the type and header information for an already parsed discourse
+
+        Parameters
+        ----------
+        data : :class:`~polyglotdb.io.discoursedata.DiscourseData`
+            Parsed data
+        corpus_name : str
+            name of the corpus
+
+        Returns
+        -------
+        dict
+            Types, type headers, token headers, subannotations and speakers of the discourse
+        """
         return_dict = {}
         return_dict['types'], return_dict['type_headers'] = data.types(corpus_name)
         return_dict['token_headers'] = data.token_headers
@@ -12,7 +12,7 @@ class MausParser(AlignerParser):
     phone_label = 'mau'
 
     def __init__(self, annotation_tiers, hierarchy, make_transcription=True,
-                 stop_check=None, call_back=None):
+                 stop_check=None, call_back=None, chunk_size=None):
         super(MausParser, self).__init__(annotation_tiers, hierarchy,
-                make_transcription, stop_check, call_back)
+                make_transcription, stop_check, call_back, chunk_size=chunk_size)
         self.speaker_parser = FilenameSpeakerParser(0)
@@ -21,14 +21,16 @@ class PartiturParser(BaseParser):
         Function to check for whether parsing should stop
     call_back : callable
         Function to report progress in parsing
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker to generate at a time when importing
     """
     _extensions = ['.par,2']
 
     def __init__(self, annotation_tiers, hierarchy,
-                 stop_check=None, call_back=None):
+                 stop_check=None, call_back=None, chunk_size=None):
         super(PartiturParser, self).__init__(annotation_tiers, hierarchy,
                                              make_transcription=False, make_label=False,
-                                             stop_check=stop_check, call_back=call_back)
+                                             stop_check=stop_check, call_back=call_back, chunk_size=chunk_size)
         self.speaker_parser = DirectorySpeakerParser()
 
     def parse_discourse(self, path, types_only=False):
@@ -19,14 +19,16 @@ class TranscriptionTextParser(BaseParser):
         Function to check whether to halt parsing
     call_back : callable, optional
         Function to output progress messages
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker to generate at a time when importing
     '''
 
     def __init__(self, annotation_tiers,
-                 stop_check=None, call_back=None):
+                 stop_check=None, call_back=None, chunk_size=None):
         super(TranscriptionTextParser, self).__init__(annotation_tiers,
                                                       Hierarchy({'word': None}), make_transcription=False,
                                                       make_label=True,
-                                                      stop_check=stop_check, call_back=call_back)
+                                                      stop_check=stop_check, call_back=call_back, chunk_size=chunk_size)
 
     def parse_discourse(self, path, types_only=False):
         '''
@@ -28,15 +28,17 @@ class TextgridParser(BaseParser):
         Function to check whether to halt parsing
     call_back : callable, optional
         Function to output progress messages
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker to generate at a time when importing
     """
     _extensions = ['.textgrid']
 
     def __init__(self, annotation_tiers, hierarchy, make_transcription=True,
                  make_label=False,
-                 stop_check=None, call_back=None):
+                 stop_check=None, call_back=None, chunk_size=None):
         super(TextgridParser, self).__init__(annotation_tiers, hierarchy,
                                              make_transcription=True, make_label=True,
-                                             stop_check=stop_check, call_back=call_back)
+                                             stop_check=stop_check, call_back=call_back, chunk_size=chunk_size)
 
     def load_textgrid(self, path):
         """
@@ -23,14 +23,16 @@ class TimitParser(BaseParser):
         Function to check whether to halt parsing
     call_back : callable, optional
         Function to output progress messages
+    chunk_size : int, optional
+        Number of annotations of the highest linguistic type per speaker to generate at a time when importing
     """
     _extensions = ['.wrd', '.WRD']
 
     def __init__(self, annotation_tiers, hierarchy,
-                 stop_check=None, call_back=None):
+                 stop_check=None, call_back=None, chunk_size=None):
         super(TimitParser, self).__init__(annotation_tiers, hierarchy,
                                           make_transcription=True, make_label=False,
-                                          stop_check=stop_check, call_back=call_back)
+                                          stop_check=stop_check, call_back=call_back, chunk_size=chunk_size)
         self.speaker_parser = DirectorySpeakerParser()
 
     def parse_discourse(self, word_path, types_only=False):
@@ -1,34 +1,115 @@
 from uuid import uuid1
+from bisect import bisect_left, bisect_right
 import hashlib
 
 from ..helper import normalize_values_for_neo4j
 
 
+_TYPE_ID_CACHE_SIZE = 100000
+
+_type_id_cache = {}
+
+
+def _type_id(values, corpus=None):
+    key = (values, corpus)
+    try:
+        return _type_id_cache[key]
+    except KeyError:
+        pass
+    except TypeError:
+        key = None
+    m = hashlib.sha1()
+    value = ' '.join(map(str, values))
+    if corpus is not None:
+        value += ' ' + corpus
+    m.update(value.encode())
+    out = m.hexdigest()
+    if key is not None:
+        if len(_type_id_cache) >= _TYPE_ID_CACHE_SIZE:
+            _type_id_cache.clear()
+        _type_id_cache[key] = out
+    return out
+
+
 class PGAnnotation(object):
+    """
+    Annotation parsed from a corpus file
+
+    Annotations use ``__slots__`` to keep memory down for large corpora, and their ids, property dictionaries and
+    subannotation lists are only created when first accessed.
+    """
+    __slots__ = ('_id', 'label', 'begin', 'end', '_type_properties', '_token_properties', 'super_id',
+                 'previous_id', 'speaker', '_subannotations')
+
     def __init__(self, label, begin, end):
-        self.id = uuid1()
+        self._id = None
         self.label = label
         if begin > end:
             begin, end = end, begin
         self.begin = begin
         self.end = end
-        try:
-            self.midpoint = (self.end - self.begin) / 2 + self.begin
-        except TypeError:
-            self.midpoint = None
 
-        self.type_properties = {}
-        self.token_properties = {}
+        self._type_properties = None
+        self._token_properties = None
         self.super_id = None
         self.previous_id = None
         self.speaker = None
 
-        self.subannotations = []
+        self._subannotations = None
+
+    @property
+    def id(self):
+        if self._id is None:
+            self._id = uuid1()
+        return self._id
+
+    @id.setter
+    def id(self, value):
+        self._id = value
+
+    @property
+    def midpoint(self):
+        try:
+            return (self.end - self.begin) / 2 + self.begin
+        except TypeError:
+            return None
+
+    @property
+    def type_properties(self):
+        if self._type_properties is None:
+            self._type_properties = {}
+        return self._type_properties
+
+    @type_properties.setter
+    def type_properties(self, value):
+        self._type_properties = value
+
+    @property
+    def token_properties(self):
+        if self._token_properties is None:
+            self._token_properties = {}
+        return self._token_properties
+
+    @token_properties.setter
+    def token_properties(self, value):
+        self._token_properties = value
+
+    @property
+    def subannotations(self):
+        if self._subannotations is None:
+            self._subannotations = []
+        return self._subannotations
+
+    @subannotations.setter
+    def subannotations(self, value):
+        self._subannotations = value
 
     def sha(self, corpus=None):
         """
         Constructs hash of values and corpus name
 
+        Hashes are cached by type values, so annotations of the same type only hash them once.
+
         Parameters
         ----------
         corpus : str
@@ -38,13 +119,7 @@ class PGAnnotation(object):
         str
             a hex string containing the digest of the values as hexadecimal numbers
         """
-        m = hashlib.sha1()
-        value = ' '.join(map(str, self.type_values()))
-        if corpus is not None:
-            value += ' ' + corpus
-        m.update(value.encode())
-        out = m.hexdigest()
-        return out
+        return _type_id(tuple(self.type_values()), corpus)
 
     def type_keys(self):
         """
@@ -111,6 +186,40 @@ class PGAnnotation(object):
                 yield normalized[k]
 
 
+class _IntervalIndex(object):
+    """
+    Sorted arrays over the annotations of a single speaker (or of all speakers), for bisection
+    by time point and by midpoint
+    """
+
+    def __init__(self, annotations):
+        timed = [(i, x) for i, x in enumerate(annotations) if x.begin is not None and x.end is not None]
+        by_begin = sorted(timed, key=lambda x: x[1].begin)
+        self.begins = [x.begin for _, x in by_begin]
+        self.annotations = [x for _, x in by_begin]
+        self.max_ends = []
+        max_end = None
+        for x in self.annotations:
+            if max_end is None or x.end > max_end:
+                max_end = x.end
+            self.max_ends.append(max_end)
+        by_midpoint = sorted(timed, key=lambda x: x[1].midpoint)
+        self.midpoints = [x.midpoint for _, x in by_midpoint]
+        self.midpoint_annotations = by_midpoint
+
+    def lookup(self, timepoint):
+        end = bisect_right(self.begins, timepoint)
+        # The first annotation whose end reaches the time point is where the running maximum end first does
+        ind = bisect_left(self.max_ends, timepoint, 0, end)
+        if ind < end:
+            return self.annotations[ind]
+        return None
+
+    def lookup_range(self, begin, end):
+        found = self.midpoint_annotations[bisect_left(self.midpoints, begin):bisect_right(self.midpoints, end)]
+        return [x for _, x in sorted(found, key=lambda x: (x[1].begin, x[0]))]
+
+
 class PGAnnotationType(object):
     def __init__(self, name):
         self.name = name
@@ -121,21 +230,29 @@ class PGAnnotationType(object):
         self.type_properties = set()
         self.token_properties = set()
         self.is_word = False
-        self._lookup_dict = None
+        self._index = None
+        self._speakers = set()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_index'] = None
+        return state
 
     def optimize_lookups(self):
         """
-        optimizes the lookup dictionary
+        Sorts the annotations by begin time and builds per-speaker interval indexes for
+        :meth:`lookup` and :meth:`lookup_range`
         """
-        if self._lookup_dict is not None:
+        if self._index is not None:
             return
-        self._list = sorted(self._list, key=lambda x: x.begin)
-        if len(self._list) > 1000:
-            self._lookup_dict = {}
-            cur = 0
-            while cur < len(self._list):
-                self._lookup_dict[cur] = self._list[cur].begin
-                cur += 1000
+        self._list = sorted(self._list, key=lambda x: (x.begin is None, x.begin))
+        by_speaker = {}
+        for x in self._list:
+            if x.speaker not in by_speaker:
+                by_speaker[x.speaker] = []
+            by_speaker[x.speaker].append(x)
+        self._index = {k: _IntervalIndex(v) for k, v in by_speaker.items()}
+        self._index[None] = _IntervalIndex(self._list)
 
     def add(self, annotation):
         """
@@ -147,6 +264,7 @@ class PGAnnotationType(object):
             the annotation to add
         """
         self._list.append(annotation)
+        self._index = None
         self.type_property_keys.update(annotation.type_keys())
         for k, v in annotation.type_properties.items():
             if isinstance(v, list):
@@ -157,6 +275,21 @@ class PGAnnotationType(object):
         self.token_property_keys.update(annotation.token_keys())
         self.token_properties.update((k, type(v)) for k, v in annotation.token_properties.items() if v is not None)
 
+    def merge(self, other):
+        """
+        Adds the properties and speakers of another PGAnnotationType object, but not its annotations
+
+        Parameters
+        ----------
+        other : :class:`~polyglotdb.io.types.standardized.PGAnnotationType`
+            the annotation type to merge
+        """
+        self.type_property_keys.update(other.type_property_keys)
+        self.token_property_keys.update(other.token_property_keys)
+        self.type_properties.update(other.type_properties)
+        self.token_properties.update(other.token_properties)
+        self._speakers.update(other.speakers)
+
     @property
     def speakers(self):
         """
@@ -167,7 +300,7 @@ class PGAnnotationType(object):
         speakers : set
             a set of speakers
         """
-        speakers = set()
+        speakers = set(self._speakers)
         for x in self:
             s = 'unknown'
             if x.speaker is not None:
@@ -177,45 +310,28 @@ class PGAnnotationType(object):
 
     def lookup(self, timepoint, speaker=None):
         """
-        Searches the lookup_dict for a particular begin time, and optionally a speaker 
+        Finds the earliest annotation that contains a time point, optionally restricted to a speaker
 
         Parameters
         ----------
         timepoint : double
-            the begin of the desired linguistic object
+            the time point the desired linguistic object contains
         speaker : str
             Defaults to None
+
+        Returns
+        -------
+        :class:`~polyglotdb.io.types.standardized.PGAnnotation` or None
+            The annotation, or None if no annotation contains the time point
         """
-        if self._lookup_dict is not None:
-            prev = 0
-            for ind, time in sorted(self._lookup_dict.items()):
-                if timepoint < time:
-                    if prev != 0:
-                        prev -= 500
-                    lookup_list = self._list[prev:ind + 100]
-                    break
-                prev = ind
-            else:
-                if ind != 0:
-                    ind -= 500
-                lookup_list = self._list[ind:]
-        else:
-            lookup_list = self._list
-        if speaker is None:
-            return next((x for x in lookup_list
-                         if timepoint >= x.begin and
-                         timepoint <= x.end),
-                        None)
-        else:
-            return next((x for x in lookup_list
-                         if x.speaker == speaker and
-                         timepoint >= x.begin and
-                         timepoint <= x.end),
-                        None)
+        self.optimize_lookups()
+        if speaker not in self._index:
+            return None
+        return self._index[speaker].lookup(timepoint)
 
     def lookup_range(self, begin, end, speaker=None):
         """
-        Searches the lookup_dict for objects between begin time, end time, and optionally a speaker 
+        Finds annotations whose midpoints are between a begin time and an end time, optionally restricted to a speaker
 
         Parameters
         ----------
@@ -225,36 +341,16 @@ class PGAnnotationType(object):
             the upper bound of the range
         speaker : str
             Defaults to None
+
+        Returns
+        -------
+        list
+            Annotations sorted by begin time
         """
-        if self._lookup_dict is not None:
-            prev = 0
-            mapping = sorted(self._lookup_dict.items())
-            for i, (ind, time) in enumerate(mapping):
-                if begin < time:
-                    if end < time:
-                        lookup_list = self._list[prev:ind]
-                    else:
-                        try:
-                            lookup_list = self._list[prev:mapping[i + 1][0]]
-                        except IndexError:
-                            lookup_list = self._list[prev:]
-                    break
-                prev = ind
-            else:
-                lookup_list = self._list[ind:]
-        else:
-            lookup_list = self._list
-        if speaker is None:
-            return sorted([x for x in lookup_list
-                           if x.midpoint >= begin and
-                           x.midpoint <= end],
-                          key=lambda x: x.begin)
-        else:
-            return sorted([x for x in lookup_list
-                           if x.speaker == speaker and
-                           x.midpoint >= begin and
-                           x.midpoint <= end],
-                          key=lambda x: x.begin)
+        self.optimize_lookups()
+        if speaker not in self._index:
+            return []
+        return self._index[speaker].lookup_range(begin, end)
 
     def __getitem__(self, key):
         return self._list[key]
@@ -264,13 +360,37 @@ class PGAnnotationType(object):
             yield a
 
 
+class PGAnnotationStream(dict):
+    """
+    PGAnnotationType objects with the properties and speakers of a discourse's annotations, but not the
+    annotations themselves, which are generated in chunks on demand
+
+    Parameters
+    ----------
+    chunks : callable
+        Function returning a generator of dictionaries of PGAnnotationType objects, each with a chunk of the
+        annotations
+    """
+
+    def __init__(self, chunks):
+        super(PGAnnotationStream, self).__init__()
+        self.chunks = chunks
+
+
 class PGSubAnnotation(PGAnnotation):
+    __slots__ = ('type',)
+
     def __init__(self, label, type, begin, end):
-        self.id = uuid1()
+        self._id = None
         self.label = label
         self.type = type
         self.begin = begin
         self.end = end
 
-        self.type_properties = {}
-        self.token_properties = {}
+        self._type_properties = None
+        self._token_properties = None
+        self.super_id = None
+        self.previous_id = None
+        self.speaker = None
+
+        self._subannotations = None
@@ -143,8 +143,11 @@ class AggregationAttribute(AcousticAttribute):
         data = self.attribute.hydrate(corpus, utterance_id, begin, end)
         agg_data = {}
         for i, c in enumerate(self.output_columns):
-            gen = [x[self.attribute.output_columns[i]] for x in data if self.attribute.output_columns[i] in x]
-            gen = [x for x in gen if x is not None]
+            column = data.column(self.attribute.output_columns[i])
+            if column is None:
+                gen = []
+            else:
+                gen = [x for x in column.tolist() if x is not None and x == x]
             if not gen:
                 agg_data[c] = None
             else:
@@ -215,11 +218,7 @@ class Track(AggregationAttribute):
     def hydrate(self, corpus, utterance_id, begin, end):
         data = self.attribute.hydrate(corpus, utterance_id, begin, end)
         if self.attribute.relative_time:
-            begin = Decimal(begin)
-            end = Decimal(end)
-            duration = end - begin
-            for p in data:
-                p.time = (p.time - begin) / duration
+            data = data.relative(Decimal(begin), Decimal(end))
         return data
 
     def __repr__(self):
@@ -251,9 +250,14 @@ class InterpolatedTrack(Track):
                     undef_regions.append((x1, x[i + 1]))
         new_data = RawTrack()
         for o in self.attribute.output_columns:
-            y = [data[x1][o] for x1 in x if data[x1][o] and data[x1][o] > 0]
+            column = data.column(o)
+            if column is None:
+                voiced = []
+            else:
+                voiced = [(x1, v) for x1, v in zip(x, column.tolist()) if v and v > 0]
+            y = [v for _, v in voiced]
             if len(y) > 1:
-                f = interpolate.interp1d([float(x1) for x1 in x if data[x1][o] and data[x1][o] > 0], y)
+                f = interpolate.interp1d([float(x1) for x1, _ in voiced], y)
             for k in new_times:
                 out_time = k
                 if self.attribute.relative_time:
@@ -1,4 +1,4 @@
-from ..base.helper import key_for_cypher, value_for_cypher
+from ..base.helper import key_for_cypher
 
 from ..base.elements import (ClauseElement, EqualClauseElement as BaseEqualClauseElement,
                              GtClauseElement as BaseGtClauseElement, GteClauseElement as BaseGteClauseElement,
@@ -138,9 +138,13 @@ class ContainsClauseElement(AnnotationClauseElement):
     sign = 'contains'
     template = '''({alias})<-[:contained_by]-({token})-[:is_a]->({type} {{{label}: {value}}})'''
 
+    def __init__(self, attribute, value):
+        super(ContainsClauseElement, self).__init__(attribute, value)
+        self.value_alias_prefix = 'contains_'
+
     def for_cypher(self):
         kwargs = {'alias': self.attribute.annotation.alias,
-                  'value': value_for_cypher(self.value),
+                  'value': self.cypher_value_string(),
                   'label': key_for_cypher(self.attribute.label),
                   'type': ':{}_type'.format(self.attribute.node.node_type),
                   'token': ':{}'.format(self.attribute.node.node_type)}
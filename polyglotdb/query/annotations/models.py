@@ -6,6 +6,8 @@ from ..base.helper import value_for_cypher
 
 
 class BaseAnnotation(object):
+    __slots__ = ()
+
     def load(self, id):
         """ raise NotImplementedError"""
         raise (NotImplementedError)
@@ -60,6 +62,16 @@ class BaseAnnotation(object):
 
 
 class LinguisticAnnotation(BaseAnnotation):
+    """
+    Annotation model for query results and loaded annotations
+
+    Models use ``__slots__``, and for query results the models of their preloaded annotations, speakers and
+    discourses are only created when one of them is first accessed.
+    """
+    __slots__ = ('_corpus_context', '_unsaved', '_type', '_node', '_type_node', '_previous', '_following',
+                 '_subannotations', '_id', '_label', '_supers', '_subs', '_speaker', '_discourse', '_tracks',
+                 '_preloaded', '_pending_preloads')
+
     def __init__(self, corpus_context=None):
         self._corpus_context = corpus_context
         self._unsaved = False
@@ -80,6 +92,7 @@ class LinguisticAnnotation(BaseAnnotation):
         self._tracks = {}
 
         self._preloaded = False
+        self._pending_preloads = None
 
     def __str__(self):
         return '<{} annotation with id: {}>'.format(self._type, self._node['id'])
@@ -120,6 +133,28 @@ class LinguisticAnnotation(BaseAnnotation):
             for t in v:
                 t.corpus_context = context
 
+    def _set_node(self, item, annotation_type):
+        # Like setting node, but with the annotation type given rather than added to the record
+        self._node = item
+        self._id = item['id']
+        if annotation_type in self._corpus_context.hierarchy:
+            self._type = annotation_type
+
+    def _load_preloads(self):
+        from .results import hydrate_preloads
+        r, to_find, to_preload, shared = self._pending_preloads
+        self._pending_preloads = None
+        hydrate_preloads(self, r, to_find, to_preload, self._corpus_context, shared)
+
+    def _is_related(self, key):
+        if key in ['previous', 'following', 'speaker', 'discourse'] or key.startswith('previous') or \
+                key.startswith('following'):
+            return True
+        hierarchy = self.corpus_context.hierarchy
+        if key in hierarchy.get_lower_types(self._type) or key in hierarchy.get_higher_types(self._type):
+            return True
+        return key in hierarchy.subannotations.get(self._type, [])
+
     @property
     def properties(self):
         """ Returns sorted untion of node property keys and type_node property keys """
@@ -193,6 +228,8 @@ class LinguisticAnnotation(BaseAnnotation):
             return self
         if key == 'current':
             return self
+        if self._pending_preloads is not None and self._is_related(key):
+            self._load_preloads()
         if key == 'label' and self._type == 'utterance':
             return '{} ({} to {})'.format(self.discourse.name, self.begin, self.end)
         if key == 'previous':
@@ -482,6 +519,8 @@ class LinguisticAnnotation(BaseAnnotation):
 
 
 class SubAnnotation(BaseAnnotation):
+    __slots__ = ('_corpus_context', '_type', '_id', '_node', '_annotation', '_unsaved')
+
     def __init__(self, corpus_context=None):
         self._corpus_context = corpus_context
         self._type = None
@@ -573,6 +612,8 @@ class SubAnnotation(BaseAnnotation):
 
 
 class Speaker(SubAnnotation):
+    __slots__ = ()
+
     def __init__(self, corpus_context=None):
         self._corpus_context = corpus_context
         self._type = 'Speaker'
@@ -619,6 +660,8 @@ class Speaker(SubAnnotation):
 
 
 class Discourse(Speaker):
+    __slots__ = ()
+
     def __init__(self, corpus_context=None):
         self._corpus_context = corpus_context
         self._type = 'Discourse'
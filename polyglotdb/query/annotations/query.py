@@ -1,10 +1,13 @@
 
 import copy
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 
 from .elements import (RightAlignedClauseElement, LeftAlignedClauseElement,
                        NotRightAlignedClauseElement, NotLeftAlignedClauseElement)
 
-from .attributes import (HierarchicalAnnotation)
+from .attributes import (HierarchicalAnnotation, DiscourseAnnotation)
 
 from .results import QueryResults
 
@@ -166,10 +169,18 @@ class GraphQuery(BaseQuery):
         self._preload_acoustics.extend(args)
         return self
 
-    def all(self):
+    def all(self, stream=False, fetch_size=None):
         """
         Returns all results for the query
 
+        Parameters
+        ----------
+        stream : bool
+            If True, fetch results from the database as they are iterated over rather than all at once, so that
+            memory use is bounded by the fetch size rather than the number of results
+        fetch_size : int, optional
+            Number of records to fetch at a time when streaming, defaults to the ``query_fetch_size`` configuration
+
         Returns
         -------
         res_list : list
@@ -187,6 +198,11 @@ class GraphQuery(BaseQuery):
                 self.preload(getattr(self.to_find, 'discourse'))
             if not speaker_found:
                 self.preload(getattr(self.to_find, 'speaker'))
+            # Tracks are fetched for the utterances of a block of results at once, so their IDs are needed in the records
+            if self.to_find.node_type != 'utterance' and 'utterance' in self.corpus.hierarchy.annotation_types:
+                if not any(isinstance(p, HierarchicalAnnotation) and p.node_type == 'utterance'
+                           for p in self._preload):
+                    self.preload(getattr(self.to_find, 'utterance'))
         if self._acoustic_columns:
             for a in self._acoustic_columns:
                 discourse_found = False
@@ -223,7 +239,96 @@ class GraphQuery(BaseQuery):
                         self._hidden_columns.append(a.node.id.column_name(a.utterance_alias))
                     else:
                         self._hidden_columns.append(a.node.utterance.id.column_name(a.utterance_alias))
-        return QueryResults(self)
+        return QueryResults(self, stream=stream, fetch_size=fetch_size)
+
+    def profile(self):
+        """
+        Run the query with ``PROFILE``, fetching and hydrating all its results, to see where the time goes
+
+        The sub-queries of a :class:`SplitQuery` are all collected in the same profile.
+
+        Returns
+        -------
+        :class:`~polyglotdb.query.base.profile.QueryProfile`
+            Timings of each stage of running the query, and the plans of its statements with the database hits, rows
+            and time of each operator
+        """
+        with self.corpus.profile_queries('PROFILE') as profile:
+            results = self.all()
+            if results is not None:
+                for _ in results:
+                    pass
+        return profile
+
+    def explain(self):
+        """
+        Get the plans the database would use for the query, with ``EXPLAIN``, without running it
+
+        Returns
+        -------
+        :class:`~polyglotdb.query.base.profile.QueryProfile`
+            Plans of the query's statements, along with the time taken to generate them
+        """
+        with self.corpus.profile_queries('EXPLAIN') as profile:
+            self.all()
+        return profile
+
+    def page_after(self, last_key=None, size=100):
+        """
+        Get a page of results using keyset pagination, ordered by discourse, begin time and id
+
+        Rather than skipping over the results of previous pages, like :meth:`offset`, each page filters on the
+        key of the last result of the previous page, so later pages take as long as the first.
+
+        Parameters
+        ----------
+        last_key : tuple, optional
+            Discourse, begin time and id of the last result of the previous page, as given by the ``last_key`` of that
+            page's results, defaults to getting the first page
+        size : int
+            Number of results in the page, defaults to 100
+
+        Returns
+        -------
+        :class:`~polyglotdb.query.annotations.results.QueryResults`
+            Results in the page, with the key of the last result as ``last_key``, which is None for an empty page
+        """
+        from ..base.complex import or_, and_
+        if self._order_by or self._offset is not None:
+            raise GraphQueryError('Pages are ordered by discourse, begin and id, and cannot be combined with '
+                                  'order_by or offset.')
+        q = GraphQuery(self.corpus, self.to_find, self.stop_check)
+        for p in self._parameters:
+            if isinstance(getattr(self, p), list):
+                setattr(q, p, list(getattr(self, p)))
+            else:
+                setattr(q, p, copy.deepcopy(getattr(self, p)))
+        discourse = getattr(self.to_find, 'discourse')
+        if last_key is not None:
+            last_discourse, last_begin, last_id = last_key
+            # The clauses are grouped so that their parameters do not clash with other filters on the same attributes
+            q._criterion.append(and_(discourse.name >= last_discourse,
+                                     or_(discourse.name > last_discourse,
+                                         self.to_find.begin > last_begin,
+                                         and_(self.to_find.begin == last_begin, self.to_find.id > last_id))))
+        q._order_by = [(discourse.name, False), (self.to_find.begin, False), (self.to_find.id, False)]
+        q._limit = size
+        if self._columns:
+            q._hidden_columns.extend([discourse.name.column_name('page_discourse'),
+                                      self.to_find.begin.column_name('page_begin'),
+                                      self.to_find.id.column_name('page_id')])
+        elif not any(isinstance(x, DiscourseAnnotation) for x in q._preload):
+            q._preload.append(discourse)
+        results = q.all()
+        results.last_key = None
+        if results.cache:
+            r = results.cache[-1]
+            if self._columns:
+                results.last_key = (r['page_discourse'], r['page_begin'], r['page_id'])
+            else:
+                node = r[self.to_find.alias]
+                results.last_key = (r[discourse.alias]['name'], node['begin'], node['id'])
+        return results
 
     def create_subset(self, label):
         labels_to_add = []
@@ -235,6 +340,10 @@ class GraphQuery(BaseQuery):
             self.corpus.hierarchy.add_token_subsets(self.corpus, self.to_find.node_type, labels_to_add)
 
     def set_properties(self, **kwargs):
+        super(GraphQuery, self).set_properties(**kwargs)
+        self._update_token_properties(**kwargs)
+
+    def _update_token_properties(self, **kwargs):
         props_to_remove = []
         props_to_add = []
         for k, v in kwargs.items():
@@ -243,7 +352,6 @@ class GraphQuery(BaseQuery):
             else:
                 if not self.corpus.hierarchy.has_token_property(self.to_find.node_type, k):
                     props_to_add.append((k, type(kwargs[k])))
-        super(GraphQuery, self).set_properties(**kwargs)
         if props_to_add:
             self.corpus.hierarchy.add_token_properties(self.corpus, self.to_find.node_type, props_to_add)
         if props_to_remove:
@@ -256,7 +364,9 @@ class GraphQuery(BaseQuery):
     def cache(self, *args):
         self._cache.extend(args)
         self.corpus.execute_cypher(self.cypher(), **self.cypher_params())
+        self._update_cached_properties(*args)
 
+    def _update_cached_properties(self, *args):
         props_to_add = []
         for k in args:
             k = k.output_label
@@ -349,6 +459,13 @@ class SplitQuery(GraphQuery):
         if filter_on_speaker and filter_on_discourse:
             yield self.base_query()
             return
+        if selection:
+            num_splits = len([x for x in splitter_names if (x in selection) == include])
+        else:
+            num_splits = len(splitter_names)
+        if not self.corpus.query_planner.should_split(self, num_splits, self.corpus.config.query_split_threshold):
+            yield self.base_query()
+            return
         for i, x in enumerate(splitter_names):
             if selection:
                 if include and x not in selection:
@@ -365,6 +482,65 @@ class SplitQuery(GraphQuery):
             base = base.filter(splitter_attribute == x)
             yield base
 
+    def _map_split_queries(self, function):
+        """
+        Apply a function to each split query, running up to ``query_workers`` of them at once on their own
+        database sessions
+
+        Parameters
+        ----------
+        function : callable
+            Function to apply to each split query
+
+        Yields
+        ------
+        object
+            Return values of the function, in the order of the split queries
+        """
+        workers = self._query_workers()
+        if workers <= 1:
+            for q in self.split_queries():
+                if self.stop_check():
+                    return
+                yield function(q)
+            return
+        call_back = self.call_back
+        self.call_back = None
+        try:
+            queries = list(self.split_queries())
+        finally:
+            self.call_back = call_back
+        total = len(queries)
+        if call_back is not None:
+            call_back(0, total)
+        queries = iter(queries)
+        pending = deque()
+        done = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for q in islice(queries, workers):
+                    pending.append(executor.submit(function, q))
+                while pending:
+                    result = pending.popleft().result()
+                    if self.stop_check():
+                        return
+                    for q in islice(queries, 1):
+                        pending.append(executor.submit(function, q))
+                    done += 1
+                    if call_back is not None:
+                        call_back(done)
+                        call_back('Queried {} {} of {}...'.format(self.splitter, done, total))
+                    yield result
+            finally:
+                for f in pending:
+                    f.cancel()
+
+    def _query_workers(self):
+        try:
+            return self.corpus.config.query_workers
+        except AttributeError:
+            return 1
+
     def set_pause(self):
         """ sets a pause in queries """
         for q in self.split_queries():
@@ -372,59 +548,63 @@ class SplitQuery(GraphQuery):
                 return
             q.set_pause()
 
-    def all(self):
-        """ returns all results from a query """
+    def all(self, stream=False, fetch_size=None):
+        """ returns all results from a query, see :meth:`~polyglotdb.query.annotations.query.GraphQuery.all` """
         results = None
-        for q in self.split_queries():
-            if self.stop_check():
-                return
+        if stream:
+            for q in self.split_queries():
+                if self.stop_check():
+                    return
+                if results is None:
+                    results = q.all(stream=stream, fetch_size=fetch_size)
+                else:
+                    results.add_results(q)
+            return results
+        for r in self._map_split_queries(lambda q: q.all()):
             if results is None:
-                r = q.all()
                 results = r
             else:
-                results.add_results(q)
+                results.cache.extend(r.cache)
+        if self.stop_check():
+            return
         return results
 
     def count(self):
-        count = 0
-        for q in self.split_queries():
-            count += q.count()
-        return count
+        return sum(self._map_split_queries(lambda q: q.count()))
 
     def to_csv(self, path):
-        for i, q in enumerate(self.split_queries()):
+        # Split queries run in parallel are fetched in full by their worker, and are written out in order
+        stream = self._query_workers() <= 1
+        for i, r in enumerate(self._map_split_queries(lambda q: q.all(stream=stream))):
             if i == 0:
                 mode = 'w'
             else:
                 mode = 'a'
-            r = q.all()
-
             r.to_csv(path, mode=mode)
 
     def delete(self):
         """ deletes the query """
-        for q in self.split_queries():
-            if self.stop_check():
-                return
-            q.delete()
+        for _ in self._map_split_queries(lambda q: q.delete()):
+            pass
 
     def cache(self, *args):
-        for q in self.split_queries():
-            if self.stop_check():
-                return
-            q.cache(*args)
+        # Token properties are added to the hierarchy first, as that sets a default value on every token
+        self._update_cached_properties(*args)
+
+        def cache_query(q):
+            q._cache.extend(args)
+            q.corpus.execute_cypher(q.cypher(), **q.cypher_params())
+
+        for _ in self._map_split_queries(cache_query):
+            pass
 
     def set_label(self, *args):
         """ sets the query type"""
-        for q in self.split_queries():
-            if self.stop_check():
-                return
-            q.set_label(*args)
+        for _ in self._map_split_queries(lambda q: q.set_label(*args)):
+            pass
 
     def set_properties(self, **kwargs):
         """ sets the query token """
-        for q in self.split_queries():
-            if self.stop_check():
-                return
-            q.set_properties(**kwargs)
-
+        self._update_token_properties(**kwargs)
+        for _ in self._map_split_queries(lambda q: BaseQuery.set_properties(q, **kwargs)):
+            pass
@@ -1,39 +1,117 @@
 
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
 from polyglotdb.exceptions import GraphQueryError
 
 from ..base.results import BaseQueryResults, BaseRecord
 
-from .attributes import (HierarchicalAnnotation, SubPathAnnotation,
+from ..base.attributes import CollectionNode
+from .attributes import (AnnotationNode, HierarchicalAnnotation, SubPathAnnotation,
                          SubAnnotation as QuerySubAnnotation,
                          SpeakerAnnotation, DiscourseAnnotation,
                          Track as TrackAnnotation)
+from .attributes.path import PositionalAnnotation
 from .attributes.precedence import FollowingAnnotation, PreviousAnnotation
 from ...acoustics.classes import Track
 from .models import LinguisticAnnotation, SubAnnotation, Speaker, Discourse
 
 
-def hydrate_model(r, to_find, to_find_type, to_preload, to_preload_acoustics, corpus):
-    base_annotation_type = to_find.replace('node_', '')
+def hydrate_model(r, to_find, to_find_type, to_preload, to_preload_acoustics, corpus, shared=None):
+    """
+    Create an annotation model from a query record
+
+    Models of the preloaded annotations, speakers and discourses are only created when they are first accessed,
+    see :func:`hydrate_preloads`.
+
+    Parameters
+    ----------
+    r : dict
+        Record of the query
+    to_find : str
+        Alias of the annotation in the record
+    to_find_type : str
+        Alias of the annotation's type in the record
+    to_preload : list
+        Preloaded annotations, speakers and discourses
+    to_preload_acoustics : list
+        Preloaded acoustic tracks
+    corpus : :class:`~polyglotdb.corpus.CorpusContext`
+        Corpus that was queried
+    shared : dict, optional
+        Speaker and discourse models to reuse across records, indexed by their class and name
+
+    Returns
+    -------
+    :class:`~polyglotdb.query.annotations.models.LinguisticAnnotation`
+        Annotation model
+    """
     a = LinguisticAnnotation(corpus)
-    r[to_find]['neo4j_label'] = to_find.replace('node_', '')
-    a.node = r[to_find]
+    a._set_node(r[to_find], to_find.replace('node_', ''))
     a.type_node = r[to_find_type]
     a._preloaded = True
+    if to_preload:
+        a._pending_preloads = (r, to_find, to_preload, shared)
+
+    for pre in to_preload_acoustics:
+        if a._type == 'utterance':
+            utterance_id = a.id
+        else:
+            utterance_id = a.utterance.id
+        # Tracks are normally fetched for blocks of records beforehand, so this is only for utterances that could
+        # not be, like when the utterance, discourse or speaker of the records are not preloaded
+        if utterance_id not in pre.attribute.cache:
+            data = corpus.get_utterance_acoustics(pre.attribute.label, utterance_id, a.discourse.name, a.speaker.name)
+            pre.attribute.cache[utterance_id] = data
+        a._load_track(pre)
+    return a
+
+
+def _shared_model(model_class, node, corpus, shared):
+    if shared is None:
+        m = model_class(corpus)
+        m.node = node
+        return m
+    key = (model_class, node['name'])
+    try:
+        return shared[key]
+    except KeyError:
+        m = model_class(corpus)
+        m.node = node
+        shared[key] = m
+    return m
+
+
+def hydrate_preloads(a, r, to_find, to_preload, corpus, shared=None):
+    """
+    Create the models for the preloaded annotations, speakers and discourses of an annotation model
+
+    Parameters
+    ----------
+    a : :class:`~polyglotdb.query.annotations.models.LinguisticAnnotation`
+        Annotation model created from the record
+    r : dict
+        Record of the query
+    to_find : str
+        Alias of the annotation in the record
+    to_preload : list
+        Preloaded annotations, speakers and discourses
+    corpus : :class:`~polyglotdb.corpus.CorpusContext`
+        Corpus that was queried
+    shared : dict, optional
+        Speaker and discourse models to reuse across records, indexed by their class and name
+    """
+    base_annotation_type = to_find.replace('node_', '')
     for pre in to_preload:
         if isinstance(pre, DiscourseAnnotation):
-            pa = Discourse(corpus)
-            pa.node = r[pre.alias]
-            a._discourse = pa
+            a._discourse = _shared_model(Discourse, r[pre.alias], corpus, shared)
         elif isinstance(pre, SpeakerAnnotation):
-            pa = Speaker(corpus)
-            pa.node = r[pre.alias]
-            a._speaker = pa
+            a._speaker = _shared_model(Speaker, r[pre.alias], corpus, shared)
 
     for pre in to_preload:
         if isinstance(pre, HierarchicalAnnotation):
             pa = LinguisticAnnotation(corpus)
-            r[pre.alias]['neo4j_label'] = pre.alias.split('_')[-1]
-            pa.node = r[pre.alias]
+            pa._set_node(r[pre.alias], pre.alias.split('_')[-1])
             pa.type_node = r[pre.type_alias]
             pa._preloaded = True
             pa._discourse = a._discourse
@@ -43,7 +121,6 @@ def hydrate_model(r, to_find, to_find_type, to_preload, to_preload_acoustics, co
             subannotations = r[pre.collection_alias]
             for s in subannotations:
                 sa = SubAnnotation(corpus)
-                s['neo4j_label'] = pre.collection_alias.split('_in_')[0].replace('node_', '')
                 sa._annotation = a
                 sa.node = s
                 if sa._type not in a._subannotations:
@@ -56,14 +133,12 @@ def hydrate_model(r, to_find, to_find_type, to_preload, to_preload_acoustics, co
             subannotations = r[pre.subannotation_alias]
             for i, e in enumerate(subs):
                 pa = LinguisticAnnotation(corpus)
-                e['neo4j_label'] = pre.collected_node.alias.replace('node_', '')
-                pa.node = e
+                pa._set_node(e, pre.collected_node.alias.replace('node_', ''))
                 pa.type_node = sub_types[i]
                 pa._preloaded = True
                 for s in subannotations[i]:
                     sa = SubAnnotation(corpus)
                     sa._annotation = pa
-                    s['neo4j_label'] = pre.subannotation_alias.split('_in_')[0].replace('node_', '')
                     sa.node = s
                     if sa._type not in pa._subannotations:
                         pa._subannotations[sa._type] = []
@@ -80,9 +155,7 @@ def hydrate_model(r, to_find, to_find_type, to_preload, to_preload_acoustics, co
             break
         pa = LinguisticAnnotation(corpus)
         pa._preloaded = True
-        pa = LinguisticAnnotation(corpus)
-        r[pre.alias]['neo4j_label'] = pre.alias.split('_')[-1]
-        pa.node = r[pre.alias]
+        pa._set_node(r[pre.alias], pre.alias.split('_')[-1])
         pa.type_node = r[pre.type_alias]
         pa._discourse = a._discourse
         pa._speaker = a._speaker
@@ -97,8 +170,7 @@ def hydrate_model(r, to_find, to_find_type, to_preload, to_preload_acoustics, co
             break
         pa = LinguisticAnnotation(corpus)
         pa._preloaded = True
-        r[pre.alias]['neo4j_label'] = pre.alias.split('_')[-1]
-        pa.node = r[pre.alias]
+        pa._set_node(r[pre.alias], pre.alias.split('_')[-1])
         pa.type_node = r[pre.type_alias]
         pa._discourse = a._discourse
         pa._speaker = a._speaker
@@ -115,9 +187,7 @@ def hydrate_model(r, to_find, to_find_type, to_preload, to_preload_acoustics, co
                 break
             pa = LinguisticAnnotation(corpus)
             pa._preloaded = True
-            pa = LinguisticAnnotation(corpus)
-            r[pre.alias]['neo4j_label'] = pre.alias.split('_')[-1]
-            pa.node = r[pre.alias]
+            pa._set_node(r[pre.alias], pre.alias.split('_')[-1])
             pa.type_node = r[pre.type_alias]
             pa._discourse = a._discourse
             pa._speaker = a._speaker
@@ -132,40 +202,77 @@ def hydrate_model(r, to_find, to_find_type, to_preload, to_preload_acoustics, co
                 break
             pa = LinguisticAnnotation(corpus)
             pa._preloaded = True
-            r[pre.alias]['neo4j_label'] = pre.alias.split('_')[-1]
-            pa.node = r[pre.alias]
+            pa._set_node(r[pre.alias], pre.alias.split('_')[-1])
             pa.type_node = r[pre.type_alias]
             pa._discourse = a._discourse
             pa._speaker = a._speaker
             current._previous = pa
             current = pa
 
-    for pre in to_preload_acoustics:
-        if a._type == 'utterance':
-            utterance_id = a.id
-        else:
-            utterance_id = a.utterance.id
-        if utterance_id not in pre.attribute.cache:
-            data = corpus.get_utterance_acoustics(pre.attribute.label, utterance_id, a.discourse.name, a.speaker.name)
-            pre.attribute.cache[utterance_id] = data
-        a._load_track(pre)
-    return a
+
+def attribute_type(attribute, hierarchy):
+    """
+    Look up the type of a query column in the corpus hierarchy
+
+    Parameters
+    ----------
+    attribute : :class:`~polyglotdb.query.base.attributes.NodeAttribute`
+        Column of a query
+    hierarchy : :class:`~polyglotdb.structure.Hierarchy`
+        Hierarchy of the corpus
+
+    Returns
+    -------
+    type or None
+        Type of the column's values, or None if it is not known
+    """
+    node = attribute.node
+    if isinstance(node, CollectionNode) and not isinstance(node, PositionalAnnotation):
+        return list
+    label = attribute.label
+    if label in ['begin', 'end', 'duration']:
+        return float
+    if label in ['id', 'label']:
+        return str
+    if isinstance(node, DiscourseAnnotation):
+        properties = hierarchy.discourse_properties
+    elif isinstance(node, SpeakerAnnotation):
+        properties = hierarchy.speaker_properties
+    elif isinstance(node, AnnotationNode):
+        properties = hierarchy.token_properties.get(node.node_type, set()) | \
+                     hierarchy.type_properties.get(node.node_type, set())
+    else:
+        return None
+    for name, t in properties:
+        if name == label:
+            return t
+    return None
 
 
 class QueryResults(BaseQueryResults):
-    def __init__(self, query):
-        super(QueryResults, self).__init__(query)
+    def __init__(self, query, stream=False, fetch_size=None):
+        super(QueryResults, self).__init__(query, stream=stream, fetch_size=fetch_size)
         self.speaker_discourse_channels = {}
+        self._shared_models = {}
+        self._prefetched_blocks = set()
         self.num_tracks = 0
         self.track_columns = []
         if query._columns:
+            hierarchy = query.corpus.hierarchy
+            for x in query._columns:
+                self._column_types[x.output_alias.replace('`', '')] = attribute_type(x, hierarchy)
             self._acoustic_columns = query._acoustic_columns
             for x in query._acoustic_columns:
+                acoustic_types = dict(hierarchy.acoustic_properties.get(x.attribute.label, []))
                 if isinstance(x, TrackAnnotation):
                     self.num_tracks += 1
                     self.track_columns.extend(y for y in x.output_columns if y not in self.track_columns)
+                    for y in x.output_columns:
+                        self._column_types[y] = acoustic_types.get(y, float)
                 else:
                     self._columns.extend(x.output_columns)
+                    for y in x.output_columns:
+                        self._column_types[y] = float
         if query._columns and self._acoustic_columns:
             statement = '''MATCH (s:Speaker:{corpus_name})-[r:speaks_in]->(d:Discourse:{corpus_name})
             RETURN s.name as speaker, d.name as discourse, r.channel as channel'''.format(corpus_name=self.corpus.cypher_safe_name)
@@ -187,34 +294,183 @@ class QueryResults(BaseQueryResults):
     def columns(self):
         return self._columns + self.track_columns
 
+    def __getitem__(self, key):
+        if not self.stream and 0 <= key < len(self.cache) and self._acoustic_labels():
+            self._prefetch_cache_block(key)
+        return super(QueryResults, self).__getitem__(key)
+
+    def _block_size(self):
+        if self.fetch_size is None:
+            return self.corpus.config.query_fetch_size
+        return self.fetch_size
+
+    def _prefetch_cache_block(self, index):
+        """
+        Fetch the acoustic tracks for the block of loaded records containing an index, so that indexing into the
+        results fetches them in batches rather than one utterance at a time
+
+        Parameters
+        ----------
+        index : int
+            Index of a record in the loaded records
+        """
+        block_size = self._block_size()
+        begin = index - index % block_size
+        if begin in self._prefetched_blocks:
+            return
+        self._prefetched_blocks.add(begin)
+        self._prefetch_acoustics(self.cache[begin:begin + block_size])
+
+    def _stream_records(self):
+        if not self._acoustic_labels():
+            for r in super(QueryResults, self)._stream_records():
+                yield r
+            return
+        # Acoustic tracks for the next block of records are fetched in the background while the block after it is
+        # read from the graph database
+        block_size = self._block_size()
+        records = self._raw_records()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            previous = None
+            while True:
+                block = list(islice(records, block_size))
+                if not block:
+                    break
+                future = executor.submit(self._prefetch_acoustics, block)
+                if previous is not None:
+                    for r in self._sanitize_block(*previous):
+                        yield r
+                previous = block, future
+            if previous is not None:
+                for r in self._sanitize_block(*previous):
+                    yield r
+
+    def _sanitize_block(self, block, future):
+        future.result()
+        for r in block:
+            yield self._sanitize_record(r)
+
+    def _acoustic_labels(self):
+        if self.models:
+            if self._utterance_alias() is None:
+                return []
+            return [a.attribute.label for a in self._preload_acoustics]
+        return [a.attribute.label for a in self._acoustic_columns]
+
+    def _utterance_alias(self):
+        if self._to_find == 'node_utterance':
+            return self._to_find
+        for pre in self._preload:
+            if isinstance(pre, HierarchicalAnnotation) and pre.node_type == 'utterance':
+                return pre.alias
+        return None
+
+    def _utterances_to_fetch(self, block):
+        """
+        Collect the utterances in a block of records whose acoustic tracks are not cached yet
+
+        Parameters
+        ----------
+        block : list
+            Records of the query
+
+        Returns
+        -------
+        dict
+            Tuples of the ID, discourse name and speaker name of each utterance, indexed by the utterance ID and
+            then the name of the acoustic track
+        """
+        needed = {}
+        if self.models:
+            discourse_alias = None
+            speaker_alias = None
+            for pre in self._preload:
+                if isinstance(pre, DiscourseAnnotation):
+                    discourse_alias = pre.alias
+                elif isinstance(pre, SpeakerAnnotation):
+                    speaker_alias = pre.alias
+            utterance_alias = self._utterance_alias()
+            if discourse_alias is None or speaker_alias is None or utterance_alias is None:
+                return needed
+            for a in self._preload_acoustics:
+                label = a.attribute.label
+                for r in block:
+                    if r[utterance_alias] is None:
+                        continue
+                    utterance_id = r[utterance_alias]['id']
+                    if utterance_id in a.attribute.cache:
+                        continue
+                    needed.setdefault(label, {})[utterance_id] = (utterance_id, r[discourse_alias]['name'],
+                                                                  r[speaker_alias]['name'])
+            return needed
+        for a in self._acoustic_columns:
+            label = a.attribute.label
+            for r in block:
+                if r[a.begin_alias] is None:
+                    continue
+                utterance_id = r[a.utterance_alias]
+                if utterance_id in a.attribute.cache:
+                    continue
+                needed.setdefault(label, {})[utterance_id] = (utterance_id, r[a.discourse_alias],
+                                                              r[a.speaker_alias])
+        return needed
+
+    def _prefetch_acoustics(self, block):
+        profile = self.corpus.query_profile
+        if profile is None:
+            self._fetch_acoustics(block)
+        else:
+            with profile.time('hydrate_acoustics'):
+                self._fetch_acoustics(block)
+
+    def _fetch_acoustics(self, block):
+        for label, utterances in self._utterances_to_fetch(block).items():
+            tracks = self.corpus.get_utterances_acoustics(label, utterances.values())
+            self.acoustic_cache[label].update(tracks)
+
     def _sanitize_record(self, r):
+        profile = self.corpus.query_profile
         if self.models:
-            r = hydrate_model(r, self._to_find, self._to_find_type, self._preload, self._preload_acoustics, self.corpus)
+            if profile is None:
+                return hydrate_model(r, self._to_find, self._to_find_type, self._preload, self._preload_acoustics,
+                                     self.corpus, self._shared_models)
+            with profile.time('hydrate_models'):
+                return hydrate_model(r, self._to_find, self._to_find_type, self._preload, self._preload_acoustics,
+                                     self.corpus, self._shared_models)
+        r = AnnotationRecord(r)
+        if not self._acoustic_columns:
+            return r
+        if profile is None:
+            self._hydrate_acoustics(r)
         else:
-            r = AnnotationRecord(r)
-            for a in self._acoustic_columns:
-                if r[a.begin_alias] is None:
-                    for k in a.output_columns:
-                        r.add_acoustic(k, None)
-                else:
-                    utterance_id = r[a.utterance_alias]
-                    discourse = r[a.discourse_alias]
-                    speaker = r[a.speaker_alias]
-                    if utterance_id not in a.attribute.cache:
-                        data = self.corpus.get_utterance_acoustics(a.attribute.label, utterance_id, discourse, speaker)
-                        a.attribute.cache[utterance_id] = data
-                    t = a.hydrate(self.corpus, utterance_id,
-                                  r[a.begin_alias],
-                                  r[a.end_alias])
-                    for k in a.output_columns:
-                        if k == 'time':
-                            continue
-                        if k in self.track_columns:
-                            r.add_track(t)
-                        else:
-                            r.add_acoustic(k, t[k])
+            with profile.time('hydrate_acoustics'):
+                self._hydrate_acoustics(r)
         return r
 
+    def _hydrate_acoustics(self, r):
+        for a in self._acoustic_columns:
+            if r[a.begin_alias] is None:
+                for k in a.output_columns:
+                    r.add_acoustic(k, None)
+            else:
+                utterance_id = r[a.utterance_alias]
+                discourse = r[a.discourse_alias]
+                speaker = r[a.speaker_alias]
+                # Tracks are normally fetched for blocks of records beforehand
+                if utterance_id not in a.attribute.cache:
+                    data = self.corpus.get_utterance_acoustics(a.attribute.label, utterance_id, discourse, speaker)
+                    a.attribute.cache[utterance_id] = data
+                t = a.hydrate(self.corpus, utterance_id,
+                              r[a.begin_alias],
+                              r[a.end_alias])
+                for k in a.output_columns:
+                    if k == 'time':
+                        continue
+                    if k in self.track_columns:
+                        r.add_track(t)
+                    else:
+                        r.add_acoustic(k, t[k])
+
     def rows_for_csv(self):
         header = self.columns
         for line in self:
@@ -229,6 +485,35 @@ class QueryResults(BaseQueryResults):
             else:
                 yield baseline
 
+    def _columnar_values(self):
+        if self.models or not self._acoustic_columns:
+            return super(QueryResults, self)._columnar_values()
+        if self.num_tracks > 1:
+            raise (GraphQueryError('Only one track attribute can currently be exported in long format.'))
+        # Acoustic values are added to the records as they are hydrated, with tracks in long format
+        columns = [k for k in self.columns if k not in self.track_columns]
+        data = {k: [] for k in self.columns}
+        for line in self:
+            values = [line[k] for k in columns]
+            if not self.track_columns:
+                for k, v in zip(columns, values):
+                    data[k].append(v)
+                continue
+            track = line.track
+            num_points = len(track)
+            for k, v in zip(columns, values):
+                data[k].extend([v] * num_points)
+            for k in self.track_columns:
+                if k == 'time':
+                    data[k].extend(track.time_array.tolist())
+                    continue
+                column = track.column(k)
+                if column is None:
+                    data[k].extend([None] * num_points)
+                else:
+                    data[k].extend(None if x is not None and x != x else x for x in column.tolist())
+        return data
+
     def to_csv(self, path, mode='w'):
         if self.num_tracks > 1:
             raise (GraphQueryError('Only one track attribute can currently be exported to csv.'))
@@ -256,10 +541,5 @@ class AnnotationRecord(BaseRecord):
         self.acoustic_values.append(value)
 
     def add_track(self, track):
-
-        for point in track:
-            if point.time not in self.track:
-                self.track.add(point)
-            else:
-                self.track[point.time].update(point)
+        self.track.update(track)
         self.track_columns = self.track.keys()
@@ -349,6 +349,13 @@ class Node(object):
     def for_json(self):
         return [self.node_type]
 
+    @property
+    def statistics_label(self):
+        """
+        Label of the nodes matched, in corpus statistics
+        """
+        return self.node_type
+
     def for_match(self):
         return self.match_template.format(alias=self.define_alias)
 
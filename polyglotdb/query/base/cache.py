@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import pickle
+import uuid
+
+
+class ResultCache(object):
+    """
+    Size-bounded cache of query results on disk, with each result stored as a pickle file and the least recently used
+    results removed once the total size of the cache is exceeded.  Results are marked as used by updating the
+    modification times of their files, so the cache can be shared by several processes.
+
+    Parameters
+    ----------
+    directory : str
+        Directory to store results in
+    max_size : int
+        Maximum total size in bytes of the stored results
+    """
+    extension = '.pickle'
+
+    def __init__(self, directory, max_size):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(*args):
+        """
+        Create a key from JSON-serializable descriptions of a result
+
+        Returns
+        -------
+        str
+            Digest of the descriptions
+        """
+        data = json.dumps(args, sort_keys=True, default=str)
+        return hashlib.sha1(data.encode('utf8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + self.extension)
+
+    def get(self, key):
+        """
+        Get a stored result
+
+        Parameters
+        ----------
+        key : str
+            Key of the result
+
+        Returns
+        -------
+        object
+            Stored result
+
+        Raises
+        ------
+        KeyError
+            If no result is stored for the key
+        """
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            raise KeyError(key)
+        return value
+
+    def set(self, key, value):
+        """
+        Store a result, removing the least recently used results if the cache becomes too large
+
+        Parameters
+        ----------
+        key : str
+            Key of the result
+        value : object
+            Result to store
+        """
+        path = self.path(key)
+        # Write to a temporary file first so that other threads and processes never load partial results
+        temp_path = '{}.{}.tmp'.format(path, uuid.uuid4().hex)
+        with open(temp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        self.evict(keep={path})
+
+    def evict(self, keep=None):
+        """
+        Remove the least recently used results until the total size of the cache is at most its maximum size
+
+        Parameters
+        ----------
+        keep : collection, optional
+            Paths of files that should not be removed
+
+        Returns
+        -------
+        int
+            Number of results removed
+        """
+        if keep is None:
+            keep = set()
+        files = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.extension):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            total += stat.st_size
+            files.append((stat.st_mtime, stat.st_size, path))
+        removed = 0
+        for mtime, size, path in sorted(files):
+            if total <= self.max_size:
+                break
+            if path in keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        """
+        Remove all stored results
+        """
+        for name in os.listdir(self.directory):
+            if name.endswith(self.extension):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
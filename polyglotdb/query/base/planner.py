@@ -0,0 +1,287 @@
+from .complex import ComplexClause, or_
+from .elements import (EqualClauseElement, NotEqualClauseElement, InClauseElement, NotInClauseElement,
+                       NullClauseElement, NotNullClauseElement, GtClauseElement, GteClauseElement, LtClauseElement,
+                       LteClauseElement, RegexClauseElement)
+
+RANGE_SELECTIVITY = 1 / 3
+DEFAULT_SELECTIVITY = 1 / 2
+UNKNOWN_DISTINCT_COUNT = 10
+
+
+class CorpusStatistics(object):
+    """
+    Numbers of nodes and of distinct property values in a corpus, used to estimate how many rows parts of a query
+    will match
+
+    Parameters
+    ----------
+    label_counts : dict, optional
+        Number of nodes of each annotation, annotation type (``'<annotation>_type'``), speaker and discourse label
+    property_counts : dict, optional
+        Number of distinct values of each property, indexed by label and then property name
+    """
+
+    def __init__(self, label_counts=None, property_counts=None):
+        if label_counts is None:
+            label_counts = {}
+        self.label_counts = label_counts
+        if property_counts is None:
+            property_counts = {}
+        self.property_counts = property_counts
+
+    def to_json(self):
+        return {'label_counts': self.label_counts, 'property_counts': self.property_counts}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data.get('label_counts', {}), data.get('property_counts', {}))
+
+    def node_count(self, label):
+        """
+        Get the number of nodes with a label
+
+        Parameters
+        ----------
+        label : str
+            Node label
+
+        Returns
+        -------
+        int or None
+            Number of nodes, or None if it is not known
+        """
+        return self.label_counts.get(label, None)
+
+    def distinct_count(self, label, property_name):
+        """
+        Get the number of distinct values of a property on nodes with a label, falling back to the annotation type
+        nodes for properties of annotation types
+
+        Parameters
+        ----------
+        label : str
+            Node label
+        property_name : str
+            Property name
+
+        Returns
+        -------
+        int or None
+            Number of distinct values, or None if it is not known
+        """
+        for l in [label, '{}_type'.format(label)]:
+            try:
+                return self.property_counts[l][property_name]
+            except KeyError:
+                continue
+        return None
+
+
+class QueryPlanner(object):
+    """
+    Cost-based planner that uses corpus statistics to estimate the number of rows matched by the nodes and filters
+    of a query, to order the patterns and filters of its Cypher statement from the most to the least selective,
+    and to decide whether splitting a query by speaker or discourse is worthwhile
+
+    Without statistics, all nodes and filters are estimated equally, and the order of the query is kept.
+
+    Parameters
+    ----------
+    statistics : :class:`CorpusStatistics`, optional
+        Statistics of the corpus
+    """
+
+    def __init__(self, statistics=None):
+        if statistics is None:
+            statistics = CorpusStatistics()
+        self.statistics = statistics
+
+    def node_count(self, node):
+        """
+        Estimate the number of nodes matched by a node pattern, without any filters
+
+        Returns
+        -------
+        float or None
+            Estimated number of nodes, or None if it is not known
+        """
+        return self.statistics.node_count(node.statistics_label)
+
+    def selectivity(self, criterion):
+        """
+        Estimate the proportion of rows that pass a filter
+
+        Parameters
+        ----------
+        criterion : :class:`~polyglotdb.query.base.elements.ClauseElement` or :class:`~polyglotdb.query.base.complex.ComplexClause`
+            Filter of a query
+
+        Returns
+        -------
+        float
+            Proportion between 0 and 1
+        """
+        if isinstance(criterion, ComplexClause):
+            values = [self.selectivity(x) for x in criterion.clauses]
+            if isinstance(criterion, or_):
+                return min(1.0, sum(values))
+            selectivity = 1.0
+            for v in values:
+                selectivity *= v
+            return selectivity
+        if isinstance(criterion, (NullClauseElement, NotNullClauseElement)):
+            selectivity = 1 / UNKNOWN_DISTINCT_COUNT
+            if isinstance(criterion, NotNullClauseElement):
+                selectivity = 1 - selectivity
+            return selectivity
+        if isinstance(criterion, (GtClauseElement, GteClauseElement, LtClauseElement, LteClauseElement)):
+            return RANGE_SELECTIVITY
+        if not isinstance(criterion, (EqualClauseElement, NotEqualClauseElement, InClauseElement, RegexClauseElement)):
+            return DEFAULT_SELECTIVITY
+        from .attributes import NodeAttribute
+        if isinstance(criterion.value, NodeAttribute):
+            return DEFAULT_SELECTIVITY
+        try:
+            distinct = self.statistics.distinct_count(criterion.attribute.node.statistics_label,
+                                                      criterion.attribute.label)
+        except AttributeError:
+            distinct = None
+        if not distinct:
+            distinct = UNKNOWN_DISTINCT_COUNT
+        if isinstance(criterion, RegexClauseElement):
+            return min(1.0, DEFAULT_SELECTIVITY * 10 / distinct)
+        if isinstance(criterion, InClauseElement):
+            selectivity = min(1.0, len(criterion.value) / distinct)
+            if isinstance(criterion, NotInClauseElement):
+                selectivity = 1 - selectivity
+            return selectivity
+        selectivity = 1 / distinct
+        if isinstance(criterion, NotEqualClauseElement):
+            selectivity = 1 - selectivity
+        return selectivity
+
+    @staticmethod
+    def _criterion_node(criterion):
+        try:
+            return criterion.attribute.node
+        except AttributeError:
+            nodes = criterion.nodes
+            if len(set(nodes)) == 1:
+                return nodes[0]
+        return None
+
+    def estimate(self, node, criteria):
+        """
+        Estimate the number of rows matched by a node pattern with the filters that only involve that node
+
+        Parameters
+        ----------
+        node : :class:`~polyglotdb.query.base.attributes.Node`
+            Node of a query
+        criteria : list
+            Filters of the query
+
+        Returns
+        -------
+        float or None
+            Estimated number of rows, or None if the number of nodes is not known
+        """
+        count = self.node_count(node)
+        if count is None:
+            return None
+        for c in criteria:
+            if self._criterion_node(c) == node:
+                count *= self.selectivity(c)
+        return count
+
+    def order_nodes(self, nodes, criteria, anchor=None):
+        """
+        Order the nodes of a query from the fewest to the most estimated rows, so that the most selective pattern
+        anchors the ``MATCH`` of the query.  Nodes without estimates follow, with the anchor node first.
+
+        Parameters
+        ----------
+        nodes : collection
+            Nodes of a query
+        criteria : list
+            Filters of the query
+        anchor : :class:`~polyglotdb.query.base.attributes.Node`, optional
+            Node the query is finding, used first when no estimates are available
+
+        Returns
+        -------
+        list
+            Ordered nodes
+        """
+        def key(node):
+            estimate = self.estimate(node, criteria)
+            return (estimate is None, estimate if estimate is not None else 0, node != anchor, node.for_match())
+
+        return sorted(nodes, key=key)
+
+    def order_criteria(self, criteria):
+        """
+        Order filters from the most to the least selective, keeping the order of filters that are estimated equally
+
+        Parameters
+        ----------
+        criteria : list
+            Filters of a query
+
+        Returns
+        -------
+        list
+            Ordered filters
+        """
+        return sorted(criteria, key=self.selectivity)
+
+    def estimate_rows(self, query):
+        """
+        Estimate the number of rows a query returns, assuming each of its other nodes matches about one node
+        for each node it is finding
+
+        Parameters
+        ----------
+        query : :class:`~polyglotdb.query.base.query.BaseQuery`
+            Query to estimate
+
+        Returns
+        -------
+        float or None
+            Estimated number of rows, or None if the number of nodes being found is not known
+        """
+        count = self.node_count(query.to_find)
+        if count is None:
+            return None
+        for c in query._criterion:
+            count *= self.selectivity(c)
+        return count
+
+    def should_split(self, query, num_splits, threshold):
+        """
+        Decide whether running a query as separate queries for each speaker or discourse is worthwhile, which is
+        when no threshold is set, or when there is more than one of them and the query is not estimated to return
+        fewer rows than the threshold
+
+        Parameters
+        ----------
+        query : :class:`~polyglotdb.query.base.query.BaseQuery`
+            Query to split
+        num_splits : int
+            Number of queries it would be split into
+        threshold : int
+            Estimated number of rows below which queries are run as a single query
+
+        Returns
+        -------
+        bool
+            True if the query should be split
+        """
+        if not threshold:
+            return True
+        if num_splits <= 1:
+            return False
+        estimate = self.estimate_rows(query)
+        if estimate is None:
+            return True
+        return estimate >= threshold
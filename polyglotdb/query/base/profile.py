@@ -0,0 +1,216 @@
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+
+class QueryPlan(object):
+    """
+    Operator of a Neo4j query plan, from running a statement with ``EXPLAIN`` or ``PROFILE``
+
+    Parameters
+    ----------
+    operator : str
+        Name of the operator
+    identifiers : list
+        Variables the operator produces
+    arguments : dict
+        Details of the operator, like the expressions it evaluates
+    db_hits : int or None
+        Number of database accesses by the operator, only available for profiled statements
+    rows : int or None
+        Number of rows produced by the operator, only available for profiled statements
+    time : int or None
+        Time spent in the operator, as reported by the database, only available for profiled statements
+    children : list
+        :class:`QueryPlan` objects for the operators this one takes its rows from
+    """
+
+    def __init__(self, operator, identifiers=None, arguments=None, db_hits=None, rows=None, time=None,
+                 children=None):
+        self.operator = operator
+        if identifiers is None:
+            identifiers = []
+        self.identifiers = identifiers
+        if arguments is None:
+            arguments = {}
+        self.arguments = arguments
+        self.db_hits = db_hits
+        self.rows = rows
+        self.time = time
+        if children is None:
+            children = []
+        self.children = children
+
+    @classmethod
+    def from_summary(cls, plan):
+        """
+        Create a plan tree from the plan or profile of a Neo4j result summary
+
+        Parameters
+        ----------
+        plan : dict
+            Plan or profile of a :class:`neo4j.ResultSummary`
+
+        Returns
+        -------
+        :class:`QueryPlan`
+            Root operator of the plan
+        """
+        arguments = dict(plan.get('args', {}))
+        return cls(plan.get('operatorType'), list(plan.get('identifiers', [])), arguments,
+                   plan.get('dbHits'), plan.get('rows'), plan.get('time', arguments.get('Time')),
+                   [cls.from_summary(x) for x in plan.get('children', [])])
+
+    def __iter__(self):
+        yield self
+        for c in self.children:
+            for x in c:
+                yield x
+
+    @property
+    def total_db_hits(self):
+        """
+        Number of database accesses by this operator and the ones below it, or None if the plan was not profiled
+        """
+        hits = [x.db_hits for x in self if x.db_hits is not None]
+        if not hits:
+            return None
+        return sum(hits)
+
+    def __str__(self):
+        lines = []
+        self._format(lines, 0)
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return '<QueryPlan {}>'.format(self.operator)
+
+    def _format(self, lines, depth):
+        line = '{}{} ({})'.format('  ' * depth, self.operator, ', '.join(self.identifiers))
+        if self.db_hits is not None:
+            line += ', db hits: {}, rows: {}'.format(self.db_hits, self.rows)
+            if self.time is not None:
+                line += ', time: {}'.format(self.time)
+        lines.append(line)
+        for c in self.children:
+            c._format(lines, depth + 1)
+
+
+class QueryProfile(object):
+    """
+    Collector of client-side timings for the stages of running queries, and of the plans of the statements run
+    with ``EXPLAIN`` or ``PROFILE``
+
+    Profiles are collected for all the queries run by a corpus context while it is set as the context's
+    ``query_profile`` (see :meth:`~polyglotdb.corpus.BaseContext.profile_queries`), including the sub-queries of
+    :class:`~polyglotdb.query.annotations.query.SplitQuery` objects run on several threads.
+
+    Parameters
+    ----------
+    mode : str, optional
+        ``'EXPLAIN'`` or ``'PROFILE'`` to prefix the statements run with, to collect their plans
+
+    Attributes
+    ----------
+    timings : dict
+        Total seconds spent in each stage: generating Cypher (``'cypher'``), waiting for the database to start
+        returning results (``'execute'``), fetching records (``'fetch'``), creating annotation models from records
+        (``'hydrate_models'``) and loading acoustic measurements (``'hydrate_acoustics'``)
+    counts : dict
+        Number of times each stage was timed
+    plans : list
+        Tuples of the statement and the :class:`QueryPlan` of the statements run
+    server_timings : list
+        Tuples of the milliseconds the database took until results were available and until they were consumed,
+        for each statement run with ``EXPLAIN`` or ``PROFILE``
+    """
+    stages = ['cypher', 'execute', 'fetch', 'hydrate_models', 'hydrate_acoustics']
+
+    def __init__(self, mode=None):
+        self.mode = mode
+        self.timings = {k: 0.0 for k in self.stages}
+        self.counts = {k: 0 for k in self.stages}
+        self.plans = []
+        self.server_timings = []
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        """
+        Add time spent in a stage
+
+        Parameters
+        ----------
+        stage : str
+            Stage of running queries
+        seconds : float
+            Time spent
+        """
+        with self._lock:
+            self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+            self.counts[stage] = self.counts.get(stage, 0) + 1
+
+    @contextmanager
+    def time(self, stage):
+        """
+        Time the code run in the context as a stage
+        """
+        begin = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, perf_counter() - begin)
+
+    def add_summary(self, statement, summary):
+        """
+        Add the plan and server timings from the summary of a statement run with ``EXPLAIN`` or ``PROFILE``
+
+        Parameters
+        ----------
+        statement : str
+            Statement run
+        summary : :class:`neo4j.ResultSummary`
+            Summary of its result
+        """
+        plan = summary.profile
+        if plan is None:
+            plan = summary.plan
+        if plan is not None:
+            plan = QueryPlan.from_summary(plan)
+        with self._lock:
+            self.plans.append((statement, plan))
+            self.server_timings.append((summary.result_available_after, summary.result_consumed_after))
+
+    def merge(self, other):
+        """
+        Add the timings and plans of another profile
+
+        Parameters
+        ----------
+        other : :class:`QueryProfile`
+            Profile to add
+        """
+        with self._lock:
+            for k, v in other.timings.items():
+                self.timings[k] = self.timings.get(k, 0.0) + v
+                self.counts[k] = self.counts.get(k, 0) + other.counts[k]
+            self.plans.extend(other.plans)
+            self.server_timings.extend(other.server_timings)
+
+    @property
+    def total_db_hits(self):
+        """
+        Number of database accesses of all profiled statements, or None if no statements were profiled
+        """
+        hits = [x.total_db_hits for _, x in self.plans if x is not None and x.total_db_hits is not None]
+        if not hits:
+            return None
+        return sum(hits)
+
+    def __str__(self):
+        lines = ['{}: {:.4f} s ({})'.format(k, v, self.counts[k]) for k, v in self.timings.items()]
+        for statement, plan in self.plans:
+            lines.append('')
+            lines.append(statement)
+            if plan is not None:
+                lines.append(str(plan))
+        return '\n'.join(lines)
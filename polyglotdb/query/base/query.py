@@ -1,7 +1,9 @@
 from .results import BaseQueryResults
 
 from .func import Count
-from ..base.helper import key_for_cypher, value_for_cypher
+from ..base.helper import key_for_cypher
+
+CYPHER_CACHE_SIZE = 1000
 
 
 class BaseQuery(object):
@@ -150,7 +152,7 @@ class BaseQuery(object):
         """
         self._aggregate = [Count()]
         cypher = self.cypher()
-        value = self.corpus.execute_cypher(cypher, **self.cypher_params())
+        value = self.corpus.cached_cypher(cypher, **self.cypher_params())
         self._aggregate = []
         return list(value[0].values())[0]
 
@@ -162,7 +164,7 @@ class BaseQuery(object):
         """
         self._aggregate.extend(args)
         cypher = self.cypher()
-        value = self.corpus.execute_cypher(cypher, **self.cypher_params())
+        value = self.corpus.cached_cypher(cypher, **self.cypher_params())
         if self._group_by or any(not x.collapsing for x in self._aggregate):
             return list(value)
         elif len(self._aggregate) > 1:
@@ -188,7 +190,36 @@ class BaseQuery(object):
     def cypher(self):
         """
         Generates a Cypher statement based on the query.
+
+        All values in the query are passed as parameters (see :meth:`cypher_params`), so statements are cached on the
+        corpus context by the shape of the query, and queries that only differ in their values, like the split queries
+        of a :class:`~polyglotdb.query.annotations.query.SplitQuery`, share the same statement and Neo4j query plan.
+
+        Match patterns and filters are ordered from the most to the least selective by the corpus query planner (see
+        :class:`~polyglotdb.query.base.planner.QueryPlanner`).
         """
+        profile = self.corpus.query_profile
+        if profile is None:
+            return self._cached_cypher()
+        with profile.time('cypher'):
+            return self._cached_cypher()
+
+    def _cached_cypher(self):
+        return_statement = self.generate_return()
+        key = (type(self), self.to_find.for_match(), tuple(c.for_cypher() for c in self._criterion),
+               tuple(w for x in self._preload for w in x.withs), return_statement)
+        cache = self.corpus._cypher_cache
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        cypher = self._generate_cypher(return_statement)
+        if len(cache) >= CYPHER_CACHE_SIZE:
+            cache.clear()
+        cache[key] = cypher
+        return cypher
+
+    def _generate_cypher(self, return_statement):
         kwargs = {'match': '',
                   'optional_match': '',
                   'where': '',
@@ -197,13 +228,15 @@ class BaseQuery(object):
 
         # generate initial match strings
 
-        match_strings = set()
+        planner = self.corpus.query_planner
+        match_strings = []
         withs = set()
         nodes = self.required_nodes()
-        for node in nodes:
-            if node.has_subquery:
-                continue
-            match_strings.add(node.for_match())
+        # The most selective pattern anchors the match
+        for node in planner.order_nodes([x for x in nodes if not x.has_subquery], self._criterion, self.to_find):
+            match_string = node.for_match()
+            if match_string not in match_strings:
+                match_strings.append(match_string)
             withs.update(node.withs)
 
         kwargs['match'] = 'MATCH ' + ',\n'.join(match_strings)
@@ -211,7 +244,7 @@ class BaseQuery(object):
         # generate main filters
 
         properties = []
-        for c in self._criterion:
+        for c in planner.order_criteria(self._criterion):
             if c.in_subquery:
                 continue
             properties.append(c.for_cypher())
@@ -252,7 +285,7 @@ class BaseQuery(object):
             withs.update(node.withs)
         kwargs['with'] = '\n'.join(with_statements)
 
-        kwargs['return'] = self.generate_return()
+        kwargs['return'] = return_statement
         cypher = self.query_template.format(**kwargs)
 
         return cypher
@@ -280,8 +313,23 @@ class BaseQuery(object):
         self.corpus.execute_cypher(self.cypher(), **self.cypher_params())
         self._set_properties = {}
 
-    def all(self):
-        return BaseQueryResults(self)
+    def all(self, stream=False, fetch_size=None):
+        """
+        Returns all results for the query
+
+        Parameters
+        ----------
+        stream : bool
+            If True, fetch results from the database as they are iterated over rather than all at once
+        fetch_size : int, optional
+            Number of records to fetch at a time when streaming, defaults to the ``query_fetch_size`` configuration
+
+        Returns
+        -------
+        :class:`~polyglotdb.query.base.results.BaseQueryResults`
+            Results of the query
+        """
+        return BaseQueryResults(self, stream=stream, fetch_size=fetch_size)
 
     def get(self):
         r = BaseQueryResults(self)
@@ -305,8 +353,18 @@ class BaseQuery(object):
                         params[c.cypher_value_string()[1:-1].replace('`', '')] = c.value
                 except AttributeError:
                     pass
+        for k, v in self._set_properties.items():
+            params[self._set_property_param(k)] = v
+        if self._limit is not None:
+            params['query_limit'] = self._limit
+        if self._offset is not None:
+            params['query_offset'] = self._offset
         return params
 
+    @staticmethod
+    def _set_property_param(key):
+        return 'set_property_{}'.format(key.replace('`', ''))
+
     def generate_return(self):
         """
         Generates final statement from query object, calling whichever one of the other generate statements is specified in the query obj
@@ -371,11 +429,8 @@ class BaseQuery(object):
 
     def _generate_set_properties_return(self):
         set_strings = []
-        for k, v in self._set_properties.items():
-            if v is None:
-                v = 'NULL'
-            else:
-                v = value_for_cypher(v)
+        for k in self._set_properties.keys():
+            v = '$`{}`'.format(self._set_property_param(k))
             s = self.set_property_template.format(alias=self.to_find.alias, attribute=k, value=v)
             set_strings.append(s)
         return 'SET ' + ', '.join(set_strings)
@@ -420,12 +475,12 @@ class BaseQuery(object):
 
     def _generate_limit(self):
         if self._limit is not None:
-            return '\nLIMIT {}'.format(self._limit)
+            return '\nLIMIT $query_limit'
         return ''
 
     def _generate_offset(self):
         if self._offset is not None:
-            return '\nSKIP {}'.format(self._offset)
+            return '\nSKIP $query_offset'
         return ''
 
     def _generate_order_by(self):
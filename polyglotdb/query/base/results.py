@@ -1,3 +1,50 @@
+from itertools import islice
+
+from polyglotdb.exceptions import GraphQueryError
+
+
+def _column_to_numpy(values, value_type=None):
+    """
+    Convert the values of a result column to a NumPy array, as floats, integers or booleans where possible, and as
+    objects otherwise
+
+    Null values are converted to NaN in numeric columns
+    """
+    import numpy as np
+    if value_type in (None, float, int, bool):
+        has_null = any(x is None for x in values)
+        array = None
+        if not has_null:
+            array = np.array(values)
+        elif value_type is not bool:
+            try:
+                array = np.array([np.nan if x is None else x for x in values])
+            except (TypeError, ValueError):
+                pass
+        if array is not None and array.ndim == 1 and array.dtype.kind in 'biuf':
+            if value_type is float:
+                array = array.astype('float64')
+            return array
+    array = np.empty(len(values), dtype=object)
+    for i, x in enumerate(values):
+        array[i] = x
+    return array
+
+
+def _column_to_arrow(values, value_type=None):
+    """
+    Convert the values of a result column to an Arrow array, using the type of the column if the values allow it
+    """
+    import pyarrow as pa
+    arrow_types = {float: pa.float64(), int: pa.int64(), bool: pa.bool_(), str: pa.string()}
+    if value_type in arrow_types:
+        try:
+            return pa.array(values, type=arrow_types[value_type])
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+            pass
+    return pa.array(values)
+
+
 class BaseRecord(object):
     def __init__(self, result):
         self.columns = list(result.keys())
@@ -12,23 +59,52 @@ class BaseRecord(object):
         return ', '.join('{}: {}'.format(k, v) for k, v in zip(self.columns, self.values))
 
 class BaseQueryResults(object):
-    def __init__(self, query):
+    """
+    Results of a query
+
+    Parameters
+    ----------
+    query : :class:`~polyglotdb.query.base.BaseQuery`
+        Query to get results for
+    stream : bool
+        If True, records are fetched from the database as they are iterated over, rather than all being loaded when
+        the results are created.  Streamed results can only be iterated over once, and do not support indexing,
+        ``len`` or ``previous``.
+    fetch_size : int, optional
+        Number of records to fetch at a time when streaming, defaults to the ``query_fetch_size`` configuration
+    """
+    def __init__(self, query, stream=False, fetch_size=None):
         self.corpus = query.corpus
         self.call_back = query.call_back
         self.stop_check = query.stop_check
         self.cursors = []
         self.evaluated = []
         self.current_ind = 0
+        self.stream = stream
+        self.fetch_size = fetch_size
+        self._records = None
+        self._column_types = {}
+        # Only the query's own statement is explained or profiled, not other statements run while profiling
+        profile_mode = None
+        if self.corpus.query_profile is not None:
+            profile_mode = self.corpus.query_profile.mode
+        if stream:
+            self.cache = []
+            self.cursors.append(self.corpus.stream_cypher(query.cypher(), fetch_size, profile_mode=profile_mode,
+                                                          **query.cypher_params()))
         if query._columns:
-            self.cache = self.corpus.execute_cypher(query.cypher(), **query.cypher_params())
+            if not stream:
+                self.cache = self.corpus.cached_cypher(query.cypher(), profile_mode=profile_mode,
+                                                      **query.cypher_params())
             self.models = False
             self._preload = None
             self._to_find = None
             self._to_find_type = None
             self._columns = [x.output_alias.replace('`', '') for x in query._columns]
         else:
-
-            self.cache = self.corpus.execute_cypher(query.cypher(), **query.cypher_params())
+            if not stream:
+                self.cache = self.corpus.cached_cypher(query.cypher(), profile_mode=profile_mode,
+                                                      **query.cypher_params())
             self.models = True
             self._preload = query._preload
             self._to_find = query.to_find.alias
@@ -42,7 +118,34 @@ class BaseQueryResults(object):
     def __str__(self):
         return '\n'.join(str(x) for x in self)
 
+    def _check_not_streamed(self):
+        if self.stream:
+            raise GraphQueryError('Streamed results can only be iterated over.')
+
+    def _raw_records(self):
+        if not self.stream:
+            for r in self.cache:
+                yield r
+            return
+        for c in self.cursors:
+            if self.stop_check is not None and self.stop_check():
+                return
+            for r in c:
+                yield r
+
+    def _stream_records(self):
+        for r in self._raw_records():
+            yield self._sanitize_record(r)
+
+    def close(self):
+        """
+        Stop streaming results, closing their database sessions
+        """
+        for c in self.cursors:
+            c.close()
+
     def __getitem__(self, key):
+        self._check_not_streamed()
         if key < 0:
             raise (IndexError('Results do not support negative indexing.'))
         cur_cache_len = len(self.cache)
@@ -75,10 +178,28 @@ class BaseQueryResults(object):
 
     def add_results(self, query):
         ## Add some validation
+        if self.stream:
+            self.cursors.append(self._query_cursor(query))
+            return
         cursor = query.all().cache
         self.cache.extend(cursor)
 
+    def _query_cursor(self, query):
+        # Queries are only run once the previous cursors are exhausted
+        results = query.all(stream=True, fetch_size=self.fetch_size)
+        try:
+            for r in results.cursors[0]:
+                yield r
+        finally:
+            results.close()
+
     def next(self, number):
+        if self.stream:
+            if self._records is None:
+                self._records = self._stream_records()
+            to_return = list(islice(self._records, number))
+            self.current_ind += len(to_return)
+            return to_return
         next_ind = number + self.current_ind
         if next_ind > len(self.cache):
             self._cache_cursor(up_to=next_ind)
@@ -87,6 +208,7 @@ class BaseQueryResults(object):
         return to_return
 
     def previous(self, number):
+        self._check_not_streamed()
         if number > self.current_ind:
             to_return = self.cache[0:self.current_ind]
             self.current_ind = 0
@@ -97,8 +219,15 @@ class BaseQueryResults(object):
         return to_return
 
     def __iter__(self):
-        for r in self.cache:
-            yield self._sanitize_record(r)
+        if self.stream:
+            if self._records is None:
+                self._records = self._stream_records()
+            for r in self._records:
+                self.current_ind += 1
+                yield r
+            return
+        for r in self._stream_records():
+            yield r
 
     def rows_for_csv(self):
         header = self.columns
@@ -114,7 +243,71 @@ class BaseQueryResults(object):
             baseline = {k: line[k] for k in self.columns}
             yield baseline
 
+    def _columnar_values(self):
+        """
+        Get the values of each column, straight from the database records
+
+        Returns
+        -------
+        dict
+            Lists of values indexed by column name, in the order of the columns
+        """
+        if self.models:
+            raise GraphQueryError('Columnar results require the columns of the query to be specified.')
+        if self.stream and self._records is not None:
+            raise GraphQueryError('Streamed results can only be iterated over once.')
+        columns = self.columns
+        if not self.stream:
+            return {k: [r[k] for r in self.cache] for k in columns}
+        self._records = iter(())
+        data = {k: [] for k in columns}
+        for r in self._raw_records():
+            for k in columns:
+                data[k].append(r[k])
+        return data
+
+    def to_numpy(self):
+        """
+        Get the results as NumPy arrays, with types from the corpus hierarchy where they are known
+
+        Numeric columns with null values are converted to floats with NaN for the null values.
+
+        Returns
+        -------
+        dict
+            :class:`numpy.ndarray` objects indexed by column name, in the order of the columns
+        """
+        return {k: _column_to_numpy(v, self._column_types.get(k)) for k, v in self._columnar_values().items()}
+
+    def to_arrow(self):
+        """
+        Get the results as an Arrow table, with types from the corpus hierarchy where they are known.
+        Requires pyarrow.
+
+        Returns
+        -------
+        :class:`pyarrow.Table`
+            Results of the query
+        """
+        import pyarrow as pa
+        data = self._columnar_values()
+        return pa.table({k: _column_to_arrow(v, self._column_types.get(k)) for k, v in data.items()})
+
+    def to_dataframe(self):
+        """
+        Get the results as a pandas data frame, with the same column types as :meth:`to_numpy`. Requires pandas.
+
+        Returns
+        -------
+        :class:`pandas.DataFrame`
+            Results of the query
+        """
+        import pandas as pd
+        data = self.to_numpy()
+        return pd.DataFrame(data, columns=list(data.keys()))
+
     def __len__(self):
+        self._check_not_streamed()
         self._cache_cursor()
         return len(self.cache)
 
@@ -24,6 +24,10 @@ class LexiconNode(Node):
     def alias(self):
         return key_for_cypher(self.alias_template.format(t='type_'+self.key))
 
+    @property
+    def statistics_label(self):
+        return '{}_type'.format(self.node_type)
+
     @property
     def define_alias(self):
         """ Returns a cypher string for getting all type_labels"""
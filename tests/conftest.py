@@ -448,6 +448,21 @@ def acoustic_utt_config(graph_db, textgrid_test_dir, acoustic_syllabics):
     return config
 
 
+@pytest.fixture(scope='session')
+def local_acoustic_config(graph_db, textgrid_test_dir):
+    config = CorpusConfig('acoustic_local', acoustic_store='local', **graph_db)
+
+    acoustic_path = os.path.join(textgrid_test_dir, 'acoustic_corpus.TextGrid')
+    with CorpusContext(config) as c:
+        c.reset()
+        parser = inspect_textgrid(acoustic_path)
+        c.load(parser, acoustic_path)
+
+        c.encode_pauses(['sil'])
+        c.encode_utterances(min_pause_length=0)
+    return config
+
+
 @pytest.fixture(scope='session')
 def overlapped_config(graph_db, textgrid_test_dir, acoustic_syllabics):
     config = CorpusConfig('overlapped', **graph_db)
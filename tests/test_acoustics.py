@@ -1,9 +1,13 @@
 import os
 from decimal import Decimal
 
+import numpy as np
 import pytest
 
 from polyglotdb import CorpusContext
+from polyglotdb.acoustics.classes import Track, TimePoint
+from polyglotdb.acoustics.store import LocalAcousticStore
+from polyglotdb.corpus.audio import epoch_to_ms, phone_labels
 
 
 
@@ -25,3 +29,180 @@ def test_wav_info(acoustic_utt_config):
 
 
 
+
+
+def test_prepare_sound_files(textgrid_test_dir, tmpdir):
+    import soundfile
+    from polyglotdb.acoustics.io import prepare_sound_files
+
+    audio_dir = os.path.join(str(tmpdir), 'prepared_audio')
+    info = prepare_sound_files(os.path.join(textgrid_test_dir, 'acoustic_corpus.wav'), audio_dir)
+    assert info['sampling_rate'] == 16000
+    assert info['num_channels'] == 1
+    assert abs(info['duration'] - 26.72325) < 0.001
+    for name, rate in [('consonant', 16000), ('vowel', 11000), ('low_freq', 2000)]:
+        sound_info = soundfile.info(info['{}_file_path'.format(name)])
+        assert sound_info.samplerate == rate
+        assert abs(sound_info.duration - info['duration']) < 0.01
+
+
+def test_evict_sound_files(textgrid_test_dir, tmpdir):
+    from polyglotdb.acoustics.io import create_sound_file, evict_sound_files
+
+    audio_dir = os.path.join(str(tmpdir), 'audio_cache')
+    wav_path = os.path.join(textgrid_test_dir, 'acoustic_corpus.wav')
+    paths = []
+    for i, discourse in enumerate(['first', 'second', 'third']):
+        path = create_sound_file(wav_path, os.path.join(audio_dir, discourse), 'vowel')
+        os.utime(path, (i, i))
+        paths.append(path)
+    size = os.path.getsize(paths[0])
+    assert evict_sound_files(audio_dir, size * 3) == []
+    assert evict_sound_files(audio_dir, size * 2 - 1, keep={paths[0]}) == [('second', 'vowel'), ('third', 'vowel')]
+    assert os.path.exists(paths[0])
+    assert not os.path.exists(paths[1])
+
+
+def test_pin_sound_files(textgrid_test_dir, tmpdir):
+    from polyglotdb.config import CorpusConfig
+
+    config = CorpusConfig('pinned', data_dir=str(tmpdir))
+    wav_path = os.path.join(textgrid_test_dir, 'acoustic_corpus.wav')
+    g = CorpusContext(config)
+    g.execute_cypher = lambda statement, **parameters: []
+    sound_files = [{'name': d, 'file_path': wav_path, 'sampling_rate': 16000} for d in ['first', 'second']]
+    size = os.path.getsize(g.sound_file_path(sound_files[0], 'vowel'))
+    g.config.audio_cache_size = size
+    with g.pin_sound_files():
+        paths = [g.sound_file_path(sf, 'vowel') for sf in sound_files]
+        assert all(os.path.exists(p) for p in paths)
+    g.evict_sound_files()
+    assert os.path.exists(paths[1])
+    assert not os.path.exists(paths[0])
+
+
+def test_track_arrays():
+    track = Track()
+    for time, value in [(Decimal('4.25'), 503), (Decimal('4.23'), 501), (Decimal('4.24'), 502)]:
+        point = TimePoint(time)
+        point.add_value('F1', value)
+        track.add(point)
+    point = TimePoint(Decimal('4.23'))
+    point.add_value('F2', 1500)
+    track.add(point)
+
+    assert len(track) == 3
+    assert track.times() == [Decimal('4.23'), Decimal('4.24'), Decimal('4.25')]
+    assert track.keys() == ['F1', 'F2']
+    assert track[Decimal('4.23')]['F2'] == 1500
+    assert not track[Decimal('4.24')].has_value('F2')
+    assert list(track.column('F1')) == [501, 502, 503]
+    assert [p.time for p in track.slice(Decimal('4.235'), Decimal('4.25'))] == [Decimal('4.24'), Decimal('4.25')]
+    assert track.relative(Decimal('4.23'), Decimal('4.25')).times() == [Decimal('0'), Decimal('0.5'), Decimal('1')]
+
+    other = Track.from_arrays([4.26, 4.24], [[1.0], [2.0]], ['F3'])
+    merged = Track()
+    merged.update(track)
+    merged.update(other)
+    assert len(merged) == 4
+    assert merged[Decimal('4.24')]['F3'] == 2.0
+    assert merged.keys() == ['F1', 'F2', 'F3']
+
+
+def test_epoch_times():
+    times = epoch_to_ms([4230000000, 4240400000, 86404250600000])
+    assert times.tolist() == [4230, 4240, 4251]
+    assert epoch_to_ms([4230], precision='ms').tolist() == [4230]
+
+    track = Track.from_arrays(times / 1000, [[501], [None], [503]], ['F1'], time_precision=3)
+    assert track.times() == [Decimal('4.23'), Decimal('4.24'), Decimal('4.251')]
+    assert track[Decimal('4.24')]['F1'] is None
+    assert [p.time for p in track.slice(Decimal('4.23'), Decimal('4.24'))] == [Decimal('4.23'), Decimal('4.24')]
+    assert track.relative(Decimal('4.23'), Decimal('4.25')).times()[1] == Decimal('0.5')
+
+
+def test_local_acoustic_store(tmpdir):
+    store = LocalAcousticStore(str(tmpdir))
+    store.write('pitch', {'time': [4240, 4230, 5000], 'speaker': ['s1', 's1', 's2'], 'discourse': ['d', 'd', 'd'],
+                          'channel': [0, 0, 0], 'F0': [None, 100.0, 80.0], 'phone': ['a', 'a', 'b'],
+                          'utterance_id': ['u1', 'u1', 'u2']})
+    store.write('pitch', {'time': [4230], 'speaker': ['s1'], 'discourse': ['d'], 'channel': [0],
+                          'F0_relativized': [1.0]})
+
+    columns = store.read('pitch', ['F0', 'F0_relativized'], discourse='d', speaker='s1', utterance_ids=['u1'])
+    assert columns['time'].tolist() == [4230, 4240]
+    assert columns['F0'][0] == 100.0 and columns['F0_relativized'][0] == 1.0
+    assert store.read('pitch', ['F0'], discourse='d', begin=Decimal('4.235'), end=5)['time'].tolist() == [4240, 5000]
+    assert store.has_measurements('pitch', 'd')
+    assert not store.has_measurements('pitch', 'other')
+
+    summaries = store.aggregate('pitch', ['mean', 'count'], ['F0'], phones=['a', 'b'])
+    assert summaries[(None, 'a')] == {('mean', 'F0'): 100.0, ('count', 'F0'): 1}
+    assert summaries[(None, 'b')][('mean', 'F0')] == 80.0
+
+    store.remove_fields('pitch', ['F0_relativized'])
+    assert 'F0_relativized' not in store.read('pitch')
+    store.delete('pitch', 'd', 's1', 4.23, 4.235)
+    assert store.read('pitch')['time'].tolist() == [4240, 5000]
+    store.drop('pitch')
+    assert not store.has_measurements('pitch', 'd')
+
+
+def test_local_acoustic_corpus(local_acoustic_config):
+    from polyglotdb.acoustics.segments import generate_utterance_segments
+
+    with CorpusContext(local_acoustic_config) as g:
+        g.reset_acoustics()
+        g.hierarchy.add_acoustic_properties(g, 'pitch', [('F0', float)])
+        g.encode_hierarchy()
+        q = g.query_graph(g.phone).columns(g.phone.label.column_name('label'), g.phone.begin.column_name('begin'),
+                                           g.phone.end.column_name('end'),
+                                           g.phone.utterance.id.column_name('utterance_id'))
+        phones = {}
+        for r in q.all():
+            phones.setdefault(r['utterance_id'], []).append((r['label'], r['begin'], r['end']))
+        labels = sorted({x[0] for v in phones.values() for x in v})
+        phone_values = {label: 100.0 + 10 * i for i, label in enumerate(labels)}
+
+        # Two points in each phone, 5 Hz either side of the phone's value
+        tracks = {}
+        expected = {}
+        for seg in generate_utterance_segments(g, padding=0):
+            track = Track()
+            for label, begin, end in phones.get(seg['utterance_id'], []):
+                for time, offset in [(begin + (end - begin) / 3, -5), (begin + 2 * (end - begin) / 3, 5)]:
+                    point = TimePoint(Decimal(str(round(time, 3))))
+                    point.add_value('F0', phone_values[label] + offset)
+                    track.add(point)
+            tracks[seg] = track
+            expected[seg['utterance_id'], seg['discourse'], seg['speaker']] = track
+        g.save_acoustic_tracks('pitch', tracks, g.speakers[0])
+        assert g.discourse_has_acoustics('pitch', g.discourses[0])
+
+        for (utterance_id, discourse, speaker), track in expected.items():
+            saved = g.get_utterance_acoustics('pitch', utterance_id, discourse, speaker)
+            assert saved.times() == track.times()
+            assert [p['F0'] for p in saved] == [p['F0'] for p in track]
+
+        g.encode_acoustic_statistic('pitch', 'mean', by_phone=True)
+        means = g.get_acoustic_statistic('pitch', 'mean', by_phone=True)
+        for label, value in phone_values.items():
+            assert means[label][0] == pytest.approx(value)
+
+        g.relativize_acoustic_measure('pitch', by_speaker=True)
+        values = np.array([p['F0'] for track in expected.values() for p in track])
+        mean, sd = values.mean(), values.std(ddof=1)
+        for (utterance_id, discourse, speaker), track in expected.items():
+            saved = g.get_utterance_acoustics('pitch', utterance_id, discourse, speaker)
+            assert [p['F0_relativized'] for p in saved] == pytest.approx([(p['F0'] - mean) / sd for p in track])
+        g.reset_acoustics()
+
+
+def test_phone_labels():
+    labels = np.empty(3, dtype=object)
+    labels[:] = ['a', 'b', 'c']
+    phones = (np.array([0.1, 0.2, 0.3]), np.array([0.2, 0.3, 0.4]), labels)
+    assert phone_labels(phones, np.array([0.05, 0.1, 0.25, 0.45])) == [None, 'a', 'b', 'c']
+    # Only phones overlapping the time points are used
+    assert phone_labels(phones, np.array([0.35, 0.38])) == ['c', 'c']
+    assert phone_labels(None, np.array([0.1])) == [None]
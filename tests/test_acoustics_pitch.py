@@ -64,6 +64,24 @@ def test_analyze_pitch_basic_praat(acoustic_utt_config, praat_path):
             assert len(r.track)
 
 
+@pytest.mark.acoustic
+def test_batched_pitch_tracks(acoustic_utt_config, praat_path):
+    with CorpusContext(acoustic_utt_config) as g:
+        g.reset_acoustics()
+        g.config.praat_path = praat_path
+        g.analyze_pitch()
+        q = g.query_graph(g.phone).filter(g.phone.label == 'ow')
+        q = q.columns(g.phone.begin.column_name('begin'), g.phone.end.column_name('end'),
+                      g.phone.utterance.id.column_name('utterance_id'),
+                      g.phone.discourse.name.column_name('discourse'), g.phone.speaker.name.column_name('speaker'),
+                      g.phone.pitch.track)
+        results = q.all(stream=True, fetch_size=2)
+        for r in results:
+            expected = g.get_utterance_acoustics('pitch', r['utterance_id'], r['discourse'], r['speaker'])
+            expected = expected.slice(r['begin'], r['end'])
+            assert r.track.times() == expected.times()
+
+
 @pytest.mark.acoustic
 def test_reset_utterances(acoustic_utt_config, praat_path):
     with CorpusContext(acoustic_utt_config) as g:
@@ -76,3 +76,41 @@ def test_remove_discourse(graph_db):
         c.remove_discourse('acoustic_corpus')
         assert not os.path.exists(d['consonant_file_path'])
 
+
+
+def test_schema_manager(graph_db):
+    with CorpusContext('schema_test', **graph_db) as c:
+        c.schema.ensure(constraints=[('schema_test_node', 'id')],
+                        indexes=[('schema_test_node', 'id'), ('schema_test_node', 'label')])
+        assert c.schema.has_constraint('schema_test_node', 'id')
+        assert c.schema.has_index('schema_test_node', 'label')
+
+    with CorpusContext('schema_test', **graph_db) as c:
+        assert c.schema.has_constraint('schema_test_node', 'id')
+        assert c.schema.has_index('schema_test_node', 'label')
+        assert not c.schema.has_index('schema_test_node', 'begin')
+
+
+def test_shared_driver(graph_db):
+    first = CorpusContext('driver_test', **graph_db)
+    second = CorpusContext('driver_test_other', **graph_db)
+    driver = first.graph_driver
+    assert second.graph_driver is driver
+
+    first.close()
+    third = CorpusContext('driver_test', **graph_db)
+    assert third.graph_driver is driver
+
+    other = CorpusContext('driver_test', graph_max_connection_pool_size=5, **graph_db)
+    assert other.graph_driver is not driver
+    for c in [second, third, other]:
+        c.close()
+
+
+def test_graph_session(graph_db):
+    with CorpusContext('driver_test', **graph_db) as c:
+        with c.graph_session() as session:
+            with c.graph_session() as inner:
+                assert inner is session
+            assert c.execute_cypher('RETURN 1 AS one')[0]['one'] == 1
+        assert getattr(c._local, 'session', None) is None
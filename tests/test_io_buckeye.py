@@ -105,3 +105,57 @@ def test_load_directory_buckeye(graph_db, buckeye_test_dir):
         results = q.all()
         print(results)
         assert (all(x['speaker'] == 'tes' for x in results))
+
+
+def test_discourse_information_buckeye(buckeye_test_dir):
+    word_path = os.path.join(buckeye_test_dir, 'test.words')
+    parser = inspect_buckeye(word_path)
+    information = parser.parse_information(word_path, 'directory_buckeye')
+    data = parser.parse_discourse(word_path)
+    single_pass = parser.discourse_information(data, 'directory_buckeye')
+    assert information['types'] == single_pass['types']
+    assert information['type_headers'] == single_pass['type_headers']
+    assert information['token_headers'] == single_pass['token_headers']
+    assert information['speakers'] == single_pass['speakers']
+
+
+def test_load_directory_buckeye_multiprocessing(graph_db, buckeye_test_dir):
+    with CorpusContext('directory_buckeye_multiprocessing', **graph_db) as c:
+        c.reset()
+        parser = inspect_buckeye(buckeye_test_dir)
+        c.load(parser, buckeye_test_dir, num_jobs=2)
+
+        q1 = c.query_graph(c.word).filter(c.word.label == 'that\'s')
+        assert (q1.count() == 2)
+
+        q = c.query_graph(c.phone).filter(c.phone.label == 's')
+        assert (q.count() == 3)
+
+        q = q.columns(c.phone.speaker.name.column_name('speaker'))
+        results = q.all()
+        assert (all(x['speaker'] == 'tes' for x in results))
+
+
+def test_load_discourse_buckeye_bolt_transport(graph_db, buckeye_test_dir):
+    with CorpusContext('discourse_buckeye_bolt', import_transport='bolt', import_batch_size=5, **graph_db) as c:
+        c.reset()
+        word_path = os.path.join(buckeye_test_dir, 'test.words')
+        parser = inspect_buckeye(word_path)
+        c.load(parser, word_path)
+        assert not os.listdir(c.config.temporary_directory('csv'))
+
+        assert (c.hierarchy.has_type_property('word', 'transcription'))
+
+        q = c.query_graph(c.phone).filter(c.phone.label == 's')
+        assert (q.count() == 3)
+
+        q = c.query_graph(c.word).filter(c.word.label == 'that\'s')
+        q = q.columns(c.word.following.label.column_name('following'))
+        results = q.all()
+        assert (sorted(x['following'] for x in results) == ['<IVER>', 'that'])
+
+        c.encode_pauses(['{B_TRANS}', '<IVER>', '<VOCNOISE>'])
+        c.encode_utterances(min_pause_length=0)
+        assert not os.listdir(c.config.temporary_directory('csv'))
+        q = c.query_graph(c.utterance)
+        assert (q.count() > 0)
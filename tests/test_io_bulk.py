@@ -0,0 +1,130 @@
+import os
+import re
+import csv
+
+from polyglotdb.io import inspect_buckeye, inspect_fave
+
+from polyglotdb import CorpusContext
+from polyglotdb.config import CorpusConfig
+
+uuid_pattern = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+
+def read_bulk_import_graph(command):
+    nodes = {}
+    for arg in command:
+        if not arg.startswith('--nodes='):
+            continue
+        with open(arg.split('=', 1)[1], 'r', encoding='utf8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            for line in reader:
+                labels = None
+                props = {}
+                key = None
+                for h, v in zip(header, line):
+                    if h == ':LABEL':
+                        labels = frozenset(v.split(';'))
+                        continue
+                    name, _, t = h.partition(':')
+                    if v == '':
+                        continue
+                    if t == 'float':
+                        v = float(v)
+                    elif t == 'long':
+                        v = int(v)
+                    elif t.startswith('ID'):
+                        key = v
+                    props[name] = v
+                nodes[key] = (labels, tuple(sorted(props.items())))
+    relationships = set()
+    for arg in command:
+        if not arg.startswith('--relationships='):
+            continue
+        with open(arg.split('=', 1)[1], 'r', encoding='utf8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            for line in reader:
+                props = {}
+                for h, v in zip(header, line):
+                    name, _, t = h.partition(':')
+                    if t.startswith('START_ID'):
+                        start = v
+                    elif t.startswith('END_ID'):
+                        end = v
+                    elif t == 'TYPE':
+                        rel_type = v
+                    elif t == 'long':
+                        props[name] = int(v)
+                    else:
+                        props[name] = v
+                # neo4j-admin is run without skipping bad relationships, so all of them must be between nodes
+                assert start in nodes
+                assert end in nodes
+                relationships.add((rel_type, start, end, tuple(sorted(props.items()))))
+    return set(nodes.values()), relationships
+
+
+def read_bulk_import_files(directory):
+    # Token ids are generated when files are parsed, so they are masked and the rows sorted
+    files = {}
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name), 'r', encoding='utf8') as f:
+            lines = f.read().splitlines()
+        files[name] = lines[:1] + sorted(uuid_pattern.sub('<id>', x) for x in lines[1:])
+    return files
+
+
+def read_database_graph(corpus_context):
+    statement = '''MATCH (n:{corpus}) RETURN labels(n) AS labels, properties(n) AS props
+    UNION ALL MATCH (n:Corpus) WHERE n.name = $corpus_name RETURN labels(n) AS labels, properties(n) AS props'''
+    nodes = set()
+    for r in corpus_context.execute_cypher(statement.format(corpus=corpus_context.cypher_safe_name),
+                                           corpus_name=corpus_context.corpus_name):
+        nodes.add((frozenset(r['labels']), tuple(sorted(r['props'].items()))))
+    statement = '''MATCH (a:{corpus})-[r]->(b:{corpus})
+    RETURN type(r) AS type, coalesce(a.id, a.name) AS start, coalesce(b.id, b.name) AS end, properties(r) AS props'''
+    relationships = set()
+    for r in corpus_context.execute_cypher(statement.format(corpus=corpus_context.cypher_safe_name)):
+        relationships.add((r['type'], r['start'], r['end'], tuple(sorted(r['props'].items()))))
+    return nodes, relationships
+
+
+def test_bulk_import_matches_import(graph_db, buckeye_test_dir, tmpdir):
+    word_path = os.path.join(buckeye_test_dir, 'test.words')
+    parser = inspect_buckeye(word_path)
+    data = parser.parse_discourse(word_path)
+    with CorpusContext('bulk_buckeye', **graph_db) as c:
+        c.reset()
+        c.initialize_import(data.speakers, data.token_headers, data.hierarchy.subannotations)
+        c.add_types(*data.types(c.corpus_name))
+        c.add_discourse(data)
+        c.finalize_import(data.speakers, data.token_headers, parser.hierarchy)
+        imported_nodes, imported_relationships = read_database_graph(c)
+
+        c.start_bulk_import(os.path.join(str(tmpdir), 'bulk_buckeye'))
+        c.initialize_import(data.speakers, data.token_headers, data.hierarchy.subannotations)
+        c.add_types(*data.types(c.corpus_name))
+        c.add_discourse(data)
+        c.finalize_import(data.speakers, data.token_headers, parser.hierarchy)
+        command = c.finish_bulk_import()
+
+    assert command[:4] == ['neo4j-admin', 'database', 'import', 'full']
+    bulk_nodes, bulk_relationships = read_bulk_import_graph(command)
+    assert bulk_nodes == imported_nodes
+    assert bulk_relationships == imported_relationships
+
+
+def test_load_directory_multiprocessing_matches_serial(fave_test_dir, tmpdir):
+    config = CorpusConfig('fave_num_jobs', data_dir=str(tmpdir))
+    outputs = []
+    for num_jobs in [1, 2]:
+        c = CorpusContext(config)
+        parser = inspect_fave(fave_test_dir)
+        directory = os.path.join(str(tmpdir), 'bulk_{}'.format(num_jobs))
+        c.load_bulk(parser, fave_test_dir, directory=directory, num_jobs=num_jobs)
+        outputs.append(read_bulk_import_files(directory))
+        assert not os.path.exists(os.path.join(config.temp_dir, 'parsed'))
+    assert 'word_type_nodes.csv' in outputs[0]
+    assert 'word_nodes.csv' in outputs[0]
+    assert outputs[0] == outputs[1]
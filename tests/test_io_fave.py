@@ -92,3 +92,25 @@ def test_load_fave_stereo(fave_test_dir, graph_db):
 
         assert (len(s['channels']) == 1)
         assert (s['channels'] == [1])
+
+
+def test_load_fave_concurrent(fave_test_dir, graph_db):
+    with CorpusContext('test_fave_concurrent', import_workers=2, **graph_db) as c:
+        c.reset()
+        parser = inspect_fave(fave_test_dir)
+        c.load(parser, fave_test_dir)
+
+        q = c.query_graph(c.word).filter(c.word.label == 'JURASSIC')
+        q = q.filter(c.word.speaker.name == 'Gary Salvi')
+        assert (q.count() == 1)
+
+        q = c.query_graph(c.word).filter(c.word.label == 'JURASSIC')
+        q = q.filter(c.word.speaker.name == 'Interviewer')
+        assert (q.count() == 0)
+
+        q = c.query_graph(c.word).filter(c.word.label == 'PLANET')
+        q = q.filter(c.word.speaker.name == 'Gary Salvi')
+        q = q.columns(c.word.label, c.word.following.label.column_name('following'))
+        results = q.all()
+        assert (len(results) == 1)
+        assert (results[0]['following'] == 'JURASSIC')
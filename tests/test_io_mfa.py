@@ -87,3 +87,33 @@ def test_two_format_parsing(mfa_test_dir, graph_db):
             c.load(parser, invalid_dir)
 
 
+
+
+def test_stream_mfa(mfa_test_dir):
+    path = os.path.join(mfa_test_dir, "mfa_test.TextGrid")
+    parser = inspect_mfa(path)
+    data = parser.parse_discourse(path)
+    expected = {}
+    for chunk in data.annotation_chunks():
+        for k, v in chunk.items():
+            expected[k] = [(x.label, x.begin, x.end, x.type_properties) for x in v]
+
+    parser = inspect_mfa(path, chunk_size=3)
+    streamed_data = parser.parse_discourse(path)
+    assert streamed_data.speakers == data.speakers
+    assert streamed_data.token_headers == data.token_headers
+    assert streamed_data.types('test') == data.types('test')
+    streamed = {k: [] for k in expected}
+    n_chunks = 0
+    labels = {}
+    for chunk in streamed_data.annotation_chunks():
+        n_chunks += 1
+        for k, v in chunk.items():
+            streamed[k].extend((x.label, x.begin, x.end, x.type_properties) for x in v)
+            labels.update((x.id, x.label) for x in v)
+        for x in chunk['phone']:
+            if x.super_id is not None:
+                word = labels[x.super_id]
+                assert word in [w.label for w in chunk['word']]
+    assert n_chunks > 1
+    assert streamed == expected
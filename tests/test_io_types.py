@@ -52,3 +52,44 @@ def test_compile_digraphs():
 
     digraph_at.digraphs = set(['aa', 'aab'])
     assert (digraph_at.digraph_pattern == re.compile('aab|aa|\d+|\S'))
+
+
+def test_annotation_type_lookup():
+    from polyglotdb.io.types.standardized import PGAnnotation, PGAnnotationType
+
+    at = PGAnnotationType('phone')
+    for label, begin, end, speaker in [('b', 1.0, 1.5, 'a'), ('a', 0.0, 1.0, 'a'),
+                                       ('c', 1.5, 3.0, 'a'), ('x', 0.0, 2.0, 'b')]:
+        annotation = PGAnnotation(label, begin, end)
+        annotation.speaker = speaker
+        at.add(annotation)
+
+    assert at.lookup(0.5, speaker='a').label == 'a'
+    assert at.lookup(1.0, speaker='a').label == 'a'
+    assert at.lookup(1.2, speaker='a').label == 'b'
+    assert at.lookup(1.2, speaker='b').label == 'x'
+    assert at.lookup(3.5, speaker='a') is None
+    assert at.lookup(1.2, speaker='c') is None
+    assert [x.label for x in at.lookup_range(0.2, 1.3, speaker='a')] == ['a', 'b']
+    assert [x.label for x in at.lookup_range(0.2, 1.3)] == ['a', 'x', 'b']
+    assert at.lookup_range(0.2, 1.3, speaker='c') == []
+
+    annotation = PGAnnotation('d', 3.0, 4.0)
+    annotation.speaker = 'a'
+    at.add(annotation)
+    assert at.lookup(3.5, speaker='a').label == 'd'
+
+
+def test_annotation_properties():
+    from polyglotdb.io.types.standardized import PGAnnotation
+
+    a = PGAnnotation('cat', 1.0, 0.5)
+    assert (a.begin, a.end, a.midpoint) == (0.5, 1.0, 0.75)
+    assert a.id == a.id
+    a.type_properties['transcription'] = ['k', 'ae', 't']
+    b = PGAnnotation('cat', 2.0, 2.5)
+    b.type_properties.update({'transcription': ['k', 'ae', 't']})
+    assert a.sha('corpus') == b.sha('corpus')
+    assert a.sha('corpus') != a.sha()
+    assert a.id != b.id
+    assert b.subannotations == []
@@ -1,9 +1,221 @@
+import os
+from decimal import Decimal
+
 import pytest
 
 from polyglotdb import CorpusContext
 from polyglotdb.query.base.func import Count
 from polyglotdb.query.base.complex import or_, and_
 from polyglotdb.utils import get_corpora_list
+from polyglotdb.exceptions import GraphQueryError
+
+
+def test_stream_split_queries(overlapped_config):
+    with CorpusContext(overlapped_config) as g:
+        q = g.query_graph(g.word).filter(g.word.label == 'this')
+        q = q.columns(g.word.speaker.name.column_name('speaker_name'), g.word.begin.column_name('begin'))
+        q = q.order_by(g.word.begin)
+        expected = [(x['speaker_name'], x['begin']) for x in q.all()]
+
+        results = q.all(stream=True, fetch_size=1)
+        first = results.next(1)
+        assert len(first) == 1
+        streamed = [(x['speaker_name'], x['begin']) for x in first + list(results)]
+        assert sorted(streamed) == sorted(expected)
+        with pytest.raises(GraphQueryError):
+            len(results)
+
+        results = g.query_graph(g.word).filter(g.word.label == 'this').all(stream=True)
+        assert len([x.label for x in results]) == 4
+
+
+def test_parallel_split_queries(overlapped_config):
+    with CorpusContext(overlapped_config) as g:
+        q = g.query_graph(g.word).filter(g.word.label == 'this')
+        q = q.columns(g.word.speaker.name.column_name('speaker_name'), g.word.begin.column_name('begin'))
+        expected = [(x['speaker_name'], x['begin']) for x in q.all()]
+        expected_count = q.count()
+
+        g.config.query_workers = 2
+        try:
+            q = g.query_graph(g.word).filter(g.word.label == 'this')
+            q = q.columns(g.word.speaker.name.column_name('speaker_name'), g.word.begin.column_name('begin'))
+            assert [(x['speaker_name'], x['begin']) for x in q.all()] == expected
+            assert q.count() == expected_count
+        finally:
+            g.config.query_workers = 1
+
+
+def test_profile(overlapped_config):
+    with CorpusContext(overlapped_config) as g:
+        q = g.query_graph(g.word).filter(g.word.label == 'this')
+        num_queries = len(list(q.split_queries()))
+        profile = q.profile()
+        assert len(profile.plans) == num_queries
+        assert all(statement.startswith('PROFILE') for statement, _ in profile.plans)
+        assert profile.total_db_hits > 0
+        assert profile.counts['hydrate_models'] == 4
+        assert profile.timings['fetch'] > 0
+
+        profile = q.explain()
+        assert len(profile.plans) == num_queries
+        assert all(statement.startswith('EXPLAIN') for statement, _ in profile.plans)
+        assert profile.total_db_hits is None
+        assert profile.counts['hydrate_models'] == 0
+        assert g.query_profile is None
+
+
+def test_query_result_cache(overlapped_config):
+    with CorpusContext(overlapped_config) as g:
+        g.config.query_cache_size = 10 ** 7
+        execute_cypher = g.execute_cypher
+        try:
+            g.result_cache.clear()
+            q = g.query_graph(g.word).filter(g.word.label == 'this')
+            q = q.columns(g.word.begin.column_name('begin'))
+            expected = [x['begin'] for x in q.all()]
+            expected_count = q.count()
+            assert os.listdir(g.config.query_cache_dir)
+
+            def fail(*args, **kwargs):
+                raise AssertionError('Query was not cached')
+
+            g.execute_cypher = fail
+            assert [x['begin'] for x in q.all()] == expected
+            assert q.count() == expected_count
+
+            g.bump_corpus_version()
+            with pytest.raises(AssertionError):
+                q.count()
+        finally:
+            g.execute_cypher = execute_cypher
+            g.result_cache.clear()
+            g.config.query_cache_size = None
+
+
+def test_query_planner(overlapped_config):
+    with CorpusContext(overlapped_config) as g:
+        g.refresh_statistics()
+        statistics = g.query_planner.statistics
+        assert statistics.node_count('word') == g.query_graph(g.word).count()
+        assert statistics.node_count('Speaker') == len(g.speakers)
+        assert statistics.distinct_count('word', 'label') > 1
+
+        q = g.query_graph(g.word).filter(g.word.label == 'this')
+        assert g.query_planner.estimate_rows(q) < statistics.node_count('word')
+        expected = q.count()
+
+        g.config.query_split_threshold = statistics.node_count('word') + 1
+        try:
+            assert len(list(q.split_queries())) == 1
+            assert q.count() == expected
+        finally:
+            g.config.query_split_threshold = 0
+
+
+def test_page_after(overlapped_config):
+    with CorpusContext(overlapped_config) as g:
+        q = g.query_graph(g.word).columns(g.word.discourse.name.column_name('discourse'),
+                                          g.word.begin.column_name('begin'), g.word.id.column_name('id'))
+        q = q.order_by(g.word.discourse.name).order_by(g.word.begin).order_by(g.word.id)
+        expected = [(x['discourse'], x['begin'], x['id']) for x in q.all()]
+
+        q = g.query_graph(g.word).columns(g.word.discourse.name.column_name('discourse'),
+                                          g.word.begin.column_name('begin'), g.word.id.column_name('id'))
+        paged = []
+        page = q.page_after(size=3)
+        while page.last_key is not None:
+            assert len(page) <= 3
+            paged.extend((x['discourse'], x['begin'], x['id']) for x in page)
+            page = q.page_after(page.last_key, size=3)
+        assert paged == expected
+
+        page = g.query_graph(g.word).page_after(size=2)
+        assert len(page) == 2
+        assert page.last_key == (page[1].discourse.name, page[1].begin, page[1].id)
+
+        with pytest.raises(GraphQueryError):
+            q.order_by(g.word.label).page_after(size=3)
+
+
+def test_columnar_results(overlapped_config, acoustic_utt_config):
+    with CorpusContext(acoustic_utt_config) as g:
+        q = g.query_graph(g.phone).filter(g.phone.label == 'ow')
+        q = q.order_by(g.phone.begin)
+        q = q.columns(g.phone.utterance.id.column_name('id'))
+        utt_id = q.all()[0]['id']
+        expected_formants = {Decimal('4.23'): {'F1': 501, 'F2': 1500, 'F3': 2500},
+                             Decimal('4.24'): {'F1': 502, 'F2': 1499, 'F3': 2498},
+                             Decimal('4.25'): {'F1': 503, 'F2': 1498, 'F3': 2500},
+                             Decimal('4.26'): {'F1': 504, 'F2': 1497, 'F3': 2502},
+                             Decimal('4.27'): {'F1': 505, 'F2': 1496, 'F3': 2500}}
+        g.reset_acoustic_measure('formants')
+        g.hierarchy.add_acoustic_properties(g, 'formants', [('F1', float), ('F2', float), ('F3', float)])
+        g.encode_hierarchy()
+        g.save_acoustic_track('formants', 'acoustic_corpus', expected_formants, utterance_id=utt_id)
+
+        q = g.query_graph(g.phone).filter(g.phone.label == 'ow')
+        q = q.order_by(g.phone.begin)
+        q = q.columns(g.phone.label.column_name('label'), g.phone.begin.column_name('begin'),
+                      g.phone.formants.track)
+        results = q.all()
+        num_points = [len(r.track) for r in results]
+
+        # Tracks are flattened to one row per time point, repeating the other columns
+        data = q.all().to_numpy()
+        assert list(data.keys())[:3] == ['label', 'begin', 'time']
+        assert len(data['time']) == sum(num_points)
+        assert list(data['label']) == ['ow'] * sum(num_points)
+        assert list(data['begin'][:num_points[0]]) == [results[0]['begin']] * num_points[0]
+        times = sorted(expected_formants)
+        assert [round(x, 2) for x in data['time'][:num_points[0]]] == [float(x) for x in times]
+        for f in ['F1', 'F2', 'F3']:
+            assert [round(x) for x in data[f][:num_points[0]]] == [expected_formants[x][f] for x in times]
+
+    with CorpusContext(overlapped_config) as g:
+        q = g.query_graph(g.word).filter(g.word.label == 'this')
+        q = q.columns(g.word.label.column_name('label'), g.word.begin.column_name('begin'),
+                      g.word.speaker.name.column_name('speaker_name'))
+        q = q.order_by(g.word.begin)
+        expected = [(x['label'], x['begin'], x['speaker_name']) for x in q.all()]
+
+        data = q.all().to_numpy()
+        assert list(data.keys()) == ['label', 'begin', 'speaker_name']
+        assert data['begin'].dtype == 'float64'
+        assert list(zip(data['label'], data['begin'], data['speaker_name'])) == expected
+
+        data = q.all(stream=True).to_numpy()
+        assert sorted(zip(data['label'], data['begin'], data['speaker_name'])) == sorted(expected)
+
+        pd = pytest.importorskip('pandas')
+        df = q.all().to_dataframe()
+        assert isinstance(df, pd.DataFrame)
+        assert list(df.columns) == ['label', 'begin', 'speaker_name']
+        assert df['begin'].dtype == 'float64'
+        assert list(df.itertuples(index=False, name=None)) == expected
+
+        pa = pytest.importorskip('pyarrow')
+        table = q.all().to_arrow()
+        assert table.column_names == ['label', 'begin', 'speaker_name']
+        assert table.schema.field('label').type == pa.string()
+        assert table.schema.field('begin').type == pa.float64()
+        assert list(zip(*(table.column(k).to_pylist() for k in table.column_names))) == expected
+
+        table = q.all(stream=True).to_arrow()
+        assert sorted(zip(*(table.column(k).to_pylist() for k in table.column_names))) == sorted(expected)
+
+
+def test_cypher_cache(overlapped_config):
+    with CorpusContext(overlapped_config) as g:
+        q = g.query_graph(g.word).filter(g.word.label == 'this').filter(g.word.speaker.name == 'Speaker 1')
+        other = g.query_graph(g.word).filter(g.word.label == 'is').filter(g.word.speaker.name == 'Speaker 2')
+        assert q.cypher() is other.cypher()
+        assert q.cypher_params()['node_Speaker_name'] == 'Speaker 1'
+        assert other.cypher_params()['node_Speaker_name'] == 'Speaker 2'
+
+        q._set_properties = {'checked': True}
+        assert 'True' not in q.cypher()
+        assert q.cypher_params()['set_property_checked'] is True
 
 
 def test_speaker_split_queries(overlapped_config):
@@ -117,6 +117,9 @@ def test_preload(acoustic_config):
         results = q.all()
 
         for r in results:
+            # Preloaded annotations are only created when first accessed
+            assert (not r._supers)
+            assert (r.word is not None)
             assert ('word' in r._supers)
             assert (r._supers['word'] is not None)
 
@@ -126,6 +129,7 @@ def test_preload(acoustic_config):
         results = q.all()
 
         for r in results:
+            assert (r.phone is not None)
             assert ('phone' in r._subs)
             assert (r._subs['phone'] is not None)
 
@@ -244,3 +248,12 @@ def test_delete(subannotation_config):
         model.load(id)
 
         assert (model.voicing_during_closure == [])
+
+
+def test_preload_shared_speakers(acoustic_config):
+    with CorpusContext(acoustic_config) as c:
+        q = c.query_graph(c.phone).preload(c.phone.speaker, c.phone.discourse)
+        results = q.all()
+        first, second = results[0], results[1]
+        assert first.speaker is second.speaker
+        assert first.discourse is second.discourse